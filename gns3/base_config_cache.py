@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Cache of the base config files (startup-config, private-config etc.) sent to
+the server when nodes are created.
+"""
+
+import os
+
+from .qt import QtCore, qslot
+
+import logging
+log = logging.getLogger(__name__)
+
+# files to read larger than this (in total) are read in a thread
+ASYNC_READ_THRESHOLD = 64 * 1024
+
+
+def read_config(path):
+    """
+    Reads a config file.
+
+    :param path: config file path
+
+    :returns: tuple (content, error message), content is None on error
+    """
+
+    try:
+        with open(path, "rb") as f:
+            log.info("Opening configuration file: {}".format(path))
+            return f.read().decode("utf-8").replace("\r", ""), None
+    except OSError as e:
+        return None, "Could not read configuration file {}: {}".format(path, e)
+    except UnicodeDecodeError as e:
+        return None, "Invalid configuration file {}: {}".format(path, e)
+
+
+class _ReadTask(QtCore.QRunnable):
+
+    """
+    Reads config files in the thread pool.
+
+    :param files: list of (path, modification time)
+    :param done_signal: signal emitted with the results
+    """
+
+    def __init__(self, files, done_signal):
+
+        super().__init__()
+        self._files = files
+        self._done_signal = done_signal
+
+    def run(self):
+
+        results = {}
+        for path, mtime in self._files:
+            results[path] = (mtime, read_config(path))
+        self._done_signal.emit(results)
+
+
+class BaseConfigCache(QtCore.QObject):
+
+    """
+    Contents of the base config files, read again only when their
+    modification time changes. Many nodes often share the same base
+    config, it is read once.
+
+    Large files are read in a thread so creating many nodes doesn't
+    block the GUI, a file is not read twice at the same time.
+    """
+
+    _read_done_signal = QtCore.pyqtSignal(object)
+
+    def __init__(self):
+
+        super().__init__()
+        # path: (modification time, content)
+        self._contents = {}
+        # path: list of requests waiting for the file
+        self._reading = {}
+        self._hits = 0
+        self._misses = 0
+        self._read_done_signal.connect(self._readDoneSlot)
+
+    def _cached(self, path, mtime):
+        """
+        Returns the cached content of a file or None.
+        """
+
+        entry = self._contents.get(path)
+        if entry is not None and entry[0] == mtime:
+            self._hits += 1
+            return entry[1]
+        return None
+
+    def _store(self, path, mtime, result):
+        """
+        Caches the content of a file that has been read.
+
+        :returns: tuple (content, error message)
+        """
+
+        self._misses += 1
+        content, error = result
+        if error is None:
+            self._contents[path] = (mtime, content)
+        else:
+            self._contents.pop(path, None)
+        return result
+
+    def read(self, path):
+        """
+        Reads a config file.
+
+        :param path: config file path
+
+        :returns: tuple (content, error message), content is None on error
+        """
+
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError as e:
+            return None, "Could not read configuration file {}: {}".format(path, e)
+        content = self._cached(path, mtime)
+        if content is not None:
+            return content, None
+        return self._store(path, mtime, read_config(path))
+
+    def readMany(self, paths, callback):
+        """
+        Reads config files. The callback is called right away when the
+        files are cached or small, otherwise once they are read in a thread.
+
+        :param paths: list of config file paths
+        :param callback: callback receiving a dictionary of paths and
+        tuples (content, error message)
+        """
+
+        request = {"callback": callback, "results": {}, "missing": set()}
+        to_read = []
+        size = 0
+        for path in set(paths):
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                request["results"][path] = (None, "Could not read configuration file {}: {}".format(path, e))
+                continue
+            content = self._cached(path, stat.st_mtime)
+            if content is not None:
+                request["results"][path] = (content, None)
+            elif path in self._reading:
+                # the file is already being read for another request
+                self._reading[path].append(request)
+                request["missing"].add(path)
+            else:
+                to_read.append((path, stat.st_mtime))
+                size += stat.st_size
+
+        if not request["missing"] and size <= ASYNC_READ_THRESHOLD:
+            for path, mtime in to_read:
+                request["results"][path] = self._store(path, mtime, read_config(path))
+            callback(request["results"])
+            return
+
+        for path, mtime in to_read:
+            self._reading[path] = [request]
+            request["missing"].add(path)
+        if to_read:
+            log.debug("reading {} config files ({} bytes) in a thread".format(len(to_read), size))
+            QtCore.QThreadPool.globalInstance().start(_ReadTask(to_read, self._read_done_signal))
+
+    @qslot
+    def _readDoneSlot(self, results):
+        """
+        Slot called when files have been read in a thread.
+
+        :param results: dictionary of paths and (modification time, (content, error message))
+        """
+
+        for path, (mtime, result) in results.items():
+            result = self._store(path, mtime, result)
+            for request in self._reading.pop(path, []):
+                request["results"][path] = result
+                request["missing"].discard(path)
+                if not request["missing"]:
+                    request["callback"](request["results"])
+
+    def clear(self):
+        """
+        Forgets the cached contents.
+        """
+
+        self._contents.clear()
+
+    def statistics(self):
+        """
+        Returns the cache statistics.
+
+        :returns: dictionary
+        """
+
+        return {"files": len(self._contents), "hits": self._hits, "misses": self._misses}
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of BaseConfigCache.
+
+        :returns: instance of BaseConfigCache
+        """
+
+        if not hasattr(BaseConfigCache, "_instance") or BaseConfigCache._instance is None:
+            BaseConfigCache._instance = BaseConfigCache()
+        return BaseConfigCache._instance
@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Sink writing a packet capture streamed from a remote server to local files.
+"""
+
+import os
+import time
+import struct
+
+from .qt import QtCore
+
+import logging
+log = logging.getLogger(__name__)
+
+PCAP_GLOBAL_HEADER_SIZE = 24
+PCAP_RECORD_HEADER_SIZE = 16
+
+# maximum amount of data waiting to be read by a live packet capture reader
+LIVE_OUTPUT_MAX_PENDING = 16 * 1024 * 1024
+
+
+class CaptureSink(QtCore.QObject):
+
+    """
+    Keeps the capture file open and buffers the received data. The buffer is
+    written when it reaches flush_size or every flush_interval milliseconds,
+    so the packet capture reader following the file sees timely data.
+
+    In ring buffer mode, the capture is split in several files which are
+    rotated when they reach ring_buffer_size bytes or are older than
+    ring_buffer_duration seconds, only the last ring_buffer_files are kept.
+    Readers following the capture are fed by the sink so they continue
+    across rotations.
+
+    :param path: path to the local capture file, or path prefix in ring buffer mode
+    :param flush_size: buffer size triggering a write
+    :param flush_interval: maximum delay in milliseconds before buffered data is written
+    :param ring_buffer_size: rotate files bigger than this size in bytes (0 to disable)
+    :param ring_buffer_duration: rotate files older than this duration in seconds (0 to disable)
+    :param ring_buffer_files: number of files to keep (0 to keep all of them)
+    :param pcapng: write the capture in the PCAPNG format
+    """
+
+    error_signal = QtCore.Signal(str)
+
+    def __init__(self, path, flush_size=64 * 1024, flush_interval=250,
+                 ring_buffer_size=0, ring_buffer_duration=0, ring_buffer_files=0, pcapng=False):
+
+        super().__init__()
+        self._flush_size = flush_size
+        self._buffer = bytearray()
+        self._ring_buffer = bool(ring_buffer_size or ring_buffer_duration)
+        self._ring_buffer_size = ring_buffer_size
+        self._ring_buffer_duration = ring_buffer_duration
+        self._ring_buffer_files = ring_buffer_files
+        self._pcapng = pcapng
+        # the received data is written as is unless it must be split or converted
+        self._passthrough = not self._ring_buffer and not pcapng
+        self._live_outputs = []
+        self._live_outputs_without_header = []
+        self._closed = False
+
+        # statistics
+        self._bytes = 0
+        self._packets = 0
+        self._bytes_per_second = 0
+        self._packets_per_second = 0
+        self._last_sample = (time.monotonic(), 0, 0)
+
+        # incremental PCAP parser state
+        self._header = bytearray()
+        self._header_size = PCAP_GLOBAL_HEADER_SIZE
+        self._record_header = None
+        self._record = bytearray()
+        self._skip = 0
+        self._endianness = None
+        self._nanoseconds = False
+        self._link_type = None
+        self._snap_length = None
+        self._file_header = None
+
+        self._files = []
+        self._file_number = 0
+        self._file = None
+        self._file_size = 0
+        self._file_opened = 0
+        if self._ring_buffer:
+            self._base_path = path
+            self._path = None
+        else:
+            self._path = path
+            self._file = open(path, "ab")
+
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setInterval(flush_interval)
+        self._flush_timer.timeout.connect(self.flush)
+        self._flush_timer.start()
+
+    def path(self):
+        """
+        Returns the path to the current local capture file.
+        """
+
+        return self._path
+
+    def files(self):
+        """
+        Returns the capture files kept in ring buffer mode, oldest first.
+        """
+
+        return list(self._files)
+
+    def ringBuffer(self):
+        """
+        Returns True if the capture is written in ring buffer mode.
+        """
+
+        return self._ring_buffer
+
+    def addLiveOutput(self, device):
+        """
+        Feeds a device (the packet capture reader standard input) with the
+        capture. It receives the content of the current file and then the
+        packets as they arrive, even across file rotations.
+
+        :param device: QIODevice instance
+        """
+
+        self.flush()
+        if self._path and os.path.exists(self._path):
+            try:
+                with open(self._path, "rb") as f:
+                    device.write(f.read())
+            except OSError as e:
+                log.warning("Could not read packet capture {}: {}".format(self._path, e))
+        elif self._ring_buffer:
+            # the first file is not created yet, the reader will receive its header
+            self._live_outputs_without_header.append(device)
+        self._live_outputs.append(device)
+
+    def removeLiveOutput(self, device):
+        """
+        Stops feeding a device with the capture.
+
+        :param device: QIODevice instance
+        """
+
+        if device in self._live_outputs:
+            self._live_outputs.remove(device)
+        if device in self._live_outputs_without_header:
+            self._live_outputs_without_header.remove(device)
+
+    def write(self, data):
+        """
+        Adds data received from the server.
+
+        :param data: capture data (bytes)
+        """
+
+        if self._closed:
+            return
+        self._bytes += len(data)
+        if self._passthrough:
+            self._buffer += data
+        self._parse(data)
+        if len(self._buffer) >= self._flush_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered data to the capture file.
+        """
+
+        self._updateRates()
+        if not self._buffer:
+            return
+        if self._file is not None:
+            try:
+                self._file.write(self._buffer)
+                self._file.flush()
+            except OSError as e:
+                self.error_signal.emit("Could not write packet capture {}: {}".format(self._path, e))
+        for device in list(self._live_outputs):
+            if device.bytesToWrite() > LIVE_OUTPUT_MAX_PENDING:
+                log.warning("The packet capture reader is too slow, packets have been dropped")
+                continue
+            if device.write(bytes(self._buffer)) == -1:
+                self._live_outputs.remove(device)
+        self._buffer.clear()
+
+    def close(self):
+        """
+        Writes the remaining data and closes the capture file.
+        """
+
+        self._flush_timer.stop()
+        self.flush()
+        self._live_outputs = []
+        self._live_outputs_without_header = []
+        self._closeFile()
+        self._closed = True
+
+    def statistics(self):
+        """
+        Returns the capture statistics.
+
+        :returns: dictionary
+        """
+
+        return {"bytes": self._bytes,
+                "packets": self._packets,
+                "bytes_per_second": self._bytes_per_second,
+                "packets_per_second": self._packets_per_second}
+
+    def _updateRates(self):
+
+        now = time.monotonic()
+        last_time, last_bytes, last_packets = self._last_sample
+        elapsed = now - last_time
+        if elapsed >= 1:
+            self._bytes_per_second = int((self._bytes - last_bytes) / elapsed)
+            self._packets_per_second = int((self._packets - last_packets) / elapsed)
+            self._last_sample = (now, self._bytes, self._packets)
+
+    def _closeFile(self):
+
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except OSError as e:
+            log.warning("Could not close packet capture {}: {}".format(self._path, e))
+        self._file = None
+
+    def _rotate(self):
+        """
+        Starts a new capture file and deletes the oldest ones.
+        """
+
+        self.flush()
+        self._closeFile()
+        extension = ".pcapng" if self._pcapng else ".pcap"
+        self._file_number += 1
+        self._path = "{}_{:05d}{}".format(self._base_path, self._file_number, extension)
+        while self._ring_buffer_files and len(self._files) >= self._ring_buffer_files:
+            oldest = self._files.pop(0)
+            try:
+                os.remove(oldest)
+            except OSError as e:
+                log.warning("Could not delete packet capture {}: {}".format(oldest, e))
+        try:
+            self._file = open(self._path, "wb")
+            self._file.write(self._file_header)
+        except OSError as e:
+            self.error_signal.emit("Could not create packet capture {}: {}".format(self._path, e))
+            return
+        log.info("Packet capture rotated to {}".format(self._path))
+        self._files.append(self._path)
+        self._file_size = len(self._file_header)
+        self._file_opened = time.monotonic()
+        for device in self._live_outputs_without_header:
+            device.write(self._file_header)
+        self._live_outputs_without_header = []
+
+    def _emit(self, data):
+        """
+        Adds converted data to the capture.
+        """
+
+        self._file_size += len(data)
+        self._buffer += data
+
+    def _needRotation(self):
+
+        if self._file is None:
+            return True
+        if self._ring_buffer_size and self._file_size >= self._ring_buffer_size:
+            return True
+        if self._ring_buffer_duration and time.monotonic() - self._file_opened >= self._ring_buffer_duration:
+            return True
+        return False
+
+    def _onGlobalHeader(self, header):
+
+        _, _, _, _, snap_length, link_type = struct.unpack(self._endianness + "HHiIII", header[4:])
+        self._link_type = link_type
+        self._snap_length = snap_length
+        if self._pcapng:
+            # section header block followed by the interface description block
+            self._file_header = struct.pack("<IIIHHq", 0x0A0D0D0A, 28, 0x1A2B3C4D, 1, 0, -1) + struct.pack("<I", 28)
+            options = b""
+            if self._nanoseconds:
+                # if_tsresol option
+                options = struct.pack("<HHB3x", 9, 1, 9) + struct.pack("<HH", 0, 0)
+            length = 20 + len(options)
+            self._file_header += struct.pack("<IIHHI", 1, length, link_type, 0, snap_length) + options + struct.pack("<I", length)
+        else:
+            self._file_header = bytes(header)
+
+        if self._ring_buffer:
+            self._rotate()
+        elif not self._passthrough:
+            self._emit(self._file_header)
+
+    def _onRecord(self, header, data):
+
+        if self._ring_buffer and self._needRotation():
+            self._rotate()
+        if self._pcapng:
+            seconds, fraction, included_length, original_length = struct.unpack(self._endianness + "IIII", header)
+            timestamp = seconds * (1000000000 if self._nanoseconds else 1000000) + fraction
+            padding = b"\0" * (-included_length % 4)
+            length = 32 + included_length + len(padding)
+            self._emit(struct.pack("<IIIIIII", 6, length, 0, timestamp >> 32, timestamp & 0xffffffff, included_length, original_length) +
+                       data + padding + struct.pack("<I", length))
+        else:
+            self._emit(header + data)
+
+    def _parse(self, data):
+        """
+        Follows the PCAP records in the received data. Packets are counted
+        and, unless the data is written as is, split in records.
+        """
+
+        view = memoryview(data)
+        while len(view):
+            if self._skip:
+                skipped = min(self._skip, len(view))
+                if self._record_header is not None:
+                    self._record += view[:skipped]
+                self._skip -= skipped
+                view = view[skipped:]
+                if self._skip == 0 and self._record_header is not None:
+                    self._onRecord(self._record_header, bytes(self._record))
+                    self._record_header = None
+                    self._record.clear()
+                continue
+
+            needed = self._header_size - len(self._header)
+            self._header += view[:needed]
+            view = view[needed:]
+            if len(self._header) < self._header_size:
+                return
+
+            if self._endianness is None:
+                magic = bytes(self._header[:4])
+                if magic in (b"\xd4\xc3\xb2\xa1", b"\x4d\x3c\xb2\xa1"):
+                    self._endianness = "<"
+                elif magic in (b"\xa1\xb2\xc3\xd4", b"\xa1\xb2\x3c\x4d"):
+                    self._endianness = ">"
+                else:
+                    # not a PCAP file, only the bytes are counted
+                    log.debug("Unknown capture format for {}".format(self._path))
+                    if not self._passthrough:
+                        self.error_signal.emit("Packet capture is not in the PCAP format, it cannot be rotated or converted")
+                    self._skip = float("inf")
+                    continue
+                self._nanoseconds = magic in (b"\x4d\x3c\xb2\xa1", b"\xa1\xb2\x3c\x4d")
+                if not self._passthrough:
+                    self._onGlobalHeader(self._header)
+                self._header_size = PCAP_RECORD_HEADER_SIZE
+            else:
+                included_length = struct.unpack(self._endianness + "I", self._header[8:12])[0]
+                self._packets += 1
+                if self._passthrough:
+                    self._skip = included_length
+                elif included_length:
+                    self._record_header = bytes(self._header)
+                    self._skip = included_length
+                else:
+                    self._onRecord(bytes(self._header), b"")
+            self._header.clear()
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Export and import of the configs of many nodes at once.
+"""
+
+import io
+import os
+import time
+import tarfile
+import zipfile
+import collections
+
+from .qt import QtCore, qslot
+
+import logging
+log = logging.getLogger(__name__)
+
+# configs requested at the same time from a server
+MAX_TRANSFERS_PER_SERVER = 4
+
+# archive format and the mode used to open it
+ARCHIVE_FORMATS = collections.OrderedDict([
+    ("zip", "w"),
+    ("tar", "w"),
+    ("tar.gz", "w:gz"),
+])
+
+
+def archive_format(path):
+    """
+    Returns the archive format matching the extension of a file.
+
+    :param path: archive path
+
+    :returns: archive format or None
+    """
+
+    path = path.lower()
+    if path.endswith(".zip"):
+        return "zip"
+    if path.endswith(".tar"):
+        return "tar"
+    if path.endswith(".tar.gz") or path.endswith(".tgz"):
+        return "tar.gz"
+    return None
+
+
+def import_configs(nodes, directory):
+    """
+    Imports the configs of nodes from a directory,
+    which is listed only once for all the nodes.
+
+    :param nodes: list of Node instances
+    :param directory: source directory path
+    """
+
+    contents = os.listdir(directory)
+    for node in nodes:
+        node.importConfigFromDirectory(directory, contents)
+
+
+class ConfigFileWriter(QtCore.QObject):
+
+    """
+    Writes config files to a directory or to an archive. It is used
+    from a worker thread so the disk writes don't block the GUI.
+
+    :param destination: destination directory or archive path
+    :param archive: archive format (see ARCHIVE_FORMATS) or None to write to a directory
+    """
+
+    error = QtCore.pyqtSignal(str)
+    written = QtCore.pyqtSignal(int)
+    closed = QtCore.pyqtSignal()
+
+    def __init__(self, destination, archive=None):
+
+        super().__init__()
+        self._destination = destination
+        self._archive_format = archive
+        self._archive = None
+        self._failed = False
+
+    def _openArchive(self):
+
+        if self._archive_format == "zip":
+            self._archive = zipfile.ZipFile(self._destination, ARCHIVE_FORMATS["zip"], zipfile.ZIP_DEFLATED)
+        else:
+            self._archive = tarfile.open(self._destination, ARCHIVE_FORMATS[self._archive_format])
+
+    @qslot
+    def write(self, file_name, content):
+        """
+        Writes a config file.
+
+        :param file_name: file name
+        :param content: file content (string)
+        """
+
+        if self._failed:
+            return
+        data = content.encode("utf-8")
+        try:
+            if self._archive_format is None:
+                path = os.path.join(self._destination, file_name)
+                log.info("saving config to {}".format(path))
+                with open(path, "wb") as f:
+                    f.write(data)
+            else:
+                if self._archive is None:
+                    self._openArchive()
+                if self._archive_format == "zip":
+                    self._archive.writestr(file_name, data)
+                else:
+                    info = tarfile.TarInfo(file_name)
+                    info.size = len(data)
+                    info.mtime = time.time()
+                    self._archive.addfile(info, io.BytesIO(data))
+        except (OSError, tarfile.TarError, zipfile.BadZipFile) as e:
+            if self._archive_format is not None:
+                # the next files could not be added to the archive either
+                self._failed = True
+                self.error.emit("Could not write to {}: {}".format(self._destination, e))
+            else:
+                self.error.emit("Could not export config to {}: {}".format(path, e))
+            return
+        self.written.emit(len(data))
+
+    @qslot
+    def close(self):
+        """
+        Closes the archive, if any.
+        """
+
+        if self._archive is not None:
+            try:
+                self._archive.close()
+            except OSError as e:
+                self.error.emit("Could not write to {}: {}".format(self._destination, e))
+            self._archive = None
+        self.closed.emit()
+
+
+class ConfigExporter(QtCore.QObject):
+
+    """
+    Exports the configs of many nodes.
+
+    The configs are requested from each server with at most max_transfers
+    requests at once and are written in a worker thread. With dry_run, the
+    configs are requested but not written, to know the size of the export.
+
+    :param nodes: list of Node instances
+    :param destination: destination directory or archive path
+    :param archive: archive format (see ARCHIVE_FORMATS) or None to write to a directory
+    :param dry_run: only computes the size of the configs
+    :param max_transfers: maximum number of requests at once per server
+    """
+
+    # number of nodes processed
+    updated = QtCore.pyqtSignal(int)
+    # bytes processed and total bytes (0 when unknown)
+    bytes_updated = QtCore.pyqtSignal(int, int)
+    error = QtCore.pyqtSignal(str)
+    finished = QtCore.pyqtSignal()
+
+    # requests to the writer living in the worker thread
+    _write_signal = QtCore.pyqtSignal(str, str)
+    _close_signal = QtCore.pyqtSignal()
+
+    def __init__(self, nodes, destination=None, archive=None, dry_run=False, max_transfers=MAX_TRANSFERS_PER_SERVER):
+
+        super().__init__()
+        self._nodes = list(nodes)
+        self._destination = destination
+        self._archive = archive
+        self._dry_run = dry_run
+        self._max_transfers = max_transfers
+
+        self._queues = collections.OrderedDict()
+        self._transfers = {}
+        self._done = 0
+        self._size = 0
+        self._file_count = 0
+        self._errors = []
+        self._canceled = False
+        self._closing = False
+        self._finished = False
+        self._writer = None
+        self._thread = None
+
+    def start(self):
+        """
+        Starts the export.
+        """
+
+        for node in self._nodes:
+            self._queues.setdefault(node.server(), collections.deque()).append(node)
+            self._transfers.setdefault(node.server(), 0)
+
+        if not self._dry_run:
+            self._writer = ConfigFileWriter(self._destination, self._archive)
+            self._writer.written.connect(self._writtenSlot)
+            self._writer.error.connect(self._writerErrorSlot)
+            self._writer.closed.connect(self._writerClosedSlot)
+            self._write_signal.connect(self._writer.write)
+            self._close_signal.connect(self._writer.close)
+            self._thread = QtCore.QThread()
+            self._writer.moveToThread(self._thread)
+            self._thread.start()
+
+        log.info("exporting the configs of {} nodes".format(len(self._nodes)))
+        for server in list(self._queues):
+            self._nextTransfers(server)
+        self._checkFinished()
+
+    def cancel(self):
+        """
+        Cancels the export, the files already received are still written.
+        """
+
+        self._canceled = True
+        for queue in self._queues.values():
+            queue.clear()
+        self._checkFinished()
+
+    def _nextTransfers(self, server):
+        """
+        Requests configs from a server until the maximum
+        number of requests at once is reached.
+
+        :param server: HTTPClient instance
+        """
+
+        queue = self._queues[server]
+        while queue and self._transfers[server] < self._max_transfers:
+            node = queue.popleft()
+            self._transfers[server] += 1
+            node.httpGet(node.configFilesPath(),
+                         self._configFilesCallback,
+                         context={"node": node},
+                         showProgress=False)
+
+    def _configFilesCallback(self, result, error=False, context={}, **kwargs):
+        """
+        Callback for the config requests.
+
+        :param result: server response
+        :param error: indicates an error (boolean)
+        """
+
+        node = context["node"]
+        self._transfers[node.server()] -= 1
+        self._done += 1
+        if error:
+            message = "Could not export the configs of {}: {}".format(node.name(), result.get("message", "unknown error"))
+            log.error(message)
+            self._errors.append(message)
+            self.error.emit(message)
+        else:
+            for file_name, content in node.configFiles(result).items():
+                self._file_count += 1
+                if self._dry_run:
+                    self._size += len(content.encode("utf-8"))
+                else:
+                    self._write_signal.emit(file_name, content)
+
+        self.updated.emit(self._done)
+        if self._dry_run:
+            self.bytes_updated.emit(self._size, 0)
+        self._nextTransfers(node.server())
+        self._checkFinished()
+
+    def _checkFinished(self):
+        """
+        Closes the writer once there is nothing left to request.
+        """
+
+        if self._closing or any(self._queues.values()) or any(self._transfers.values()):
+            return
+        self._closing = True
+        if self._dry_run:
+            self._finish()
+        else:
+            self._close_signal.emit()
+
+    @qslot
+    def _writtenSlot(self, size):
+
+        self._size += size
+        self.bytes_updated.emit(self._size, 0)
+
+    @qslot
+    def _writerErrorSlot(self, message):
+
+        log.error(message)
+        self._errors.append(message)
+        self.error.emit(message)
+
+    @qslot
+    def _writerClosedSlot(self):
+
+        self._finish()
+
+    def _finish(self):
+
+        if self._thread is not None:
+            self._thread.quit()
+            self._thread.wait()
+            self._thread = None
+        log.info("{} config files ({} bytes) exported from {} nodes{}".format(self._file_count,
+                                                                              self._size,
+                                                                              self._done,
+                                                                              " (dry run)" if self._dry_run else ""))
+        self._finished = True
+        self.finished.emit()
+
+    def nodeCount(self):
+        """
+        Returns the number of nodes to export.
+
+        :returns: number of nodes
+        """
+
+        return len(self._nodes)
+
+    def isFinished(self):
+        """
+        Returns whether the export is finished.
+
+        :returns: boolean
+        """
+
+        return self._finished
+
+    def size(self):
+        """
+        Returns the number of bytes of the configs received so far.
+
+        :returns: size in bytes
+        """
+
+        return self._size
+
+    def fileCount(self):
+        """
+        Returns the number of config files received so far.
+
+        :returns: number of files
+        """
+
+        return self._file_count
+
+    def errors(self):
+        """
+        Returns the error messages.
+
+        :returns: list of messages
+        """
+
+        return self._errors
+
+    def canceled(self):
+        """
+        Returns whether the export was canceled.
+
+        :returns: boolean
+        """
+
+        return self._canceled
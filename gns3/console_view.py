@@ -26,7 +26,7 @@ from .topology import Topology
 from .version import __version__
 from .console_cmd import ConsoleCmd
 from .pycutext import PyCutExt
-from .modules import MODULES
+from .modules.module import Module
 from .local_config import LocalConfig
 
 
@@ -66,9 +66,7 @@ class ConsoleView(PyCutExt, ConsoleCmd):
         except Exception as e:
             sys.stderr.write(e)
 
-        for module in MODULES:
-            instance = module.instance()
-            instance.notification_signal.connect(self.writeNotification)
+        Module.connectInstances(lambda instance: instance.notification_signal.connect(self.writeNotification))
 
         # required for Cmd module (do_help etc.)
         self.stdout = sys.stdout
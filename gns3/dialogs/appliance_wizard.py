@@ -133,12 +133,14 @@ class ApplianceWizard(QtWidgets.QWizard, Ui_ApplianceWizard):
 
             if GNS3VM.instance().isRunning():
                 self.uiVMRadioButton.setChecked(True)
-            elif Servers.instance().localServer().isLocalServerRunning() and self.uiLocalRadioButton.isEnabled():
-                self.uiLocalRadioButton.setChecked(True)
-            elif len(Servers.instance().remoteServers().values()) > 0:
-                self.uiRemoteRadioButton.setChecked(True)
             else:
-                self.uiRemoteRadioButton.setChecked(False)
+                if len(Servers.instance().remoteServers().values()) > 0:
+                    self.uiRemoteRadioButton.setChecked(True)
+                else:
+                    self.uiRemoteRadioButton.setChecked(False)
+                if self.uiLocalRadioButton.isEnabled():
+                    # the local server is selected once it has replied
+                    Servers.instance().localServer().isLocalServerRunning(qpartial(self._localServerRunningCallback))
 
         elif self.page(page_id) == self.uiFilesWizardPage:
             self._refreshVersions()
@@ -174,6 +176,16 @@ class ApplianceWizard(QtWidgets.QWizard, Ui_ApplianceWizard):
             self._server_check = True
             self.next()
 
+    def _localServerRunningCallback(self, running):
+        """
+        Selects the local server if it is running.
+
+        :param running: True if the local server is running
+        """
+
+        if running and self.uiLocalRadioButton.isEnabled() and not GNS3VM.instance().isRunning():
+            self.uiLocalRadioButton.setChecked(True)
+
     def _qemuServerCapabilitiesCallback(self, result, error=None, *args, **kwargs):
         """
         Check if server support KVM or not
@@ -25,6 +25,7 @@ from gns3.version import __version__
 from gns3.qt import QtWidgets, QtCore
 from gns3.ui.export_debug_dialog_ui import Ui_ExportDebugDialog
 from gns3.local_config import LocalConfig
+from gns3.request_metrics import RequestMetrics
 
 import logging
 log = logging.getLogger(__name__)
@@ -54,6 +55,9 @@ class ExportDebugDialog(QtWidgets.QDialog, Ui_ExportDebugDialog):
         try:
             with ZipFile(path, 'w') as zip:
                 zip.writestr("debug.txt", self._getDebugData())
+                metrics = RequestMetrics.instance()
+                zip.writestr("network_statistics.json", metrics.toJSON())
+                zip.writestr("network_statistics.csv", metrics.toCSV())
                 dir = LocalConfig.configDirectory()
                 for filename in os.listdir(dir):
                     path = os.path.join(dir, filename)
@@ -17,7 +17,8 @@
 
 import os
 
-from gns3.qt import QtWidgets
+from gns3.qt import QtWidgets, qpartial
+from gns3.http_client import TextSink
 from gns3.ui.file_editor_dialog_ui import Ui_FileEditorDialog
 
 import logging
@@ -56,8 +57,10 @@ class FileEditorDialog(QtWidgets.QDialog, Ui_FileEditorDialog):
         self._node.httpPost("/files" + self._path, None, body=text)
 
     def _refreshSlot(self):
-        self._node.httpGet("/files" + self._path, self._getCallback)
+        # the file is decoded while it is received
+        sink = TextSink()
+        self._node.httpGet("/files" + self._path, qpartial(self._getCallback, sink), sink=sink)
 
-    def _getCallback(self, result, error=False, raw_body=None, **kwargs):
+    def _getCallback(self, sink, result, error=False, **kwargs):
         if not error:
-            self.uiFileTextEdit.setText(raw_body)
+            self.uiFileTextEdit.setText(sink.text())
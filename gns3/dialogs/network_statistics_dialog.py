@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Dialog showing the statistics of the requests sent to the servers.
+"""
+
+from ..qt import QtCore, QtWidgets
+from ..ui.network_statistics_dialog_ui import Ui_NetworkStatisticsDialog
+from ..request_metrics import RequestMetrics, COLUMNS
+from ..servers import Servers
+from ..utils import human_filesize
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class StatisticsItem(QtWidgets.QTreeWidgetItem):
+
+    """
+    Tree widget item sorted on the values rather than on the displayed text.
+    """
+
+    def __init__(self, parent, statistics):
+
+        super().__init__(parent)
+        self._values = [statistics[column] for column in COLUMNS]
+        for column, value in enumerate(self._values):
+            if value is None:
+                text = ""
+            elif COLUMNS[column] in ("bytes_in", "bytes_out"):
+                text = human_filesize(value)
+            else:
+                text = str(value)
+            self.setText(column, text)
+
+    def __lt__(self, other):
+
+        column = self.treeWidget().sortColumn()
+        value = self._values[column]
+        other_value = other._values[column]
+        if value is None or other_value is None:
+            return value is None and other_value is not None
+        return value < other_value
+
+
+class NetworkStatisticsDialog(QtWidgets.QDialog, Ui_NetworkStatisticsDialog):
+
+    """
+    Network statistics dialog, refreshed every second.
+
+    :param parent: parent widget
+    """
+
+    def __init__(self, parent):
+
+        super().__init__(parent)
+        self.setupUi(self)
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose, True)
+        self.uiResetPushButton.clicked.connect(self._resetSlot)
+        self.uiExportPushButton.clicked.connect(self._exportSlot)
+        self.uiStatisticsTreeWidget.sortByColumn(COLUMNS.index("p95"), QtCore.Qt.DescendingOrder)
+
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setInterval(1000)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self._refresh_timer.start()
+        self.refresh()
+
+    def refresh(self):
+        """
+        Shows the current statistics.
+        """
+
+        statistics = RequestMetrics.instance().statistics()
+        self.uiStatisticsTreeWidget.setUpdatesEnabled(False)
+        self.uiStatisticsTreeWidget.clear()
+        for endpoint_statistics in statistics:
+            StatisticsItem(self.uiStatisticsTreeWidget, endpoint_statistics)
+        self.uiStatisticsTreeWidget.setUpdatesEnabled(True)
+
+        lines = ["{} requests, {} errors, {} in flight".format(sum(s["count"] for s in statistics),
+                                                               sum(s["errors"] for s in statistics),
+                                                               sum(s["in_flight"] for s in statistics))]
+        server_statistics = RequestMetrics.instance().serverStatistics()
+        for server in Servers.instance().servers():
+            connection_statistics = server.connection().statistics()
+            if not connection_statistics["requests"]:
+                continue
+            latency = ""
+            statistics = server_statistics.get(server.url())
+            if statistics and statistics["p50"] is not None:
+                latency = ", p50 {:.1f} ms, p95 {:.1f} ms, p99 {:.1f} ms".format(statistics["p50"], statistics["p95"], statistics["p99"])
+            lines.append("{}: {} requests, {} keep-alive pre-connects{}".format(server.url(),
+                                                                                connection_statistics["requests"],
+                                                                                connection_statistics["preconnects"],
+                                                                                latency))
+        self.uiSummaryLabel.setText("\n".join(lines))
+
+    def _resetSlot(self):
+        """
+        Slot to forget the recorded statistics.
+        """
+
+        RequestMetrics.instance().reset()
+        self.refresh()
+
+    def _exportSlot(self):
+        """
+        Slot to export the statistics as JSON or CSV.
+        """
+
+        path, selected_filter = QtWidgets.QFileDialog.getSaveFileName(self, "Export network statistics", "network_statistics.json",
+                                                                      "JSON file (*.json);;CSV file (*.csv)")
+        if not path:
+            return
+        metrics = RequestMetrics.instance()
+        content = metrics.toCSV() if path.endswith(".csv") or selected_filter.startswith("CSV") else metrics.toJSON()
+        try:
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(content)
+        except OSError as e:
+            QtWidgets.QMessageBox.critical(self, "Network statistics", "Could not export the network statistics to {}: {}".format(path, e))
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Dialog to place several nodes from a template.
+"""
+
+from ..qt import QtWidgets
+from ..ui.node_placement_dialog_ui import Ui_NodePlacementDialog
+from ..utils.node_layout import LAYOUTS
+
+
+class NodePlacementDialog(QtWidgets.QDialog, Ui_NodePlacementDialog):
+
+    """
+    Asks the number of nodes and how to lay them out.
+
+    :param parent: parent widget
+    :param template_name: name of the template
+    """
+
+    def __init__(self, parent, template_name):
+
+        super().__init__(parent)
+        self.setupUi(self)
+        self.setWindowTitle("Place {} nodes".format(template_name))
+        for layout in LAYOUTS:
+            self.uiLayoutComboBox.addItem(layout.capitalize(), layout)
+        self.uiLayoutComboBox.currentIndexChanged.connect(self._layoutChangedSlot)
+
+    def _layoutChangedSlot(self, index):
+        """
+        Slot called when the layout is changed.
+
+        :param index: layout index
+        """
+
+        self.uiNodesPerLineSpinBox.setEnabled(self.uiLayoutComboBox.itemData(index) == "grid")
+
+    def count(self):
+        """
+        Returns the number of nodes to place.
+        """
+
+        return self.uiCountSpinBox.value()
+
+    def placementLayout(self):
+        """
+        Returns the layout of the nodes (grid, ring or line).
+        """
+
+        return self.uiLayoutComboBox.currentData()
+
+    def spacing(self):
+        """
+        Returns the distance between the nodes.
+        """
+
+        return self.uiSpacingSpinBox.value()
+
+    def nodesPerLine(self):
+        """
+        Returns the number of nodes on a line of the grid.
+        """
+
+        return self.uiNodesPerLineSpinBox.value()
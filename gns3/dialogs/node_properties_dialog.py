@@ -21,6 +21,10 @@ Dialog to configure and update node settings using widget pages.
 
 from ..qt import QtCore, QtGui, QtWidgets
 from ..ui.node_properties_dialog_ui import Ui_NodePropertiesDialog
+from ..node import Node
+
+import logging
+log = logging.getLogger(__name__)
 
 
 class NodePropertiesDialog(QtWidgets.QDialog, Ui_NodePropertiesDialog):
@@ -181,11 +185,16 @@ class NodePropertiesDialog(QtWidgets.QDialog, Ui_NodePropertiesDialog):
                     # child.node().update(settings)  #TODO: delete
                     child.settings().update(settings)
 
-        # update the nodes with the settings
+        # update the nodes with the settings, only the changed
+        # settings are sent and unchanged nodes are not updated
+        statistics = Node.updateStatistics()
         for item in self._parent_items.values():
             for index in range(0, item.childCount()):
                 child = item.child(index)
                 child.node().update(child.settings())
+        new_statistics = Node.updateStatistics()
+        log.info("settings applied: {} update requests sent, {} saved".format(new_statistics["sent"] - statistics["sent"],
+                                                                           new_statistics["skipped"] - statistics["skipped"]))
 
     def resetSettings(self):
         """
@@ -48,7 +48,7 @@ class SetupWizard(QtWidgets.QWizard, Ui_SetupWizard):
 
         self._server = Servers.instance().localServer()
         self.uiGNS3VMDownloadLinkUrlLabel.setText('')
-        self.uiRefreshPushButton.clicked.connect(self._refreshVMListSlot)
+        self.uiRefreshPushButton.clicked.connect(self._refreshPushButtonClickedSlot)
         self.uiVmwareRadioButton.clicked.connect(self._listVMwareVMsSlot)
         self.uiVirtualBoxRadioButton.clicked.connect(self._listVirtualBoxVMsSlot)
         self.uiVMwareBannerButton.clicked.connect(self._VMwareBannerButtonClickedSlot)
@@ -183,7 +183,8 @@ class SetupWizard(QtWidgets.QWizard, Ui_SetupWizard):
                     if new_local_server_ip != previous_local_server_ip:
                         servers.stopLocalServer(wait=True)
                         if servers.startLocalServer():
-                            worker = WaitForConnectionWorker(new_local_server_ip, servers.localServer().port())
+                            worker = WaitForConnectionWorker(new_local_server_ip, servers.localServer().port(),
+                                                             user=servers.localServer().user(), password=servers.localServer().password())
                             dialog = ProgressDialog(worker, "Local server", "Connecting...", "Cancel", busy=True, parent=self)
                             dialog.show()
                             dialog.exec_()
@@ -230,16 +231,25 @@ class SetupWizard(QtWidgets.QWizard, Ui_SetupWizard):
             dialog.exec_()
         return True
 
-    def _refreshVMListSlot(self):
+    def _refreshPushButtonClickedSlot(self):
+        """
+        Slot to request the list of VMs again from the server.
+        """
+
+        self._refreshVMListSlot(refresh=True)
+
+    def _refreshVMListSlot(self, refresh=False):
         """
         Refresh the list of VM available in VMware or VirtualBox.
+
+        :param refresh: ignore the cached list
         """
 
         server = Servers.instance().localServer()
         if self.uiVmwareRadioButton.isChecked():
-            server.get("/vmware/vms", self._getVMsFromServerCallback)
+            server.inventory().get("/vmware/vms", self._getVMsFromServerCallback, refresh=refresh)
         elif self.uiVirtualBoxRadioButton.isChecked():
-            server.get("/virtualbox/vms", self._getVMsFromServerCallback)
+            server.inventory().get("/virtualbox/vms", self._getVMsFromServerCallback, refresh=refresh)
 
     def _getVMsFromServerCallback(self, result, error=False, **kwargs):
         """
@@ -27,6 +27,9 @@ import os
 from ..qt import QtCore, QtWidgets
 from ..utils.progress_dialog import ProgressDialog
 from ..utils.process_files_worker import ProcessFilesWorker
+from ..utils.snapshot_worker import SnapshotWorker
+from ..utils.snapshot_store import SnapshotStore, SnapshotStoreError
+from ..utils import human_filesize
 from ..ui.snapshots_dialog_ui import Ui_SnapshotsDialog
 from ..topology import Topology
 from ..node import Node
@@ -68,18 +71,24 @@ class SnapshotsDialog(QtWidgets.QDialog, Ui_SnapshotsDialog):
         for snapshot in os.listdir(snapshot_dir):
             match = re.search(r"^(.*)_([0-9]+)_([0-9]+)", snapshot)
             if match:
-                snapshot_name = match.group(1)
-                snapshot_date = match.group(2)[:2] + '/' + match.group(2)[2:4] + '/' + match.group(2)[4:]
-                snapshot_time = match.group(3)[:2] + ':' + match.group(3)[2:4] + ':' + match.group(3)[4:]
-                snapshots.append((snapshot_name, snapshot_date, snapshot_time))
+                snapshot_path = os.path.join(snapshot_dir, snapshot)
+                snapshots.append(self._snapshotInfo(match, snapshot_path, self._directorySize(snapshot_path)))
+
+        # incremental snapshots
+        store = SnapshotStore(snapshot_dir)
+        for snapshot in store.snapshots():
+            match = re.search(r"^(.*)_([0-9]+)_([0-9]+)", os.path.basename(snapshot["path"]))
+            if match:
+                snapshots.append(self._snapshotInfo(match, snapshot["path"], snapshot["incremental_size"]))
 
         # Sort by date
-        snapshots = sorted(snapshots, key=(lambda v: v[1] + v[2]))
-        for snapshot_name, snapshot_date, snapshot_time in snapshots:
+        snapshots = sorted(snapshots, key=(lambda v: v[1][4:] + v[1][2:4] + v[1][:2] + v[2]))
+        for snapshot_name, snapshot_date, snapshot_time, snapshot_path, snapshot_size in snapshots:
+            snapshot_date = snapshot_date[:2] + '/' + snapshot_date[2:4] + '/' + snapshot_date[4:]
+            snapshot_time = snapshot_time[:2] + ':' + snapshot_time[2:4] + ':' + snapshot_time[4:]
             item = QtWidgets.QListWidgetItem(self.uiSnapshotsList)
-            item.setText("{} on {} at {}".format(snapshot_name, snapshot_date, snapshot_time))
-            item.setData(QtCore.Qt.UserRole, os.path.join(snapshot_dir, snapshot))
-
+            item.setText("{} on {} at {} ({})".format(snapshot_name, snapshot_date, snapshot_time, human_filesize(snapshot_size)))
+            item.setData(QtCore.Qt.UserRole, snapshot_path)
 
         if self.uiSnapshotsList.count():
             self.uiSnapshotsList.setCurrentRow(0)
@@ -89,6 +98,28 @@ class SnapshotsDialog(QtWidgets.QDialog, Ui_SnapshotsDialog):
             self.uiDeletePushButton.setEnabled(False)
             self.uiRestorePushButton.setEnabled(False)
 
+    @staticmethod
+    def _snapshotInfo(match, snapshot_path, snapshot_size):
+
+        return (match.group(1), match.group(2), match.group(3), snapshot_path, snapshot_size)
+
+    @staticmethod
+    def _directorySize(path):
+        """
+        Returns the size of all the files in a directory.
+
+        :param path: path to the directory
+        """
+
+        size = 0
+        for root, _, files in os.walk(path):
+            for filename in files:
+                try:
+                    size += os.path.getsize(os.path.join(root, filename))
+                except OSError:
+                    pass
+        return size
+
     def _createSnapshotSlot(self):
         """
         Slot to create a snapshot.
@@ -98,9 +129,12 @@ class SnapshotsDialog(QtWidgets.QDialog, Ui_SnapshotsDialog):
         if ok and snapshot_name:
             from ..main_window import MainWindow
             MainWindow.instance().saveProject(self._project_path)
-            snapshot_name = "{name}_{date}".format(name=snapshot_name, date=time.strftime("%d%m%y_%H%M%S"))
-            snapshot_dir = os.path.join(self._project_files_dir, "snapshots", snapshot_name)
-            worker = ProcessFilesWorker(os.path.dirname(self._project_path), snapshot_dir, skip_dirs=["snapshots"])
+            if MainWindow.instance().settings()["incremental_snapshots"]:
+                worker = SnapshotWorker(os.path.join(self._project_files_dir, "snapshots"), os.path.dirname(self._project_path), snapshot_name=snapshot_name)
+            else:
+                snapshot_name = "{name}_{date}".format(name=snapshot_name, date=time.strftime("%d%m%y_%H%M%S"))
+                snapshot_dir = os.path.join(self._project_files_dir, "snapshots", snapshot_name)
+                worker = ProcessFilesWorker(os.path.dirname(self._project_path), snapshot_dir, skip_dirs=["snapshots"])
             progress_dialog = ProgressDialog(worker, "Creating snapshot", "Copying project files...", "Cancel", parent=self)
             progress_dialog.show()
             progress_dialog.exec_()
@@ -114,7 +148,13 @@ class SnapshotsDialog(QtWidgets.QDialog, Ui_SnapshotsDialog):
         item = self.uiSnapshotsList.currentItem()
         if item:
             snapshot_path = item.data(QtCore.Qt.UserRole)
-            shutil.rmtree(snapshot_path, ignore_errors=True)
+            if SnapshotStore.isManifest(snapshot_path):
+                try:
+                    SnapshotStore(os.path.join(self._project_files_dir, "snapshots")).delete(snapshot_path)
+                except SnapshotStoreError as e:
+                    QtWidgets.QMessageBox.critical(self, "Delete snapshot", "Cannot delete snapshot: {}".format(e))
+            else:
+                shutil.rmtree(snapshot_path, ignore_errors=True)
             self._listSnaphosts()
 
     def _restoreSnapshotSlot(self):
@@ -152,7 +192,12 @@ class SnapshotsDialog(QtWidgets.QDialog, Ui_SnapshotsDialog):
 
         project_name, _ = os.path.splitext(os.path.basename(self._project_path))
         legacy_project_files_dir = os.path.join(snapshot_path, "{}-files".format(project_name))
-        if os.path.exists(legacy_project_files_dir):
+        if SnapshotStore.isManifest(snapshot_path):
+            worker = SnapshotWorker(os.path.join(self._project_files_dir, "snapshots"), os.path.dirname(self._project_path), manifest_path=snapshot_path)
+            progress_dialog = ProgressDialog(worker, "Restoring snapshot", "Restoring changed project files...", "Cancel", parent=self)
+            progress_dialog.show()
+            progress_dialog.exec_()
+        elif os.path.exists(legacy_project_files_dir):
             # support for pre 1.3 snapshots
             for root, dirs, _ in os.walk(self._project_files_dir):
                 dirs[:] = [d for d in dirs if d not in "snapshots"]
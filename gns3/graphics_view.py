@@ -42,10 +42,12 @@ from .dialogs.text_editor_dialog import TextEditorDialog
 from .dialogs.symbol_selection_dialog import SymbolSelectionDialog
 from .dialogs.idlepc_dialog import IdlePCDialog
 from .dialogs.console_command_dialog import ConsoleCommandDialog
+from .dialogs.node_placement_dialog import NodePlacementDialog
 from .local_config import LocalConfig
 from .progress import Progress
 from .utils.server_select import server_select
 from .utils.normalize_filename import normalize_filename
+from .utils.node_layout import node_layout
 
 # link items
 from .items.link_item import LinkItem
@@ -119,10 +121,10 @@ class GraphicsView(QtWidgets.QGraphicsView):
         reset the instances count.
         """
 
-        # reset the modules
+        # reset the modules, the modules not loaded yet have nothing to reset
         for module in MODULES:
-            instance = module.instance()
-            instance.reset()
+            if module.loaded():
+                module.instance().reset()
 
         # reset instance IDs for
         # nodes, links and ports
@@ -144,7 +146,7 @@ class GraphicsView(QtWidgets.QGraphicsView):
         Loads the settings from the persistent settings file.
         """
 
-        self._settings = LocalConfig.instance().loadSectionSettings(self.__class__.__name__, GRAPHICS_VIEW_SETTINGS)
+        self._settings = LocalConfig.instance().sectionSettings(self.__class__.__name__, GRAPHICS_VIEW_SETTINGS)
 
     def settings(self):
         """
@@ -680,18 +682,10 @@ class GraphicsView(QtWidgets.QGraphicsView):
             event.setDropAction(QtCore.Qt.CopyAction)
             event.accept()
             if event.keyboardModifiers() == QtCore.Qt.ShiftModifier:
-                max_nodes_per_line = 10  # max number of nodes on a single line
-                offset = 100  # spacing between elements
-                integer, ok = QtWidgets.QInputDialog.getInt(self, "Nodes", "Number of nodes:", 2, 1, 100, 1)
-                if ok:
-                    for node_number in range(integer):
-                        node_item = self.createNode(node_data, event.pos())
-                        if node_item is None:
-                            # stop if there is any error
-                            break
-                        x = node_item.pos().x() - (node_item.boundingRect().width() / 2) + (node_number % max_nodes_per_line) * offset
-                        y = node_item.pos().y() - (node_item.boundingRect().height() / 2) + (node_number // max_nodes_per_line) * offset
-                        node_item.setPos(x, y)
+                dialog = NodePlacementDialog(self, node_data["name"])
+                if dialog.exec_():
+                    self.createNodes(node_data, event.pos(), dialog.count(), layout=dialog.placementLayout(),
+                                     spacing=dialog.spacing(), nodes_per_line=dialog.nodesPerLine())
             else:
                 self.createNode(node_data, event.pos())
         elif event.mimeData().hasFormat("text/uri-list") and event.mimeData().hasUrls():
@@ -1035,12 +1029,20 @@ class GraphicsView(QtWidgets.QGraphicsView):
         :param items: Item instances
         """
 
-        nodes = {}
+        nodes = []
         for item in items:
             if isinstance(item, NodeItem) and hasattr(item.node(), "console") and item.node().initialized() and item.node().status() == Node.started:
-                node = item.node()
-                nodes[node.name()] = node
+                nodes.append(item.node())
+        self.consoleToNodes(nodes)
+
+    def consoleToNodes(self, nodes):
+        """
+        Console to nodes, one after the other in the order of their names.
+
+        :param nodes: Node instances
+        """
 
+        nodes = {node.name(): node for node in nodes}
         delay = self._main_window.settings()["delay_console_all"]
         counter = 0
         for name in sorted(nodes.keys()):
@@ -1532,6 +1534,73 @@ class GraphicsView(QtWidgets.QGraphicsView):
             raise ModuleError("Please select a server")
         return server
 
+    def _nodeModule(self, node_data):
+        """
+        Finds the module of a node.
+
+        :param node_data: node data to create a new node
+
+        :returns: tuple (module instance, node class)
+        """
+
+        for module in MODULES:
+            node_class = module.getNodeClass(node_data["class"])
+            if node_class and node_class in module.instance().classes():
+                return module.instance(), node_class
+        raise ModuleError("Could not find any module for {}".format(node_data["class"]))
+
+    def _nodeServer(self, node_data, node_module):
+        """
+        Finds the server of a node.
+
+        :param node_data: node data to create a new node
+        :param node_module: module instance
+
+        :returns: HTTPClient instance or None
+        """
+
+        if "server" not in node_data:
+            return self.allocateServer(node_data, node_module)
+        elif node_data["server"] == "local":
+            return Servers.instance().localServer()
+        elif node_data["server"] == "vm":
+            server = Servers.instance().vmServer()
+            if server is None:
+                QtWidgets.QMessageBox.critical(self, "GNS3 VM", "The GNS3 VM is not running")
+            return server
+        elif node_data["server"] == "load-balance":
+            QtWidgets.QMessageBox.critical(self, "Remote server", "Load-balancing support has been deprecated")
+            return None
+        return Servers.instance().getServerFromString(node_data["server"])
+
+    def _addNode(self, node_module, node_class, server, node_data, scene_pos):
+        """
+        Creates a node and adds it to the scene, centered on a position.
+
+        :param node_module: module instance
+        :param node_class: node class
+        :param server: HTTPClient instance
+        :param node_data: node data to create a new node
+        :param scene_pos: position in the scene
+
+        :returns: NodeItem instance
+        """
+
+        node = node_module.createNode(node_class, server, self._main_window.project())
+        node.error_signal.connect(self._main_window.uiConsoleTextEdit.writeError)
+        node.warning_signal.connect(self._main_window.uiConsoleTextEdit.writeWarning)
+        node.server_error_signal.connect(self._main_window.uiConsoleTextEdit.writeServerError)
+        node_item = SvgNodeItem(node, node_data["symbol"])
+        node_module.setupNode(node, node_data["name"])
+
+        self.scene().addItem(node_item)
+        x = scene_pos.x() - (node_item.boundingRect().width() / 2)
+        y = scene_pos.y() - (node_item.boundingRect().height() / 2)
+        node_item.setPos(x, y)
+        self._topology.addNode(node)
+        self._main_window.uiTopologySummaryTreeWidget.addNode(node)
+        return node_item
+
     def createNode(self, node_data, pos):
         """
         Creates a new node on the scene.
@@ -1543,54 +1612,68 @@ class GraphicsView(QtWidgets.QGraphicsView):
         """
 
         try:
-            node_module = None
-            for module in MODULES:
-                instance = module.instance()
-                node_class = module.getNodeClass(node_data["class"])
-                if node_class in instance.classes():
-                    node_module = instance
-                    break
-
-            if not node_module:
-                raise ModuleError("Could not find any module for {}".format(node_class))
-
-            if "server" not in node_data:
-                server = self.allocateServer(node_data, instance)
-            elif node_data["server"] == "local":
-                server = Servers.instance().localServer()
-            elif node_data["server"] == "vm":
-                server = Servers.instance().vmServer()
-                if server is None:
-                    QtWidgets.QMessageBox.critical(self, "GNS3 VM", "The GNS3 VM is not running")
-                    return
-            elif node_data["server"] == "load-balance":
-                QtWidgets.QMessageBox.critical(self, "Remote server", "Load-balancing support has been deprecated")
-                return
-            else:
-                server = Servers.instance().getServerFromString(node_data["server"])
-
+            node_module, node_class = self._nodeModule(node_data)
+            server = self._nodeServer(node_data, node_module)
             if server is None:
                 return
-
-            node = node_module.createNode(node_class, server, self._main_window.project())
-            node.error_signal.connect(self._main_window.uiConsoleTextEdit.writeError)
-            node.warning_signal.connect(self._main_window.uiConsoleTextEdit.writeWarning)
-            node.server_error_signal.connect(self._main_window.uiConsoleTextEdit.writeServerError)
-            node_item = SvgNodeItem(node, node_data["symbol"])
-            node_module.setupNode(node, node_data["name"])
+            return self._addNode(node_module, node_class, server, node_data, self.mapToScene(pos))
         # If no server is available a ValueError is raised
         except (ModuleError, ValueError) as e:
             QtWidgets.QMessageBox.critical(self, "Node creation", "{}".format(e))
             return
 
-        node_item.setPos(self.mapToScene(pos))
-        self.scene().addItem(node_item)
-        x = node_item.pos().x() - (node_item.boundingRect().width() / 2)
-        y = node_item.pos().y() - (node_item.boundingRect().height() / 2)
-        node_item.setPos(x, y)
-        self._topology.addNode(node)
-        self._main_window.uiTopologySummaryTreeWidget.addNode(node)
-        return node_item
+    def createNodes(self, node_data, pos, count, layout="grid", spacing=100, nodes_per_line=10):
+        """
+        Creates several nodes from the same template. The module and the
+        server are only resolved once, the setup requests are sent without
+        waiting for the previous nodes to be created.
+
+        :param node_data: node data to create the new nodes
+        :param pos: position of the first node
+        :param count: number of nodes
+        :param layout: grid, ring or line
+        :param spacing: distance between two neighbour nodes
+        :param nodes_per_line: number of nodes on a line of the grid
+
+        :returns: list of NodeItem instances
+        """
+
+        try:
+            node_module, node_class = self._nodeModule(node_data)
+            server = self._nodeServer(node_data, node_module)
+        except (ModuleError, ValueError) as e:
+            QtWidgets.QMessageBox.critical(self, "Node creation", "{}".format(e))
+            return []
+        if server is None:
+            return []
+
+        origin = self.mapToScene(pos)
+        progress_dialog = QtWidgets.QProgressDialog("Creating {} nodes...".format(count), "Cancel", 0, count, self)
+        progress_dialog.setWindowTitle("Node creation")
+        progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+
+        node_items = []
+        try:
+            for number, (x, y) in enumerate(node_layout(layout, count, spacing, nodes_per_line)):
+                if progress_dialog.wasCanceled():
+                    log.info("Node creation canceled after {} nodes".format(number))
+                    break
+                try:
+                    node_item = self._addNode(node_module, node_class, server, node_data, origin + QtCore.QPointF(x, y))
+                except (ModuleError, ValueError) as e:
+                    QtWidgets.QMessageBox.critical(self, "Node creation", "{}".format(e))
+                    break
+                node_items.append(node_item)
+                progress_dialog.setValue(number + 1)
+        finally:
+            progress_dialog.close()
+
+        # the nodes are selected so they can be moved or deleted in one go
+        self.scene().clearSelection()
+        for node_item in node_items:
+            node_item.setSelected(True)
+        return node_items
 
     def drawBackground(self, painter, rect):
         super().drawBackground(painter, rect)
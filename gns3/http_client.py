@@ -18,21 +18,27 @@
 
 import json
 import http
+import codecs
 import copy
-import ipaddress
 import uuid
 import urllib.request
 import pathlib
-import base64
 
 from .version import __version__, __version_info__
 from .qt import QtCore, QtNetwork, qpartial
 from .network_client import getNetworkUrl
+from .server_connection import ServerConnection
+from .request_metrics import RequestMetrics
+from .inventory_cache import InventoryCache
+from .wire_trace import WireTrace, BodyPreview
 from .utils import parse_version
 
 import logging
 log = logging.getLogger(__name__)
 
+# maximum amount of a reply buffered by Qt when it is written to a sink
+SINK_READ_BUFFER_SIZE = 256 * 1024
+
 
 class HttpBadRequest(Exception):
 
@@ -40,6 +46,35 @@ class HttpBadRequest(Exception):
     pass
 
 
+class TextSink:
+
+    """
+    Sink decoding a reply as it is received, the reply is
+    never held both as bytes and as text.
+
+    :param encoding: text encoding of the reply
+    """
+
+    def __init__(self, encoding="utf-8"):
+
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._chunks = []
+
+    def write(self, data):
+
+        self._chunks.append(self._decoder.decode(data))
+
+    def text(self):
+        """
+        Returns the text received so far.
+        """
+
+        self._chunks.append(self._decoder.decode(b"", final=True))
+        text = "".join(self._chunks)
+        self._chunks = [text]
+        return text
+
+
 class HTTPClient(QtCore.QObject):
 
     """
@@ -82,6 +117,8 @@ class HTTPClient(QtCore.QObject):
         self._usage = None
 
         self._network_manager = network_manager
+        self._connection = ServerConnection(self._scheme, self._http_host, self._http_port, self._user, self._password, network_manager)
+        self._inventory = InventoryCache(self)
 
         # A buffer used by progress download
         self._buffer = {}
@@ -128,6 +165,7 @@ class HTTPClient(QtCore.QObject):
     def setHost(self, host):
         self._host = host
         self._http_host = host
+        self._updateConnection()
 
     def port(self):
         """
@@ -138,6 +176,7 @@ class HTTPClient(QtCore.QObject):
     def setPort(self, port):
         self._port = port
         self._http_port = port
+        self._updateConnection()
 
     def protocol(self):
         """
@@ -153,12 +192,38 @@ class HTTPClient(QtCore.QObject):
 
     def setUser(self, user):
         self._user = user
+        self._updateConnection()
 
     def password(self):
         return self._password
 
     def setPassword(self, password):
         self._password = password
+        self._updateConnection()
+
+    def _updateConnection(self):
+
+        self._connection.setServer(self._scheme, self._http_host, self._http_port, self._user, self._password)
+        self._inventory.invalidate()
+
+    def connection(self):
+        """
+        Returns the connection layer of this server.
+
+        :returns: ServerConnection instance
+        """
+
+        return self._connection
+
+    def inventory(self):
+        """
+        Returns the cache of the interfaces, binaries, images
+        and VMs available on this server.
+
+        :returns: InventoryCache instance
+        """
+
+        return self._inventory
 
     def notify_progress_start_query(self, query_id, progress_text, response):
         """
@@ -270,24 +335,37 @@ class HTTPClient(QtCore.QObject):
         """
         log.info("Connection to %s closed", self.url())
         self._connected = False
+        self._connection.stopKeepAlive()
+        # the server may have been restarted with other binaries or images
+        self._inventory.invalidate()
         self.connection_closed_signal.emit()
 
-    def isLocalServerRunning(self):
+    def isLocalServerRunning(self, callback):
         """
-        Synchronous check if a server is already running on this host.
+        Checks if a server is already running on this host, without
+        blocking: a single probe is sent.
 
-        :returns: boolean
+        :param callback: called with True if a GNS3 server has replied
+        """
+
+        from .readiness_prober import ReadinessProber
+        prober = ReadinessProber.forServer(self, max_attempts=1, request_timeout=2, parent=self)
+        prober.finished_signal.connect(qpartial(self._localServerProbedSlot, prober, callback))
+        prober.start()
+
+    def _localServerProbedSlot(self, prober, callback, status, json_data):
+        """
+        Slot called with the reply to the probe of isLocalServerRunning().
         """
 
-        status, json_data = self.getSynchronous("version", timeout=2)
+        prober.deleteLater()
         if json_data is None or status != 200:
-            return False
+            callback(False)
+        elif json_data.get("version", None) is None:
+            log.debug("Server is not a GNS3 server")
+            callback(False)
         else:
-            version = json_data.get("version", None)
-            if version is None:
-                log.debug("Server is not a GNS3 server")
-                return False
-        return True
+            callback(True)
 
     def getSynchronous(self, endpoint, timeout=2):
         """
@@ -354,7 +432,7 @@ class HTTPClient(QtCore.QObject):
         Full arg list in createHTTPQuery
         """
 
-        self.createHTTPQuery("PUT", path, callback, **kwargs)
+        return self.createHTTPQuery("PUT", path, callback, **kwargs)
 
     def post(self, path, callback, **kwargs):
         """
@@ -366,7 +444,7 @@ class HTTPClient(QtCore.QObject):
         Full arg list in createHTTPQuery
         """
 
-        self.createHTTPQuery("POST", path, callback, **kwargs)
+        return self.createHTTPQuery("POST", path, callback, **kwargs)
 
     def delete(self, path, callback, **kwargs):
         """
@@ -378,7 +456,7 @@ class HTTPClient(QtCore.QObject):
         Full arg list in createHTTPQuery
         """
 
-        self.createHTTPQuery("DELETE", path, callback, **kwargs)
+        return self.createHTTPQuery("DELETE", path, callback, **kwargs)
 
     def _request(self, url):
         """
@@ -399,27 +477,29 @@ class HTTPClient(QtCore.QObject):
         """
         self.executeHTTPQuery("GET", "/version", query, {}, timeout=5)
 
-    def createHTTPQuery(self, method, path, callback, body={}, context={}, downloadProgressCallback=None, showProgress=True, ignoreErrors=False, progressText=None, timeout=120, **kwargs):
+    def createHTTPQuery(self, method, path, callback, body={}, context={}, downloadProgressCallback=None, showProgress=True, ignoreErrors=False, progressText=None, timeout=120, sink=None, **kwargs):
         """
         Call the remote server, if not connected, check connection before
 
         :param method: HTTP method
         :param path: Remote path
-        :param body: params to send (dictionary or pathlib.Path)
+        :param body: params to send (dictionary, pathlib.Path or QIODevice)
         :param callback: callback method to call when the server replies
         :param context: Pass a context to the response callback
         :param downloadProgressCallback: Callback called when received something, it can be an incomplete response
         :param showProgress: Display progress to the user
         :params progressText: Text display to user in the progress dialog. None for auto generated
         :param ignoreErrors: Ignore connection error (usefull to not closing a connection when notification feed is broken)
+        :param sink: Object with a write() method receiving the reply body as it arrives,
+        the callback then only receives the status, size and content type of the reply
         :returns: QNetworkReply
         """
 
         if self._connected:
-            return self.executeHTTPQuery(method, path, qpartial(callback), body, context, downloadProgressCallback=downloadProgressCallback, showProgress=showProgress, ignoreErrors=ignoreErrors, progressText=progressText, timeout=timeout)
+            return self.executeHTTPQuery(method, path, qpartial(callback), body, context, downloadProgressCallback=downloadProgressCallback, showProgress=showProgress, ignoreErrors=ignoreErrors, progressText=progressText, timeout=timeout, sink=sink)
         else:
             log.info("Connection to {}".format(self.url()))
-            query = qpartial(self._callbackConnect, method, path, qpartial(callback), body, context, downloadProgressCallback=downloadProgressCallback, showProgress=showProgress, ignoreErrors=ignoreErrors, progressText=progressText, timeout=timeout)
+            query = qpartial(self._callbackConnect, method, path, qpartial(callback), body, context, downloadProgressCallback=downloadProgressCallback, showProgress=showProgress, ignoreErrors=ignoreErrors, progressText=progressText, timeout=timeout, sink=sink)
             self._connect(query)
 
     def _connectionError(self, callback, msg=""):
@@ -496,6 +576,7 @@ class HTTPClient(QtCore.QObject):
             return
 
         self._connected = True
+        self._connection.startKeepAlive()
         self.connection_connected_signal.emit()
         kwargs["context"] = original_context
         self.executeHTTPQuery(method, path, callback, body, **kwargs)
@@ -536,6 +617,14 @@ class HTTPClient(QtCore.QObject):
             body.setData(data)
             body.open(QtCore.QIODevice.ReadOnly)
             return body
+        elif isinstance(body, QtCore.QIODevice):
+            body.open(QtCore.QIODevice.ReadOnly)
+            request.setRawHeader(b"Content-Type", b"application/octet-stream")
+            if body.isSequential():
+                # the body is generated while sent, Qt must not buffer it in memory
+                request.setHeader(QtNetwork.QNetworkRequest.ContentLengthHeader, body.size())
+                request.setAttribute(QtNetwork.QNetworkRequest.DoNotBufferUploadDataAttribute, True)
+            return body
         else:
             return None
 
@@ -543,14 +632,12 @@ class HTTPClient(QtCore.QObject):
         """
         If require add basic auth header
         """
-        if self._user:
-            auth_string = "{}:{}".format(self._user, self._password)
-            auth_string = base64.b64encode(auth_string.encode("utf-8"))
-            auth_string = "Basic {}".format(auth_string.decode())
-            request.setRawHeader(b"Authorization", auth_string.encode())
+        auth_header = self._connection.authHeader()
+        if auth_header:
+            request.setRawHeader(b"Authorization", auth_header)
         return request
 
-    def executeHTTPQuery(self, method, path, callback, body, context={}, downloadProgressCallback=None, showProgress=True, ignoreErrors=False, progressText=None, timeout=120, **kwargs):
+    def executeHTTPQuery(self, method, path, callback, body, context={}, downloadProgressCallback=None, showProgress=True, ignoreErrors=False, progressText=None, timeout=120, sink=None, **kwargs):
         """
         Call the remote server
 
@@ -564,37 +651,37 @@ class HTTPClient(QtCore.QObject):
         :param progressText: Text display to user in progress dialog. None for auto generated
         :param ignoreErrors: Ignore connection error (usefull to not closing a connection when notification feed is broken)
         :param timeout: Delay in seconds before raising a timeout
+        :param sink: Object with a write() method receiving the reply body as it arrives
         :returns: QNetworkReply
         """
 
-        try:
-            ip = self._http_host.rsplit('%', 1)[0]
-            ipaddress.IPv6Address(ip)  # remove any scope ID
-            # this is an IPv6 address, we must surround it with brackets to be used with QUrl.
-            host = "[{}]".format(ip)
-        except ipaddress.AddressValueError:
-            host = self._http_host
-
-        log.debug("{method} {protocol}://{host}:{port}/v1{path} {body}".format(method=method, protocol=self._scheme, host=host, port=self._http_port, path=path, body=body))
-        if self._user:
-            url = QtCore.QUrl("{protocol}://{user}@{host}:{port}/v1{path}".format(protocol=self._scheme, user=self._user, host=host, port=self._http_port, path=path))
-        else:
-            url = QtCore.QUrl("{protocol}://{host}:{port}/v1{path}".format(protocol=self._scheme, host=host, port=self._http_port, path=path))
-        request = self._request(url)
-
-        request = self.addAuth(request)
-
-        request.setRawHeader(b"User-Agent", "GNS3 QT Client v{version}".format(version=__version__).encode())
+        log.debug("%s %s%s %s", method, self._connection.baseUrl(), path, BodyPreview(body))
+        # the body is traced before it is converted to a QIODevice
+        trace_body = body
+        request = self._request(self._connection.url(path))
+        request = self._connection.prepareRequest(request)
 
         # By default QT doesn't support GET with body even if it's in the RFC that's why we need to use sendCustomRequest
         body = self._addBodyToRequest(body, request)
 
-        response = self._network_manager.sendCustomRequest(request, method.encode(), body)
+        response = self._connection.networkManager().sendCustomRequest(request, method.encode(), body)
+        self._connection.requestStarted()
 
         context = copy.copy(context)
         context["query_id"] = str(uuid.uuid4())
+        WireTrace.instance().request(context["query_id"], method, self._connection.baseUrl() + path, trace_body)
+        if downloadProgressCallback is not None:
+            # the latency of the streams is not recorded
+            context["stream"] = True
+        context["metrics"] = RequestMetrics.instance().requestStarted(self.url(), method, path, body.size() if body is not None else 0)
+
+        if sink is not None:
+            # Qt stops reading from the socket when the buffer is full,
+            # the memory used does not depend on the size of the reply
+            response.setReadBufferSize(SINK_READ_BUFFER_SIZE)
+            response.readyRead.connect(qpartial(self._processSinkData, response, sink, context))
 
-        response.finished.connect(qpartial(self._processResponse, response, callback, context, body, ignoreErrors))
+        response.finished.connect(qpartial(self._processResponse, response, callback, context, body, ignoreErrors, sink))
 
         if downloadProgressCallback is not None:
             response.downloadProgress.connect(qpartial(self._processDownloadProgress, response, downloadProgressCallback, context))
@@ -635,6 +722,7 @@ class HTTPClient(QtCore.QObject):
             return
 
         content = bytes(response.readAll())
+        self._recordReceived(context, len(content))
         content_type = response.header(QtNetwork.QNetworkRequest.ContentTypeHeader)
         if content_type == "application/json":
             content = content.decode("utf-8")
@@ -663,16 +751,74 @@ class HTTPClient(QtCore.QObject):
         if "query_id" in context:
             self.notify_progress_end_query(context["query_id"])
 
-    def _processResponse(self, response, callback, context, request_body, ignore_errors):
+    def _processSinkData(self, response, sink, context):
+        """
+        Writes the data received to the sink of the query.
+        The body of an HTTP error is left to _processResponse.
+        """
+
+        if "sink_error" in context:
+            return
+        status = response.attribute(QtNetwork.QNetworkRequest.HttpStatusCodeAttribute)
+        if status is None or status >= 300:
+            return
+        data = bytes(response.readAll())
+        if not data:
+            return
+        self._recordReceived(context, len(data))
+        context["sink_size"] = context.get("sink_size", 0) + len(data)
+        try:
+            sink.write(data)
+        except (OSError, ValueError) as e:
+            log.error("Can't write the reply from {}: {}".format(response.url().toString(), e))
+            context["sink_error"] = str(e)
+            if response.isRunning():
+                response.abort()
+
+    @staticmethod
+    def _recordReceived(context, size):
+
+        if "metrics" in context:
+            RequestMetrics.instance().dataReceived(context["metrics"], size)
+
+    @staticmethod
+    def _traceResponse(response, context, status, body):
+        """
+        Logs a preview of a response body and writes it to the wire trace.
+        The URL is only converted when the response is logged.
+        """
+
+        wire_trace = WireTrace.instance()
+        if not log.isEnabledFor(logging.DEBUG) and not wire_trace.isEnabled():
+            return
+        url = response.url().toString()
+        log.debug("Response from %s status %s: %s", url, status, BodyPreview(body))
+        wire_trace.response(context.get("query_id"), url, status, body)
+
+    def _processResponse(self, response, callback, context, request_body, ignore_errors, sink=None):
 
         if request_body is not None:
             request_body.close()
 
         status = None
         body = None
+        params = None
 
         if "query_id" in context:
             self.notify_progress_end_query(context["query_id"])
+        if "metrics" in context:
+            RequestMetrics.instance().requestFinished(context["metrics"],
+                                                      error=response.error() != QtNetwork.QNetworkReply.NoError,
+                                                      stream=context.get("stream", False))
+
+        if sink is not None and response.error() == QtNetwork.QNetworkReply.NoError:
+            # the end of the body may not have been written yet
+            self._processSinkData(response, sink, context)
+        if "sink_error" in context:
+            # the reply has been aborted because the sink failed
+            if callback is not None:
+                callback({"message": "Can't write the reply: {}".format(context["sink_error"])}, error=True, server=self, context=context)
+            return
 
         if response.error() != QtNetwork.QNetworkReply.NoError:
             error_code = response.error()
@@ -693,31 +839,48 @@ class HTTPClient(QtCore.QObject):
                     print(error_message)
 
             try:
-                body = bytes(response.readAll()).decode("utf-8").strip("\0")
+                data = bytes(response.readAll())
+                self._recordReceived(context, len(data))
+                body = data.decode("utf-8").strip("\0")
                 # Some time antivirus intercept our query and reply with garbage content
             except UnicodeError:
                 body = None
+            self._traceResponse(response, context, status, body)
             content_type = response.header(QtNetwork.QNetworkRequest.ContentTypeHeader)
+            if body and content_type == "application/json":
+                try:
+                    params = json.loads(body)
+                except ValueError:
+                    # It happens when an antivirus catch the communication and send is error page without changing the Content Type
+                    params = None
             if callback is not None:
-                if not body or content_type != "application/json":
+                if params is None:
                     callback({"message": error_message}, error=True, server=self, context=context)
                 else:
-                    log.debug(body)
-                    try:
-                        callback(json.loads(body), error=True, server=self, context=context)
-                    except ValueError:
-                        # It happens when an antivirus catch the communication and send is error page without changing the Content Type
-                        callback({"message": error_message}, error=True, server=self, context=context)
+                    callback(params, error=True, server=self, context=context)
+        elif sink is not None:
+            status = response.attribute(QtNetwork.QNetworkRequest.HttpStatusCodeAttribute)
+            size = context.get("sink_size", 0)
+            self._traceResponse(response, context, status, "<{} bytes written to the sink>".format(size))
+            if callback is not None:
+                metadata = {"status": status,
+                            "size": size,
+                            "content_type": response.header(QtNetwork.QNetworkRequest.ContentTypeHeader)}
+                if status >= 400:
+                    callback(metadata, error=True, server=self, context=context)
+                else:
+                    callback(metadata, server=self, context=context)
         else:
             status = response.attribute(QtNetwork.QNetworkRequest.HttpStatusCodeAttribute)
-            log.debug("Decoding response from {} response {}".format(response.url().toString(), status))
             try:
-                body = bytes(response.readAll()).decode("utf-8").strip("\0")
+                data = bytes(response.readAll())
+                self._recordReceived(context, len(data))
+                body = data.decode("utf-8").strip("\0")
             # Some time anti-virus intercept our query and reply with garbage content
             except UnicodeDecodeError:
                 body = None
+            self._traceResponse(response, context, status, body)
             content_type = response.header(QtNetwork.QNetworkRequest.ContentTypeHeader)
-            log.debug(body)
             if body and len(body.strip(" \n\t")) > 0 and content_type == "application/json":
                 params = json.loads(body)
             else:
@@ -729,13 +892,13 @@ class HTTPClient(QtCore.QObject):
                     callback(params, server=self, context=context, raw_body=body)
         # response.deleteLater()
         if status == 400:
+            # the body has already been decoded above
+            e = HttpBadRequest(body)
             try:
-                params = json.loads(body)
-                e = HttpBadRequest(body)
                 e.fingerprint = params["path"]
             # If something goes wrong for a any reason just raise the bad request
             except Exception:
-                e = HttpBadRequest(body)
+                pass
             raise e
 
     def dump(self):
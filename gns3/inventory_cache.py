@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Cache of what is available on a server (interfaces, binaries, images, VMs).
+"""
+
+import copy
+import json
+import time
+
+from .qt import QtCore, qpartial
+
+import logging
+log = logging.getLogger(__name__)
+
+# time in seconds before an inventory is requested again
+DEFAULT_TTL = 60
+INVENTORY_TTL = {
+    "/interfaces": 60,
+    "/qemu/binaries": 300,
+    "/qemu/img-binaries": 300,
+    "/qemu/capabilities": 300,
+    "/docker/images": 60,
+    # VMs are often created while the GUI is running
+    "/virtualbox/vms": 30,
+    "/vmware/vms": 30,
+}
+
+
+class InventoryCache(QtCore.QObject):
+
+    """
+    Caches the replies to the GET requests listing what is available
+    on a server. Concurrent identical requests share a single request
+    to the server, the errors are not cached.
+
+    The callbacks are always called asynchronously, even when the
+    reply is cached, like for a request sent to the server.
+
+    :param server: HTTPClient instance
+    """
+
+    def __init__(self, server):
+
+        super().__init__()
+        self._server = server
+        # key: (expiry time, result)
+        self._entries = {}
+        # key: list of (callback, context) waiting for the reply
+        self._pending = {}
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _key(path, body):
+
+        return path, json.dumps(body, sort_keys=True)
+
+    def get(self, path, callback, body=None, context={}, ttl=None, refresh=False, **kwargs):
+        """
+        GET with caching.
+
+        :param path: Remote path
+        :param callback: callback method to call with the reply
+        :param body: params to send (dictionary)
+        :param context: Pass a context to the callback
+        :param ttl: time in seconds before the reply expires (default depends on the path)
+        :param refresh: ignore the cached reply
+        :param kwargs: other createHTTPQuery parameters
+        """
+
+        key = self._key(path, body)
+        if refresh:
+            self._entries.pop(key, None)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expiry, result = entry
+            if time.monotonic() < expiry:
+                self._hits += 1
+                if callback is not None:
+                    QtCore.QTimer.singleShot(0, qpartial(self._deliver, callback, result, context))
+                return
+            del self._entries[key]
+
+        if key in self._pending:
+            # single flight: the request is already running
+            self._hits += 1
+            self._pending[key].append((callback, context))
+            return
+
+        self._misses += 1
+        if ttl is None:
+            ttl = INVENTORY_TTL.get(path, DEFAULT_TTL)
+        self._pending[key] = [(callback, context)]
+        self._server.get(path, qpartial(self._replyCallback, key, ttl), body=body, **kwargs)
+
+    def _replyCallback(self, key, ttl, result, error=False, **kwargs):
+
+        waiters = self._pending.pop(key, [])
+        if not error:
+            self._entries[key] = (time.monotonic() + ttl, result)
+        for callback, context in waiters:
+            if callback is not None:
+                self._deliver(callback, result, context, error=error)
+
+    def _deliver(self, callback, result, context, error=False):
+
+        # each callback gets its own copy, the cached reply must not be modified
+        result = copy.deepcopy(result)
+        if error:
+            callback(result, error=True, server=self._server, context=context)
+        else:
+            callback(result, server=self._server, context=context)
+
+    def invalidate(self, path=None):
+        """
+        Forgets the cached replies.
+
+        :param path: forget only the replies for this path and the paths below
+        """
+
+        if path is None:
+            self._entries.clear()
+        else:
+            for key in list(self._entries):
+                if key[0] == path or key[0].startswith(path.rstrip("/") + "/"):
+                    del self._entries[key]
+
+    def refresh(self):
+        """
+        Requests the cached replies again from the server, so the next
+        callers get up to date replies.
+        """
+
+        for path, body in list(self._entries):
+            self.get(path, None, body=json.loads(body), refresh=True)
+
+    def statistics(self):
+        """
+        Returns the number of replies served from the cache (or shared)
+        and the number of requests sent to the server.
+
+        :returns: dictionary
+        """
+
+        return {"hits": self._hits, "misses": self._misses, "entries": len(self._entries)}
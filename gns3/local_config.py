@@ -20,6 +20,10 @@ import os
 import json
 import shutil
 import copy
+import types
+import hashlib
+import threading
+import concurrent.futures
 
 import psutil
 
@@ -38,12 +42,30 @@ class LocalConfig(QtCore.QObject):
     """
 
     config_changed_signal = QtCore.Signal()
+    config_section_changed_signal = QtCore.Signal(str)
 
     def __init__(self, config_file=None):
 
         super().__init__()
         self._settings = {}
         self._last_config_changed = None
+        # sections of the config file as last read or written
+        self._file_sections = set()
+
+        # read-only snapshots of the sections, dropped when a section changes
+        self._section_views = {}
+        self._version = 0
+
+        self._config_watcher = None
+        self._config_check_timer = None
+
+        # write-behind mode
+        self._write_timer = None
+        self._write_executor = None
+        self._write_lock = threading.Lock()
+        self._write_futures = []
+        self._dirty_sections = set()
+        self._last_written_hash = None
 
         if sys.platform.startswith("win"):
             filename = "gns3_gui.ini"
@@ -175,6 +197,8 @@ class LocalConfig(QtCore.QObject):
                 self._last_config_changed = os.stat(config_path).st_mtime
                 config = json.load(f)
                 self._settings.update(config)
+                self._file_sections = set(config)
+                self._settingsChanged()
         except (ValueError, OSError) as e:
             log.error("Could not read the config file {}: {}".format(self._config_file, e))
 
@@ -185,31 +209,220 @@ class LocalConfig(QtCore.QObject):
 
         return dict()
 
-    def _writeConfig(self):
+    def _writeConfig(self, section=None):
         """
-        Write the configuration file.
+        Write the configuration file. In write-behind mode, the changed
+        section is marked dirty and the file is written later.
+
+        :param section: changed section name, None for any section
         """
 
         self._settings["version"] = __version__
+        if self._write_timer is not None:
+            self._dirty_sections.add(section or "")
+            if not self._write_timer.isActive():
+                self._write_timer.start()
+            return
+        self._saveConfigFile(self._snapshotConfig())
+
+    def _snapshotConfig(self):
+        """
+        Returns a snapshot of the settings to save: the sections are their
+        read-only views, only the sections changed since the last snapshot
+        are copied.
+        """
+
+        self._file_sections = set(self._settings)
+        return {name: self.sectionView(name) if isinstance(value, dict) else value for name, value in self._settings.items()}
+
+    def _serializeConfig(self, settings):
+        """
+        Returns the content of the configuration file, None if the file
+        already has this content. Can be called from a worker thread.
+
+        :param settings: snapshot of the settings
+        """
+
         try:
-            temporary = os.path.join(os.path.dirname(self._config_file), "gns3_gui.tmp")
-            with open(temporary, "w", encoding="utf-8") as f:
-                json.dump(self._settings, f, sort_keys=True, indent=4)
-            shutil.move(temporary, self._config_file)
-            log.info("Configuration save to %s", self._config_file)
-            self._last_config_changed = os.stat(self._config_file).st_mtime
-        except (ValueError, OSError) as e:
-            log.error("Could not write the config file {}: {}".format(self._config_file, e))
+            # the read-only mappings of the snapshot are serialized as dictionaries
+            content = json.dumps(settings, sort_keys=True, indent=4, default=dict)
+        except (TypeError, ValueError) as e:
+            log.error("Could not serialize the config: {}".format(e))
+            return None
+        content_hash = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        if content_hash == self._last_written_hash:
+            log.debug("Configuration has not changed, skip saving it")
+            return None
+        self._last_written_hash = content_hash
+        return content
+
+    def _saveConfigFile(self, settings):
+        """
+        Serializes the settings and writes them to a temporary file renamed
+        to the configuration file so a reader never sees a partial file.
+        Can be called from a worker thread.
+
+        :param settings: snapshot of the settings
+        """
+
+        with self._write_lock:
+            content = self._serializeConfig(settings)
+            if content is None:
+                return
+            try:
+                temporary = os.path.join(os.path.dirname(self._config_file), "gns3_gui.tmp")
+                with open(temporary, "w", encoding="utf-8") as f:
+                    f.write(content)
+                os.replace(temporary, self._config_file)
+                log.info("Configuration save to %s", self._config_file)
+                self._last_config_changed = os.stat(self._config_file).st_mtime
+            except OSError as e:
+                log.error("Could not write the config file {}: {}".format(self._config_file, e))
+                self._last_written_hash = None
+
+    def setWriteBehind(self, delay=500):
+        """
+        Enables the write-behind mode: changes made within delay milliseconds
+        are saved at once, by a worker thread. flush() must be called before exiting.
+
+        :param delay: delay in milliseconds before writing the changes
+        """
+
+        self._write_timer = QtCore.QTimer(self)
+        self._write_timer.setSingleShot(True)
+        self._write_timer.setInterval(delay)
+        self._write_timer.timeout.connect(self._writeBehindSlot)
+        self._write_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    def _writeBehindSlot(self):
+        """
+        Serializes and saves the dirty sections on the worker thread.
+        """
+
+        if not self._dirty_sections:
+            return
+        log.debug("Saving configuration sections: {}".format(", ".join(sorted(self._dirty_sections))))
+        self._dirty_sections.clear()
+        self._write_futures = [future for future in self._write_futures if not future.done()]
+        self._write_futures.append(self._write_executor.submit(self._saveConfigFile, self._snapshotConfig()))
+
+    def flush(self):
+        """
+        Writes the pending changes and waits for the end of the writes
+        in progress. Must be called before exiting in write-behind mode.
+        """
+
+        if self._write_timer is None:
+            return
+        self._write_timer.stop()
+        # the writes already queued are done before this one
+        self._write_executor.submit(lambda: None).result()
+        if self._dirty_sections:
+            self._dirty_sections.clear()
+            self._saveConfigFile(self._snapshotConfig())
+
+    def _settingsChanged(self, section=None):
+        """
+        Increments the settings version and drops the outdated read-only views.
+
+        :param section: changed section name, None if any section may have changed
+        """
+
+        self._version += 1
+        if section is None:
+            self._section_views.clear()
+        else:
+            self._section_views.pop(section, None)
+
+    def version(self):
+        """
+        Returns a counter incremented each time the settings change.
+        Callers can keep what they computed from a section view
+        as long as the version stays the same.
+
+        :returns: integer
+        """
+
+        return self._version
+
+    def watchConfigFile(self, debounce=200):
+        """
+        Watches the config file to reload it when another GUI changes it.
+        Changes are coalesced for debounce milliseconds. If the file cannot
+        be watched (e.g. unsupported file system) it is checked every second.
+
+        :param debounce: delay in milliseconds before reloading the file
+        """
+
+        self._config_check_timer = QtCore.QTimer(self)
+        self._config_check_timer.timeout.connect(self.checkConfigChanged)
+        self._config_watcher = QtCore.QFileSystemWatcher(self)
+        # the directory is watched too because the file is replaced when written
+        watched = self._config_watcher.addPath(self._config_file)
+        watched = self._config_watcher.addPath(os.path.dirname(self._config_file)) and watched
+        if watched:
+            self._config_check_timer.setSingleShot(True)
+            self._config_check_timer.setInterval(debounce)
+            self._config_watcher.fileChanged.connect(self._configFileChangedSlot)
+            self._config_watcher.directoryChanged.connect(self._configFileChangedSlot)
+        else:
+            log.warning("Could not watch {}, checking it for changes every second".format(self._config_file))
+            self._config_watcher = None
+            self._config_check_timer.start(1000)
+
+    def _configFileChangedSlot(self, path):
+        """
+        Called when the config file or its directory changes.
+        """
+
+        if self._config_file not in self._config_watcher.files() and os.path.exists(self._config_file):
+            # the file has been replaced
+            self._config_watcher.addPath(self._config_file)
+        self._config_check_timer.start()
 
     def checkConfigChanged(self):
+        """
+        Reloads the config file if it has been changed by another program,
+        the config_section_changed_signal is emitted for each changed section.
 
+        :returns: list of the changed section names
+        """
+
+        if self._dirty_sections or any(not future.done() for future in self._write_futures):
+            # our own changes are not saved yet, the file will be checked again later
+            return []
         try:
-            if self._last_config_changed and self._last_config_changed < os.stat(self._config_file).st_mtime:
-                log.info("Client config has changed, reloading it...")
-                self._readConfig(self._config_file)
-                self.config_changed_signal.emit()
-        except OSError as e:
+            if not self._last_config_changed or self._last_config_changed >= os.stat(self._config_file).st_mtime:
+                return []
+            log.info("Client config has changed, reloading it...")
+            with open(self._config_file, "r", encoding="utf-8") as f:
+                self._last_config_changed = os.stat(self._config_file).st_mtime
+                config = json.load(f)
+        except (ValueError, OSError) as e:
             log.error("Error when checking for changes {}: {}".format(self._config_file, str(e)))
+            return []
+
+        changed_sections = []
+        for section in sorted(self._file_sections | set(config)):
+            old_settings = self._settings.get(section)
+            if section not in config:
+                # the section has been deleted from the file
+                settings = self._settings.pop(section, None)
+            elif old_settings != config[section]:
+                settings = self._settings[section] = config[section]
+            else:
+                continue
+            if isinstance(settings, dict) or isinstance(old_settings, dict):
+                changed_sections.append(section)
+            self._settingsChanged(section)
+        self._file_sections = set(config)
+
+        if changed_sections:
+            log.info("Client config sections changed: {}".format(", ".join(sorted(changed_sections))))
+            for section in changed_sections:
+                self.config_section_changed_signal.emit(section)
+            self.config_changed_signal.emit()
+        return changed_sections
 
     def configFilePath(self):
         """
@@ -229,10 +442,15 @@ class LocalConfig(QtCore.QObject):
 
         self._config_file = config_file
         self._readConfig(self._config_file)
+        if self._config_watcher is not None:
+            self._config_watcher.removePaths(self._config_watcher.files() + self._config_watcher.directories())
+            self._config_watcher.addPath(self._config_file)
+            self._config_watcher.addPath(os.path.dirname(self._config_file))
 
     def settings(self):
         """
-        Get the settings.
+        Get a copy of all the settings. Use sectionSettings() or
+        sectionView() to avoid copying all the sections.
 
         :returns: settings (dict)
         """
@@ -248,18 +466,80 @@ class LocalConfig(QtCore.QObject):
 
         if self._settings != settings:
             self._settings.update(settings)
+            self._settingsChanged()
             self._writeConfig()
 
-    def loadSectionSettings(self, section, default_settings):
+    def sectionSettings(self, section, default_settings=None):
         """
-        Get all the settings from a given section.
+        Get a copy of a section the caller can modify.
 
-        :param default_settings: setting names and default values (dict)
+        :param section: section name
+        :param default_settings: optional setting names and default values (dict)
 
-        :returns: settings (dict)
+        :returns: settings (dict), empty if the section does not exist
+        """
+
+        if default_settings is not None:
+            self._loadDefaultSettings(section, default_settings)
+        return self.copySettings(self._settings.get(section, {}))
+
+    @classmethod
+    def _freeze(cls, value):
+
+        if isinstance(value, dict):
+            return types.MappingProxyType({name: cls._freeze(item) for name, item in value.items()})
+        if isinstance(value, list):
+            return tuple(cls._freeze(item) for item in value)
+        return value
+
+    @classmethod
+    def copySettings(cls, value):
+        """
+        Returns a copy of settings the caller can modify, the read-only
+        mappings and tuples of the section views are copied as
+        dictionaries and lists.
+
+        :param value: settings
+
+        :returns: copy of the settings
         """
 
-        settings = self.settings().get(section, dict())
+        if isinstance(value, (dict, types.MappingProxyType)):
+            return {name: cls.copySettings(item) for name, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [cls.copySettings(item) for item in value]
+        return value
+
+    def sectionView(self, section, default_settings=None):
+        """
+        Get a read-only snapshot of a section: dictionaries are
+        read-only mappings and lists are tuples. The snapshot is shared
+        by the callers until the section changes, so nothing is copied
+        when the settings are only read.
+
+        :param section: section name
+        :param default_settings: optional setting names and default values (dict)
+
+        :returns: read-only mapping, empty if the section does not exist
+        """
+
+        if default_settings is not None:
+            self._loadDefaultSettings(section, default_settings)
+        view = self._section_views.get(section)
+        if view is None:
+            view = self._freeze(self._settings.get(section, {}))
+            self._section_views[section] = view
+        return view
+
+    def _loadDefaultSettings(self, section, default_settings):
+        """
+        Adds the missing default values to a section and saves them.
+
+        :param section: section name
+        :param default_settings: setting names and default values (dict)
+        """
+
+        settings = self._settings.get(section, dict())
         changed = False
 
         def _copySettings(local, default):
@@ -272,7 +552,7 @@ class LocalConfig(QtCore.QObject):
             # use default values for missing settings
             for name, value in default.items():
                 if name not in local:
-                    local[name] = value
+                    local[name] = self.copySettings(value)
                     changed = True
                 elif isinstance(value, dict):
                     local[name] = _copySettings(local[name], default[name])
@@ -282,10 +562,21 @@ class LocalConfig(QtCore.QObject):
         self._settings[section] = settings
 
         if changed:
+            self._settingsChanged(section)
             log.info("Section %s has missing default values. Adding keys %s Saving configuration", section, ','.join(set(default_settings.keys()) - set(settings.keys())))
-            self._writeConfig()
+            self._writeConfig(section)
+
+    def loadSectionSettings(self, section, default_settings):
+        """
+        Get all the settings from a given section, with the missing
+        default values. Same as sectionSettings().
 
-        return copy.deepcopy(settings)
+        :param default_settings: setting names and default values (dict)
+
+        :returns: settings (dict)
+        """
+
+        return self.sectionSettings(section, default_settings)
 
     def saveSectionSettings(self, section, settings):
         """
@@ -298,10 +589,13 @@ class LocalConfig(QtCore.QObject):
         if section not in self._settings:
             self._settings[section] = {}
 
+        # the settings may come from a section view
+        settings = self.copySettings(settings)
         if self._settings[section] != settings:
-            self._settings[section].update(copy.deepcopy(settings))
+            self._settings[section].update(settings)
+            self._settingsChanged(section)
             log.info("Section %s has changed. Saving configuration", section)
-            self._writeConfig()
+            self._writeConfig(section)
         else:
             log.debug("Section %s has not changed. Skip saving configuration", section)
 
@@ -311,7 +605,7 @@ class LocalConfig(QtCore.QObject):
         """
 
         from gns3.settings import GENERAL_SETTINGS
-        return self.loadSectionSettings("MainWindow", GENERAL_SETTINGS)["experimental_features"]
+        return self.sectionView("MainWindow").get("experimental_features", GENERAL_SETTINGS["experimental_features"])
 
     @staticmethod
     def instance(config_file=None):
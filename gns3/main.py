@@ -38,6 +38,10 @@ except Exception as e:
 # filesystem permissions, but it's a common mistake.
 from gns3.utils.get_resource import get_resource
 
+# the option is read before parsing the arguments to measure the imports
+from gns3.utils.startup_profiler import StartupProfiler
+if "--profile-startup" in sys.argv:
+    StartupProfiler.instance().enable()
 
 import datetime
 import traceback
@@ -51,7 +55,8 @@ try:
     from gns3.qt import QtCore, QtGui, QtWidgets
 except ImportError:
     raise SystemExit("Can't import Qt modules: Qt and/or PyQt is probably not installed correctly...")
-from gns3.main_window import MainWindow
+with StartupProfiler.instance().measure("import gns3.main_window"):
+    from gns3.main_window import MainWindow
 
 from gns3.logger import init_logger
 from gns3.crash_report import CrashReport
@@ -120,6 +125,8 @@ def main():
     parser.add_argument("--version", help="show the version", action="version", version=__version__)
     parser.add_argument("--debug", help="print out debug messages", action="store_true", default=False)
     parser.add_argument("--config", help="Configuration file")
+    parser.add_argument("--wire-trace", help="write the full requests and responses sent to the servers to gns3_wire_trace.log", action="store_true", default=False)
+    parser.add_argument("--profile-startup", help="report the time spent importing and initialising each module at startup", action="store_true", default=False)
     options = parser.parse_args()
     exception_file_path = "exceptions.log"
 
@@ -230,6 +237,9 @@ def main():
     global app
     app = Application(sys.argv)
 
+    # coalesce the config file writes, they are flushed on exit
+    LocalConfig.instance().setWriteBehind()
+
     # save client logging info to a file
     logfile = os.path.join(LocalConfig.configDirectory(), "gns3_gui.log")
 
@@ -239,11 +249,16 @@ def main():
     else:
         root_logger = init_logger(logging.INFO, logfile)
 
+    if options.wire_trace:
+        from .wire_trace import WireTrace
+        WireTrace.instance().enable(os.path.join(LocalConfig.configDirectory(), "gns3_wire_trace.log"))
+
     # update the exception file path to have it in the same directory as the settings file.
     exception_file_path = os.path.join(LocalConfig.configDirectory(), exception_file_path)
 
     global mainwindow
-    mainwindow = MainWindow()
+    with StartupProfiler.instance().measure("MainWindow initialisation"):
+        mainwindow = MainWindow()
 
     # On OSX we can receive the file to open from a system event
     # loadPath is smart and will load only if a path is present
@@ -259,9 +274,17 @@ def main():
     orig_sigint = signal.signal(signal.SIGINT, sigint_handler)
     orig_sigterm = signal.signal(signal.SIGTERM, sigint_handler)
 
-    mainwindow.show()
+    with StartupProfiler.instance().measure("MainWindow show"):
+        mainwindow.show()
+    if options.profile_startup:
+        # reported once the event loop runs, when the window is displayed
+        def report_startup_profile():
+            print(StartupProfiler.instance().report())
+            StartupProfiler.instance().disable()
+        QtCore.QTimer.singleShot(0, report_startup_profile)
 
     exit_code = app.exec_()
+    LocalConfig.instance().flush()
 
     signal.signal(signal.SIGINT, orig_sigint)
     signal.signal(signal.SIGTERM, orig_sigterm)
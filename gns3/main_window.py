@@ -30,29 +30,17 @@ import logging
 import subprocess
 
 from .local_config import LocalConfig
-from .modules import MODULES
+from .modules import MODULES, VPCS
 from .modules.module_error import ModuleError
-from .modules.vpcs import VPCS
 from .qt import QtGui, QtCore, QtWidgets, QtSvg
 from .servers import Servers
 from .gns3_vm import GNS3VM
 from .node import Node
 from .ui.main_window_ui import Ui_MainWindow
-from .dialogs.about_dialog import AboutDialog
-from .dialogs.new_project_dialog import NewProjectDialog
-from .dialogs.preferences_dialog import PreferencesDialog
-from .dialogs.snapshots_dialog import SnapshotsDialog
-from .dialogs.export_debug_dialog import ExportDebugDialog
-from .dialogs.doctor_dialog import DoctorDialog
-from .dialogs.setup_wizard import SetupWizard
 from .settings import GENERAL_SETTINGS
 from .utils.progress_dialog import ProgressDialog
-from .utils.process_files_worker import ProcessFilesWorker
-from .utils.wait_for_connection_worker import WaitForConnectionWorker
-from .utils.wait_for_vm_worker import WaitForVMWorker
-from .utils.export_project_worker import ExportProjectWorker
-from .utils.import_project_worker import ImportProjectWorker
 from .utils.message_box import MessageBox
+from .utils import human_filesize
 from .ports.port import Port
 from .items.node_item import NodeItem
 from .items.link_item import LinkItem
@@ -63,11 +51,8 @@ from .topology import Topology
 from .project import Project
 from .http_client import HTTPClient
 from .progress import Progress
-from .update_manager import UpdateManager
+from .config_transfer import ConfigExporter, archive_format, import_configs
 from .utils.analytics import AnalyticsClient
-from .dialogs.appliance_wizard import ApplianceWizard
-from .dialogs.new_appliance_dialog import NewApplianceDialog
-from .registry.appliance import ApplianceError
 
 log = logging.getLogger(__name__)
 
@@ -123,11 +108,12 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self._project_dialog = None
         self._recent_file_actions = []
         self._start_time = time.time()
+        self._startup = None
+        # file opened once the local server is ready
+        self._pending_load_path = None
         local_config = LocalConfig.instance()
         local_config.config_changed_signal.connect(self._localConfigChangedSlot)
-        self._local_config_timer = QtCore.QTimer(self)
-        self._local_config_timer.timeout.connect(local_config.checkConfigChanged)
-        self._local_config_timer.start(1000)  # milliseconds
+        local_config.watchConfigFile()
         self._analytics_client = AnalyticsClient()
 
         # restore the geometry and state of the main window.
@@ -159,6 +145,13 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self._recent_file_actions_separator.setVisible(False)
         self._updateRecentFileActions()
 
+        # number of nodes by status next to the start/stop buttons
+        self._node_status_label = QtWidgets.QLabel(self.uiControlToolBar)
+        self._node_status_label.setContentsMargins(5, 0, 5, 0)
+        self.uiControlToolBar.addWidget(self._node_status_label)
+        Topology.instance().nodeIndex().updated_signal.connect(self._nodeIndexUpdatedSlot)
+        self._nodeIndexUpdatedSlot()
+
         # set the window icon
         self.setWindowIcon(QtGui.QIcon(":/images/gns3.ico"))
 
@@ -179,7 +172,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         """
 
         local_config = LocalConfig.instance()
-        self._settings = local_config.loadSectionSettings(self.__class__.__name__, GENERAL_SETTINGS)
+        self._settings = local_config.sectionSettings(self.__class__.__name__, GENERAL_SETTINGS)
 
         # restore packet capture settings
         Port.loadPacketCaptureSettings()
@@ -277,6 +270,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.uiAboutAction.triggered.connect(self._aboutActionSlot)
         self.uiExportDebugInformationAction.triggered.connect(self._exportDebugInformationSlot)
         self.uiDoctorAction.triggered.connect(self._doctorSlot)
+        self.uiNetworkStatisticsAction.triggered.connect(self._networkStatisticsSlot)
         self.uiAcademyAction.triggered.connect(self._academyActionSlot)
         self.uiIOUVMConverterAction.triggered.connect(self._IOUVMConverterActionSlot)
         # New appliance button
@@ -375,6 +369,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         """
 
         if self.checkForUnsavedChanges():
+            from .dialogs.new_project_dialog import NewProjectDialog
             self._project_dialog = NewProjectDialog(self)
             self._project_dialog.show()
             create_new_project = self._project_dialog.exec_()
@@ -394,6 +389,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         """
         Called when user want to create a new appliance
         """
+        from .dialogs.new_appliance_dialog import NewApplianceDialog
         dialog = NewApplianceDialog(self)
         dialog.show()
 
@@ -456,10 +452,31 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self._project.project_closed_signal.connect(self._projectClosedContinueLoadPath)
         self._project.close()
 
+    def _localServerReadySlot(self):
+        """
+        Slot called when the local server is ready, opens the file
+        waiting for it (only once).
+        """
+
+        self._startup.local_server_ready_signal.disconnect(self._localServerReadySlot)
+        path = self._pending_load_path
+        self._pending_load_path = None
+        if path:
+            self.loadPath(path)
+
     def loadPath(self, path):
         """Open a file and close the previous project"""
 
         if path:
+            if self._startup and not self._startup.localServerReady():
+                # opened once the local server accepts connections
+                log.info("{} will be opened when the local server is ready".format(path))
+                self._first_file_load = False
+                if self._pending_load_path is None:
+                    self._startup.local_server_ready_signal.connect(self._localServerReadySlot)
+                self._pending_load_path = path
+                return
+
             if self._first_file_load is True:
                 self._first_file_load = False
                 time.sleep(0.5)  # give some time to the server to initialize
@@ -475,10 +492,12 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
 
             if path.endswith(".gns3project") or path.endswith(".gns3p"):
                 project_name = os.path.basename(path).split('.')[0]
+                from .dialogs.new_project_dialog import NewProjectDialog
                 self._project_dialog = NewProjectDialog(self, default_project_name=project_name)
                 self._project_dialog.show()
                 if self._project_dialog.exec_():
                     new_project_settings = self._project_dialog.getNewProjectSettings()
+                    from .utils.import_project_worker import ImportProjectWorker
                     import_worker = ImportProjectWorker(path, new_project_settings)
                     import_worker.imported.connect(self.loadPath)
                     progress_dialog = ProgressDialog(import_worker, "Importing project", "Importing portable project files...", "Cancel", parent=self)
@@ -488,6 +507,8 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
                 self._project_dialog = None
 
             elif path.endswith(".gns3appliance") or path.endswith(".gns3a"):
+                from .dialogs.appliance_wizard import ApplianceWizard
+                from .registry.appliance import ApplianceError
                 try:
                     self._appliance_wizard = ApplianceWizard(self, path)
                 except ApplianceError as e:
@@ -535,13 +556,61 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         for the entire topology.
         """
 
-        options = ["Export configs to a directory", "Import configs from a directory"]
+        options = ["Export configs to a directory",
+                   "Export configs to an archive",
+                   "Import configs from a directory",
+                   "Estimate the size of the configs"]
         selection, ok = QtWidgets.QInputDialog.getItem(self, "Import/Export configs", "Please choose an option:", options, 0, False)
         if ok:
             if selection == options[0]:
                 self._exportConfigs()
-            else:
+            elif selection == options[1]:
+                self._exportConfigsToArchive()
+            elif selection == options[2]:
                 self._importConfigs()
+            else:
+                self._estimateConfigsSize()
+
+    @staticmethod
+    def _configNodes():
+        """
+        Returns the nodes with configs of all the modules.
+
+        :returns: list of Node instances
+        """
+
+        nodes = []
+        for module in MODULES:
+            instance = module.instance()
+            if hasattr(instance, "configNodes"):
+                nodes.extend(instance.configNodes())
+        return nodes
+
+    def _runConfigExporter(self, exporter, title):
+        """
+        Runs a config export with a progress dialog.
+
+        :param exporter: ConfigExporter instance
+        :param title: dialog title
+        """
+
+        progress_dialog = QtWidgets.QProgressDialog("Exporting the configs...", "Cancel", 0, exporter.nodeCount(), self)
+        progress_dialog.setWindowTitle(title)
+        progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+        progress_dialog.canceled.connect(exporter.cancel)
+        exporter.updated.connect(progress_dialog.setValue)
+        exporter.bytes_updated.connect(lambda done, total: progress_dialog.setLabelText("Exporting the configs... ({})".format(human_filesize(done))))
+
+        loop = QtCore.QEventLoop()
+        exporter.finished.connect(loop.quit)
+        exporter.start()
+        if not exporter.isFinished():
+            loop.exec_()
+        progress_dialog.close()
+
+        if exporter.errors():
+            MessageBox(self, title, "Some configs could not be exported", "\n".join(exporter.errors()))
 
     def _exportConfigs(self):
         """
@@ -551,10 +620,32 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         path = QtWidgets.QFileDialog.getExistingDirectory(self, "Export directory", self._export_configs_to_dir, QtWidgets.QFileDialog.ShowDirsOnly)
         if path:
             self._export_configs_to_dir = os.path.dirname(path)
-            for module in MODULES:
-                instance = module.instance()
-                if hasattr(instance, "exportConfigs"):
-                    instance.exportConfigs(path)
+            self._runConfigExporter(ConfigExporter(self._configNodes(), path), "Export configs")
+
+    def _exportConfigsToArchive(self):
+        """
+        Exports all configs to a tar or zip archive.
+        """
+
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export archive", self._export_configs_to_dir,
+                                                        "Zip archive (*.zip);;Tar archive (*.tar);;Compressed tar archive (*.tar.gz *.tgz)")
+        if path:
+            self._export_configs_to_dir = os.path.dirname(path)
+            archive = archive_format(path)
+            if archive is None:
+                path += ".zip"
+                archive = "zip"
+            self._runConfigExporter(ConfigExporter(self._configNodes(), path, archive=archive), "Export configs")
+
+    def _estimateConfigsSize(self):
+        """
+        Shows the size of the configs of all the nodes, without exporting them.
+        """
+
+        exporter = ConfigExporter(self._configNodes(), dry_run=True)
+        self._runConfigExporter(exporter, "Configs size")
+        if not exporter.canceled():
+            QtWidgets.QMessageBox.information(self, "Configs size", "{} config files, {}".format(exporter.fileCount(), human_filesize(exporter.size())))
 
     def _importConfigs(self):
         """
@@ -564,10 +655,10 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         path = QtWidgets.QFileDialog.getExistingDirectory(self, "Import directory", self._import_configs_from_dir, QtWidgets.QFileDialog.ShowDirsOnly)
         if path:
             self._import_configs_from_dir = os.path.dirname(path)
-            for module in MODULES:
-                instance = module.instance()
-                if hasattr(instance, "importConfigs"):
-                    instance.importConfigs(path)
+            try:
+                import_configs(self._configNodes(), path)
+            except OSError as e:
+                QtWidgets.QMessageBox.critical(self, "Import configs", "Could not list the files in {}: {}".format(path, e))
 
     def _createScreenshot(self, path):
         """
@@ -630,6 +721,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             QtWidgets.QMessageBox.warning(self, "Snapshots", "Sorry, snapshots can only be created when all nodes are stopped")
             return
 
+        from .dialogs.snapshots_dialog import SnapshotsDialog
         dialog = SnapshotsDialog(self,
                                  self._project.topologyFile(),
                                  self._project.filesDir())
@@ -736,36 +828,46 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         Slot called when starting all the nodes.
         """
 
-        for item in self.uiGraphicsView.scene().items():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "start") and item.node().initialized():
-                item.node().start()
+        for node in Topology.instance().nodeIndex().nodes("start"):
+            node.start()
 
     def _suspendAllActionSlot(self):
         """
         Slot called when suspending all the nodes.
         """
 
-        for item in self.uiGraphicsView.scene().items():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "suspend") and item.node().initialized():
-                item.node().suspend()
+        for node in Topology.instance().nodeIndex().nodes("suspend"):
+            node.suspend()
 
     def _stopAllActionSlot(self):
         """
         Slot called when stopping all the nodes.
         """
 
-        for item in self.uiGraphicsView.scene().items():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "stop") and item.node().initialized():
-                item.node().stop()
+        for node in Topology.instance().nodeIndex().nodes("stop"):
+            node.stop()
 
     def _reloadAllActionSlot(self):
         """
         Slot called when reloading all the nodes.
         """
 
-        for item in self.uiGraphicsView.scene().items():
-            if isinstance(item, NodeItem) and hasattr(item.node(), "reload") and item.node().initialized():
-                item.node().reload()
+        for node in Topology.instance().nodeIndex().nodes("reload"):
+            node.reload()
+
+    def _nodeIndexUpdatedSlot(self):
+        """
+        Slot called to show the number of nodes by status in the toolbar.
+        """
+
+        node_index = Topology.instance().nodeIndex()
+        started = node_index.count(Node.started)
+        suspended = node_index.count(Node.suspended)
+        stopped = node_index.count(Node.stopped)
+        self._node_status_label.setText('<span style="color:green">&#9679;</span> {} '
+                                        '<span style="color:orange">&#9679;</span> {} '
+                                        '<span style="color:red">&#9679;</span> {}'.format(started, suspended, stopped))
+        self._node_status_label.setToolTip("{} started, {} suspended, {} stopped".format(started, suspended, stopped))
 
     def _deviceMenuActionSlot(self):
         """
@@ -787,7 +889,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         Slot called when connecting to all the nodes using the console.
         """
 
-        self.uiGraphicsView.consoleFromItems(self.uiGraphicsView.scene().items())
+        self.uiGraphicsView.consoleToNodes(Topology.instance().nodeIndex().nodes("console", Node.started))
 
     def _vpcsActionSlot(self):
         """
@@ -907,6 +1009,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         :param silent: do not display any message
         """
 
+        from .update_manager import UpdateManager
         self._update_manager = UpdateManager()
         self._update_manager.checkForUpdate(self, silent)
 
@@ -916,6 +1019,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         """
 
         with Progress.instance().context(min_duration=0):
+            from .dialogs.setup_wizard import SetupWizard
             setup_wizard = SetupWizard(self)
             setup_wizard.show()
             setup_wizard.exec_()
@@ -951,6 +1055,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         Slot to display the GNS3 About dialog.
         """
 
+        from .dialogs.about_dialog import AboutDialog
         dialog = AboutDialog(self)
         dialog.show()
         dialog.exec_()
@@ -960,6 +1065,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         Slot to display a window for exporting debug information
         """
 
+        from .dialogs.export_debug_dialog import ExportDebugDialog
         dialog = ExportDebugDialog(self, self._project)
         dialog.show()
         dialog.exec_()
@@ -969,10 +1075,20 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         Slot to display a window for exporting debug information
         """
 
+        from .dialogs.doctor_dialog import DoctorDialog
         dialog = DoctorDialog(self)
         dialog.show()
         dialog.exec_()
 
+    def _networkStatisticsSlot(self):
+        """
+        Slot to display the statistics of the requests sent to the servers.
+        """
+
+        from .dialogs.network_statistics_dialog import NetworkStatisticsDialog
+        dialog = NetworkStatisticsDialog(self)
+        dialog.show()
+
     def _academyActionSlot(self):
         """
         Slot to launch a browser pointing to the courses page.
@@ -1059,6 +1175,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         """
 
         with Progress.instance().context(min_duration=0):
+            from .dialogs.preferences_dialog import PreferencesDialog
             dialog = PreferencesDialog(self)
             dialog.restoreGeometry(QtCore.QByteArray().fromBase64(self._settings["preferences_dialog_geometry"].encode()))
             dialog.show()
@@ -1139,6 +1256,8 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         """
 
         log.debug("_finish_application_closing")
+        if self._startup:
+            self._startup.cancel()
         VPCS.instance().stopMultiHostVPCS()
 
         GNS3VM.instance().shutdown()
@@ -1164,11 +1283,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         # check if any node is running
         topology = Topology.instance()
         topology.project = self._project
-        running_node = False
-        for node in topology.nodes():
-            if hasattr(node, "start") and node.status() == Node.started:
-                return True
-        return False
+        return len(topology.nodeIndex().nodes("start", Node.started)) > 0
 
     def checkForUnsavedChanges(self):
         """
@@ -1219,45 +1334,69 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         # restore the style
         self._setStyle(self._settings.get("style"))
 
-        servers = Servers.instance()
-        # start the GNS3 VM
-        gns3_vm = GNS3VM.instance()
-        if not gns3_vm.isRunning():
-            servers.initVMServer()
-            if gns3_vm.isRemote():
-                gns3_vm.setRunning(True)
-            elif gns3_vm.autoStart():
-                worker = WaitForVMWorker()
-                progress_dialog = ProgressDialog(worker, "GNS3 VM", "Starting the GNS3 VM...", "Cancel", busy=True, parent=self, delay=5)
-                progress_dialog.show()
-                if progress_dialog.exec_():
-                    gns3_vm.adjustLocalServerIP()
-
-        # start and connect to the local server
-        server = servers.localServer()
-        if servers.shouldLocalServerAutoStart():
-                if not servers.localServerAutoStart():
-                    QtWidgets.QMessageBox.critical(self, "Local server", "Could not start the local server process: {}".format(servers.localServerPath()))
-                    return
+        # the servers are brought up in the background, the window stays usable
+        from .startup_orchestrator import StartupOrchestrator
+        self._startup = StartupOrchestrator(self)
+        self._startup.phase_started_signal.connect(self._startupPhaseStartedSlot)
+        self._startup.phase_finished_signal.connect(self._startupPhaseFinishedSlot)
+        self._startup.finished_signal.connect(self._startupFinishedSlot)
+        self._startup.start()
 
-                worker = WaitForConnectionWorker(server.host(), server.port())
-                progress_dialog = ProgressDialog(worker,
-                                                 "Local server",
-                                                 "Connecting to server {} on port {}...".format(server.host(), server.port()),
-                                                 "Cancel", busy=True, parent=self)
-                progress_dialog.show()
-                if not progress_dialog.exec_():
-                    return
+    def _startupPhaseStartedSlot(self, name):
+        """
+        Called when a startup phase starts.
+
+        :param name: phase name
+        """
+
+        self.uiStatusBar.showMessage(self._startup.PHASE_DESCRIPTIONS.get(name, name))
+
+    def _startupPhaseFinishedSlot(self, name, success, message):
+        """
+        Called when a startup phase is finished.
+
+        :param name: phase name
+        :param success: False if the phase failed
+        :param message: error message
+        """
+
+        running_phases = self._startup.runningPhases()
+        if running_phases:
+            # the other phases are still running
+            self.uiStatusBar.showMessage(self._startup.PHASE_DESCRIPTIONS.get(running_phases[0], running_phases[0]))
+        else:
+            self.uiStatusBar.clearMessage()
+        if not success and message and name in self._startup.BLOCKING_PHASES:
+            title = "GNS3 VM" if name == "gns3_vm" else "Local server"
+            QtWidgets.QMessageBox.critical(self, title, message)
+
+    def _startupFinishedSlot(self, local_server_ready):
+        """
+        Called when the GNS3 VM and the local server are up or failed.
+
+        :param local_server_ready: False if the local server could not be started
+        """
+
+        if not local_server_ready:
+            if self._pending_load_path:
+                # the file waiting for the local server cannot be opened
+                self._startup.local_server_ready_signal.disconnect(self._localServerReadySlot)
+                path = self._pending_load_path
+                self._pending_load_path = None
+                QtWidgets.QMessageBox.critical(self, "Open file", "Could not open {}: the local server is not running".format(path))
+            return
 
         # show the setup wizard
-        if not self._settings["hide_setup_wizard"] and not gns3_vm.isRunning():
+        if not self._settings["hide_setup_wizard"] and not GNS3VM.instance().isRunning():
             with Progress.instance().context(min_duration=0):
+                from .dialogs.setup_wizard import SetupWizard
                 setup_wizard = SetupWizard(self)
                 setup_wizard.show()
                 setup_wizard.exec_()
 
         self._analytics_client.sendScreenView("Main Window")
-        self._createTemporaryProject()
+        if not self._project or self._project.temporary():
+            self._createTemporaryProject()
         self.ready_signal.emit()
 
         if self._settings["check_for_update"]:
@@ -1274,6 +1413,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         Called when the application is ready to load a project
         """
         if self._settings["auto_launch_project_dialog"] and self._first_file_load:
+            from .dialogs.new_project_dialog import NewProjectDialog
             self._project_dialog = NewProjectDialog(self, showed_from_startup=True)
             self._project_dialog.accepted.connect(self._newProjectDialodAcceptedSlot)
             self._project_dialog.show()
@@ -1354,6 +1494,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             QtWidgets.QMessageBox.critical(self, "Save project", "Could not create project directory {}: {}".format(project_dir, e))
             return
 
+        from .utils.process_files_worker import ProcessFilesWorker
         if self._project.temporary():
             # move files if saving from a temporary project
             log.info("Moving project files from {} to {}".format(self._project.filesDir(), project_dir))
@@ -1727,6 +1868,7 @@ It is your responsability to check if you have the right to distribute the image
             QtWidgets.QMessageBox.critical(self, "Export project", "Could not write {}: {}".format(path, e))
             return
 
+        from .utils.export_project_worker import ExportProjectWorker
         export_worker = ExportProjectWorker(self._project, path, include_images)
         progress_dialog = ProgressDialog(export_worker, "Exporting project", "Exporting portable project files...", "Cancel", parent=self)
         progress_dialog.show()
@@ -15,13 +15,98 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from gns3.modules.builtin import Builtin
-from gns3.modules.dynamips import Dynamips
-from gns3.modules.iou import IOU
-from gns3.modules.vpcs import VPCS
-from gns3.modules.virtualbox import VirtualBox
-from gns3.modules.qemu import Qemu
-from gns3.modules.vmware import VMware
-from gns3.modules.docker import Docker
+import importlib
+
+from gns3.utils.startup_profiler import StartupProfiler
+
+
+class LazyModule:
+
+    """
+    Stands for a module class until it is used. The module package, with
+    its node classes, is imported the first time one of its attributes is
+    accessed; looking for a node class the module does not provide does not
+    import it.
+
+    :param name: module class name
+    :param package: package of the module
+    :param node_classes: names of the node classes provided by the module
+    """
+
+    def __init__(self, name, package, node_classes):
+
+        self.__name__ = name
+        self._package = package
+        self._node_classes = node_classes
+        self._module = None
+
+    def load(self):
+        """
+        Imports the module.
+
+        :returns: module class
+        """
+
+        if self._module is None:
+            self._module = getattr(importlib.import_module(self._package), self.__name__)
+        return self._module
+
+    def loaded(self):
+        """
+        Returns True if the module has been imported.
+        """
+
+        return self._module is not None
+
+    def nodeClasses(self):
+        """
+        Returns the names of the node classes provided by the module.
+        """
+
+        return list(self._node_classes)
+
+    def getNodeClass(self, name):
+        """
+        Returns the node class with the corresponding name.
+
+        :param name: node class name
+        """
+
+        if name not in self._node_classes and not self.loaded():
+            return None
+        return self.load().getNodeClass(name)
+
+    def instance(self):
+        """
+        Returns the instance of the module, creating it when needed.
+        """
+
+        module = self.load()
+        if not hasattr(module, "_instance") or module._instance is None:
+            with StartupProfiler.instance().measure(self.__name__, category="init"):
+                return module.instance()
+        return module.instance()
+
+    def __getattr__(self, name):
+
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self):
+
+        return "<LazyModule {}>".format(self.__name__)
+
+
+VPCS = LazyModule("VPCS", "gns3.modules.vpcs", ["VPCSDevice"])
+Dynamips = LazyModule("Dynamips", "gns3.modules.dynamips", ["C1700", "C2600", "C2691", "C3600", "C3725", "C3745", "C7200",
+                                                           "EtherSwitchRouter", "EthernetSwitch", "EthernetHub",
+                                                           "FrameRelaySwitch", "ATMSwitch"])
+IOU = LazyModule("IOU", "gns3.modules.iou", ["IOUDevice"])
+Qemu = LazyModule("Qemu", "gns3.modules.qemu", ["QemuVM"])
+VirtualBox = LazyModule("VirtualBox", "gns3.modules.virtualbox", ["VirtualBoxVM"])
+VMware = LazyModule("VMware", "gns3.modules.vmware", ["VMwareVM"])
+Docker = LazyModule("Docker", "gns3.modules.docker", ["DockerVM"])
+Builtin = LazyModule("Builtin", "gns3.modules.builtin", ["Cloud", "Host"])
 
 MODULES = [VPCS, Dynamips, IOU, Qemu, VirtualBox, VMware, Docker, Builtin]
@@ -85,7 +85,7 @@ class Cloud(Node):
         if additional_settings and "nios" in additional_settings:
             self._settings["nios"] = additional_settings["nios"]
 
-        self._server.get("/interfaces", self._setupCallback)
+        self._server.inventory().get("/interfaces", self._setupCallback)
 
     def _setupCallback(self, result, error=False, **kwargs):
         """
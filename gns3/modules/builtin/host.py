@@ -61,7 +61,7 @@ class Host(Cloud):
         else:
             self.created_signal.connect(self._autoConfigure)
 
-        self._server.get("/interfaces", self._setupCallback)
+        self._server.inventory().get("/interfaces", self._setupCallback)
 
     def _autoConfigure(self, node_id):
         """
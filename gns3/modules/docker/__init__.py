@@ -22,6 +22,7 @@ from gns3.local_config import LocalConfig
 
 from ..module import Module
 from ..module_error import ModuleError
+from ..template_index import TemplateIndex
 from .docker_vm import DockerVM
 from .settings import DOCKER_SETTINGS, DOCKER_CONTAINER_SETTINGS
 
@@ -38,6 +39,7 @@ class Docker(Module):
         self._settings = {}
         self._docker_containers = {}
         self._nodes = []
+        self._index = TemplateIndex()
 
         # load the settings
         self._loadSettings()
@@ -54,8 +56,8 @@ class Docker(Module):
     def _loadSettings(self):
         """Loads the settings from the persistent settings file."""
         local_config = LocalConfig.instance()
-        self._settings = local_config.loadSectionSettings(
-            self.__class__.__name__, DOCKER_SETTINGS)
+        self._settings = dict(local_config.sectionView(
+            self.__class__.__name__, DOCKER_SETTINGS))
 
         if "containers" in self._settings:
             for image in self._settings["containers"]:
@@ -65,8 +67,9 @@ class Docker(Module):
                 if key in self._docker_containers or not name or not server:
                     continue
                 container_settings = DOCKER_CONTAINER_SETTINGS.copy()
-                container_settings.update(image)
+                container_settings.update(LocalConfig.copySettings(image))
                 self._docker_containers[key] = container_settings
+        self._index.rebuild(self._docker_containers)
 
     def _saveDockerImages(self):
         """Saves the Docker containers to the persistent settings file."""
@@ -90,6 +93,7 @@ class Docker(Module):
         :param new_iou_images: Docker images settings (dictionary)
         """
         self._docker_containers = new_docker_containers.copy()
+        self._index.rebuild(self._docker_containers)
         self._saveDockerImages()
 
     @staticmethod
@@ -148,15 +152,9 @@ class Docker(Module):
 
         image = None
         if node_name:
-            for image_key, info in self._docker_containers.items():
-                if node_name == info["name"]:
-                    image = image_key
+            image = self._index.templateKey(node_name)
         if not image:
-            selected_images = []
-            for image, info in self._docker_containers.items():
-                if info["server"] == node.server().host() or (
-                        node.server().isLocal() and info["server"] == "local"):
-                    selected_images.append(image)
+            selected_images = self._index.templateKeys(node.server())
 
             if not selected_images:
                 raise ModuleError("No Docker VM on server {}".format(
@@ -199,7 +197,7 @@ class Docker(Module):
         :param server: server to send the request to
         :param callback: callback for the reply from the server
         """
-        server.get("/docker/images", callback)
+        server.inventory().get("/docker/images", callback)
 
     @staticmethod
     def getNodeClass(name):
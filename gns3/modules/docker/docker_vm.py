@@ -169,13 +169,8 @@ class DockerVM(VM):
             self.error_signal.emit(self.id(), 'Name "{}" is already used by another node'.format(new_settings["name"]))
             return
 
-        params = {}
-        for name, value in new_settings.items():
-            if name in self._settings and self._settings[name] != value:
-                params[name] = value
-
-        log.debug("{} is updating settings: {}".format(self.name(), params))
-        self.httpPut("/docker/vms/{vm_id}".format(project_id=self._project.id(), vm_id=self._vm_id), self._updateCallback, body=params)
+        params = self._settingsDelta(new_settings)
+        self._putSettings("/docker/vms/{vm_id}".format(vm_id=self._vm_id), params, self._updateCallback)
 
     def suspend(self):
         """Suspends this Docker container."""
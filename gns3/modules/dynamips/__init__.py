@@ -30,6 +30,7 @@ from gns3.local_server_config import LocalServerConfig
 
 from ..module import Module
 from ..module_error import ModuleError
+from ..template_index import TemplateIndex
 from .nodes.router import Router
 from .nodes.c1700 import C1700
 from .nodes.c2600 import C2600
@@ -73,6 +74,7 @@ class Dynamips(Module):
         self._settings = {}
         self._ios_routers = {}
         self._nodes = []
+        self._index = TemplateIndex(first_match=True)
         self._ios_images_cache = {}
 
         self.configChangedSlot()
@@ -116,7 +118,7 @@ class Dynamips(Module):
         Loads the settings from the persistent settings file.
         """
 
-        self._settings = LocalConfig.instance().loadSectionSettings(self.__class__.__name__, DYNAMIPS_SETTINGS)
+        self._settings = dict(LocalConfig.instance().sectionView(self.__class__.__name__, DYNAMIPS_SETTINGS))
         if not os.path.exists(self._settings["dynamips_path"]):
             dynamips_path = shutil.which("dynamips")
             if dynamips_path:
@@ -152,22 +154,24 @@ class Dynamips(Module):
         Load the IOS routers from the persistent settings file.
         """
 
-        settings = LocalConfig.instance().settings()
-        if "routers" in settings.get(self.__class__.__name__, {}):
-            for router in settings[self.__class__.__name__]["routers"]:
+        # the section view is shared, only the templates not loaded yet are copied
+        settings = self._settings
+        if "routers" in settings:
+            for router in settings["routers"]:
                 name = router.get("name")
                 server = router.get("server")
-                router["image"] = router.get("path", router["image"])  # for backward compatibility before version 1.3
                 key = "{server}:{name}".format(server=server, name=name)
                 if key in self._ios_routers or not name or not server:
                     continue
                 router_settings = IOS_ROUTER_SETTINGS.copy()
-                router_settings.update(router)
+                router_settings.update(LocalConfig.copySettings(router))
+                router_settings["image"] = router.get("path", router["image"])  # for backward compatibility before version 1.3
                 # for backward compatibility before version 1.4
                 if "symbol" not in router_settings:
                     router_settings["symbol"] = router_settings["default_symbol"]
                     router_settings["symbol"] = router_settings["symbol"][:-11] + ".svg" if router_settings["symbol"].endswith("normal.svg") else router_settings["symbol"]
                 self._ios_routers[key] = router_settings
+        self._index.rebuild(self._ios_routers)
 
     def _saveIOSRouters(self):
         """
@@ -213,6 +217,7 @@ class Dynamips(Module):
         """
 
         self._ios_routers = new_ios_routers.copy()
+        self._index.rebuild(self._ios_routers)
         self._saveIOSRouters()
 
     @staticmethod
@@ -266,10 +271,9 @@ class Dynamips(Module):
         if isinstance(node, Router):
             ios_router = None
             if node_name:
-                for ios_key, info in self._ios_routers.items():
-                    if node_name == info["name"]:
-                        ios_router = self._ios_routers[ios_key]
-                        break
+                ios_key = self._index.templateKey(node_name)
+                if ios_key is not None:
+                    ios_router = self._ios_routers[ios_key]
 
             if not ios_router:
                 raise ModuleError("No IOS router for platform {}".format(node.settings()["platform"]))
@@ -322,27 +326,14 @@ class Dynamips(Module):
         log.info("Dynamips module reset")
         self._nodes.clear()
 
-    def exportConfigs(self, directory):
+    def configNodes(self):
         """
-        Exports all configs for all nodes to a directory.
+        Returns the nodes with configs that can be exported and imported.
 
-        :param directory: destination directory path
+        :returns: list of Node instances
         """
 
-        for node in self._nodes:
-            if isinstance(node, Router) and node.initialized():
-                node.exportConfigToDirectory(directory)
-
-    def importConfigs(self, directory):
-        """
-        Imports configs to all nodes from a directory.
-
-        :param directory: source directory path
-        """
-
-        for node in self._nodes:
-            if isinstance(node, Router) and node.initialized():
-                node.importConfigFromDirectory(directory)
+        return [node for node in self._nodes if isinstance(node, Router) and node.initialized()]
 
     def findAlternativeIOSImage(self, image, node):
         """
@@ -255,22 +255,15 @@ class Router(VM):
         if dynamips_id:
             params["dynamips_id"] = dynamips_id
 
-        # push the startup-config
+        # push the startup-config and private-config
+        config_paths = {}
         if not vm_id and "startup_config" in additional_settings:
-            base_config_content = self._readBaseConfig(additional_settings["startup_config"])
-            if base_config_content is not None:
-                params["startup_config_content"] = base_config_content
-            del additional_settings["startup_config"]
-
-        # push the private-config
+            config_paths["startup_config_content"] = additional_settings.pop("startup_config")
         if not vm_id and "private_config" in additional_settings:
-            base_config_content = self._readBaseConfig(additional_settings["private_config"])
-            if base_config_content is not None:
-                params["private_config_content"] = base_config_content
-            del additional_settings["private_config"]
+            config_paths["private_config_content"] = additional_settings.pop("private_config")
 
         params.update(additional_settings)
-        self.httpPost("/dynamips/vms", self._setupCallback, body=params)
+        self._postWithBaseConfigs("/dynamips/vms", self._setupCallback, params, config_paths)
 
     def _setupCallback(self, result, error=False, **kwargs):
         """
@@ -325,12 +318,8 @@ class Router(VM):
                     params["private_config_content"] = base_config_content
             del new_settings["private_config"]
 
-        for name, value in new_settings.items():
-            if name in self._settings and self._settings[name] != value:
-                params[name] = value
-
-        log.debug("{} is updating settings: {}".format(self.name(), params))
-        self.httpPut("/dynamips/vms/{vm_id}".format(vm_id=self._vm_id), self._updateCallback, body=params)
+        params.update(self._settingsDelta(new_settings))
+        self._putSettings("/dynamips/vms/{vm_id}".format(vm_id=self._vm_id), params, self._updateCallback)
 
     def _updateCallback(self, result, error=False, **kwargs):
         """
@@ -711,6 +700,32 @@ class Router(VM):
                 except OSError as e:
                     self.error_signal.emit(self.id(), "Could not export private-config to {}: {}".format(private_config_path, e))
 
+    def configFilesPath(self):
+        """
+        Returns the server path to get the configs of this router.
+
+        :returns: path
+        """
+
+        return "/dynamips/vms/{vm_id}/configs".format(vm_id=self._vm_id)
+
+    def configFiles(self, result):
+        """
+        Returns the config files found in a server response.
+
+        :param result: server response (dict)
+
+        :returns: dictionary of file names and contents
+        """
+
+        files = {}
+        base_name = normalize_filename(self.name())
+        if "startup_config_content" in result:
+            files[base_name + "_startup-config.cfg"] = result["startup_config_content"] or ""
+        if "private_config_content" in result:
+            files[base_name + "_private-config.cfg"] = result["private_config_content"] or ""
+        return files
+
     def exportConfigToDirectory(self, directory):
         """
         Exports the startup-config and private-config to a directory.
@@ -718,7 +733,7 @@ class Router(VM):
         :param directory: destination directory path
         """
 
-        self.httpGet("/dynamips/vms/{vm_id}/configs".format(vm_id=self._vm_id),
+        self.httpGet(self.configFilesPath(),
                      self._exportConfigToDirectoryCallback,
                      context={"directory": directory})
 
@@ -734,25 +749,14 @@ class Router(VM):
             log.error("error while exporting {} configs: {}".format(self.name(), result["message"]))
             self.server_error_signal.emit(self.id(), result["message"])
         else:
-            directory = context["directory"]
-            if "startup_config_content" in result:
-                config_path = os.path.join(directory, normalize_filename(self.name())) + "_startup-config.cfg"
+            for file_name, content in self.configFiles(result).items():
+                config_path = os.path.join(context["directory"], file_name)
                 try:
                     with open(config_path, "wb") as f:
-                        log.info("saving {} startup-config to {}".format(self.name(), config_path))
-                        if result["startup_config_content"]:
-                            f.write(result["startup_config_content"].encode("utf-8"))
-                except OSError as e:
-                    self.error_signal.emit(self.id(), "Could not export startup-config to {}: {}".format(config_path, e))
-            if "private_config_content" in result:
-                config_path = os.path.join(directory, normalize_filename(self.name())) + "_private-config.cfg"
-                try:
-                    with open(config_path, "wb") as f:
-                        log.info("saving {} private-config to {}".format(self.name(), config_path))
-                        if result["private_config_content"]:
-                            f.write(result["private_config_content"].encode("utf-8"))
+                        log.info("saving {} config to {}".format(self.name(), config_path))
+                        f.write(content.encode("utf-8"))
                 except OSError as e:
-                    self.error_signal.emit(self.id(), "Could not export private-config to {}: {}".format(config_path, e))
+                    self.error_signal.emit(self.id(), "Could not export config to {}: {}".format(config_path, e))
 
     def importConfig(self, path):
         """
@@ -774,18 +778,20 @@ class Router(VM):
         new_settings = {"private_config": path}
         self.update(new_settings)
 
-    def importConfigFromDirectory(self, directory):
+    def importConfigFromDirectory(self, directory, contents=None):
         """
         Imports a startup-config and a private-config from a directory.
 
         :param directory: source directory path
+        :param contents: file names in the directory, listed if not provided
         """
 
-        try:
-            contents = os.listdir(directory)
-        except OSError as e:
-            self.warning_signal.emit(self.id(), "Configuration could not be loaded from directory {}: {}".format(directory, e))
-            return
+        if contents is None:
+            try:
+                contents = os.listdir(directory)
+            except OSError as e:
+                self.warning_signal.emit(self.id(), "Configuration could not be loaded from directory {}: {}".format(directory, e))
+                return
         startup_config = normalize_filename(self.name()) + "_startup-config.cfg"
         private_config = normalize_filename(self.name()) + "_private-config.cfg"
         new_settings = {}
@@ -29,6 +29,7 @@ from gns3.local_config import LocalConfig
 
 from ..module import Module
 from ..module_error import ModuleError
+from ..template_index import TemplateIndex
 from .iou_device import IOUDevice
 from .settings import IOU_SETTINGS
 from .settings import IOU_DEVICE_SETTINGS
@@ -49,7 +50,10 @@ class IOU(Module):
         self._settings = {}
         self._nodes = []
         self._iou_devices = {}
+        self._index = TemplateIndex()
         self._iou_images_cache = {}
+        # (path, modification time) and content of the last iourc file read
+        self._iourc_cache = (None, None)
 
         self.configChangedSlot()
 
@@ -62,7 +66,7 @@ class IOU(Module):
         Loads the settings from the persistent settings file.
         """
 
-        self._settings = LocalConfig.instance().loadSectionSettings(self.__class__.__name__, IOU_SETTINGS)
+        self._settings = dict(LocalConfig.instance().sectionView(self.__class__.__name__, IOU_SETTINGS))
 
         if sys.platform.startswith("linux") and not os.path.exists(self._settings["iouyap_path"]):
             iouyap_path = shutil.which("iouyap")
@@ -95,22 +99,24 @@ class IOU(Module):
         Load the IOU devices from the persistent settings file.
         """
 
-        settings = LocalConfig.instance().settings()
-        if "devices" in settings.get(self.__class__.__name__, {}):
-            for device in settings[self.__class__.__name__]["devices"]:
+        # the section view is shared, only the templates not loaded yet are copied
+        settings = self._settings
+        if "devices" in settings:
+            for device in settings["devices"]:
                 name = device.get("name")
                 server = device.get("server")
                 key = "{server}:{name}".format(server=server, name=name)
                 if key in self._iou_devices or not name or not server:
                     continue
                 device_settings = IOU_DEVICE_SETTINGS.copy()
-                device_settings.update(device)
+                device_settings.update(LocalConfig.copySettings(device))
                 # for backward compatibility before version 1.4
                 if "symbol" not in device_settings:
                     device_settings["symbol"] = device_settings["default_symbol"]
                     device_settings["symbol"] = device_settings["symbol"][:-11] + ".svg" if device_settings["symbol"].endswith("normal.svg") else device_settings["symbol"]
                 device_settings["startup_config"] = device_settings.get("initial_config", device_settings["startup_config"])
                 self._iou_devices[key] = device_settings
+        self._index.rebuild(self._iou_devices)
 
     def _saveIOUDevices(self):
         """
@@ -156,6 +162,7 @@ class IOU(Module):
         """
 
         self._iou_devices = new_iou_devices.copy()
+        self._index.rebuild(self._iou_devices)
         self._saveIOUDevices()
 
     @staticmethod
@@ -182,6 +189,34 @@ class IOU(Module):
         self._settings.update(settings)
         self._saveSettings()
 
+    def iourcContent(self):
+        """
+        Returns the content of the iourc file. The file is read
+        again only when its path or modification time changes.
+
+        :returns: iourc content or None
+        """
+
+        iourc_path = self._settings["iourc_path"]
+        if not iourc_path or not os.path.isfile(iourc_path):
+            return None
+        try:
+            key = (iourc_path, os.path.getmtime(iourc_path))
+        except OSError:
+            return None
+
+        if self._iourc_cache[0] != key:
+            content = None
+            try:
+                with open(iourc_path, "rb") as f:
+                    content = f.read().decode("utf-8")
+            except OSError as e:
+                print("Can't open iourc file {}: {}".format(iourc_path, e))
+            except UnicodeDecodeError as e:
+                print("Invalid IOURC file {}: {}".format(iourc_path, e))
+            self._iourc_cache = (key, content)
+        return self._iourc_cache[1]
+
     def createNode(self, node_class, server, project):
         """
         Creates a new node.
@@ -208,15 +243,10 @@ class IOU(Module):
 
         iouimage = None
         if node_name:
-            for iou_key, info in self._iou_devices.items():
-                if node_name == info["name"]:
-                    iouimage = iou_key
+            iouimage = self._index.templateKey(node_name)
 
         if not iouimage:
-            selected_images = []
-            for image, info in self._iou_devices.items():
-                if info["server"] == node.server().host() or (node.server().isLocal() and info["server"] == "local"):
-                    selected_images.append(image)
+            selected_images = self._index.templateKeys(node.server())
 
             if not selected_images:
                 raise ModuleError("No IOU image found for this device")
@@ -262,27 +292,14 @@ class IOU(Module):
         log.info("IOU module reset")
         self._nodes.clear()
 
-    def exportConfigs(self, directory):
-        """
-        Exports all configs for all nodes to a directory.
-
-        :param directory: destination directory path
-        """
-
-        for node in self._nodes:
-            if node.initialized():
-                node.exportConfigToDirectory(directory)
-
-    def importConfigs(self, directory):
+    def configNodes(self):
         """
-        Imports configs to all nodes from a directory.
+        Returns the nodes with configs that can be exported and imported.
 
-        :param directory: source directory path
+        :returns: list of Node instances
         """
 
-        for node in self._nodes:
-            if node.initialized():
-                node.importConfigFromDirectory(directory)
+        return [node for node in self._nodes if node.initialized()]
 
     def findAlternativeIOUImage(self, image):
         """
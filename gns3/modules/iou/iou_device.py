@@ -50,6 +50,8 @@ class IOUDevice(VM):
 
         log.info("IOU instance is being created")
         self._vm_id = None
+        # iourc content the server already has for this device
+        self._iourc_content_pushed = None
         self._settings = {"name": "",
                           "path": "",
                           "md5sum": "",
@@ -126,24 +128,17 @@ class IOUDevice(VM):
         if vm_id:
             params["vm_id"] = vm_id
 
-        # push the startup-config
+        # push the startup-config and private-config
+        config_paths = {}
         if "startup_config" in additional_settings:
-            base_config_content = self._readBaseConfig(additional_settings["startup_config"])
-            if base_config_content is not None:
-                params["startup_config_content"] = base_config_content
-            del additional_settings["startup_config"]
-
-        # push the startup-config
+            config_paths["startup_config_content"] = additional_settings.pop("startup_config")
         if "private_config" in additional_settings:
-            base_config_content = self._readBaseConfig(additional_settings["private_config"])
-            if base_config_content is not None:
-                params["private_config_content"] = base_config_content
-            del additional_settings["private_config"]
+            config_paths["private_config_content"] = additional_settings.pop("private_config")
 
         params = self._addIourcContentToParams(params)
 
         params.update(additional_settings)
-        self.httpPost("/iou/vms", self._setupCallback, body=params, progressText="Creating {}".format(name))
+        self._postWithBaseConfigs("/iou/vms", self._setupCallback, params, config_paths, progressText="Creating {}".format(name))
 
     def _setupCallback(self, result, error=False, **kwargs):
         """
@@ -181,25 +176,37 @@ class IOUDevice(VM):
             return
 
         params = {}
-        params = self._addIourcContentToParams(params)
+        # the server keeps the iourc file of a device until it is deleted
+        iourc_content = self._module.iourcContent()
+        if iourc_content is not None and iourc_content != self._iourc_content_pushed:
+            params["iourc_content"] = iourc_content
+            self._iourc_content_pushed = iourc_content
 
         log.debug("{} is starting".format(self.name()))
         self.httpPost("/{prefix}/vms/{vm_id}/start".format(prefix=self.URL_PREFIX, vm_id=self._vm_id), self._startCallback, body=params, progressText="{} is starting".format(self.name()))
 
+    def _startCallback(self, result, error=False, **kwargs):
+        """
+        Callback for start.
+
+        :param result: server response (dict)
+        :param error: indicates an error (boolean)
+        """
+
+        if error:
+            # push the iourc file again on the next start
+            self._iourc_content_pushed = None
+        super()._startCallback(result, error=error, **kwargs)
+
     def _addIourcContentToParams(self, params):
         """
-        If an IOURC file exist push it when starting the IOU device
+        If an IOURC file exist push it when creating the IOU device
         """
-        # push the iourc file
-        module_settings = self._module.settings()
-        if module_settings["iourc_path"] and os.path.isfile(module_settings["iourc_path"]):
-            try:
-                with open(module_settings["iourc_path"], "rb") as f:
-                    params["iourc_content"] = f.read().decode("utf-8")
-            except OSError as e:
-                print("Can't open iourc file {}: {}".format(module_settings["iourc_path"], e))
-            except UnicodeDecodeError as e:
-                print("Invalid IOURC file {}: {}".format(module_settings["iourc_path"], e))
+
+        iourc_content = self._module.iourcContent()
+        if iourc_content is not None:
+            params["iourc_content"] = iourc_content
+        self._iourc_content_pushed = iourc_content
         return params
 
     def update(self, new_settings):
@@ -226,12 +233,8 @@ class IOUDevice(VM):
                 params["private_config_content"] = base_config_content
             del new_settings["private_config"]
 
-        for name, value in new_settings.items():
-            if name in self._settings and self._settings[name] != value:
-                params[name] = value
-
-        log.debug("{} is updating settings: {}".format(self.name(), params))
-        self.httpPut("/iou/vms/{vm_id}".format(vm_id=self._vm_id), self._updateCallback, body=params)
+        params.update(self._settingsDelta(new_settings))
+        self._putSettings("/iou/vms/{vm_id}".format(vm_id=self._vm_id), params, self._updateCallback)
 
     def _updateCallback(self, result, error=False, **kwargs):
         """
@@ -432,6 +435,32 @@ class IOUDevice(VM):
                 except OSError as e:
                     self.error_signal.emit(self.id(), "Could not export private-config to {}: {}".format(private_config_path, e))
 
+    def configFilesPath(self):
+        """
+        Returns the server path to get the configs of this IOU device.
+
+        :returns: path
+        """
+
+        return "/iou/vms/{vm_id}/configs".format(vm_id=self._vm_id)
+
+    def configFiles(self, result):
+        """
+        Returns the config files found in a server response.
+
+        :param result: server response (dict)
+
+        :returns: dictionary of file names and contents
+        """
+
+        files = {}
+        base_name = normalize_filename(self.name())
+        if "startup_config_content" in result:
+            files[base_name + "_startup-config.cfg"] = result["startup_config_content"] or ""
+        if "private_config_content" in result:
+            files[base_name + "_private-config.cfg"] = result["private_config_content"] or ""
+        return files
+
     def exportConfigToDirectory(self, directory):
         """
         Exports the initial-config to a directory.
@@ -439,7 +468,7 @@ class IOUDevice(VM):
         :param directory: destination directory path
         """
 
-        self.httpGet("/iou/vms/{vm_id}/configs".format(vm_id=self._vm_id),
+        self.httpGet(self.configFilesPath(),
                      self._exportConfigToDirectoryCallback,
                      context={"directory": directory})
 
@@ -455,27 +484,15 @@ class IOUDevice(VM):
             log.error("error while exporting {} IOU configs: {}".format(self.name(), result["message"]))
             self.server_error_signal.emit(self.id(), result["message"])
             return
-        export_directory = context["directory"]
 
-        if "startup_config_content" in result:
-            startup_config_path = os.path.join(export_directory, normalize_filename(self.name())) + "_startup-config.cfg"
-            try:
-                with open(startup_config_path, "wb") as f:
-                    log.info("saving {} startup-config to {}".format(self.name(), startup_config_path))
-                    if result["startup_config_content"]:
-                        f.write(result["startup_config_content"].encode("utf-8"))
-            except OSError as e:
-                self.error_signal.emit(self.id(), "could not export startup-config to {}: {}".format(startup_config_path, e))
-
-        if "private_config_content" in result:
-            private_config_path = os.path.join(export_directory, normalize_filename(self.name())) + "_private-config.cfg"
+        for file_name, content in self.configFiles(result).items():
+            config_path = os.path.join(context["directory"], file_name)
             try:
-                with open(private_config_path, "wb") as f:
-                    log.info("saving {} private-config to {}".format(self.name(), private_config_path))
-                    if result["private_config_content"]:
-                        f.write(result["private_config_content"].encode("utf-8"))
+                with open(config_path, "wb") as f:
+                    log.info("saving {} config to {}".format(self.name(), config_path))
+                    f.write(content.encode("utf-8"))
             except OSError as e:
-                self.error_signal.emit(self.id(), "could not export private-config to {}: {}".format(startup_config_path, e))
+                self.error_signal.emit(self.id(), "could not export config to {}: {}".format(config_path, e))
 
     def importConfig(self, path):
         """
@@ -497,14 +514,16 @@ class IOUDevice(VM):
         new_settings = {"private_config": path}
         self.update(new_settings)
 
-    def importConfigFromDirectory(self, directory):
+    def importConfigFromDirectory(self, directory, contents=None):
         """
         Imports IOU configs from a directory.
 
         :param directory: source directory path
+        :param contents: file names in the directory, listed if not provided
         """
 
-        contents = os.listdir(directory)
+        if contents is None:
+            contents = os.listdir(directory)
         startup_config = normalize_filename(self.name()) + "_startup-config.cfg"
         private_config = normalize_filename(self.name()) + "_private-config.cfg"
         new_settings = {}
@@ -34,14 +34,44 @@ class Module(QtCore.QObject):
 
     notification_signal = QtCore.Signal(str, str)
 
+    # modules are instantiated when first used
+    _instances = []
+    _instance_created_callbacks = []
+
     def __init__(self):
 
         super().__init__()
-        LocalConfig.instance().config_changed_signal.connect(self.configChangedSlot)
+        LocalConfig.instance().config_section_changed_signal.connect(self._configSectionChangedSlot)
+        Module._instances.append(self)
+        for callback in Module._instance_created_callbacks:
+            callback(self)
+
+    @staticmethod
+    def connectInstances(callback):
+        """
+        Calls a callback with each module instance,
+        including the instances created later.
+
+        :param callback: callable receiving the module instance
+        """
+
+        Module._instance_created_callbacks.append(callback)
+        for instance in Module._instances:
+            callback(instance)
+
+    def _configSectionChangedSlot(self, section):
+        """
+        Reloads the settings only when the section of this module changed.
+
+        :param section: changed section name
+        """
+
+        if section == self.__class__.__name__:
+            self.configChangedSlot()
 
     def configChangedSlot(self):
         """
-        Call when the configuration file has changed
+        Call when the section of this module in the configuration file has changed
         """
 
         raise NotImplementedError("Missing configChangedSlot in {}".format(self.__class__.__name__))
@@ -27,6 +27,7 @@ from gns3.local_server_config import LocalServerConfig
 
 from ..module import Module
 from ..module_error import ModuleError
+from ..template_index import TemplateIndex
 from .qemu_vm import QemuVM
 from .settings import QEMU_SETTINGS
 from .settings import QEMU_VM_SETTINGS
@@ -47,6 +48,8 @@ class Qemu(Module):
         self._settings = {}
         self._qemu_vms = {}
         self._nodes = []
+        # a node is deployed from the template with the same name
+        self._index = TemplateIndex(node_key=lambda node: node.name())
 
         self.configChangedSlot()
 
@@ -59,7 +62,7 @@ class Qemu(Module):
         Loads the settings from the persistent settings file.
         """
 
-        self._settings = LocalConfig.instance().loadSectionSettings(self.__class__.__name__, QEMU_SETTINGS)
+        self._settings = dict(LocalConfig.instance().sectionView(self.__class__.__name__, QEMU_SETTINGS))
         self._loadQemuVMs()
 
     def _saveSettings(self):
@@ -83,21 +86,23 @@ class Qemu(Module):
         Load the QEMU VMs from the persistent settings file.
         """
 
-        settings = LocalConfig.instance().settings()
-        if "vms" in settings.get(self.__class__.__name__, {}):
-            for vm in settings[self.__class__.__name__]["vms"]:
+        # the section view is shared, only the templates not loaded yet are copied
+        settings = self._settings
+        if "vms" in settings:
+            for vm in settings["vms"]:
                 name = vm.get("name")
                 server = vm.get("server")
                 key = "{server}:{name}".format(server=server, name=name)
                 if key in self._qemu_vms or not name or not server:
                     continue
                 vm_settings = QEMU_VM_SETTINGS.copy()
-                vm_settings.update(vm)
+                vm_settings.update(LocalConfig.copySettings(vm))
                 # for backward compatibility before version 1.4
                 if "symbol" not in vm_settings:
                     vm_settings["symbol"] = vm_settings.get("default_symbol", vm_settings["symbol"])
                     vm_settings["symbol"] = vm_settings["symbol"][:-11] + ".svg" if vm_settings["symbol"].endswith("normal.svg") else vm_settings["symbol"]
                 self._qemu_vms[key] = vm_settings
+        self._index.rebuild(self._qemu_vms)
 
     def _saveQemuVMs(self):
         """
@@ -124,6 +129,7 @@ class Qemu(Module):
         """
 
         self._qemu_vms = new_qemu_vms.copy()
+        self._index.rebuild(self._qemu_vms)
         self._saveQemuVMs()
 
     def addNode(self, node):
@@ -134,6 +140,7 @@ class Qemu(Module):
         """
 
         self._nodes.append(node)
+        self._index.addNode(node)
 
     def removeNode(self, node):
         """
@@ -144,6 +151,16 @@ class Qemu(Module):
 
         if node in self._nodes:
             self._nodes.remove(node)
+        self._index.removeNode(node)
+
+    def updateNode(self, node):
+        """
+        Indexes a node again after its settings have changed.
+
+        :param node: Node instance
+        """
+
+        self._index.updateNode(node)
 
     def settings(self):
         """
@@ -189,15 +206,10 @@ class Qemu(Module):
 
         vm = None
         if node_name:
-            for vm_key, info in self._qemu_vms.items():
-                if node_name == info["name"]:
-                    vm = vm_key
+            vm = self._index.templateKey(node_name)
 
         if not vm:
-            selected_vms = []
-            for vm, info in self._qemu_vms.items():
-                if info["server"] == node.server().host() or (node.server().isLocal() and info["server"] == "local"):
-                    selected_vms.append(vm)
+            selected_vms = self._index.templateKeys(node.server())
 
             if not selected_vms:
                 raise ModuleError("No QEMU VM on server {}".format(node.server().host()))
@@ -216,9 +228,8 @@ class Qemu(Module):
 
         linked_base = self._qemu_vms[vm]["linked_base"]
         if not linked_base:
-            for other_node in self._nodes:
-                if other_node.settings()["name"] == self._qemu_vms[vm]["name"] and \
-                        (self._qemu_vms[vm]["server"] == "local" and other_node.server().isLocal() or self._qemu_vms[vm]["server"] == other_node.server().host):
+            for other_node in self._index.nodes(self._qemu_vms[vm]["name"]):
+                if self._qemu_vms[vm]["server"] == "local" and other_node.server().isLocal() or self._qemu_vms[vm]["server"] == other_node.server().host():
                     raise ModuleError("Sorry a Qemu VM without the linked base setting enabled can only be used once in your topology")
 
         vm_settings = {}
@@ -255,6 +266,7 @@ class Qemu(Module):
 
         log.info("QEMU module reset")
         self._nodes.clear()
+        self._index.clearNodes()
 
     def getQemuBinariesFromServer(self, server, callback, archs=None):
         """
@@ -268,7 +280,7 @@ class Qemu(Module):
         request_body = None
         if archs is not None:
             request_body = {"archs": archs}
-        server.get("/qemu/binaries", callback, body=request_body)
+        server.inventory().get("/qemu/binaries", callback, body=request_body)
 
     def getQemuImgBinariesFromServer(self, server, callback):
         """
@@ -278,7 +290,7 @@ class Qemu(Module):
         :param callback: callback for the reply from the server
         """
 
-        server.get(r"/qemu/img-binaries", callback)
+        server.inventory().get("/qemu/img-binaries", callback)
 
     def getQemuCapabilitiesFromServer(self, server, callback):
         """
@@ -288,7 +300,7 @@ class Qemu(Module):
         :param callback: callback for the reply from the server
         """
 
-        server.get(r"/qemu/capabilities", callback)
+        server.inventory().get("/qemu/capabilities", callback)
 
     def createDiskImage(self, server, callback, options):
         """
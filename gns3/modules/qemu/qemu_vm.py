@@ -191,13 +191,8 @@ class QemuVM(VM):
             self.error_signal.emit(self.id(), 'Name "{}" is already used by another node'.format(new_settings["name"]))
             return
 
-        params = {}
-        for name, value in new_settings.items():
-            if name in self._settings and self._settings[name] != value:
-                params[name] = value
-
-        log.debug("{} is updating settings: {}".format(self.name(), params))
-        self.httpPut("/qemu/vms/{vm_id}".format(vm_id=self._vm_id), self._updateCallback, body=params)
+        params = self._settingsDelta(new_settings)
+        self._putSettings("/qemu/vms/{vm_id}".format(vm_id=self._vm_id), params, self._updateCallback)
 
     def _updateCallback(self, result, error=False, **kwargs):
         """
@@ -231,6 +226,7 @@ class QemuVM(VM):
 
         if updated:
             log.info("QEMU VM {} has been updated".format(self.name()))
+            self._module.updateNode(self)
             self.updated_signal.emit()
 
     def suspend(self):
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Indexes of the templates (VMs, images, routers) of a module
+and of the nodes created from them.
+"""
+
+
+class TemplateIndex:
+
+    """
+    Finds the templates of a module by name and by server, and the nodes
+    deployed from a template, without walking all the templates and nodes.
+
+    :param node_key: optional function returning the value identifying the
+    template of a node (for instance the VirtualBox VM name), to index the nodes
+    :param first_match: when several templates have the same name, the first
+    one is returned instead of the last one
+    """
+
+    def __init__(self, node_key=None, first_match=False):
+
+        self._node_key = node_key
+        self._first_match = first_match
+        self._keys_by_name = {}
+        self._keys_by_server = {}
+        self._nodes_by_key = {}
+        # value used to index each node, the node settings may change later
+        self._node_keys = {}
+
+    def rebuild(self, templates):
+        """
+        Indexes the templates, must be called each time they change.
+
+        :param templates: dictionary of template settings
+        """
+
+        self._keys_by_name = {}
+        self._keys_by_server = {}
+        for key, info in templates.items():
+            name = info.get("name")
+            if not self._first_match or name not in self._keys_by_name:
+                self._keys_by_name[name] = key
+            self._keys_by_server.setdefault(info.get("server"), []).append(key)
+
+    def templateKey(self, name):
+        """
+        Returns the key of a template.
+
+        :param name: template name
+        :returns: template key or None
+        """
+
+        return self._keys_by_name.get(name)
+
+    def templateKeys(self, server):
+        """
+        Returns the keys of the templates of a server.
+
+        :param server: HTTPClient instance
+        :returns: list of template keys
+        """
+
+        keys = list(self._keys_by_server.get(server.host(), []))
+        if server.isLocal() and server.host() != "local":
+            keys.extend(self._keys_by_server.get("local", []))
+        return keys
+
+    def addNode(self, node):
+        """
+        Indexes a node deployed from a template.
+
+        :param node: Node instance
+        """
+
+        if self._node_key is None or node in self._node_keys:
+            return
+        value = self._node_key(node)
+        self._node_keys[node] = value
+        self._nodes_by_key.setdefault(value, []).append(node)
+
+    def updateNode(self, node):
+        """
+        Indexes a node again after its settings have changed.
+
+        :param node: Node instance
+        """
+
+        if node not in self._node_keys or self._node_key(node) == self._node_keys[node]:
+            return
+        self.removeNode(node)
+        self.addNode(node)
+
+    def removeNode(self, node):
+        """
+        Forgets a node.
+
+        :param node: Node instance
+        """
+
+        value = self._node_keys.pop(node, None)
+        nodes = self._nodes_by_key.get(value)
+        if nodes and node in nodes:
+            nodes.remove(node)
+            if not nodes:
+                del self._nodes_by_key[value]
+
+    def nodes(self, value):
+        """
+        Returns the nodes deployed from a template.
+
+        :param value: value identifying the template (see node_key)
+        :returns: list of Node instances
+        """
+
+        return list(self._nodes_by_key.get(value, []))
+
+    def clearNodes(self):
+        """
+        Forgets all the nodes.
+        """
+
+        self._nodes_by_key.clear()
+        self._node_keys.clear()
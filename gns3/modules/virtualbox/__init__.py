@@ -29,6 +29,7 @@ from gns3.local_config import LocalConfig
 
 from ..module import Module
 from ..module_error import ModuleError
+from ..template_index import TemplateIndex
 from .virtualbox_vm import VirtualBoxVM
 from .settings import VBOX_SETTINGS
 from .settings import VBOX_VM_SETTINGS
@@ -49,6 +50,7 @@ class VirtualBox(Module):
         self._settings = {}
         self._virtualbox_vms = {}
         self._nodes = []
+        self._index = TemplateIndex(node_key=lambda node: node.settings()["vmname"])
 
         self.configChangedSlot()
 
@@ -90,7 +92,7 @@ class VirtualBox(Module):
         Loads the settings from the server settings file.
         """
 
-        self._settings = LocalConfig.instance().loadSectionSettings(self.__class__.__name__, VBOX_SETTINGS)
+        self._settings = dict(LocalConfig.instance().sectionView(self.__class__.__name__, VBOX_SETTINGS))
 
         if not os.path.exists(self._settings["vboxmanage_path"]):
             self._settings["vboxmanage_path"] = self._findVBoxManage(self)
@@ -117,16 +119,17 @@ class VirtualBox(Module):
         Load the VirtualBox VMs from the client settings file.
         """
 
-        settings = LocalConfig.instance().settings()
-        if "vms" in settings.get(self.__class__.__name__, {}):
-            for vm in settings[self.__class__.__name__]["vms"]:
+        # the section view is shared, only the templates not loaded yet are copied
+        settings = self._settings
+        if "vms" in settings:
+            for vm in settings["vms"]:
                 vmname = vm.get("vmname")
                 server = vm.get("server")
                 key = "{server}:{vmname}".format(server=server, vmname=vmname)
                 if key in self._virtualbox_vms or not vmname or not server:
                     continue
                 vm_settings = VBOX_VM_SETTINGS.copy()
-                vm_settings.update(vm)
+                vm_settings.update(LocalConfig.copySettings(vm))
                 # For backward compatibility we use vmname
                 if not vm_settings["name"]:
                     vm_settings["name"] = vmname
@@ -135,6 +138,7 @@ class VirtualBox(Module):
                     vm_settings["symbol"] = vm_settings.get("default_symbol", vm_settings["symbol"])
                     vm_settings["symbol"] = vm_settings["symbol"][:-11] + ".svg" if vm_settings["symbol"].endswith("normal.svg") else vm_settings["symbol"]
                 self._virtualbox_vms[key] = vm_settings
+        self._index.rebuild(self._virtualbox_vms)
 
     def _saveVirtualBoxVMs(self):
         """
@@ -166,6 +170,7 @@ class VirtualBox(Module):
         """
 
         self._virtualbox_vms = new_virtualbox_vms.copy()
+        self._index.rebuild(self._virtualbox_vms)
         self._saveVirtualBoxVMs()
 
     def addNode(self, node):
@@ -176,6 +181,7 @@ class VirtualBox(Module):
         """
 
         self._nodes.append(node)
+        self._index.addNode(node)
 
     def removeNode(self, node):
         """
@@ -186,6 +192,16 @@ class VirtualBox(Module):
 
         if node in self._nodes:
             self._nodes.remove(node)
+        self._index.removeNode(node)
+
+    def updateNode(self, node):
+        """
+        Indexes a node again after its settings have changed.
+
+        :param node: Node instance
+        """
+
+        self._index.updateNode(node)
 
     def settings(self):
         """
@@ -232,15 +248,10 @@ class VirtualBox(Module):
 
         vm = None
         if node_name:
-            for vm_key, info in self._virtualbox_vms.items():
-                if node_name == info["name"]:
-                    vm = vm_key
+            vm = self._index.templateKey(node_name)
 
         if not vm:
-            selected_vms = []
-            for vm, info in self._virtualbox_vms.items():
-                if info["server"] == node.server().host() or (node.server().isLocal() and info["server"] == "local"):
-                    selected_vms.append(vm)
+            selected_vms = self._index.templateKeys(node.server())
 
             if not selected_vms:
                 raise ModuleError("No VirtualBox VM on server {}".format(node.server().url()))
@@ -260,9 +271,8 @@ class VirtualBox(Module):
 
         linked_base = self._virtualbox_vms[vm]["linked_base"]
         if not linked_base:
-            for other_node in self._nodes:
-                if other_node.settings()["vmname"] == self._virtualbox_vms[vm]["vmname"] and \
-                        (self._virtualbox_vms[vm]["server"] == "local" and other_node.server().isLocal() or self._virtualbox_vms[vm]["server"] == other_node.server().host):
+            for other_node in self._index.nodes(self._virtualbox_vms[vm]["vmname"]):
+                if self._virtualbox_vms[vm]["server"] == "local" and other_node.server().isLocal() or self._virtualbox_vms[vm]["server"] == other_node.server().host():
                     raise ModuleError("Sorry a VirtualBox VM without the linked base setting enabled can only be used once in your topology")
         elif node.project().temporary():
             raise ModuleError("Sorry, VirtualBox linked clones are not supported in temporary projects")
@@ -301,6 +311,7 @@ class VirtualBox(Module):
 
         log.info("VirtualBox module reset")
         self._nodes.clear()
+        self._index.clearNodes()
 
     @staticmethod
     def getNodeClass(name):
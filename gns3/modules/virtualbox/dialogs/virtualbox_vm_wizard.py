@@ -65,7 +65,7 @@ class VirtualBoxVMWizard(VMWizard, Ui_VirtualBoxVMWizard):
         super().initializePage(page_id)
         if self.page(page_id) == self.uiVirtualBoxWizardPage:
             self.uiVMListComboBox.clear()
-            self._server.get("/virtualbox/vms", self._getVirtualBoxVMsFromServerCallback, progressText="Listing VirtualBox VMs...")
+            self._server.inventory().get("/virtualbox/vms", self._getVirtualBoxVMsFromServerCallback, progressText="Listing VirtualBox VMs...")
 
     def _getVirtualBoxVMsFromServerCallback(self, result, error=False, **kwargs):
         """
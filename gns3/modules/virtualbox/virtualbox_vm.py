@@ -172,13 +172,8 @@ class VirtualBoxVM(VM):
                 # forces the update of the VM name in VirtualBox.
                 new_settings["vmname"] = new_settings["name"]
 
-        params = {}
-        for name, value in new_settings.items():
-            if name in self._settings and self._settings[name] != value:
-                params[name] = value
-
-        log.debug("{} is updating settings: {}".format(self.name(), params))
-        self.httpPut("/virtualbox/vms/{vm_id}".format(vm_id=self._vm_id), self._updateCallback, body=params)
+        params = self._settingsDelta(new_settings)
+        self._putSettings("/virtualbox/vms/{vm_id}".format(vm_id=self._vm_id), params, self._updateCallback)
 
     def _updateCallback(self, result, error=False, **kwargs):
         """
@@ -212,6 +207,7 @@ class VirtualBoxVM(VM):
 
         if updated:
             log.info("VirtualBox VM {} has been updated".format(self.name()))
+            self._module.updateNode(self)
             self.updated_signal.emit()
 
     def suspend(self):
@@ -30,6 +30,7 @@ from gns3.local_config import LocalConfig
 
 from gns3.modules.module import Module
 from gns3.modules.module_error import ModuleError
+from gns3.modules.template_index import TemplateIndex
 from gns3.modules.vmware.vmware_vm import VMwareVM
 from gns3.modules.vmware.settings import VMWARE_SETTINGS
 from gns3.modules.vmware.settings import VMWARE_VM_SETTINGS
@@ -50,6 +51,7 @@ class VMware(Module):
         self._settings = {}
         self._vmware_vms = {}
         self._nodes = []
+        self._index = TemplateIndex(node_key=lambda node: node.settings()["vmx_path"])
 
         self.configChangedSlot()
 
@@ -154,7 +156,7 @@ class VMware(Module):
         """
 
         local_config = LocalConfig.instance()
-        self._settings = local_config.loadSectionSettings(self.__class__.__name__, VMWARE_SETTINGS)
+        self._settings = dict(local_config.sectionView(self.__class__.__name__, VMWARE_SETTINGS))
         if not os.path.exists(self._settings["vmrun_path"]):
             self._settings["vmrun_path"] = self.findVmrun()
             self._settings["host_type"] = self._determineHostType()
@@ -187,22 +189,23 @@ class VMware(Module):
         Load the VMware VMs from the client settings file.
         """
 
-        local_config = LocalConfig.instance()
-        settings = local_config.settings()
-        if "vms" in settings.get(self.__class__.__name__, {}):
-            for vm in settings[self.__class__.__name__]["vms"]:
+        # the section view is shared, only the templates not loaded yet are copied
+        settings = self._settings
+        if "vms" in settings:
+            for vm in settings["vms"]:
                 name = vm.get("name")
                 server = vm.get("server")
                 key = "{server}:{name}".format(server=server, name=name)
                 if key in self._vmware_vms or not name or not server:
                     continue
                 vm_settings = VMWARE_VM_SETTINGS.copy()
-                vm_settings.update(vm)
+                vm_settings.update(LocalConfig.copySettings(vm))
                 # for backward compatibility before version 1.4
                 if "symbol" not in vm_settings:
                     vm_settings["symbol"] = vm_settings.get("default_symbol", vm_settings["symbol"])
                     vm_settings["symbol"] = vm_settings["symbol"][:-11] + ".svg" if vm_settings["symbol"].endswith("normal.svg") else vm_settings["symbol"]
                 self._vmware_vms[key] = vm_settings
+        self._index.rebuild(self._vmware_vms)
 
     def _saveVMwareVMs(self):
         """
@@ -229,6 +232,7 @@ class VMware(Module):
         """
 
         self._vmware_vms = new_vmware_vms.copy()
+        self._index.rebuild(self._vmware_vms)
         self._saveVMwareVMs()
 
     @staticmethod
@@ -244,6 +248,7 @@ class VMware(Module):
         """
 
         self._nodes.append(node)
+        self._index.addNode(node)
 
     def removeNode(self, node):
         """
@@ -254,6 +259,16 @@ class VMware(Module):
 
         if node in self._nodes:
             self._nodes.remove(node)
+        self._index.removeNode(node)
+
+    def updateNode(self, node):
+        """
+        Indexes a node again after its settings have changed.
+
+        :param node: Node instance
+        """
+
+        self._index.updateNode(node)
 
     def settings(self):
         """
@@ -300,15 +315,10 @@ class VMware(Module):
 
         vm = None
         if node_name:
-            for vm_key, info in self._vmware_vms.items():
-                if node_name == info["name"]:
-                    vm = vm_key
+            vm = self._index.templateKey(node_name)
 
         if not vm:
-            selected_vms = []
-            for vm, info in self._vmware_vms.items():
-                if info["server"] == node.server().host() or (node.server().isLocal() and info["server"] == "local"):
-                    selected_vms.append(vm)
+            selected_vms = self._index.templateKeys(node.server())
 
             if not selected_vms:
                 raise ModuleError("No VMware VM on server {}".format(node.server().url()))
@@ -327,9 +337,8 @@ class VMware(Module):
 
         linked_base = self._vmware_vms[vm]["linked_base"]
         if not linked_base:
-            for other_node in self._nodes:
-                if other_node.settings()["vmx_path"] == self._vmware_vms[vm]["vmx_path"] and \
-                        (self._vmware_vms[vm]["server"] == "local" and other_node.server().isLocal() or self._vmware_vms[vm]["server"] == other_node.server().host):
+            for other_node in self._index.nodes(self._vmware_vms[vm]["vmx_path"]):
+                if self._vmware_vms[vm]["server"] == "local" and other_node.server().isLocal() or self._vmware_vms[vm]["server"] == other_node.server().host():
                     raise ModuleError("Sorry a VMware VM that is not a linked base can only be used once in your topology")
         elif self._settings["host_type"] == "player":
             raise ModuleError("Sorry a VMware VM cannot be use as a linked base because VMware Player doesn't support it")
@@ -368,6 +377,7 @@ class VMware(Module):
 
         log.info("VMware module reset")
         self._nodes.clear()
+        self._index.clearNodes()
 
     @staticmethod
     def getNodeClass(name):
@@ -65,7 +65,7 @@ class VMwareVMWizard(VMWizard, Ui_VMwareVMWizard):
         super().initializePage(page_id)
         if self.page(page_id) == self.uiVirtualBoxWizardPage:
             self.uiVMListComboBox.clear()
-            self._server.get("/vmware/vms", self._getVMwareVMsFromServerCallback)
+            self._server.inventory().get("/vmware/vms", self._getVMwareVMsFromServerCallback)
 
     def _getVMwareVMsFromServerCallback(self, result, error=False, **kwargs):
         """
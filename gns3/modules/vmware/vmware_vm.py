@@ -175,13 +175,8 @@ class VMwareVM(VM):
             #     # forces the update of the VM name in VirtualBox.
             #     new_settings["vmname"] = new_settings["name"]
 
-        params = {}
-        for name, value in new_settings.items():
-            if name in self._settings and self._settings[name] != value:
-                params[name] = value
-
-        log.debug("{} is updating settings: {}".format(self.name(), params))
-        self.httpPut("/vmware/vms/{vm_id}".format(vm_id=self._vm_id), self._updateCallback, body=params)
+        params = self._settingsDelta(new_settings)
+        self._putSettings("/vmware/vms/{vm_id}".format(vm_id=self._vm_id), params, self._updateCallback)
 
     def _updateCallback(self, result, error=False, **kwargs):
         """
@@ -218,6 +213,7 @@ class VMwareVM(VM):
 
         if updated or self._loading:
             log.info("VMware VM {} has been updated".format(self.name()))
+            self._module.updateNode(self)
             self.updated_signal.emit()
 
     def suspend(self):
@@ -72,7 +72,7 @@ class VPCS(Module):
         Loads the settings from the persistent settings file.
         """
 
-        self._settings = LocalConfig.instance().loadSectionSettings(self.__class__.__name__, VPCS_SETTINGS)
+        self._settings = dict(LocalConfig.instance().sectionView(self.__class__.__name__, VPCS_SETTINGS))
 
         if not self._settings["base_script_file"]:
             self._settings["base_script_file"] = get_default_base_config(get_resource(os.path.join("configs", "vpcs_base_config.txt")))
@@ -181,27 +181,14 @@ class VPCS(Module):
         log.info("VPCS module reset")
         self._nodes.clear()
 
-    def exportConfigs(self, directory):
+    def configNodes(self):
         """
-        Exports all configs for all nodes to a directory.
+        Returns the nodes with configs that can be exported and imported.
 
-        :param directory: destination directory path
+        :returns: list of Node instances
         """
 
-        for node in self._nodes:
-            if node.initialized():
-                node.exportConfigToDirectory(directory)
-
-    def importConfigs(self, directory):
-        """
-        Imports configs to all nodes from a directory.
-
-        :param directory: source directory path
-        """
-
-        for node in self._nodes:
-            if node.initialized():
-                node.importConfigFromDirectory(directory)
+        return [node for node in self._nodes if node.initialized()]
 
     def _check_vpcs_version(self, working_dir):
         """
@@ -85,12 +85,12 @@ class VPCSDevice(VM):
         if vm_id:
             params["vm_id"] = vm_id
 
+        config_paths = {}
         if "script_file" in additional_settings:
-            if os.path.isfile(additional_settings["script_file"]):
-                base_config_content = self._readBaseConfig(additional_settings["script_file"])
-                if base_config_content is not None:
-                    additional_settings["startup_script"] = base_config_content
-            del additional_settings["script_file"]
+            script_file = additional_settings.pop("script_file")
+            # if we have an vm id that mean the VM already exists, there is no need to read the script
+            if vm_id is None and os.path.isfile(script_file):
+                config_paths["startup_script"] = script_file
 
         if "startup_script_path" in additional_settings:
             del additional_settings["startup_script_path"]
@@ -100,7 +100,7 @@ class VPCSDevice(VM):
             del additional_settings["startup_script"]
 
         params.update(additional_settings)
-        self.httpPost("/vpcs/vms", self._setupCallback, body=params)
+        self._postWithBaseConfigs("/vpcs/vms", self._setupCallback, params, config_paths)
 
     def _setupCallback(self, result, error=False, **kwargs):
         """
@@ -142,13 +142,8 @@ class VPCSDevice(VM):
         if "startup_script_path" in new_settings:
             del new_settings["startup_script_path"]
 
-        params = {}
-        for name, value in new_settings.items():
-            if name in self._settings and self._settings[name] != value:
-                params[name] = value
-
-        log.debug("{} is updating settings: {}".format(self.name(), params))
-        self.httpPut("/vpcs/vms/{vm_id}".format(project_id=self._project.id(), vm_id=self._vm_id), self._updateCallback, body=params)
+        params = self._settingsDelta(new_settings)
+        self._putSettings("/vpcs/vms/{vm_id}".format(vm_id=self._vm_id), params, self._updateCallback)
 
     def _updateCallback(self, result, error=False, **kwargs):
         """
@@ -288,6 +283,28 @@ class VPCSDevice(VM):
             except OSError as e:
                 self.error_signal.emit(self.id(), "could not export the script file to {}: {}".format(path, e))
 
+    def configFilesPath(self):
+        """
+        Returns the server path to get the script file of this VPCS device.
+
+        :returns: path
+        """
+
+        return "/vpcs/vms/{vm_id}".format(vm_id=self._vm_id)
+
+    def configFiles(self, result):
+        """
+        Returns the script file found in a server response.
+
+        :param result: server response (dict)
+
+        :returns: dictionary of file names and contents
+        """
+
+        if "startup_script" not in result:
+            return {}
+        return {normalize_filename(self.name()) + "_startup.vpc": result["startup_script"] or ""}
+
     def exportConfigToDirectory(self, directory):
         """
         Exports the script-file to a directory.
@@ -295,7 +312,7 @@ class VPCSDevice(VM):
         :param directory: destination directory path
         """
 
-        self.httpGet("/vpcs/vms/{vm_id}".format(vm_id=self._vm_id),
+        self.httpGet(self.configFilesPath(),
                      self._exportConfigToDirectoryCallback,
                      context={"directory": directory})
 
@@ -310,14 +327,14 @@ class VPCSDevice(VM):
         if error:
             log.error("error while exporting {} configs: {}".format(self.name(), result["message"]))
             self.server_error_signal.emit(self.id(), result["message"])
-        elif "startup_script" in result:
-            export_directory = context["directory"]
-            config_path = os.path.join(export_directory, normalize_filename(self.name())) + "_startup.vpc"
+            return
+
+        for file_name, content in self.configFiles(result).items():
+            config_path = os.path.join(context["directory"], file_name)
             try:
                 with open(config_path, "wb") as f:
                     log.info("saving {} script file to {}".format(self.name(), config_path))
-                    if result["startup_script"]:
-                        f.write(result["startup_script"].encode("utf-8"))
+                    f.write(content.encode("utf-8"))
             except OSError as e:
                 self.error_signal.emit(self.id(), "could not export the script file to {}: {}".format(config_path, e))
 
@@ -331,18 +348,20 @@ class VPCSDevice(VM):
         new_settings = {"script_file": path}
         self.update(new_settings)
 
-    def importConfigFromDirectory(self, directory):
+    def importConfigFromDirectory(self, directory, contents=None):
         """
         Imports an initial-config from a directory.
 
         :param directory: source directory path
+        :param contents: file names in the directory, listed if not provided
         """
 
-        try:
-            contents = os.listdir(directory)
-        except OSError as e:
-            self.warning_signal.emit(self.id(), "Can't list file in {}: {}".format(directory, str(e)))
-            return
+        if contents is None:
+            try:
+                contents = os.listdir(directory)
+            except OSError as e:
+                self.warning_signal.emit(self.id(), "Can't list file in {}: {}".format(directory, str(e)))
+                return
         script_file = normalize_filename(self.name()) + "_startup.vpc"
         new_settings = {}
         if script_file in contents:
@@ -19,8 +19,9 @@
 Base class for node classes.
 """
 
-from .qt import QtCore
+from .qt import QtCore, qpartial
 from .ports.port import Port
+from .utils.name_allocator import NameAllocator
 
 import logging
 log = logging.getLogger(__name__)
@@ -53,7 +54,9 @@ class Node(QtCore.QObject):
     allocate_udp_nio_signal = QtCore.Signal(int, int, int)
 
     _instance_count = 1
-    _allocated_names = set()
+    _allocated_names = NameAllocator()
+    # update requests sent and skipped because no setting changed
+    _update_statistics = {"sent": 0, "skipped": 0}
 
     # node statuses
     stopped = 0
@@ -80,6 +83,8 @@ class Node(QtCore.QObject):
         self._loading = False
         self._status = 0
         self._ports = []
+        # settings sent to the server but not acknowledged yet
+        self._pending_settings = {}
 
     @classmethod
     def reset(cls):
@@ -90,6 +95,16 @@ class Node(QtCore.QObject):
         cls._instance_count = 1
         cls._allocated_names.clear()
 
+    @classmethod
+    def loadAllocatedNames(cls, names):
+        """
+        Adds the names of the nodes of a topology in one pass.
+
+        :param names: iterable of node names
+        """
+
+        cls._allocated_names.load(names)
+
     def allocateName(self, base_name):
         """
         Allocates a new name for a node.
@@ -100,24 +115,14 @@ class Node(QtCore.QObject):
         :returns: allocated name or None if one could not be found
         """
 
-        for number in range(1, 100000):
-            if '{0}' in base_name or '{id}' in base_name:
-                name = base_name.replace('{0}', str(number))
-                name = name.replace('{id}', str(number))
-            else:
-                name = base_name + str(number)
-            if name not in self._allocated_names:
-                self._allocated_names.add(name)
-                return name
-        return None
+        return self._allocated_names.allocate(base_name)
 
     def removeAllocatedName(self):
         """
         Removes an allocated name from a node.
         """
 
-        if self.name() in self._allocated_names:
-            self._allocated_names.remove(self.name())
+        self._allocated_names.remove(self.name())
 
     def updateAllocatedName(self, name):
         """
@@ -503,6 +508,76 @@ class Node(QtCore.QObject):
 
         self._project.put(self._server, path, callback, body=body, context=context, **kwargs)
 
+    def _settingsDelta(self, new_settings):
+        """
+        Returns the settings which differ from the last value sent to the
+        server, or from the state acknowledged by the server when no update
+        is pending.
+
+        :param new_settings: settings dictionary
+
+        :returns: changed settings (dictionary)
+        """
+
+        delta = {}
+        for name, value in new_settings.items():
+            if name not in self._settings:
+                continue
+            if name in self._pending_settings:
+                current = self._pending_settings[name]
+            else:
+                current = self._settings[name]
+            if current != value:
+                delta[name] = value
+        return delta
+
+    def _putSettings(self, path, params, callback):
+        """
+        PUTs changed settings, no request is sent when there is no change.
+
+        :param path: Remote path
+        :param params: changed settings (dictionary)
+        :param callback: callback method to call when the server replies
+
+        :returns: True if a request has been sent
+        """
+
+        if not params:
+            Node._update_statistics["skipped"] += 1
+            log.debug("{} settings are unchanged, no update sent".format(self.name()))
+            return False
+
+        Node._update_statistics["sent"] += 1
+        self._pending_settings.update(params)
+        log.debug("{} is updating settings: {}".format(self.name(), params))
+        self.httpPut(path, qpartial(self._putSettingsCallback, params, callback), body=params)
+        return True
+
+    def _putSettingsCallback(self, params, callback, result, error=False, **kwargs):
+        """
+        Callback for _putSettings.
+
+        :param params: settings sent
+        :param callback: callback method to call with the server reply
+        :param result: server response
+        :param error: indicates an error (boolean)
+        """
+
+        for name, value in params.items():
+            if name in self._pending_settings and self._pending_settings[name] == value:
+                del self._pending_settings[name]
+        return callback(result, error=error, **kwargs)
+
+    @classmethod
+    def updateStatistics(cls):
+        """
+        Returns the number of update requests sent and skipped.
+
+        :returns: dictionary
+        """
+
+        return dict(cls._update_statistics)
+
     def httpGet(self, path, callback, context={}, **kwargs):
         """
         GET on current server / project
@@ -527,26 +602,27 @@ class Node(QtCore.QObject):
 
     def allocateUDPPort(self, port_id):
         """
-        Requests an UDP port allocation.
+        Requests an UDP port allocation, the port comes from
+        the ports allocated in advance on the server.
 
         :param port_id: port identifier
         """
+
         log.debug("{} is requesting an UDP port allocation".format(self.name()))
-        self.httpPost("/ports/udp", self._allocateUDPPortCallback, context={"port_id": port_id})
+        self._project.udpPortPool(self._server).acquire(qpartial(self._allocateUDPPortCallback, port_id))
 
-    def _allocateUDPPortCallback(self, result, error=False, context={}, **kwargs):
+    def _allocateUDPPortCallback(self, port_id, lport, error_message):
         """
         Callback for allocateUDPPort.
 
-        :param result: server response (dict)
-        :param error: indicates an error (boolean)
+        :param port_id: port identifier
+        :param lport: allocated UDP port
+        :param error_message: error message, None if no error
         """
 
-        if error:
-            log.error("error while allocating an UDP port for {}: {}".format(self.name(), result["message"]))
-            self.server_error_signal.emit(self.id(), result["message"])
+        if error_message is not None:
+            log.error("error while allocating an UDP port for {}: {}".format(self.name(), error_message))
+            self.server_error_signal.emit(self.id(), error_message)
         else:
-            port_id = context["port_id"]
-            lport = result["udp_port"]
-            log.debug("{} has allocated UDP port {}".format(self.name(), port_id, lport))
+            log.debug("{} has allocated UDP port {} for port {}".format(self.name(), lport, port_id))
             self.allocate_udp_nio_signal.emit(self.id(), port_id, lport)
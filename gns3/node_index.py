@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Index of the initialized nodes of the topology by status and capability.
+"""
+
+from .qt import QtCore, qpartial
+from .node import Node
+
+# node methods indexed, to find the nodes supporting an action
+NODE_CAPABILITIES = ("start", "stop", "suspend", "reload", "console")
+
+
+class NodeIndex(QtCore.QObject):
+
+    """
+    Live sets of the initialized nodes, by status (started, stopped,
+    suspended) and by capability (see NODE_CAPABILITIES), so the actions
+    on all the nodes don't walk all the items of the scene.
+    """
+
+    # emitted when a node is indexed again (status, initialization, removal)
+    updated_signal = QtCore.Signal()
+
+    def __init__(self):
+
+        super().__init__()
+        # node: status indexed or None when the node is not initialized
+        self._nodes = {}
+        self._nodes_by_status = {Node.started: set(), Node.stopped: set(), Node.suspended: set()}
+        self._nodes_by_capability = {capability: set() for capability in NODE_CAPABILITIES}
+
+    def addNode(self, node):
+        """
+        Indexes a node and follows its status.
+
+        :param node: Node instance
+        """
+
+        if node in self._nodes:
+            return
+        self._nodes[node] = None
+
+        # we want to know about the node events
+        callback = qpartial(self._refreshNodeSlot, node)
+        node.created_signal.connect(callback)
+        node.started_signal.connect(callback)
+        node.stopped_signal.connect(callback)
+        node.suspended_signal.connect(callback)
+        self._refreshNodeSlot(node)
+
+    def removeNode(self, node):
+        """
+        Forgets a node.
+
+        :param node: Node instance
+        """
+
+        if node not in self._nodes:
+            return
+        self._unindex(node, self._nodes.pop(node))
+        self.updated_signal.emit()
+
+    def _unindex(self, node, status):
+
+        if status is None:
+            return
+        self._nodes_by_status[status].discard(node)
+        for nodes in self._nodes_by_capability.values():
+            nodes.discard(node)
+
+    def _refreshNodeSlot(self, node, *args):
+        """
+        Indexes a node again when it is created on the server or when its status changes.
+
+        :param node: Node instance
+        """
+
+        if node not in self._nodes:
+            return
+        status = node.status() if node.initialized() else None
+        if status == self._nodes[node]:
+            return
+
+        self._unindex(node, self._nodes[node])
+        self._nodes[node] = status
+        if status is not None:
+            self._nodes_by_status.setdefault(status, set()).add(node)
+            for capability, nodes in self._nodes_by_capability.items():
+                if hasattr(node, capability):
+                    nodes.add(node)
+        self.updated_signal.emit()
+
+    def nodes(self, capability=None, status=None):
+        """
+        Returns the initialized nodes.
+
+        :param capability: only returns the nodes with this method (see NODE_CAPABILITIES)
+        :param status: only returns the nodes with this status
+
+        :returns: list of Node instances
+        """
+
+        sets = []
+        if capability is not None:
+            sets.append(self._nodes_by_capability[capability])
+        if status is not None:
+            sets.append(self._nodes_by_status.get(status, set()))
+        if not sets:
+            return [node for node, indexed_status in self._nodes.items() if indexed_status is not None]
+
+        # walk the smallest set only
+        sets.sort(key=len)
+        return [node for node in sets[0] if all(node in nodes for nodes in sets[1:])]
+
+    def count(self, status):
+        """
+        Returns the number of initialized nodes with a status.
+
+        :param status: node status
+
+        :returns: number of nodes
+        """
+
+        return len(self._nodes_by_status.get(status, ()))
+
+    def clear(self):
+        """
+        Forgets all the nodes.
+        """
+
+        self._nodes.clear()
+        for nodes in self._nodes_by_status.values():
+            nodes.clear()
+        for nodes in self._nodes_by_capability.values():
+            nodes.clear()
+        self.updated_signal.emit()
@@ -18,6 +18,9 @@
 import os
 import tempfile
 
+from .qt import qpartial
+from .capture_sink import CaptureSink
+
 import logging
 log = logging.getLogger(__name__)
 
@@ -28,6 +31,7 @@ class PacketCapture:
 
     def __init__(self):
         self._capture_files = {}
+        self._capture_sinks = {}
         self._stream_capture_request = {}
 
     def startCapture(self, vm, port, file_path):
@@ -45,32 +49,75 @@ class PacketCapture:
             except OSError as e:
                 vm.error_signal.emit(vm.id(), "Could not start the packet capture reader: {}: {}".format(e, e.filename))
         else:
-            (fd, temp_capture_file_path) = tempfile.mkstemp()
-            os.close(fd)
             try:
-                port.startPacketCapture(vm.name(), temp_capture_file_path)
+                sink = self._createCaptureSink(vm, port)
+            except OSError as e:
+                vm.error_signal.emit(vm.id(), "Could not open packet capture: {}".format(e))
+                return
+            sink.error_signal.connect(qpartial(vm.error_signal.emit, vm.id()))
+            self._capture_sinks[port] = sink
+            try:
+                port.startPacketCapture(vm.name(), self._capture_files[port], sink)
             except OSError as e:
                 vm.error_signal.emit(vm.id(), "Could not start the packet capture reader: {}: {}".format(e, e.filename))
-            self._capture_files[port] = temp_capture_file_path
 
             self._stream_capture_request[port] = vm.server().get("/files/stream",
                             None,
                             body={"location": file_path},
-                            context={"pcap_file": temp_capture_file_path, "vm": vm},
+                            context={"sink": sink},
                             downloadProgressCallback=self._processDownloadPcapProgress,
                             showProgress=False)
 
         log.info("{} has successfully started capturing packets on {}".format(vm.name(), port.name()))
         vm.updated_signal.emit()
 
+    def _createCaptureSink(self, vm, port):
+        """
+        Creates the sink writing a capture streamed from a remote server.
+        In ring buffer mode, the files are created in a temporary directory
+        which is kept when the capture stops.
+
+        :param vm: Instance of the virtual machine
+        :param port: Instance of port where capture should be executed
+
+        :returns: CaptureSink instance
+        """
+
+        settings = port.packetCaptureSettings()
+        pcapng = settings["pcapng"]
+        if settings["ring_buffer"] and (settings["ring_buffer_file_size"] or settings["ring_buffer_duration"]):
+            capture_dir = tempfile.mkdtemp(prefix="gns3-capture-")
+            path = os.path.join(capture_dir, os.path.splitext(port.captureFileName(vm.name()))[0])
+            log.info("Packet capture ring buffer files will be saved in {}".format(capture_dir))
+            self._capture_files[port] = capture_dir
+            return CaptureSink(path,
+                               ring_buffer_size=settings["ring_buffer_file_size"] * 1024 * 1024,
+                               ring_buffer_duration=settings["ring_buffer_duration"],
+                               ring_buffer_files=settings["ring_buffer_files"],
+                               pcapng=pcapng)
+
+        (fd, temp_capture_file_path) = tempfile.mkstemp(suffix=".pcapng" if pcapng else ".pcap")
+        os.close(fd)
+        self._capture_files[port] = temp_capture_file_path
+        return CaptureSink(temp_capture_file_path, pcapng=pcapng)
+
     def _processDownloadPcapProgress(self, content, context={}, **kwargs):
 
-        try:
-            with open(context["pcap_file"], 'ab+') as f:
-                f.write(content)
-        except OSError as e:
-            vm = context["vm"]
-            vm.error_signal.emit(vm.id(), "Could not write packet capture: {}: {}".format(e, context["pcap_file"]))
+        context["sink"].write(content)
+
+    def statistics(self, port):
+        """
+        Returns the statistics of a capture streamed from a remote server.
+
+        :param port: Instance of port where capture is executed
+
+        :returns: dictionary or None if the capture is not streamed
+        """
+
+        sink = self._capture_sinks.get(port)
+        if sink is None:
+            return None
+        return sink.statistics()
 
     def stopCapture(self, vm, port):
         """
@@ -81,16 +128,24 @@ class PacketCapture:
         """
 
         port.stopPacketCapture()
-        if port in self._capture_files:
+        request = self._stream_capture_request.pop(port, None)
+        if request is not None:
+            request.abort()
+
+        sink = self._capture_sinks.pop(port, None)
+        if sink:
+            sink.close()
+            log.info("Packet capture on {} received {packets} packets ({bytes} bytes)".format(port.name(), **sink.statistics()))
+
+        capture_file = self._capture_files.pop(port, None)
+        if sink and sink.ringBuffer():
+            # the last files of the ring buffer are kept for later analysis
+            log.info("Packet capture files on {} kept in {}".format(port.name(), capture_file))
+        elif capture_file:
             try:
-                os.remove(self._capture_files[port])
+                os.remove(capture_file)
             except OSError as e:
-                vm.error_signal.emit(vm.id(), "Could not stop packet capture: {}: {}".format(e, self._capture_files[port]))
-            self._capture_files[port] = None
-
-        if port in self._stream_capture_request:
-            self._stream_capture_request[port].abort()
-            self._stream_capture_request[port] = None
+                vm.error_signal.emit(vm.id(), "Could not stop packet capture: {}: {}".format(e, capture_file))
 
         log.info("{} has successfully stopped capturing packets on {}".format(vm.name(), port.name()))
         vm.updated_signal.emit()
@@ -258,6 +258,7 @@ class GeneralPreferencesPage(QtWidgets.QWidget, Ui_GeneralPreferencesPageWidget)
         self.uiCheckForUpdateCheckBox.setChecked(settings["check_for_update"])
         self.uiLinkManualModeCheckBox.setChecked(settings["link_manual_mode"])
         self.uiExperimentalFeaturesCheckBox.setChecked(settings["experimental_features"])
+        self.uiIncrementalSnapshotsCheckBox.setChecked(settings["incremental_snapshots"])
         self.uiSlowStartAllSpinBox.setValue(settings["slow_device_start_all"])
         self.uiTelnetConsoleCommandLineEdit.setText(settings["telnet_console_command"])
         self.uiTelnetConsoleCommandLineEdit.setCursorPosition(0)
@@ -323,6 +324,7 @@ class GeneralPreferencesPage(QtWidgets.QWidget, Ui_GeneralPreferencesPageWidget)
                                 "experimental_features": self.uiExperimentalFeaturesCheckBox.isChecked(),
                                 "check_for_update": self.uiCheckForUpdateCheckBox.isChecked(),
                                 "link_manual_mode": self.uiLinkManualModeCheckBox.isChecked(),
+                                "incremental_snapshots": self.uiIncrementalSnapshotsCheckBox.isChecked(),
                                 "slow_device_start_all": self.uiSlowStartAllSpinBox.value(),
                                 "telnet_console_command": self.uiTelnetConsoleCommandLineEdit.text(),
                                 "serial_console_command": self.uiSerialConsoleCommandLineEdit.text(),
@@ -83,6 +83,11 @@ class PacketCapturePreferencesPage(QtWidgets.QWidget, Ui_PacketCapturePreference
         self.uiAutoStartCheckBox.setChecked(settings["command_auto_start"])
         self.uiCaptureAnalyzerCommandLineEdit.setText(settings["packet_capture_analyzer_command"])
         self.uiCaptureAnalyzerCommandLineEdit.setCursorPosition(0)
+        self.uiRingBufferGroupBox.setChecked(settings["ring_buffer"])
+        self.uiRingBufferFileSizeSpinBox.setValue(settings["ring_buffer_file_size"])
+        self.uiRingBufferDurationSpinBox.setValue(settings["ring_buffer_duration"])
+        self.uiRingBufferFilesSpinBox.setValue(settings["ring_buffer_files"])
+        self.uiPcapngCheckBox.setChecked(settings["pcapng"])
 
     def loadPreferences(self):
         """
@@ -97,7 +102,16 @@ class PacketCapturePreferencesPage(QtWidgets.QWidget, Ui_PacketCapturePreference
         Saves the packet capture preferences.
         """
 
+        if self.uiRingBufferGroupBox.isChecked() and not self.uiRingBufferFileSizeSpinBox.value() and not self.uiRingBufferDurationSpinBox.value():
+            QtWidgets.QMessageBox.critical(self, "Ring buffer", "A file size or a duration is required to rotate the capture files")
+            return
+
         new_settings = {"packet_capture_reader_command": self.uiCaptureReaderCommandLineEdit.text(),
                         "command_auto_start": self.uiAutoStartCheckBox.isChecked(),
-                        "packet_capture_analyzer_command": self.uiCaptureAnalyzerCommandLineEdit.text()}
+                        "packet_capture_analyzer_command": self.uiCaptureAnalyzerCommandLineEdit.text(),
+                        "ring_buffer": self.uiRingBufferGroupBox.isChecked(),
+                        "ring_buffer_file_size": self.uiRingBufferFileSizeSpinBox.value(),
+                        "ring_buffer_duration": self.uiRingBufferDurationSpinBox.value(),
+                        "ring_buffer_files": self.uiRingBufferFilesSpinBox.value(),
+                        "pcapng": self.uiPcapngCheckBox.isChecked()}
         Port.setPacketCaptureSettings(new_settings)
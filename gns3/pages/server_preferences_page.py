@@ -62,7 +62,7 @@ class ServerPreferencesPage(QtWidgets.QWidget, Ui_ServerPreferencesPageWidget):
         self.uiRestoreDefaultsPushButton.clicked.connect(self._restoreDefaultsSlot)
         self.uiLocalServerAutoStartCheckBox.stateChanged.connect(self._useLocalServerAutoStartSlot)
         self.uiEnableVMCheckBox.stateChanged.connect(self._enableGNS3VMSlot)
-        self.uiRefreshPushButton.clicked.connect(self._refreshVMListSlot)
+        self.uiRefreshPushButton.clicked.connect(self._refreshPushButtonClickedSlot)
         self.uiVmwareRadioButton.clicked.connect(self._listVMwareVMsSlot)
         self.uiVirtualBoxRadioButton.clicked.connect(self._listVirtualBoxVMsSlot)
         self.uiRemoteRadioButton.toggled.connect(self._remoteGNS3VMToggledSlot)
@@ -100,18 +100,27 @@ class ServerPreferencesPage(QtWidgets.QWidget, Ui_ServerPreferencesPageWidget):
         QtWidgets.QMessageBox.warning(self, "GNS3 VM on VirtualBox", "VirtualBox doesn't support nested virtualization, this means running Qemu based VM could be very slow")
         self._refreshVMListSlot()
 
-    def _refreshVMListSlot(self):
+    def _refreshPushButtonClickedSlot(self):
+        """
+        Slot to request the list of VMs again from the server.
+        """
+
+        self._refreshVMListSlot(refresh=True)
+
+    def _refreshVMListSlot(self, refresh=False):
         """
         Refresh the list of VM available in VMware or VirtualBox.
+
+        :param refresh: ignore the cached list
         """
 
         if not self.uiEnableVMCheckBox.isChecked():
             return
         server = Servers.instance().localServer()
         if self.uiVmwareRadioButton.isChecked():
-            server.get("/vmware/vms", self._getVMsFromServerCallback)
+            server.inventory().get("/vmware/vms", self._getVMsFromServerCallback, refresh=refresh)
         elif self.uiVirtualBoxRadioButton.isChecked():
-            server.get("/virtualbox/vms", self._getVMsFromServerCallback)
+            server.inventory().get("/virtualbox/vms", self._getVMsFromServerCallback, refresh=refresh)
 
     def _remoteGNS3VMToggledSlot(self, state):
         """
@@ -464,7 +473,8 @@ class ServerPreferencesPage(QtWidgets.QWidget, Ui_ServerPreferencesPageWidget):
         if restart_local_server:
             servers.stopLocalServer(wait=True)
             if servers.startLocalServer():
-                worker = WaitForConnectionWorker(new_local_server_settings["host"], new_local_server_settings["port"])
+                worker = WaitForConnectionWorker(new_local_server_settings["host"], new_local_server_settings["port"],
+                                                 user=new_local_server_settings.get("user"), password=new_local_server_settings.get("password"))
                 dialog = ProgressDialog(worker, "Local server", "Connecting...", "Cancel", busy=True, parent=self)
                 dialog.show()
                 dialog.exec_()
@@ -29,6 +29,7 @@ import logging
 
 log = logging.getLogger(__name__)
 
+from gns3.qt import QtCore
 from gns3.utils.normalize_filename import normalize_filename
 from ..local_config import LocalConfig
 from ..nios.nio_udp import NIOUDP
@@ -82,6 +83,8 @@ class Port:
         self._tail_process = None
         self._capture_reader_process = None
         self._capture_analyzer_process = None
+        self._capture_sink = None
+        self._capture_sink_reader_process = None
 
         if default_nio is None:
             self._default_nio = NIOUDP
@@ -439,7 +442,7 @@ class Port:
         Loads the packet capture settings from the persistent settings file.
         """
 
-        cls._settings = LocalConfig.instance().loadSectionSettings("PacketCapture", PACKET_CAPTURE_SETTINGS)
+        cls._settings = LocalConfig.instance().sectionSettings("PacketCapture", PACKET_CAPTURE_SETTINGS)
 
     @classmethod
     def setPacketCaptureSettings(cls, new_settings):
@@ -489,19 +492,32 @@ class Port:
 
         return self._capturing
 
-    def startPacketCapture(self, source_node_name, capture_file_path):
+    def startPacketCapture(self, source_node_name, capture_file_path, capture_sink=None):
         """
         Starts a packet capture.
 
         :param capture_file_path: PCAP capture output file
+        :param capture_sink: CaptureSink instance when the capture is streamed from a remote server
         """
 
         self._capturing = True
         self._capture_file_path = capture_file_path
+        self._capture_sink = capture_sink
         log.info("Saving packet capture to {}".format(capture_file_path))
-        if os.path.isfile(capture_file_path) and self._settings["command_auto_start"]:
+        # a live reader of a ring buffer is started before the first file is created
+        live_ring_buffer = capture_sink is not None and capture_sink.ringBuffer() and "|" in self._settings["packet_capture_reader_command"]
+        if (live_ring_buffer or os.path.isfile(capture_file_path)) and self._settings["command_auto_start"]:
             self.startPacketCaptureReader(source_node_name)
 
+    def _captureFilePath(self):
+        """
+        Returns the path of the capture file currently written.
+        """
+
+        if self._capture_sink is not None and self._capture_sink.path():
+            return self._capture_sink.path()
+        return self._capture_file_path
+
     def stopPacketCapture(self):
         """
         Stops a packet capture.
@@ -509,6 +525,12 @@ class Port:
 
         self._capturing = False
         self._capture_file_path = ""
+        if self._capture_sink is not None:
+            if self._capture_sink_reader_process is not None:
+                self._capture_sink.removeLiveOutput(self._capture_sink_reader_process)
+                # the reader gets the end of the capture and keeps displaying it
+                self._capture_sink_reader_process.closeWriteChannel()
+            self._capture_sink = None
         if self._tail_process and self._tail_process.poll() is None:
             try:
                 self._tail_process.kill()
@@ -522,8 +544,16 @@ class Port:
         Starts the packet capture reader.
         """
 
-        if not os.path.isfile(self._capture_file_path):
-            raise FileNotFoundError("the {} capture file does not exist on this host".format(self._capture_file_path))
+        command = self._settings["packet_capture_reader_command"]
+        if self._capture_sink is not None and self._capture_sink.ringBuffer() and "|" in command:
+            # live traffic capture of a ring buffer: the files are rotated
+            # so the reader is fed by the capture sink instead of tail
+            self._startCaptureSinkReader(source_node_name, command.split("|", 1)[1])
+            return
+
+        capture_file_path = self._captureFilePath()
+        if not os.path.isfile(capture_file_path):
+            raise FileNotFoundError("the {} capture file does not exist on this host".format(capture_file_path))
 
         if self._tail_process and self._tail_process.poll() is None:
             self._tail_process.kill()
@@ -532,15 +562,11 @@ class Port:
             self._capture_reader_process.kill()
             self._capture_reader_process = None
 
-        command = self._settings["packet_capture_reader_command"]
-
         # PCAP capture file path
-        command = command.replace("%c", '"' + self._capture_file_path + '"')
+        command = command.replace("%c", '"' + capture_file_path + '"')
 
         # Add description
-        description = "{} {} to {} {}".format(source_node_name, self.name(),
-                                              self.destinationNode().name(), self.destinationPort().name())
-        command = command.replace("%d", description)
+        command = command.replace("%d", self._captureDescription(source_node_name))
 
         if "|" in command:
             # live traffic capture (using tail)
@@ -578,23 +604,63 @@ class Port:
                 command = shlex.split(command)
             self._capture_reader_process = subprocess.Popen(command)
 
+    def _captureDescription(self, source_node_name):
+
+        return "{} {} to {} {}".format(source_node_name, self.name(),
+                                       self.destinationNode().name(), self.destinationPort().name())
+
+    def _startCaptureSinkReader(self, source_node_name, command):
+        """
+        Starts a packet capture reader reading the capture on its standard input.
+
+        :param source_node_name: source node name
+        :param command: reader command
+        """
+
+        if self._capture_sink_reader_process is not None:
+            self._capture_sink.removeLiveOutput(self._capture_sink_reader_process)
+            self._capture_sink_reader_process.kill()
+            self._capture_sink_reader_process = None
+
+        command = command.replace("%d", self._captureDescription(source_node_name)).strip()
+        if sys.platform.startswith("win"):
+            command = command.replace("%c", "-")
+        else:
+            try:
+                command = [arg.replace("%c", "-") for arg in shlex.split(command)]
+            except ValueError as e:
+                log.error("Invalid packet capture command {}: {}".format(command, e))
+                return
+
+        process = QtCore.QProcess()
+        process.setStandardOutputFile(QtCore.QProcess.nullDevice())
+        if isinstance(command, list):
+            process.start(command[0], command[1:])
+        else:
+            process.start(command)
+        if not process.waitForStarted():
+            raise OSError("could not start {}: {}".format(command, process.errorString()))
+        self._capture_sink_reader_process = process
+        self._capture_sink.addLiveOutput(process)
+
     def startPacketCaptureAnalyzer(self):
         """
         Starts the packet capture analyzer.
         """
 
-        if not os.path.isfile(self._capture_file_path):
-            raise FileNotFoundError("the {} capture file does not exist on this host".format(self._capture_file_path))
+        capture_file_path = self._captureFilePath()
+        if not os.path.isfile(capture_file_path):
+            raise FileNotFoundError("the {} capture file does not exist on this host".format(capture_file_path))
 
         if self._capture_analyzer_process and self._capture_analyzer_process.poll() is None:
             self._capture_analyzer_process.kill()
             self._capture_analyzer_process = None
 
         command = self._settings["packet_capture_analyzer_command"]
-        temp_capture_file_path = os.path.join(tempfile.gettempdir(), os.path.basename(self._capture_file_path))
+        temp_capture_file_path = os.path.join(tempfile.gettempdir(), os.path.basename(capture_file_path))
 
         try:
-            shutil.copy(self._capture_file_path, temp_capture_file_path)
+            shutil.copy(capture_file_path, temp_capture_file_path)
         except OSError:
             raise
 
@@ -23,6 +23,7 @@ from .qt import QtCore, qpartial
 from gns3.servers import Servers
 from gns3.topology import Topology
 from gns3.node import Node
+from gns3.udp_port_pool import UDPPortPool
 
 import logging
 log = logging.getLogger(__name__)
@@ -62,6 +63,9 @@ class Project(QtCore.QObject):
         self._listen_notification = False
         self._notifications_stream = set()
 
+        # UDP ports allocated in advance on each server
+        self._udp_port_pools = {}
+
         super().__init__()
 
     def name(self):
@@ -111,6 +115,19 @@ class Project(QtCore.QObject):
         """
         return self._created_servers
 
+    def udpPortPool(self, server):
+        """
+        Returns the UDP ports allocated in advance on a server for this project.
+
+        :param server: HTTPClient instance
+
+        :returns: UDPPortPool instance
+        """
+
+        if server not in self._udp_port_pools:
+            self._udp_port_pools[server] = UDPPortPool(self, server)
+        return self._udp_port_pools[server]
+
     def id(self):
         """
         Get project identifier
@@ -186,7 +203,7 @@ class Project(QtCore.QObject):
 
         Full arg list in createHTTPQuery
         """
-        self._projectHTTPQuery(server, "GET", path, callback, **kwargs)
+        return self._projectHTTPQuery(server, "GET", path, callback, **kwargs)
 
     def post(self, server, path, callback, body={}, **kwargs):
         """
@@ -199,7 +216,7 @@ class Project(QtCore.QObject):
 
         Full arg list in createHTTPQuery
         """
-        self._projectHTTPQuery(server, "POST", path, callback, body=body, **kwargs)
+        return self._projectHTTPQuery(server, "POST", path, callback, body=body, **kwargs)
 
     def put(self, server, path, callback, body={}, **kwargs):
         """
@@ -212,7 +229,7 @@ class Project(QtCore.QObject):
 
         Full arg list in createHTTPQuery
         """
-        self._projectHTTPQuery(server, "PUT", path, callback, body=body, **kwargs)
+        return self._projectHTTPQuery(server, "PUT", path, callback, body=body, **kwargs)
 
     def delete(self, server, path, callback, body={}, **kwargs):
         """
@@ -225,7 +242,7 @@ class Project(QtCore.QObject):
 
         Full arg list in createHTTPQuery
         """
-        self._projectHTTPQuery(server, "DELETE", path, callback, body=body, **kwargs)
+        return self._projectHTTPQuery(server, "DELETE", path, callback, body=body, **kwargs)
 
     def _projectHTTPQuery(self, server, method, path, callback, body={}, **kwargs):
         """
@@ -236,6 +253,7 @@ class Project(QtCore.QObject):
         :param path: Remote path
         :param callback: callback method to call when the server replies
         :param body: params to send (dictionary)
+        :returns: QNetworkReply or None if the project is not yet created on the server
 
         Full arg list in createHTTPQuery
         """
@@ -266,7 +284,7 @@ class Project(QtCore.QObject):
                 # If the project creation is already in progress we bufferize the query
                 self._callback_finish_creating_on_server[server].append(func)
         else:
-            self._projectOnServerCreated(method, path, callback, body, params={}, server=server, **kwargs)
+            return self._projectOnServerCreated(method, path, callback, body, params={}, server=server, **kwargs)
 
     def _projectOnServerCreated(self, method, path, callback, body, params={}, error=False, server=None, **kwargs):
         """
@@ -304,7 +322,7 @@ class Project(QtCore.QObject):
             self._startListenNotifications(server)
 
         path = "/projects/{project_id}{path}".format(project_id=self._id, path=path)
-        server.createHTTPQuery(method, path, callback, body=body, **kwargs)
+        response = server.createHTTPQuery(method, path, callback, body=body, **kwargs)
 
         # Call all operations waiting for project creation:
         if server in self._callback_finish_creating_on_server:
@@ -312,6 +330,7 @@ class Project(QtCore.QObject):
             del self._callback_finish_creating_on_server[server]
             for call in callbacks:
                 call()
+        return response
 
     def close(self, local_server_shutdown=False):
         """Close project"""
@@ -349,6 +368,8 @@ class Project(QtCore.QObject):
 
         if server in self._created_servers:
             self._created_servers.remove(server)
+        # the server releases the ports of a closed project
+        self._udp_port_pools.pop(server, None)
         if len(self._created_servers) == 0:
             self._closed = True
             self.project_closed_signal.emit()
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Waits for a server to answer HTTP requests.
+"""
+
+import json
+import time
+import random
+import base64
+import binascii
+import ipaddress
+
+from .version import __version__
+from .qt import QtCore, QtNetwork, qpartial
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class ReadinessProber(QtCore.QObject):
+
+    """
+    Polls an endpoint of a server until it answers. The probes are sent
+    with the Qt network stack and spaced with an exponential backoff with
+    jitter, so waiting does not burn CPU. Connection errors and timeouts are
+    retried, any HTTP reply ends the probing: status 200 means the server
+    is ready.
+
+    The prober is asynchronous (start() and finished_signal) but it can
+    be waited for with waitForReady(), for instance in a worker thread.
+    It must be used in the thread where it has been created.
+
+    :param host: server host
+    :param port: server port
+    :param protocol: http or https
+    :param user: user for the authentication
+    :param password: password for the authentication
+    :param endpoint: endpoint to probe
+    :param timeout: maximum time to wait for the server in seconds
+    :param max_attempts: maximum number of probes (0 for no limit)
+    :param initial_delay: delay before the second probe in seconds
+    :param max_delay: maximum delay between two probes in seconds
+    :param jitter: random variation of the delays (fraction of the delay)
+    :param request_timeout: maximum time to wait for the reply to a probe in seconds
+    :param accept_insecure_certificate: digest of a self-signed certificate to accept
+    """
+
+    # status code (0 if the server could not be reached) and JSON reply
+    finished_signal = QtCore.Signal(int, object)
+    _cancel_signal = QtCore.Signal()
+
+    def __init__(self, host, port, protocol="http", user=None, password=None, endpoint="version",
+                 timeout=30, max_attempts=0, initial_delay=0.05, max_delay=2.0, jitter=0.2,
+                 request_timeout=3, accept_insecure_certificate=None, parent=None):
+
+        super().__init__(parent)
+        self._host = host
+        self._port = port
+        self._protocol = protocol
+        self._user = user
+        self._password = password
+        self._endpoint = endpoint
+        self._timeout = timeout
+        self._max_attempts = max_attempts
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._jitter = jitter
+        self._request_timeout = request_timeout
+        self._accept_insecure_certificate = accept_insecure_certificate
+
+        self._network_manager = None
+        self._reply = None
+        self._timer = None
+        self._running = False
+        self._done = False
+        self._start_time = None
+        self._attempts = 0
+        self._status = 0
+        self._json = None
+        self._error = ""
+        self._time_to_ready = None
+        self._cancel_signal.connect(self._cancelSlot)
+
+    @staticmethod
+    def forServer(server, **kwargs):
+        """
+        Creates a prober for a server.
+
+        :param server: HTTPClient instance
+        :param kwargs: other ReadinessProber parameters
+
+        :returns: ReadinessProber instance
+        """
+
+        return ReadinessProber(server.host(), server.port(), protocol=server.protocol(),
+                               user=server.user(), password=server.password(),
+                               accept_insecure_certificate=server.acceptInsecureCertificate(),
+                               **kwargs)
+
+    def url(self):
+        """
+        Returns the probed URL.
+        """
+
+        try:
+            ipaddress.IPv6Address(self._host.rsplit('%', 1)[0])
+            host = "[{}]".format(self._host.rsplit('%', 1)[0])
+        except ipaddress.AddressValueError:
+            host = self._host
+        return "{}://{}:{}/v1/{}".format(self._protocol, host, self._port, self._endpoint)
+
+    def start(self):
+        """
+        Starts probing the server.
+        """
+
+        if self._running:
+            return
+        if self._network_manager is None:
+            self._network_manager = QtNetwork.QNetworkAccessManager(self)
+            self._network_manager.sslErrors.connect(self._sslErrorsSlot)
+        self._running = True
+        self._done = False
+        self._attempts = 0
+        self._status = 0
+        self._json = None
+        self._error = ""
+        self._time_to_ready = None
+        self._start_time = time.monotonic()
+        self._probe()
+
+    def cancel(self):
+        """
+        Stops probing the server, can be called from another thread.
+        """
+
+        self._cancel_signal.emit()
+
+    def waitForReady(self):
+        """
+        Probes the server and waits for the result.
+
+        :returns: tuple (status code, JSON reply), status 0 if the server could not be reached
+        """
+
+        loop = QtCore.QEventLoop()
+        self.finished_signal.connect(self._quitLoop(loop))
+        self.start()
+        if not self._done:
+            loop.exec_()
+        return self._status, self._json
+
+    @staticmethod
+    def _quitLoop(loop):
+
+        return lambda *args: loop.quit()
+
+    def isReady(self):
+        """
+        Returns True if the server has replied with status 200.
+        """
+
+        return self._status == 200
+
+    def error(self):
+        """
+        Returns the last error when the server could not be reached.
+        """
+
+        return self._error
+
+    def metrics(self):
+        """
+        Returns the probing metrics.
+
+        :returns: dictionary with the number of probes and the time to ready in seconds (None if not ready)
+        """
+
+        return {"attempts": self._attempts,
+                "time_to_ready": self._time_to_ready,
+                "status": self._status}
+
+    def _delay(self):
+        """
+        Returns the delay in seconds before the next probe.
+        """
+
+        delay = min(self._max_delay, self._initial_delay * (2 ** (self._attempts - 1)))
+        return delay * (1 + random.uniform(-self._jitter, self._jitter))
+
+    def _probe(self):
+
+        if not self._running:
+            return
+        self._attempts += 1
+        request = QtNetwork.QNetworkRequest(QtCore.QUrl(self.url()))
+        request.setRawHeader(b"User-Agent", "GNS3 QT Client v{version}".format(version=__version__).encode())
+        if self._user:
+            auth_string = base64.b64encode("{}:{}".format(self._user, self._password).encode("utf-8"))
+            request.setRawHeader(b"Authorization", "Basic {}".format(auth_string.decode()).encode())
+        self._reply = self._network_manager.get(request)
+        self._reply.finished.connect(qpartial(self._replySlot, self._reply))
+        QtCore.QTimer.singleShot(int(self._request_timeout * 1000), qpartial(self._requestTimeoutSlot, self._reply))
+
+    def _requestTimeoutSlot(self, reply):
+
+        if reply is self._reply and reply.isRunning():
+            reply.abort()
+
+    def _sslErrorsSlot(self, reply, errors):
+
+        certificate = binascii.hexlify(errors[0].certificate().digest()).decode("utf-8")
+        if self._accept_insecure_certificate == certificate:
+            reply.ignoreSslErrors()
+
+    def _replySlot(self, reply):
+
+        if reply is not self._reply:
+            return
+        self._reply = None
+        reply.deleteLater()
+        if not self._running:
+            return
+
+        status = reply.attribute(QtNetwork.QNetworkRequest.HttpStatusCodeAttribute)
+        if status:
+            json_data = None
+            if status == 200:
+                try:
+                    json_data = json.loads(bytes(reply.readAll()).decode("utf-8"))
+                except ValueError as e:
+                    log.debug("Invalid reply from {}: {}".format(self.url(), e))
+            self._finish(int(status), json_data)
+            return
+
+        self._error = reply.errorString()
+        elapsed = time.monotonic() - self._start_time
+        if (self._max_attempts and self._attempts >= self._max_attempts) or elapsed >= self._timeout:
+            self._finish(0, None)
+            return
+        delay = min(self._delay(), max(self._timeout - elapsed, 0))
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._probe)
+        self._timer.start(int(delay * 1000))
+
+    def _cancelSlot(self):
+
+        if not self._running:
+            return
+        log.debug("Probing {} canceled".format(self.url()))
+        if self._timer is not None:
+            self._timer.stop()
+        if self._reply is not None:
+            reply = self._reply
+            self._reply = None
+            reply.abort()
+        self._error = "Canceled"
+        self._finish(0, None)
+
+    def _finish(self, status, json_data):
+
+        self._running = False
+        self._done = True
+        self._status = status
+        self._json = json_data
+        elapsed = time.monotonic() - self._start_time
+        if status == 200:
+            self._time_to_ready = elapsed
+            log.info("{} is ready after {} probes in {:.0f} ms".format(self.url(), self._attempts, elapsed * 1000))
+        elif status:
+            log.info("{} replied with status code {} after {} probes in {:.0f} ms".format(self.url(), status, self._attempts, elapsed * 1000))
+        else:
+            log.info("{} could not be reached after {} probes in {:.0f} ms: {}".format(self.url(), self._attempts, elapsed * 1000, self._error))
+        self.finished_signal.emit(status, json_data)
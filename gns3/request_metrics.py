@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Collects metrics about the requests sent to the servers.
+"""
+
+import io
+import re
+import csv
+import json
+import math
+import time
+import collections
+
+import logging
+log = logging.getLogger(__name__)
+
+# number of latencies kept per endpoint to compute the percentiles
+LATENCY_SAMPLES = 1000
+
+UUID_REGEX = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+
+# the remaining of the path after these segments is a file path
+FILE_PATH_SEGMENTS = ("files", "images")
+
+COLUMNS = ("server", "method", "endpoint", "count", "errors", "in_flight",
+           "p50", "p95", "p99", "bytes_in", "bytes_out")
+
+
+def endpointTemplate(path):
+    """
+    Returns the endpoint of a path with the identifiers replaced,
+    for instance /projects/{id}/qemu/vms/{id}/start.
+
+    :param path: request path
+    :returns: endpoint template
+    """
+
+    path = path.split("?", 1)[0]
+    segments = []
+    for segment in path.split("/"):
+        if segments and segments[-1] in FILE_PATH_SEGMENTS:
+            segments.append("{path}")
+            break
+        if UUID_REGEX.match(segment) or segment.isdigit():
+            segments.append("{id}")
+        else:
+            segments.append(segment)
+    return "/".join(segments)
+
+
+def latencyPercentile(latencies, percentile):
+    """
+    Returns a percentile of latencies (nearest rank).
+
+    :param latencies: sorted latencies in seconds
+    :param percentile: percentile (0-100)
+    :returns: latency in milliseconds or None without latency
+    """
+
+    if not latencies:
+        return None
+    index = min(len(latencies) - 1, int(math.ceil(percentile / 100 * len(latencies))) - 1)
+    return round(latencies[index] * 1000, 1)
+
+
+class _EndpointMetrics:
+
+    def __init__(self):
+
+        self.count = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+
+
+class RequestMetrics:
+
+    """
+    Records the count, errors, latency and size of the requests per server
+    and endpoint template, to tell slow servers from slow GUI code.
+    """
+
+    def __init__(self):
+
+        self._endpoints = collections.OrderedDict()
+        self._start = time.time()
+
+    def _metrics(self, server, method, endpoint):
+
+        key = (server, method, endpoint)
+        metrics = self._endpoints.get(key)
+        if metrics is None:
+            metrics = self._endpoints[key] = _EndpointMetrics()
+        return metrics
+
+    def requestStarted(self, server, method, path, bytes_out=0):
+        """
+        Records a request sent to a server.
+
+        :param server: server URL
+        :param method: HTTP method
+        :param path: request path
+        :param bytes_out: size of the request body
+
+        :returns: token to pass to requestFinished()
+        """
+
+        endpoint = endpointTemplate(path)
+        metrics = self._metrics(server, method, endpoint)
+        metrics.count += 1
+        metrics.in_flight += 1
+        metrics.bytes_out += bytes_out
+        return (server, method, endpoint, time.monotonic())
+
+    def dataReceived(self, token, size):
+        """
+        Records data received for a request.
+
+        :param token: token returned by requestStarted()
+        :param size: number of bytes received
+        """
+
+        server, method, endpoint, _ = token
+        self._metrics(server, method, endpoint).bytes_in += size
+
+    def requestFinished(self, token, error=False, stream=False):
+        """
+        Records the end of a request.
+
+        :param token: token returned by requestStarted()
+        :param error: True if the request failed
+        :param stream: True for a streamed reply, its duration is not a latency
+        """
+
+        server, method, endpoint, start = token
+        metrics = self._metrics(server, method, endpoint)
+        metrics.in_flight = max(0, metrics.in_flight - 1)
+        if error:
+            metrics.errors += 1
+        if not stream:
+            metrics.latencies.append(time.monotonic() - start)
+
+    def reset(self):
+        """
+        Forgets the recorded metrics, the requests in flight are kept.
+        """
+
+        for key, metrics in list(self._endpoints.items()):
+            if metrics.in_flight:
+                in_flight = metrics.in_flight
+                metrics = self._endpoints[key] = _EndpointMetrics()
+                metrics.in_flight = in_flight
+            else:
+                del self._endpoints[key]
+        self._start = time.time()
+
+    def statistics(self):
+        """
+        Returns the metrics of each endpoint, latencies are in milliseconds.
+
+        :returns: list of dictionaries
+        """
+
+        statistics = []
+        for (server, method, endpoint), metrics in self._endpoints.items():
+            latencies = sorted(metrics.latencies)
+            statistics.append({"server": server,
+                               "method": method,
+                               "endpoint": endpoint,
+                               "count": metrics.count,
+                               "errors": metrics.errors,
+                               "in_flight": metrics.in_flight,
+                               "p50": latencyPercentile(latencies, 50),
+                               "p95": latencyPercentile(latencies, 95),
+                               "p99": latencyPercentile(latencies, 99),
+                               "bytes_in": metrics.bytes_in,
+                               "bytes_out": metrics.bytes_out})
+        return statistics
+
+    def serverStatistics(self):
+        """
+        Returns the metrics of each server, all endpoints
+        together, latencies are in milliseconds.
+
+        :returns: dictionary of server URLs and dictionaries
+        """
+
+        servers = collections.OrderedDict()
+        for (server, _, _), metrics in self._endpoints.items():
+            server_metrics = servers.setdefault(server, {"count": 0, "errors": 0, "latencies": []})
+            server_metrics["count"] += metrics.count
+            server_metrics["errors"] += metrics.errors
+            server_metrics["latencies"].extend(metrics.latencies)
+
+        statistics = collections.OrderedDict()
+        for server, server_metrics in servers.items():
+            latencies = sorted(server_metrics["latencies"])
+            statistics[server] = {"count": server_metrics["count"],
+                                  "errors": server_metrics["errors"],
+                                  "p50": latencyPercentile(latencies, 50),
+                                  "p95": latencyPercentile(latencies, 95),
+                                  "p99": latencyPercentile(latencies, 99)}
+        return statistics
+
+    def toJSON(self):
+        """
+        Exports the metrics as JSON.
+
+        :returns: string
+        """
+
+        return json.dumps({"since": self._start,
+                           "servers": self.serverStatistics(),
+                           "endpoints": self.statistics()}, indent=4)
+
+    def toCSV(self):
+        """
+        Exports the metrics as CSV.
+
+        :returns: string
+        """
+
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=COLUMNS)
+        writer.writeheader()
+        for row in self.statistics():
+            writer.writerow(row)
+        return output.getvalue()
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of RequestMetrics.
+
+        :returns: instance of RequestMetrics
+        """
+
+        if not hasattr(RequestMetrics, "_instance"):
+            RequestMetrics._instance = RequestMetrics()
+        return RequestMetrics._instance
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Connections used to send the HTTP requests to a server.
+"""
+
+import math
+import time
+import base64
+import ipaddress
+
+from .version import __version__
+from .qt import QtCore, QtNetwork
+
+import logging
+log = logging.getLogger(__name__)
+
+# Qt opens at most 6 connections to the same host with a network access manager
+CONNECTIONS_PER_NETWORK_MANAGER = 6
+
+DEFAULT_CONNECTION_SETTINGS = {
+    "max_connections_per_host": CONNECTIONS_PER_NETWORK_MANAGER,
+    "keep_alive_interval": 30,
+    "http_pipelining": False,
+    "http2": False,
+}
+
+
+class ServerConnection(QtCore.QObject):
+
+    """
+    Builds the requests to a server and keeps its connections warm.
+
+    The base URL and the authentication header are computed once, not for
+    each request. When no request has been sent for keep_alive_interval
+    seconds, a connection is opened in advance so the next request does
+    not wait for a new TCP (and TLS) handshake.
+
+    Qt opens at most 6 connections to a host per network access manager,
+    more connections are obtained with additional network access managers
+    used in turn.
+
+    :param scheme: http or https
+    :param host: server host
+    :param port: server port
+    :param user: user for the authentication
+    :param password: password for the authentication
+    :param network_manager: network access manager shared with the other servers
+    """
+
+    _settings = dict(DEFAULT_CONNECTION_SETTINGS)
+
+    def __init__(self, scheme, host, port, user, password, network_manager):
+
+        super().__init__()
+        self._scheme = scheme
+        self._host = host
+        self._port = port
+        self._user = user
+        self._password = password
+        self._network_manager = network_manager
+        self._network_managers = [network_manager]
+        self._network_manager_index = 0
+        self._base_url = None
+        self._auth_header = None
+        self._user_agent = "GNS3 QT Client v{version}".format(version=__version__).encode()
+
+        # statistics
+        self._requests = 0
+        self._preconnects = 0
+        self._last_request = None
+
+        self._keep_alive_timer = None
+
+    @classmethod
+    def setSettings(cls, settings):
+        """
+        Sets the connection settings of all the servers.
+
+        :param settings: settings dictionary
+        """
+
+        cls._settings = dict(DEFAULT_CONNECTION_SETTINGS)
+        cls._settings.update(settings)
+
+    @classmethod
+    def settings(cls):
+        """
+        Returns the connection settings.
+
+        :returns: settings dictionary
+        """
+
+        return dict(cls._settings)
+
+    def setServer(self, scheme, host, port, user, password):
+        """
+        Changes the server address or credentials.
+        """
+
+        self._scheme = scheme
+        self._host = host
+        self._port = port
+        self._user = user
+        self._password = password
+        self._base_url = None
+        self._auth_header = None
+
+    def baseUrl(self):
+        """
+        Returns the URL of the API, computed once.
+
+        :returns: string
+        """
+
+        if self._base_url is None:
+            try:
+                ip = self._host.rsplit('%', 1)[0]
+                ipaddress.IPv6Address(ip)  # remove any scope ID
+                # this is an IPv6 address, we must surround it with brackets to be used with QUrl.
+                host = "[{}]".format(ip)
+            except ipaddress.AddressValueError:
+                host = self._host
+            if self._user:
+                self._base_url = "{protocol}://{user}@{host}:{port}/v1".format(protocol=self._scheme, user=self._user, host=host, port=self._port)
+            else:
+                self._base_url = "{protocol}://{host}:{port}/v1".format(protocol=self._scheme, host=host, port=self._port)
+        return self._base_url
+
+    def authHeader(self):
+        """
+        Returns the basic authentication header value, computed once.
+
+        :returns: bytes or None without authentication
+        """
+
+        if self._auth_header is None and self._user:
+            auth_string = "{}:{}".format(self._user, self._password)
+            auth_string = base64.b64encode(auth_string.encode("utf-8"))
+            self._auth_header = "Basic {}".format(auth_string.decode()).encode()
+        return self._auth_header
+
+    def url(self, path):
+        """
+        Returns the URL of an API path.
+
+        :param path: API path
+        :returns: QUrl instance
+        """
+
+        return QtCore.QUrl(self.baseUrl() + path)
+
+    def prepareRequest(self, request):
+        """
+        Adds the headers and attributes common to all the requests.
+
+        :param request: QNetworkRequest instance
+        :returns: QNetworkRequest instance
+        """
+
+        auth_header = self.authHeader()
+        if auth_header:
+            request.setRawHeader(b"Authorization", auth_header)
+        request.setRawHeader(b"User-Agent", self._user_agent)
+        if self._settings["http_pipelining"]:
+            request.setAttribute(QtNetwork.QNetworkRequest.HttpPipeliningAllowedAttribute, True)
+        if self._settings["http2"]:
+            # only with Qt >= 5.8, HTTP/2 is negotiated with TLS
+            attribute = getattr(QtNetwork.QNetworkRequest, "HTTP2AllowedAttribute", None)
+            if attribute is not None:
+                request.setAttribute(attribute, True)
+        return request
+
+    def _networkManagers(self):
+        """
+        Returns the network access managers used for this server, creating
+        the additional ones needed by max_connections_per_host.
+
+        :returns: list of QNetworkAccessManager instances
+        """
+
+        count = max(1, math.ceil(self._settings["max_connections_per_host"] / CONNECTIONS_PER_NETWORK_MANAGER))
+        while len(self._network_managers) < count:
+            network_manager = QtNetwork.QNetworkAccessManager(self)
+            # SSL errors are handled like for the shared network access manager
+            network_manager.sslErrors.connect(self._network_manager.sslErrors)
+            self._network_managers.append(network_manager)
+        return self._network_managers[:count]
+
+    def networkManager(self):
+        """
+        Returns the network access manager to send the next request.
+
+        :returns: QNetworkAccessManager instance
+        """
+
+        network_managers = self._networkManagers()
+        if len(network_managers) == 1:
+            return self._network_manager
+        self._network_manager_index = (self._network_manager_index + 1) % len(network_managers)
+        return network_managers[self._network_manager_index]
+
+    def requestStarted(self):
+        """
+        Called when a request is sent to the server.
+        """
+
+        self._requests += 1
+        self._last_request = time.monotonic()
+
+    def startKeepAlive(self):
+        """
+        Keeps the connections to the server warm.
+        """
+
+        interval = self._settings["keep_alive_interval"]
+        if not interval or self._keep_alive_timer is not None:
+            return
+        self._keep_alive_timer = QtCore.QTimer(self)
+        self._keep_alive_timer.setInterval(interval * 1000)
+        self._keep_alive_timer.timeout.connect(self._keepAliveSlot)
+        self._keep_alive_timer.start()
+
+    def stopKeepAlive(self):
+        """
+        Stops keeping the connections warm.
+        """
+
+        if self._keep_alive_timer is not None:
+            self._keep_alive_timer.stop()
+            self._keep_alive_timer = None
+
+    def _keepAliveSlot(self):
+        """
+        Opens a connection in advance with each network access manager if
+        the server has been idle, the connections opened by the last
+        requests may have been closed.
+        """
+
+        interval = self._settings["keep_alive_interval"]
+        if self._last_request is not None and time.monotonic() - self._last_request < interval:
+            return
+        log.debug("Opening connections in advance to {}:{}".format(self._host, self._port))
+        # each network access manager has its own connections
+        for network_manager in self._networkManagers():
+            if self._scheme == "https":
+                network_manager.connectToHostEncrypted(self._host, self._port)
+            else:
+                network_manager.connectToHost(self._host, self._port)
+            # Qt does nothing if a connection is still open, this is not
+            # the number of connections actually opened
+            self._preconnects += 1
+        self._last_request = time.monotonic()
+
+    def statistics(self):
+        """
+        Returns the connection statistics.
+
+        :returns: dictionary with the number of requests and the number
+        of connections requested in advance by the keep-alive
+        """
+
+        return {"requests": self._requests,
+                "preconnects": self._preconnects}
@@ -50,6 +50,15 @@ class ServerItem(QtWidgets.QTreeWidgetItem):
         self._server.system_usage_updated_signal.connect(self._refreshStatusSlot)
         self._refreshStatusSlot()
 
+    def server(self):
+        """
+        Returns the server of this item.
+
+        :returns: HTTPClient instance
+        """
+
+        return self._server
+
     def _refreshStatusSlot(self):
         """
         Changes the icon to show the node status (started, stopped etc.)
@@ -122,6 +131,24 @@ class ServerSummaryView(QtWidgets.QTreeWidget):
                 self.takeTopLevelItem(self.indexOfTopLevelItem(self._servers[url]))
         self._servers[url] = ServerItem(self, server)
 
+    def contextMenuEvent(self, event):
+        """
+        Handles all context menu events.
+
+        :param event: QContextMenuEvent instance
+        """
+
+        item = self.itemAt(event.pos())
+        if not isinstance(item, ServerItem):
+            return
+        menu = QtWidgets.QMenu()
+        refresh_action = QtWidgets.QAction("Refresh inventory", menu)
+        refresh_action.setStatusTip("Request the interfaces, binaries, images and VMs available on the server again")
+        inventory = item.server().inventory()
+        refresh_action.triggered.connect(lambda: inventory.refresh())
+        menu.addAction(refresh_action)
+        menu.exec_(event.globalPos())
+
     def _serverRemovedSlot(self, url):
         """
         Called when a server is removed to the list of servers
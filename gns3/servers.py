@@ -21,6 +21,7 @@ Keeps track of all the local and remote servers and their settings.
 
 import sys
 import os
+import time
 import shlex
 import signal
 import urllib
@@ -34,11 +35,12 @@ import stat
 import struct
 import psutil
 
-from .qt import QtNetwork, QtWidgets, QtCore
+from .qt import QtNetwork, QtWidgets, QtCore, qpartial
 from .network_client import getNetworkUrl
 from .local_config import LocalConfig
 from .settings import SERVERS_SETTINGS
 from .local_server_config import LocalServerConfig
+from .server_connection import ServerConnection
 from .progress import Progress
 from .utils.sudo import sudo
 
@@ -231,7 +233,8 @@ class Servers(QtCore.QObject):
         Loads the server settings from the persistent settings file.
         """
 
-        self._settings = LocalConfig.instance().loadSectionSettings("Servers", SERVERS_SETTINGS)
+        self._settings = LocalConfig.instance().sectionSettings("Servers", SERVERS_SETTINGS)
+        ServerConnection.setSettings(self._settings["connections"])
 
         local_server_settings = self._settings["local_server"]
         if not os.path.exists(local_server_settings["path"]):
@@ -255,7 +258,7 @@ class Servers(QtCore.QObject):
             changed = True
 
         # For 1.3 compatibity old LocalServer section
-        local_server = LocalConfig.instance().loadSectionSettings("LocalServer", {})
+        local_server = LocalConfig.instance().sectionSettings("LocalServer", {})
         if "auth" in local_server:
             local_server["auth"] = local_server_settings["auth"]
             local_server["user"] = local_server_settings["user"]
@@ -408,29 +411,47 @@ class Servers(QtCore.QObject):
             # Permission issue, or process no longer exists, or file is empty
             return
 
-    def localServerAutoStart(self):
+    def localServerAutoStart(self, callback):
         """
         Try to start the embed gns3 server.
+
+        :param callback: called with False if the local server could not be started
         """
 
         # We check if two gui are not launched at the same time
         # to avoid killing the server of the other GUI
         if not LocalConfig.isMainGui():
             log.info("Not the main GUI, will not autostart the server")
-            return True
+            callback(True)
+            return
+
+        self.localServer().isLocalServerRunning(qpartial(self._localServerCheckedCallback, callback))
+
+    def _localServerCheckedCallback(self, callback, running, killed=False):
+        """
+        Called once it is known if a local server is already running.
+
+        :param callback: localServerAutoStart() callback
+        :param running: True if a server is running on this host
+        :param killed: True if the running server has already been killed
+        """
 
-        if self.localServer().isLocalServerRunning():
+        if running and not killed:
             log.info("A local server already running on this host")
             # Try to kill the server. The server can be still running after
             # if the server was started by hand
             self._killAlreadyRunningServer()
+            self.localServer().isLocalServerRunning(qpartial(self._localServerCheckedCallback, callback, killed=True))
+            return
 
-        if not self.localServer().isLocalServerRunning():
+        if not running:
             if not self.initLocalServer():
-                return False
+                callback(False)
+                return
             if not self.startLocalServer():
-                return False
-        return True
+                callback(False)
+                return
+        callback(True)
 
     def initLocalServer(self):
         """
@@ -607,6 +628,43 @@ class Servers(QtCore.QObject):
                         if proceed == QtWidgets.QMessageBox.Yes:
                             self._local_server_process.kill()
 
+    def interruptLocalServer(self, callback, timeout=2):
+        """
+        Stops the local server without blocking: it is interrupted and
+        killed if it is still running after the timeout.
+
+        :param callback: called once the local server has stopped
+        :param timeout: time in seconds before killing the local server
+        """
+
+        if not self.localServerIsRunning():
+            callback()
+            return
+        log.info("Interrupting local server (PID={})".format(self._local_server_process.pid))
+        try:
+            if sys.platform.startswith("win"):
+                self._local_server_process.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                self._local_server_process.send_signal(signal.SIGINT)
+        # If the process is already dead we received a permission error
+        except PermissionError:
+            pass
+        self._waitLocalServerStopped(callback, time.monotonic() + timeout)
+
+    def _waitLocalServerStopped(self, callback, deadline):
+        """
+        Checks if the local server has stopped, kills it after the deadline.
+        """
+
+        if self.localServerIsRunning():
+            if deadline is not None and time.monotonic() >= deadline:
+                log.warning("Killing local server (PID={})".format(self._local_server_process.pid))
+                self._local_server_process.kill()
+                deadline = None
+            QtCore.QTimer.singleShot(100, qpartial(self._waitLocalServerStopped, callback, deadline))
+            return
+        callback()
+
     def localServer(self):
         """
         Returns the local server.
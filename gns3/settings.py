@@ -256,6 +256,7 @@ GENERAL_SETTINGS = {
     "last_check_for_update": 0,
     "slow_device_start_all": 0,
     "link_manual_mode": True,
+    "incremental_snapshots": False,
     "telnet_console_command": DEFAULT_TELNET_CONSOLE_COMMAND,
     "serial_console_command": DEFAULT_SERIAL_CONSOLE_COMMAND,
     "vnc_console_command": DEFAULT_VNC_CONSOLE_COMMAND,
@@ -319,12 +320,23 @@ SERVERS_SETTINGS = {
         "remote_vm_password": ""
     },
     "remote_servers": [],
+    "connections": {
+        "max_connections_per_host": 6,
+        "keep_alive_interval": 30,  # seconds, 0 to disable
+        "http_pipelining": False,
+        "http2": False,
+    },
 }
 
 PACKET_CAPTURE_SETTINGS = {
     "packet_capture_reader_command": DEFAULT_PACKET_CAPTURE_READER_COMMAND,
     "command_auto_start": True,
     "packet_capture_analyzer_command": DEFAULT_PACKET_CAPTURE_ANALYZER_COMMAND,
+    "ring_buffer": False,
+    "ring_buffer_file_size": 100,  # MB
+    "ring_buffer_duration": 0,  # seconds
+    "ring_buffer_files": 10,
+    "pcapng": False,
 }
 
 CUSTOM_CONSOLE_COMMANDS_SETTINGS = {
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Brings up the servers at startup without blocking the main window.
+"""
+
+import time
+import collections
+
+from .qt import QtCore, qpartial, qslot
+from .servers import Servers
+from .gns3_vm import GNS3VM
+from .readiness_prober import ReadinessProber
+from .utils.startup_profiler import StartupProfiler
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class StartupOrchestrator(QtCore.QObject):
+
+    """
+    Starts the GNS3 VM and the local server at the same time and connects
+    to the remote servers in the background. The GNS3 VM is waited for in
+    a thread, the servers are probed with asynchronous requests. The main
+    window stays usable in the meantime.
+
+    The startup is finished when the GNS3 VM and the local server are up
+    (or failed), the remote servers do not delay it. The duration of each
+    phase is logged.
+
+    :param parent: parent object
+    """
+
+    # name of the phase
+    phase_started_signal = QtCore.Signal(str)
+    # name of the phase, success, error message
+    phase_finished_signal = QtCore.Signal(str, bool, str)
+    local_server_ready_signal = QtCore.Signal()
+    # True if the local server is ready
+    finished_signal = QtCore.Signal(bool)
+
+    # phases delaying the end of the startup
+    BLOCKING_PHASES = ("gns3_vm", "local_server")
+
+    PHASE_DESCRIPTIONS = {"gns3_vm": "Starting the GNS3 VM...",
+                          "local_server": "Connecting to the local server...",
+                          "remote_servers": "Connecting to the remote servers..."}
+
+    def __init__(self, parent=None):
+
+        super().__init__(parent)
+        self._phases = collections.OrderedDict()
+        self._workers = {}
+        self._remote_servers = set()
+        self._local_server = None
+        self._local_server_prober = None
+        self._started = False
+        self._finished = False
+        self._local_server_started = False
+        self._local_server_ready = False
+
+    def start(self):
+        """
+        Starts all the phases.
+        """
+
+        if self._started:
+            return
+        self._started = True
+        servers = Servers.instance()
+        gns3_vm = GNS3VM.instance()
+        if not gns3_vm.isRunning():
+            servers.initVMServer()
+            if gns3_vm.isRemote():
+                gns3_vm.setRunning(True)
+            elif gns3_vm.autoStart():
+                self._startVM()
+
+        if servers.shouldLocalServerAutoStart():
+            self._startLocalServer()
+        else:
+            self._local_server_ready = True
+
+        self._connectRemoteServers()
+        self._checkFinished()
+
+    def cancel(self):
+        """
+        Stops waiting for the servers, for instance when the application is closed.
+        """
+
+        for name in list(self._workers):
+            worker, thread = self._workers.pop(name)
+            worker.cancel()
+            thread.quit()
+            if not thread.wait(3000):
+                thread.terminate()
+                thread.wait()
+            self._finishPhase(name, False, "Canceled")
+        # the local server may be probed or restarted
+        self._cancelLocalServerProber()
+        self._finishPhase("local_server", False, "Canceled")
+
+    def _cancelLocalServerProber(self):
+
+        prober = self._local_server_prober
+        if prober is not None:
+            self._local_server_prober = None
+            prober.cancel()
+            prober.deleteLater()
+
+    def isFinished(self):
+        """
+        Returns True once the GNS3 VM and the local server are up or failed.
+        """
+
+        return self._finished
+
+    def localServerReady(self):
+        """
+        Returns True if the local server accepts connections
+        (or is not started by the GUI).
+        """
+
+        return self._local_server_ready
+
+    def phases(self):
+        """
+        Returns the phases with their duration in seconds
+        (None for a phase still running) and result.
+
+        :returns: list of (name, duration, success) tuples
+        """
+
+        return [(name, phase["duration"], phase["success"]) for name, phase in self._phases.items()]
+
+    def runningPhases(self):
+        """
+        Returns the names of the phases still running, in the order they
+        have been started.
+
+        :returns: list of phase names
+        """
+
+        return [name for name, phase in self._phases.items() if phase["success"] is None]
+
+    def _startPhase(self, name):
+
+        log.info("Startup phase {} started".format(name))
+        self._phases[name] = {"start": time.monotonic(), "duration": None, "success": None}
+        self.phase_started_signal.emit(name)
+
+    def _finishPhase(self, name, success, message=""):
+
+        phase = self._phases.get(name)
+        if phase is None or phase["success"] is not None:
+            return
+        phase["duration"] = time.monotonic() - phase["start"]
+        phase["success"] = success
+        log.info("Startup phase {} {} in {:.0f} ms".format(name, "finished" if success else "failed", phase["duration"] * 1000))
+        StartupProfiler.instance().record(name, phase["duration"])
+        self.phase_finished_signal.emit(name, success, message)
+
+    def _runWorker(self, name, worker, callback):
+        """
+        Runs a worker (same interface than for the progress dialog)
+        in its own thread.
+
+        :param name: phase name
+        :param worker: worker instance
+        :param callback: called with the success and the error message
+        """
+
+        thread = QtCore.QThread(self)
+        worker.setObjectName(worker.__class__.__name__)
+        worker.moveToThread(thread)
+        worker.finished.connect(qpartial(self._workerFinishedSlot, name, callback, True, ""))
+        worker.error.connect(qpartial(self._workerErrorSlot, name, callback))
+        thread.started.connect(worker.run)
+        self._workers[name] = (worker, thread)
+        thread.start()
+
+    @qslot
+    def _workerErrorSlot(self, name, callback, message, stop=False):
+
+        self._workerFinishedSlot(name, callback, False, message)
+
+    @qslot
+    def _workerFinishedSlot(self, name, callback, success, message):
+
+        if name not in self._workers:
+            return  # canceled
+        _, thread = self._workers.pop(name)
+        thread.quit()
+        thread.finished.connect(thread.deleteLater)
+        callback(success, message)
+
+    def _startVM(self):
+
+        from .utils.wait_for_vm_worker import WaitForVMWorker
+        self._startPhase("gns3_vm")
+        self._runWorker("gns3_vm", WaitForVMWorker(), self._vmStartedCallback)
+
+    def _vmStartedCallback(self, success, message):
+
+        if success:
+            servers = Servers.instance()
+            host = servers.localServer().host()
+            GNS3VM.instance().adjustLocalServerIP()
+            if servers.localServer().host() != host and self._local_server is not None:
+                # the local server has been started in parallel and must listen on the new address
+                log.info("Restarting the local server to listen on {}".format(servers.localServer().host()))
+                self._cancelLocalServerProber()
+                self._phases.pop("local_server", None)
+                self._local_server_started = False
+                # the phase runs until the local server is started again
+                self._startPhase("local_server")
+                servers.interruptLocalServer(self._localServerStoppedCallback)
+        self._finishPhase("gns3_vm", success, message)
+        self._reportLocalServerReady()
+        self._checkFinished()
+
+    def _localServerStoppedCallback(self):
+
+        phase = self._phases.get("local_server")
+        if phase is None or phase["success"] is not None:
+            return  # canceled
+        self._launchLocalServer()
+
+    def _startLocalServer(self):
+
+        self._startPhase("local_server")
+        self._launchLocalServer()
+
+    def _launchLocalServer(self):
+
+        servers = Servers.instance()
+        self._local_server = servers.localServer()
+        servers.localServerAutoStart(self._localServerAutoStartedCallback)
+
+    def _localServerAutoStartedCallback(self, success):
+
+        phase = self._phases.get("local_server")
+        if phase is None or phase["success"] is not None:
+            return  # canceled
+        if not success:
+            self._localServerStartedCallback(False, "Could not start the local server process: {}".format(Servers.instance().localServerPath()))
+            return
+        # probed from the main thread, the network requests are asynchronous
+        self._local_server_prober = ReadinessProber.forServer(self._local_server, parent=self)
+        self._local_server_prober.finished_signal.connect(self._localServerProbedSlot)
+        self._local_server_prober.start()
+
+    def _localServerProbedSlot(self, status, json_data):
+
+        prober = self._local_server_prober
+        self._local_server_prober = None
+        if prober is None:
+            return  # canceled
+        prober.deleteLater()
+        if status == 200:
+            self._localServerStartedCallback(True, "")
+        elif status == 0:
+            self._localServerStartedCallback(False, "Could not connect to {} on port {}: {}".format(self._local_server.host(),
+                                                                                                    self._local_server.port(),
+                                                                                                    prober.error()))
+        else:
+            self._localServerStartedCallback(False, "Local server {} has replied with status code {}".format(self._local_server.url(), status))
+
+    def _localServerStartedCallback(self, success, message):
+
+        self._finishPhase("local_server", success, message)
+        if success:
+            self._local_server_started = True
+            self._reportLocalServerReady()
+        self._checkFinished()
+
+    def _reportLocalServerReady(self):
+        """
+        Reports the local server as ready, once. When the local server IP is
+        adjusted to the GNS3 VM subnet, the local server may be restarted on
+        another address once the GNS3 VM is started, so it is reported ready
+        only after the GNS3 VM phase.
+        """
+
+        if self._local_server_ready or not self._local_server_started:
+            return
+        phase = self._phases.get("gns3_vm")
+        if phase is not None and phase["success"] is None and Servers.instance().vmSettings()["adjust_local_server_ip"]:
+            log.info("The local server is ready, waiting for the GNS3 VM before using it")
+            return
+        self._local_server_ready = True
+        self.local_server_ready_signal.emit()
+
+    def _connectRemoteServers(self):
+        """
+        Connects to the remote servers, a failure is only logged.
+        """
+
+        remote_servers = list(Servers.instance().remoteServers().values())
+        if not remote_servers:
+            return
+        self._startPhase("remote_servers")
+        for server in remote_servers:
+            self._remote_servers.add(server)
+            server.get("/version", qpartial(self._remoteServerConnectedCallback, server), showProgress=False)
+
+    def _remoteServerConnectedCallback(self, server, result, error=False, **kwargs):
+
+        if error:
+            log.warning("Could not connect to remote server {}: {}".format(server.url(), result.get("message", "")))
+        self._remote_servers.discard(server)
+        if not self._remote_servers:
+            self._finishPhase("remote_servers", True)
+
+    def _checkFinished(self):
+
+        if self._finished:
+            return
+        for name in self.BLOCKING_PHASES:
+            if name in self._phases and self._phases[name]["success"] is None:
+                return
+        self._finished = True
+        self.finished_signal.emit(self._local_server_ready)
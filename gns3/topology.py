@@ -22,6 +22,8 @@ Handles the saving and loading of a topology.
 
 import os
 import json
+import time
+import collections
 import uuid
 import glob
 import shutil
@@ -38,6 +40,8 @@ from .items.rectangle_item import RectangleItem
 from .items.ellipse_item import EllipseItem
 from .items.svg_image_item import SvgImageItem
 from .items.pixmap_image_item import PixmapImageItem
+from .node import Node
+from .node_index import NodeIndex
 from .servers import Servers
 from .modules import MODULES
 from .modules.module_error import ModuleError
@@ -105,9 +109,14 @@ class Topology:
         self._topology = None
         self._initialized_nodes = []
         self._initialized_links = []
+        self._node_index = NodeIndex()
         self._instances = []
         self._auto_start = False
         self._project = None
+        # load timing: start of the load, creation of the first and last links
+        self._load_started = None
+        self._links_started = None
+        self._links_finished = None
 
     @property
     def project(self):
@@ -138,6 +147,7 @@ class Topology:
 
         # self._topology.add_node(node)
         self._nodes.append(node)
+        self._node_index.addNode(node)
 
     def removeNode(self, node):
         """
@@ -148,6 +158,7 @@ class Topology:
 
         if node in self._nodes:
             self._nodes.remove(node)
+        self._node_index.removeNode(node)
 
     def getVM(self, vm_id):
         """
@@ -348,6 +359,15 @@ class Topology:
 
         return self._nodes
 
+    def nodeIndex(self):
+        """
+        Returns the index of the initialized nodes by status and capability.
+
+        :returns: NodeIndex instance
+        """
+
+        return self._node_index
+
     def links(self):
         """
         Returns all the links in this topology.
@@ -404,6 +424,7 @@ class Topology:
         self._images.clear()
         self._initialized_nodes.clear()
         self._initialized_links.clear()
+        self._node_index.clear()
         self._instances = []
         log.info("Topology reset")
 
@@ -618,6 +639,10 @@ class Topology:
             log.warn("not a topology file")
             return
 
+        self._load_started = time.time()
+        self._links_started = None
+        self._links_finished = None
+
         # auto start option
         self._auto_start = topology.get("auto_start", False)
 
@@ -701,16 +726,19 @@ class Topology:
                     continue
                 topology_nodes[topology_node["id"]] = topology_node
 
+            # the names are allocated again when the nodes are loaded, the
+            # existing names must be known before a name can be allocated
+            Node.loadAllocatedNames(topology_node.get("properties", {}).get("name") for topology_node in topology_nodes.values())
+
             for topology_node in topology_nodes.values():
                 log.debug("loading node with ID {}".format(topology_node["id"]))
 
                 try:
                     node_module = None
                     for module in MODULES:
-                        instance = module.instance()
                         node_class = module.getNodeClass(topology_node["type"])
                         if node_class:
-                            node_module = instance
+                            node_module = module.instance()
                             break
                     if not node_module:
                         raise ModuleError("Could not find any module for {}".format(topology_node["type"]))
@@ -785,6 +813,9 @@ class Topology:
                 view.scene().addItem(node_item)
                 main_window.uiTopologySummaryTreeWidget.addNode(node)
 
+            # the UDP ports of the links are allocated while the nodes are created
+            self._reserveLinkPorts(topology)
+
         # notes
         if "notes" in topology["topology"]:
             notes = topology["topology"]["notes"]
@@ -930,6 +961,8 @@ class Topology:
                         log.error(msg)
 
                     if source_port and destination_port:
+                        if self._links_started is None:
+                            self._links_started = time.time()
                         link = view.addLink(source_node, source_port, destination_node, destination_port)
                         callback = qpartial(self._linkCreatedSlot, topology)
                         link.add_link_signal.connect(callback)
@@ -949,6 +982,7 @@ class Topology:
         """
 
         self._initialized_links.append(link_id)
+        self._links_finished = time.time()
         self._autoStart(topology)
 
     def _autoStart(self, topology):
@@ -958,6 +992,7 @@ class Topology:
 
         if "nodes" not in topology["topology"] or ((len(topology["topology"].get("links", [])) == len(self._initialized_links)) and (len(topology["topology"]["nodes"]) == len(self._initialized_nodes))):
             log.info("Topology initialized")
+            self._logLoadTiming()
             # Auto start
             if self._auto_start:
                 log.info("Auto start nodes")
@@ -967,6 +1002,50 @@ class Topology:
                         log.info("Auto start node %s", initialized_node.name())
                         initialized_node.start()
 
+    def _reserveLinkPorts(self, topology):
+        """
+        Allocates in advance the UDP ports needed by the links of a topology.
+
+        :param topology: topology representation
+        """
+
+        stub_ports = set()
+        for topology_node in topology["topology"].get("nodes", []):
+            for port in topology_node.get("ports", []):
+                if port.get("stub"):
+                    stub_ports.add((topology_node["id"], port.get("id")))
+
+        nodes = {node.id(): node for node in self._nodes}
+        ports_needed = collections.Counter()
+        for topology_link in topology["topology"].get("links", []):
+            endpoints = ((topology_link.get("source_node_id"), topology_link.get("source_port_id")),
+                         (topology_link.get("destination_node_id"), topology_link.get("destination_port_id")))
+            # a link to a stub port (a cloud for instance) doesn't use UDP ports
+            if any(endpoint in stub_ports for endpoint in endpoints):
+                continue
+            for node_id, _ in endpoints:
+                if node_id in nodes:
+                    ports_needed[nodes[node_id].server()] += 1
+
+        for server, count in ports_needed.items():
+            self._project.udpPortPool(server).reserve(count)
+
+    def _logLoadTiming(self):
+        """
+        Logs how long the topology took to load.
+        """
+
+        if self._load_started is None:
+            return
+        now = time.time()
+        summary = "Topology loaded in {:.2f} seconds: {} nodes, {} links".format(now - self._load_started,
+                                                                                len(self._initialized_nodes),
+                                                                                len(self._initialized_links))
+        if self._links_started is not None and self._links_finished is not None:
+            summary += " created in {:.2f} seconds".format(self._links_finished - self._links_started)
+        log.info(summary)
+        self._load_started = None
+
     def _createPortLabel(self, node, label_info):
         """
         Creates a port label.
@@ -15,7 +15,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import jsonschema
 import json
 import os
 
@@ -29,6 +28,9 @@ def getTopologyValidationErrors(topology):
     :returns: Return None if ok otherwise an error message
     """
 
+    # imported when needed, it takes a noticeable time to load
+    import jsonschema
+
     with open(get_resource(os.path.join("schemas", "topology.json"))) as f:
         schema = json.load(f)
 
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+UDP ports allocated in advance on a server, to create the links
+without waiting for a port allocation.
+"""
+
+import collections
+
+import logging
+log = logging.getLogger(__name__)
+
+# number of ports kept allocated in advance
+UDP_PORT_BATCH_SIZE = 8
+
+
+class UDPPortPool:
+
+    """
+    UDP ports allocated on a server for a project before they are needed.
+
+    The ports are allocated for the project, not for a node, so any node
+    of the project running on the server can use them. When the pool runs
+    low, new ports are requested in a batch, without waiting for the
+    previous replies.
+
+    :param project: Project instance
+    :param server: HTTPClient instance
+    :param batch_size: number of ports kept allocated in advance
+    """
+
+    def __init__(self, project, server, batch_size=UDP_PORT_BATCH_SIZE):
+
+        self._project = project
+        self._server = server
+        self._batch_size = batch_size
+        self._ports = collections.deque()
+        # callbacks waiting for a port
+        self._waiters = collections.deque()
+        # allocations sent to the server and not replied yet
+        self._requested = 0
+        self._allocated = 0
+        self._served_from_pool = 0
+
+    def _available(self):
+        """
+        Returns the number of ports allocated or being allocated
+        which are not promised to a waiting callback.
+        """
+
+        return len(self._ports) + self._requested - len(self._waiters)
+
+    def _request(self, count):
+        """
+        Sends port allocations to the server.
+
+        :param count: number of ports
+        """
+
+        if count <= 0:
+            return
+        log.debug("allocating {} UDP ports in advance on {}".format(count, self._server.host()))
+        for _ in range(count):
+            self._requested += 1
+            self._project.post(self._server, "/ports/udp", self._allocatedCallback, showProgress=False)
+
+    def reserve(self, count):
+        """
+        Allocates ports in advance for the next requests, for
+        instance for the links of a topology being loaded.
+
+        :param count: number of ports which will be needed
+        """
+
+        self._request(count - self._available())
+
+    def acquire(self, callback):
+        """
+        Gets a port. The callback is called right away if a port is
+        available, otherwise as soon as the server allocates one.
+
+        :param callback: callback receiving the port and an error message
+        (None if no error)
+        """
+
+        if self._ports:
+            self._served_from_pool += 1
+            callback(self._ports.popleft(), None)
+        else:
+            self._waiters.append(callback)
+
+        # allocate more ports before the pool is empty
+        if self._available() < self._batch_size // 2:
+            self._request(self._batch_size - self._available())
+
+    def _allocatedCallback(self, result, error=False, **kwargs):
+        """
+        Callback for the port allocations.
+
+        :param result: server response (dict)
+        :param error: indicates an error (boolean)
+        """
+
+        self._requested -= 1
+        if error:
+            message = result.get("message", "unknown error")
+            log.error("error while allocating an UDP port on {}: {}".format(self._server.host(), message))
+            # the allocations are not retried, a waiting callback
+            # gets the error instead of waiting forever
+            if self._waiters:
+                self._waiters.popleft()(None, message)
+            return
+
+        self._allocated += 1
+        port = result["udp_port"]
+        if self._waiters:
+            self._waiters.popleft()(port, None)
+        else:
+            self._ports.append(port)
+
+    def statistics(self):
+        """
+        Returns the pool statistics.
+
+        :returns: dictionary
+        """
+
+        return {"allocated": self._allocated,
+                "served_from_pool": self._served_from_pool,
+                "available": len(self._ports),
+                "waiting": len(self._waiters)}
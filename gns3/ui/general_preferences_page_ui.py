@@ -332,6 +332,9 @@ class Ui_GeneralPreferencesPageWidget(object):
         self.uiExperimentalFeaturesCheckBox = QtWidgets.QCheckBox(self.tab)
         self.uiExperimentalFeaturesCheckBox.setObjectName("uiExperimentalFeaturesCheckBox")
         self.verticalLayout_2.addWidget(self.uiExperimentalFeaturesCheckBox)
+        self.uiIncrementalSnapshotsCheckBox = QtWidgets.QCheckBox(self.tab)
+        self.uiIncrementalSnapshotsCheckBox.setObjectName("uiIncrementalSnapshotsCheckBox")
+        self.verticalLayout_2.addWidget(self.uiIncrementalSnapshotsCheckBox)
         self.uiSlowStartAllLabel = QtWidgets.QLabel(self.tab)
         self.uiSlowStartAllLabel.setObjectName("uiSlowStartAllLabel")
         self.verticalLayout_2.addWidget(self.uiSlowStartAllLabel)
@@ -417,6 +420,7 @@ class Ui_GeneralPreferencesPageWidget(object):
         self.uiCrashReportCheckBox.setText(_translate("GeneralPreferencesPageWidget", "Send anonymous crash reports"))
         self.uiStatsCheckBox.setText(_translate("GeneralPreferencesPageWidget", "Send anonymous usage statistics"))
         self.uiExperimentalFeaturesCheckBox.setText(_translate("GeneralPreferencesPageWidget", "Enable experimental features (dangerous, restart required)"))
+        self.uiIncrementalSnapshotsCheckBox.setText(_translate("GeneralPreferencesPageWidget", "Use incremental snapshots (only store files that changed)"))
         self.uiSlowStartAllLabel.setText(_translate("GeneralPreferencesPageWidget", "Delay between each device start when starting all devices:"))
         self.uiSlowStartAllSpinBox.setSuffix(_translate("GeneralPreferencesPageWidget", " seconds"))
         self.uiMiscTabWidget.setTabText(self.uiMiscTabWidget.indexOf(self.tab), _translate("GeneralPreferencesPageWidget", "Miscellaneous"))
@@ -427,6 +427,8 @@ class Ui_MainWindow(object):
         self.uiExportDebugInformationAction.setObjectName("uiExportDebugInformationAction")
         self.uiDoctorAction = QtWidgets.QAction(MainWindow)
         self.uiDoctorAction.setObjectName("uiDoctorAction")
+        self.uiNetworkStatisticsAction = QtWidgets.QAction(MainWindow)
+        self.uiNetworkStatisticsAction.setObjectName("uiNetworkStatisticsAction")
         self.uiExportProjectAction = QtWidgets.QAction(MainWindow)
         icon32 = QtGui.QIcon()
         icon32.addPixmap(QtGui.QPixmap(":/icons/export_config.svg"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
@@ -470,6 +472,7 @@ class Ui_MainWindow(object):
         self.uiHelpMenu.addAction(self.uiSetupWizard)
         self.uiHelpMenu.addAction(self.uiAcademyAction)
         self.uiHelpMenu.addAction(self.uiDoctorAction)
+        self.uiHelpMenu.addAction(self.uiNetworkStatisticsAction)
         self.uiHelpMenu.addAction(self.uiExportDebugInformationAction)
         self.uiHelpMenu.addAction(self.uiAboutQtAction)
         self.uiHelpMenu.addAction(self.uiAboutAction)
@@ -707,6 +710,7 @@ class Ui_MainWindow(object):
         self.uiExportDebugInformationAction.setText(_translate("MainWindow", "Export debug information"))
         self.uiExportDebugInformationAction.setToolTip(_translate("MainWindow", "&Export debug information"))
         self.uiDoctorAction.setText(_translate("MainWindow", "GNS3 &Doctor"))
+        self.uiNetworkStatisticsAction.setText(_translate("MainWindow", "&Network statistics"))
         self.uiExportProjectAction.setText(_translate("MainWindow", "Export portable project"))
         self.uiImportProjectAction.setText(_translate("MainWindow", "Import portable project"))
         self.uiEditReadmeAction.setText(_translate("MainWindow", "Edit readme"))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file '/home/grossmj/PycharmProjects/gns3-gui/gns3/ui/network_statistics_dialog.ui'
+#
+# Created: Mon Jul 11 10:12:31 2016
+#      by: PyQt5 UI code generator 5.2.1
+#
+# WARNING! All changes made in this file will be lost!
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+class Ui_NetworkStatisticsDialog(object):
+    def setupUi(self, NetworkStatisticsDialog):
+        NetworkStatisticsDialog.setObjectName("NetworkStatisticsDialog")
+        NetworkStatisticsDialog.resize(900, 450)
+        NetworkStatisticsDialog.setModal(False)
+        self.verticalLayout = QtWidgets.QVBoxLayout(NetworkStatisticsDialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.uiSummaryLabel = QtWidgets.QLabel(NetworkStatisticsDialog)
+        self.uiSummaryLabel.setText("")
+        self.uiSummaryLabel.setObjectName("uiSummaryLabel")
+        self.verticalLayout.addWidget(self.uiSummaryLabel)
+        self.uiStatisticsTreeWidget = QtWidgets.QTreeWidget(NetworkStatisticsDialog)
+        self.uiStatisticsTreeWidget.setRootIsDecorated(False)
+        self.uiStatisticsTreeWidget.setObjectName("uiStatisticsTreeWidget")
+        self.verticalLayout.addWidget(self.uiStatisticsTreeWidget)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.uiResetPushButton = QtWidgets.QPushButton(NetworkStatisticsDialog)
+        self.uiResetPushButton.setObjectName("uiResetPushButton")
+        self.horizontalLayout.addWidget(self.uiResetPushButton)
+        self.uiExportPushButton = QtWidgets.QPushButton(NetworkStatisticsDialog)
+        self.uiExportPushButton.setObjectName("uiExportPushButton")
+        self.horizontalLayout.addWidget(self.uiExportPushButton)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.uiButtonBox = QtWidgets.QDialogButtonBox(NetworkStatisticsDialog)
+        self.uiButtonBox.setOrientation(QtCore.Qt.Horizontal)
+        self.uiButtonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Close)
+        self.uiButtonBox.setObjectName("uiButtonBox")
+        self.horizontalLayout.addWidget(self.uiButtonBox)
+        self.verticalLayout.addLayout(self.horizontalLayout)
+
+        self.retranslateUi(NetworkStatisticsDialog)
+        self.uiButtonBox.rejected.connect(NetworkStatisticsDialog.reject)
+        QtCore.QMetaObject.connectSlotsByName(NetworkStatisticsDialog)
+
+    def retranslateUi(self, NetworkStatisticsDialog):
+        _translate = QtCore.QCoreApplication.translate
+        NetworkStatisticsDialog.setWindowTitle(_translate("NetworkStatisticsDialog", "Network statistics"))
+        self.uiStatisticsTreeWidget.setSortingEnabled(True)
+        self.uiStatisticsTreeWidget.headerItem().setText(0, _translate("NetworkStatisticsDialog", "Server"))
+        self.uiStatisticsTreeWidget.headerItem().setText(1, _translate("NetworkStatisticsDialog", "Method"))
+        self.uiStatisticsTreeWidget.headerItem().setText(2, _translate("NetworkStatisticsDialog", "Endpoint"))
+        self.uiStatisticsTreeWidget.headerItem().setText(3, _translate("NetworkStatisticsDialog", "Count"))
+        self.uiStatisticsTreeWidget.headerItem().setText(4, _translate("NetworkStatisticsDialog", "Errors"))
+        self.uiStatisticsTreeWidget.headerItem().setText(5, _translate("NetworkStatisticsDialog", "In flight"))
+        self.uiStatisticsTreeWidget.headerItem().setText(6, _translate("NetworkStatisticsDialog", "p50 (ms)"))
+        self.uiStatisticsTreeWidget.headerItem().setText(7, _translate("NetworkStatisticsDialog", "p95 (ms)"))
+        self.uiStatisticsTreeWidget.headerItem().setText(8, _translate("NetworkStatisticsDialog", "p99 (ms)"))
+        self.uiStatisticsTreeWidget.headerItem().setText(9, _translate("NetworkStatisticsDialog", "Received"))
+        self.uiStatisticsTreeWidget.headerItem().setText(10, _translate("NetworkStatisticsDialog", "Sent"))
+        self.uiResetPushButton.setText(_translate("NetworkStatisticsDialog", "&Reset"))
+        self.uiExportPushButton.setText(_translate("NetworkStatisticsDialog", "&Export..."))
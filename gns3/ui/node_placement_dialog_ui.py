@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file '/home/grossmj/PycharmProjects/gns3-gui/gns3/ui/node_placement_dialog.ui'
+#
+# Created: Mon Jul 11 10:12:31 2016
+#      by: PyQt5 UI code generator 5.2.1
+#
+# WARNING! All changes made in this file will be lost!
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+class Ui_NodePlacementDialog(object):
+    def setupUi(self, NodePlacementDialog):
+        NodePlacementDialog.setObjectName("NodePlacementDialog")
+        NodePlacementDialog.resize(320, 200)
+        NodePlacementDialog.setModal(True)
+        self.verticalLayout = QtWidgets.QVBoxLayout(NodePlacementDialog)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.formLayout = QtWidgets.QFormLayout()
+        self.formLayout.setObjectName("formLayout")
+        self.uiCountLabel = QtWidgets.QLabel(NodePlacementDialog)
+        self.uiCountLabel.setObjectName("uiCountLabel")
+        self.formLayout.setWidget(0, QtWidgets.QFormLayout.LabelRole, self.uiCountLabel)
+        self.uiCountSpinBox = QtWidgets.QSpinBox(NodePlacementDialog)
+        self.uiCountSpinBox.setMinimum(1)
+        self.uiCountSpinBox.setMaximum(1000)
+        self.uiCountSpinBox.setProperty("value", 2)
+        self.uiCountSpinBox.setObjectName("uiCountSpinBox")
+        self.formLayout.setWidget(0, QtWidgets.QFormLayout.FieldRole, self.uiCountSpinBox)
+        self.uiLayoutLabel = QtWidgets.QLabel(NodePlacementDialog)
+        self.uiLayoutLabel.setObjectName("uiLayoutLabel")
+        self.formLayout.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.uiLayoutLabel)
+        self.uiLayoutComboBox = QtWidgets.QComboBox(NodePlacementDialog)
+        self.uiLayoutComboBox.setObjectName("uiLayoutComboBox")
+        self.formLayout.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.uiLayoutComboBox)
+        self.uiNodesPerLineLabel = QtWidgets.QLabel(NodePlacementDialog)
+        self.uiNodesPerLineLabel.setObjectName("uiNodesPerLineLabel")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.LabelRole, self.uiNodesPerLineLabel)
+        self.uiNodesPerLineSpinBox = QtWidgets.QSpinBox(NodePlacementDialog)
+        self.uiNodesPerLineSpinBox.setMinimum(1)
+        self.uiNodesPerLineSpinBox.setMaximum(100)
+        self.uiNodesPerLineSpinBox.setProperty("value", 10)
+        self.uiNodesPerLineSpinBox.setObjectName("uiNodesPerLineSpinBox")
+        self.formLayout.setWidget(2, QtWidgets.QFormLayout.FieldRole, self.uiNodesPerLineSpinBox)
+        self.uiSpacingLabel = QtWidgets.QLabel(NodePlacementDialog)
+        self.uiSpacingLabel.setObjectName("uiSpacingLabel")
+        self.formLayout.setWidget(3, QtWidgets.QFormLayout.LabelRole, self.uiSpacingLabel)
+        self.uiSpacingSpinBox = QtWidgets.QSpinBox(NodePlacementDialog)
+        self.uiSpacingSpinBox.setMinimum(20)
+        self.uiSpacingSpinBox.setMaximum(1000)
+        self.uiSpacingSpinBox.setProperty("value", 100)
+        self.uiSpacingSpinBox.setObjectName("uiSpacingSpinBox")
+        self.formLayout.setWidget(3, QtWidgets.QFormLayout.FieldRole, self.uiSpacingSpinBox)
+        self.verticalLayout.addLayout(self.formLayout)
+        spacerItem = QtWidgets.QSpacerItem(20, 10, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout.addItem(spacerItem)
+        self.uiButtonBox = QtWidgets.QDialogButtonBox(NodePlacementDialog)
+        self.uiButtonBox.setOrientation(QtCore.Qt.Horizontal)
+        self.uiButtonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Cancel|QtWidgets.QDialogButtonBox.Ok)
+        self.uiButtonBox.setObjectName("uiButtonBox")
+        self.verticalLayout.addWidget(self.uiButtonBox)
+
+        self.retranslateUi(NodePlacementDialog)
+        self.uiButtonBox.accepted.connect(NodePlacementDialog.accept)
+        self.uiButtonBox.rejected.connect(NodePlacementDialog.reject)
+        QtCore.QMetaObject.connectSlotsByName(NodePlacementDialog)
+
+    def retranslateUi(self, NodePlacementDialog):
+        _translate = QtCore.QCoreApplication.translate
+        NodePlacementDialog.setWindowTitle(_translate("NodePlacementDialog", "Place nodes"))
+        self.uiCountLabel.setText(_translate("NodePlacementDialog", "Number of nodes:"))
+        self.uiLayoutLabel.setText(_translate("NodePlacementDialog", "Layout:"))
+        self.uiNodesPerLineLabel.setText(_translate("NodePlacementDialog", "Nodes per line:"))
+        self.uiSpacingLabel.setText(_translate("NodePlacementDialog", "Spacing:"))
+        self.uiSpacingSpinBox.setSuffix(_translate("NodePlacementDialog", " pixels"))
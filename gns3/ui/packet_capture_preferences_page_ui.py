@@ -52,13 +52,49 @@ class Ui_PacketCapturePreferencesPageWidget(object):
         self.uiCaptureAnalyzerCommandLineEdit.setObjectName("uiCaptureAnalyzerCommandLineEdit")
         self.gridlayout.addWidget(self.uiCaptureAnalyzerCommandLineEdit, 6, 0, 1, 2)
         self.gridLayout.addWidget(self.uiSettingsGroupBox, 0, 0, 1, 2)
+        self.uiRingBufferGroupBox = QtWidgets.QGroupBox(PacketCapturePreferencesPageWidget)
+        self.uiRingBufferGroupBox.setCheckable(True)
+        self.uiRingBufferGroupBox.setChecked(False)
+        self.uiRingBufferGroupBox.setObjectName("uiRingBufferGroupBox")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.uiRingBufferGroupBox)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.uiRingBufferFileSizeLabel = QtWidgets.QLabel(self.uiRingBufferGroupBox)
+        self.uiRingBufferFileSizeLabel.setObjectName("uiRingBufferFileSizeLabel")
+        self.gridLayout_2.addWidget(self.uiRingBufferFileSizeLabel, 0, 0, 1, 1)
+        self.uiRingBufferFileSizeSpinBox = QtWidgets.QSpinBox(self.uiRingBufferGroupBox)
+        self.uiRingBufferFileSizeSpinBox.setMinimum(0)
+        self.uiRingBufferFileSizeSpinBox.setMaximum(100000)
+        self.uiRingBufferFileSizeSpinBox.setProperty("value", 100)
+        self.uiRingBufferFileSizeSpinBox.setObjectName("uiRingBufferFileSizeSpinBox")
+        self.gridLayout_2.addWidget(self.uiRingBufferFileSizeSpinBox, 0, 1, 1, 1)
+        self.uiRingBufferDurationLabel = QtWidgets.QLabel(self.uiRingBufferGroupBox)
+        self.uiRingBufferDurationLabel.setObjectName("uiRingBufferDurationLabel")
+        self.gridLayout_2.addWidget(self.uiRingBufferDurationLabel, 1, 0, 1, 1)
+        self.uiRingBufferDurationSpinBox = QtWidgets.QSpinBox(self.uiRingBufferGroupBox)
+        self.uiRingBufferDurationSpinBox.setMinimum(0)
+        self.uiRingBufferDurationSpinBox.setMaximum(86400)
+        self.uiRingBufferDurationSpinBox.setObjectName("uiRingBufferDurationSpinBox")
+        self.gridLayout_2.addWidget(self.uiRingBufferDurationSpinBox, 1, 1, 1, 1)
+        self.uiRingBufferFilesLabel = QtWidgets.QLabel(self.uiRingBufferGroupBox)
+        self.uiRingBufferFilesLabel.setObjectName("uiRingBufferFilesLabel")
+        self.gridLayout_2.addWidget(self.uiRingBufferFilesLabel, 2, 0, 1, 1)
+        self.uiRingBufferFilesSpinBox = QtWidgets.QSpinBox(self.uiRingBufferGroupBox)
+        self.uiRingBufferFilesSpinBox.setMinimum(0)
+        self.uiRingBufferFilesSpinBox.setMaximum(10000)
+        self.uiRingBufferFilesSpinBox.setProperty("value", 10)
+        self.uiRingBufferFilesSpinBox.setObjectName("uiRingBufferFilesSpinBox")
+        self.gridLayout_2.addWidget(self.uiRingBufferFilesSpinBox, 2, 1, 1, 1)
+        self.gridLayout.addWidget(self.uiRingBufferGroupBox, 1, 0, 1, 2)
+        self.uiPcapngCheckBox = QtWidgets.QCheckBox(PacketCapturePreferencesPageWidget)
+        self.uiPcapngCheckBox.setObjectName("uiPcapngCheckBox")
+        self.gridLayout.addWidget(self.uiPcapngCheckBox, 2, 0, 1, 2)
         spacerItem = QtWidgets.QSpacerItem(253, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
-        self.gridLayout.addItem(spacerItem, 1, 0, 1, 1)
+        self.gridLayout.addItem(spacerItem, 3, 0, 1, 1)
         self.uiRestoreDefaultsPushButton = QtWidgets.QPushButton(PacketCapturePreferencesPageWidget)
         self.uiRestoreDefaultsPushButton.setObjectName("uiRestoreDefaultsPushButton")
-        self.gridLayout.addWidget(self.uiRestoreDefaultsPushButton, 1, 1, 1, 1)
+        self.gridLayout.addWidget(self.uiRestoreDefaultsPushButton, 3, 1, 1, 1)
         spacerItem1 = QtWidgets.QSpacerItem(20, 5, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        self.gridLayout.addItem(spacerItem1, 2, 0, 1, 2)
+        self.gridLayout.addItem(spacerItem1, 4, 0, 1, 2)
 
         self.retranslateUi(PacketCapturePreferencesPageWidget)
         QtCore.QMetaObject.connectSlotsByName(PacketCapturePreferencesPageWidget)
@@ -73,5 +109,15 @@ class Ui_PacketCapturePreferencesPageWidget(object):
         self.uiAutoStartCheckBox.setText(_translate("PacketCapturePreferencesPageWidget", "Automatically start the packet capture application"))
         self.uiPreconfiguredCaptureReaderCommandLabel.setText(_translate("PacketCapturePreferencesPageWidget", "Preconfigured packet capture reader commands:"))
         self.uiPreconfiguredCaptureReaderCommandPushButton.setText(_translate("PacketCapturePreferencesPageWidget", "&Set"))
+        self.uiRingBufferGroupBox.setTitle(_translate("PacketCapturePreferencesPageWidget", "Ring buffer for captures streamed from remote servers"))
+        self.uiRingBufferFileSizeLabel.setText(_translate("PacketCapturePreferencesPageWidget", "Start a new file after:"))
+        self.uiRingBufferFileSizeSpinBox.setSpecialValueText(_translate("PacketCapturePreferencesPageWidget", "No size limit"))
+        self.uiRingBufferFileSizeSpinBox.setSuffix(_translate("PacketCapturePreferencesPageWidget", " MB"))
+        self.uiRingBufferDurationLabel.setText(_translate("PacketCapturePreferencesPageWidget", "Or after:"))
+        self.uiRingBufferDurationSpinBox.setSpecialValueText(_translate("PacketCapturePreferencesPageWidget", "No time limit"))
+        self.uiRingBufferDurationSpinBox.setSuffix(_translate("PacketCapturePreferencesPageWidget", " seconds"))
+        self.uiRingBufferFilesLabel.setText(_translate("PacketCapturePreferencesPageWidget", "Number of files to keep:"))
+        self.uiRingBufferFilesSpinBox.setSpecialValueText(_translate("PacketCapturePreferencesPageWidget", "All"))
+        self.uiPcapngCheckBox.setText(_translate("PacketCapturePreferencesPageWidget", "Save captures streamed from remote servers in the PCAPNG format"))
         self.uiRestoreDefaultsPushButton.setText(_translate("PacketCapturePreferencesPageWidget", "Restore defaults"))
 
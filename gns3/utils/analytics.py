@@ -72,7 +72,7 @@ class AnalyticsClient(QtCore.QObject):
 
         self._rate_limit[screen] = datetime.utcnow().timestamp()
 
-        settings = LocalConfig.instance().loadSectionSettings("MainWindow", GENERAL_SETTINGS)
+        settings = LocalConfig.instance().sectionView("MainWindow", GENERAL_SETTINGS)
         if settings["send_stats"] is False:
             log.debug("Stats is turn off ignore call %s", screen)
             return
@@ -16,12 +16,19 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import sys
 import zipfile
 import shutil
 
 from ..qt import QtCore
 from ..servers import Servers
 
+import logging
+log = logging.getLogger(__name__)
+
+# Size of the buffer used to write the archive
+BUFFER_SIZE = 1024 * 1024
+
 
 class ExportProjectWorker(QtCore.QObject):
     """
@@ -32,78 +39,167 @@ class ExportProjectWorker(QtCore.QObject):
     error = QtCore.pyqtSignal(str, bool)
     finished = QtCore.pyqtSignal()
     updated = QtCore.pyqtSignal(int)
+    bytes_updated = QtCore.pyqtSignal("qint64", "qint64")
 
     def __init__(self, project, path, include_images):
         super().__init__()
         self._project = project
         self._include_images = include_images
         self._path = path
+        self._is_running = False
+        self._response = None
+        self._file = None
+        self._vm_archive = None
+        self._received = 0
 
     def run(self):
 
+        self._is_running = True
         vm_server = None
         for server in self._project.servers():
             if server.isGNS3VM():
                 vm_server = server
 
         if vm_server:
-            self._project.get(vm_server,
-                              "/export",
-                              self._exportVmReceived,
-                              downloadProgressCallback=self._downloadFileProgress)
+            # the VM archive is downloaded first and merged in the local archive at the end
+            self._vm_archive = self._path + ".vm.tmp"
+            if self._openArchive(self._vm_archive):
+                self._response = self._project.get(vm_server,
+                                                   "/export",
+                                                   self._exportVmReceived,
+                                                   downloadProgressCallback=self._downloadFileProgress)
         else:
-            self._project.get(Servers.instance().localServer(),
-                              "/export?include_images={}".format(self._include_images),
-                              self._exportLocalReceived,
-                              downloadProgressCallback=self._downloadFileProgress)
+            self._exportLocal()
 
-    def _exportVmReceived(self, content, error=False, server=None, context={}, **kwargs):
-        if error:
-            self.error.emit("Can't export the project from the VM", True)
-            self.finished.emit()
-            return
+    def _openArchive(self, path):
+        """
+        Opens the file receiving the archive, it stays open during all the download.
+        """
 
-        vm_path = os.path.join(self._project.filesDir(), "servers", "vm")
-        if os.path.exists(vm_path):
-            shutil.rmtree(vm_path, ignore_errors=True)
         try:
-            os.makedirs(vm_path, exist_ok=True)
+            self._file = open(path, "wb", buffering=BUFFER_SIZE)
         except OSError as e:
-            self.error.emit("Can't create directory {}: {}".format(vm_path, e), True)
+            self.error.emit("Can't write project file {}: {}".format(path, e), True)
             self.finished.emit()
-            return
+            return False
+        return True
 
-        with zipfile.ZipFile(self._path) as myzip:
-            myzip.extractall(vm_path)
+    def _closeArchive(self):
 
-        # We reset the content of the file
-        try:
-            open(self._path, 'wb+').close()
-        except OSError as e:
-            self.error.emit("Can't write project file {}: {}".format(self._path, e), True)
+        if self._file:
+            try:
+                self._file.close()
+            except OSError as e:
+                log.error("Can't close project file {}: {}".format(self._file.name, e))
+            self._file = None
+
+    def _removeTemporaryFiles(self):
+
+        if self._vm_archive:
+            try:
+                os.remove(self._vm_archive)
+            except OSError:
+                pass
+            self._vm_archive = None
+
+    def _exportLocal(self):
+
+        if self._openArchive(self._path):
+            self._response = self._project.get(Servers.instance().localServer(),
+                                               "/export?include_images={}".format(self._include_images),
+                                               self._exportLocalReceived,
+                                               downloadProgressCallback=self._downloadFileProgress)
+
+    def _exportVmReceived(self, content, error=False, server=None, context={}, **kwargs):
+        self._closeArchive()
+        if not self._is_running:
+            return
+        if error:
+            self._removeTemporaryFiles()
+            self.error.emit("Can't export the project from the VM", True)
             self.finished.emit()
             return
 
-        self._project.get(Servers.instance().localServer(), "/export?include_images={}".format(self._include_images), self._exportLocalReceived, downloadProgressCallback=self._downloadFileProgress)
+        # the VM files are merged from the VM archive, a local copy must not be exported
+        shutil.rmtree(os.path.join(self._project.filesDir(), "servers", "vm"), ignore_errors=True)
+        self._exportLocal()
 
     def _exportLocalReceived(self, content, error=False, server=None, context={}, **kwargs):
+        self._closeArchive()
+        if not self._is_running:
+            return
         if error:
+            self._removeTemporaryFiles()
             self.error.emit("Can't export the project from the local server", True)
             self.finished.emit()
             return
+
+        if self._vm_archive:
+            try:
+                self._mergeArchive(self._vm_archive, "servers/vm/")
+            except (OSError, zipfile.BadZipfile) as e:
+                self.error.emit("Can't add the VM files to the project file {}: {}".format(self._path, e), True)
+                self.finished.emit()
+                return
+            finally:
+                self._removeTemporaryFiles()
         self.finished.emit()
 
+    def _mergeArchive(self, source_path, prefix):
+        """
+        Appends the files of an archive to the exported project
+        without extracting them on disk.
+
+        :param source_path: path to the archive to merge
+        :param prefix: path of the files in the exported project
+        """
+
+        with zipfile.ZipFile(source_path) as source_zip, zipfile.ZipFile(self._path, "a", allowZip64=True) as project_zip:
+            for info in source_zip.infolist():
+                if not self._is_running:
+                    return
+                target_info = zipfile.ZipInfo(prefix + info.filename, info.date_time)
+                target_info.compress_type = info.compress_type
+                target_info.external_attr = info.external_attr
+                if info.filename.endswith("/"):
+                    project_zip.writestr(target_info, b"")
+                    continue
+                with source_zip.open(info) as source:
+                    if sys.version_info >= (3, 6):
+                        with project_zip.open(target_info, "w", force_zip64=True) as target:
+                            shutil.copyfileobj(source, target, BUFFER_SIZE)
+                    else:
+                        project_zip.writestr(target_info, source.read())
+
     def _downloadFileProgress(self, content, server=None, context={}, **kwargs):
         """
         Called for each part of the file
         """
+
+        if not self._is_running or self._file is None:
+            return
         try:
-            with open(self._path, 'ab') as f:
-                f.write(content)
+            self._file.write(content)
         except OSError as e:
             self.error.emit("Can't write project file {}: {}".format(self._path, e), True)
-            self.finished.emit()
+            self.cancel()
             return
+        self._received += len(content)
+        self.bytes_updated.emit(self._received, 0)
 
     def cancel(self):
-        pass
+        """
+        Cancel this worker.
+        """
+
+        if not self:
+            return
+        self._is_running = False
+        if self._response is not None and self._response.isRunning():
+            self._response.abort()
+        self._closeArchive()
+        self._removeTemporaryFiles()
+        try:
+            os.remove(self._path)
+        except OSError:
+            pass
@@ -16,7 +16,6 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import pathlib
-import zipfile
 import uuid
 import os
 import sys
@@ -25,6 +24,7 @@ import sys
 from ..qt import QtCore
 from ..servers import Servers
 from ..gns3_vm import GNS3VM
+from .zip_stream_device import ZipStreamDevice
 
 
 class ImportProjectWorker(QtCore.QObject):
@@ -37,15 +37,29 @@ class ImportProjectWorker(QtCore.QObject):
     finished = QtCore.pyqtSignal()
     updated = QtCore.pyqtSignal(int)
     imported = QtCore.pyqtSignal(str)
+    bytes_updated = QtCore.pyqtSignal("qint64", "qint64")
 
     def __init__(self, source, new_project_settings):
         super().__init__()
         self._source = source
         self._new_project_settings = new_project_settings
         self._project_uuid = str(uuid.uuid4())
+        self._is_running = False
+        self._response = None
+
+    def _setResponse(self, response):
+        """
+        Keep the running query to report the upload progress and to be able to cancel it.
+        """
+
+        self._response = response
+        if response is not None:
+            response.uploadProgress.connect(self.bytes_updated)
 
     def run(self):
 
+        self._is_running = True
+
         self._dst = self._new_project_settings['project_files_dir']
         name = self._new_project_settings['project_name']
         self._project_file = self._new_project_settings['project_path']
@@ -54,6 +68,8 @@ class ImportProjectWorker(QtCore.QObject):
                                               timeout=None)
 
     def _createProjectCallback(self, content, error=False, server=None, context={}, **kwargs):
+        if not self._is_running:
+            return
         if error:
             self.error.emit("Can't import the project", True)
             self.finished.emit()
@@ -61,12 +77,13 @@ class ImportProjectWorker(QtCore.QObject):
 
         self.updated.emit(25)
         if sys.platform.startswith("linux") and not GNS3VM.instance().isRunning():
-            Servers.instance().localServer().post("/projects/{}/import?gns3vm=0".format(self._project_uuid), self._importProjectCallback, body=pathlib.Path(self._source), timeout=None)
+            self._setResponse(Servers.instance().localServer().post("/projects/{}/import?gns3vm=0".format(self._project_uuid), self._importProjectCallback, body=pathlib.Path(self._source), timeout=None))
         else:
-            Servers.instance().localServer().post("/projects/{}/import?gns3vm=1".format(self._project_uuid), self._importProjectCallback, body=pathlib.Path(self._source), timeout=None)
-
+            self._setResponse(Servers.instance().localServer().post("/projects/{}/import?gns3vm=1".format(self._project_uuid), self._importProjectCallback, body=pathlib.Path(self._source), timeout=None))
 
     def _importProjectCallback(self, content, error=False, server=None, context={}, **kwargs):
+        if not self._is_running:
+            return
         if error:
             self.error.emit("Can't import the project", True)
             self.finished.emit()
@@ -80,26 +97,21 @@ class ImportProjectWorker(QtCore.QObject):
                 self.finished.emit()
                 return
 
-            self._zippath = os.path.join(self._dst, "servers", "vm.zip")
-            with zipfile.ZipFile(self._zippath, 'w') as z:
-                for root, dirs, files in os.walk(os.path.join(self._dst, "servers", "vm")):
-                    for file in files:
-                        path = os.path.join(root, file)
-                        z.write(path, os.path.relpath(path, os.path.join(self._dst, "servers", "vm")))
-
-            Servers.instance().vmServer().post("/projects/{}/import".format(self._project_uuid), self._importProjectVMCallback, body=pathlib.Path(self._zippath))
+            # the archive is generated while it is uploaded
+            try:
+                body = ZipStreamDevice(os.path.join(self._dst, "servers", "vm"))
+            except OSError as e:
+                self.error.emit("Can't read the GNS3 VM files: {}".format(e), True)
+                self.finished.emit()
+                return
+            self._setResponse(Servers.instance().vmServer().post("/projects/{}/import".format(self._project_uuid), self._importProjectVMCallback, body=body, timeout=None))
         else:
             self.finished.emit()
             self.imported.emit(self._project_file)
 
     def _importProjectVMCallback(self, content, error=False, server=None, context={}, **kwargs):
-        try:
-            os.remove(self._zippath)
-        except OSError as e:
-            self.error.emit("Can't write the topology {}: {}".format(self._path, str(e)), True)
-            self.finished.emit()
+        if not self._is_running:
             return
-
         if error:
             self.error.emit("Can't import the project", True)
             self.finished.emit()
@@ -108,5 +120,13 @@ class ImportProjectWorker(QtCore.QObject):
         self.imported.emit(self._project_file)
 
     def cancel(self):
-        pass
+        """
+        Cancel this worker.
+        """
+
+        if not self:
+            return
+        self._is_running = False
+        if self._response is not None and self._response.isRunning():
+            self._response.abort()
 
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import re
+import heapq
+
+# the numbers allocated are lower than this limit
+MAX_NUMBER = 100000
+
+
+class _Pattern:
+
+    """
+    Allocation state of a name pattern: the numbers lower than
+    next_number are allocated, except the ones in the free list.
+    """
+
+    def __init__(self, base_name):
+
+        if '{0}' in base_name or '{id}' in base_name:
+            parts = re.split(r"\{0\}|\{id\}", base_name)
+        else:
+            parts = [base_name, ""]
+        self._parts = parts
+        self._regex = re.compile("^" + r"(\d+)".join(re.escape(part) for part in parts) + "$")
+        self.next_number = 1
+        self.free_numbers = []
+
+    def name(self, number):
+
+        return str(number).join(self._parts)
+
+    def number(self, name):
+        """
+        Returns the number of a name matching the pattern, or None.
+        """
+
+        match = self._regex.match(name)
+        if match is None:
+            return None
+        numbers = set(match.groups())
+        if len(numbers) != 1:
+            return None
+        number = numbers.pop()
+        if number.startswith("0"):
+            return None
+        return int(number)
+
+
+class NameAllocator:
+
+    """
+    Allocates unique names made of a base name and the lowest free number.
+
+    A base name is completed with the number, or the number replaces {0}
+    or {id}. Each base name keeps the next number never allocated and a
+    free list of the lower numbers released, so allocating a name does not
+    try all the numbers from 1.
+    """
+
+    def __init__(self):
+
+        self._names = set()
+        self._patterns = {}
+
+    def clear(self):
+        """
+        Forgets all the names.
+        """
+
+        self._names.clear()
+        self._patterns.clear()
+
+    def load(self, names):
+        """
+        Adds many names at once, for instance when a topology is loaded.
+        The state of each base name is computed again the first time it is used.
+
+        :param names: iterable of names
+        """
+
+        self._names.update(name for name in names if name)
+        self._patterns.clear()
+
+    def allocate(self, base_name):
+        """
+        Allocates the name with the lowest free number.
+
+        :param base_name: base name
+
+        :returns: allocated name or None if one could not be found
+        """
+
+        pattern = self._patterns.get(base_name)
+        if pattern is None:
+            pattern = self._patterns[base_name] = _Pattern(base_name)
+
+        # a released number may have been taken again with add()
+        while pattern.free_numbers:
+            number = heapq.heappop(pattern.free_numbers)
+            name = pattern.name(number)
+            if name not in self._names:
+                self._names.add(name)
+                return name
+
+        # skip the names added with add()
+        while pattern.next_number < MAX_NUMBER:
+            number = pattern.next_number
+            pattern.next_number += 1
+            name = pattern.name(number)
+            if name not in self._names:
+                self._names.add(name)
+                return name
+        return None
+
+    def add(self, name):
+        """
+        Marks a name as allocated.
+
+        :param name: name
+        """
+
+        self._names.add(name)
+
+    def remove(self, name):
+        """
+        Releases a name, its number can be allocated again.
+
+        :param name: name
+        """
+
+        if name not in self._names:
+            return
+        self._names.remove(name)
+        for pattern in self._patterns.values():
+            number = pattern.number(name)
+            if number is not None and number < pattern.next_number:
+                heapq.heappush(pattern.free_numbers, number)
+
+    def __contains__(self, name):
+
+        return name in self._names
+
+    def __len__(self):
+
+        return len(self._names)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import math
+
+LAYOUTS = ("grid", "ring", "line")
+
+
+def node_layout(layout, count, spacing=100, nodes_per_line=10):
+    """
+    Computes the positions of nodes placed together.
+
+    :param layout: grid, ring or line
+    :param count: number of nodes
+    :param spacing: distance between two neighbour nodes
+    :param nodes_per_line: number of nodes on a line of the grid
+
+    :returns: list of (x, y) offsets from the first position
+    """
+
+    if layout == "grid":
+        return [((number % nodes_per_line) * spacing, (number // nodes_per_line) * spacing) for number in range(count)]
+    elif layout == "line":
+        return [(number * spacing, 0) for number in range(count)]
+    elif layout == "ring":
+        if count == 1:
+            return [(0, 0)]
+        # the radius keeps the neighbour nodes spacing apart
+        radius = max(spacing, spacing / (2 * math.sin(math.pi / count)))
+        positions = []
+        for number in range(count):
+            angle = 2 * math.pi * number / count - math.pi / 2
+            positions.append((radius + radius * math.cos(angle), radius + radius * math.sin(angle)))
+        return positions
+    raise ValueError("Unknown layout {}".format(layout))
@@ -21,6 +21,7 @@ Progress dialog that blocking tasks (file operations, network connections etc.)
 
 import sip
 from ..qt import QtWidgets, QtCore, qslot
+from ..utils import human_filesize
 
 import logging
 log = logging.getLogger(__name__)
@@ -64,6 +65,10 @@ class ProgressDialog(QtWidgets.QProgressDialog):
         self._worker.finished.connect(self.accept)
         self._worker.updated.connect(self._updateProgressSlot)
         self._worker.error.connect(self._error)
+        # workers transferring data can report their progress in bytes
+        self._label_text = label_text
+        if hasattr(self._worker, "bytes_updated"):
+            self._worker.bytes_updated.connect(self._updateBytesSlot)
         self._thread.started.connect(self._worker.run)
 
         self._countdownTimer = None
@@ -147,6 +152,20 @@ class ProgressDialog(QtWidgets.QProgressDialog):
             # It seems in some cases this is called on a deleted object and crash
             self.setValue(value)
 
+    @qslot
+    def _updateBytesSlot(self, done, total):
+        """
+        Slot to show the number of bytes processed.
+
+        :param done: number of bytes processed
+        :param total: total number of bytes (0 if unknown)
+        """
+
+        if total > 0:
+            self.setLabelText("{} ({} of {})".format(self._label_text, human_filesize(done), human_filesize(total)))
+        else:
+            self.setLabelText("{} ({})".format(self._label_text, human_filesize(done)))
+
     @qslot
     def _error(self, message, stop=False):
         """
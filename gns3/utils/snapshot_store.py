@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Content-addressed store for incremental project snapshots.
+
+Files are stored once under snapshots/objects/ using their SHA-256 as name
+and each snapshot is a JSON manifest under snapshots/manifests/ mapping the
+relative path of every project file to its object. Creating a snapshot only
+hashes and stores the files which changed since the previous snapshot and
+restoring one only rewrites the files which differ from the project.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+
+import logging
+log = logging.getLogger(__name__)
+
+# ioctl request number to clone a file on Linux (btrfs, xfs...)
+FICLONE = 0x40049409
+
+
+class SnapshotStoreError(Exception):
+    pass
+
+
+class SnapshotStore:
+
+    """
+    Incremental snapshot store.
+
+    :param snapshots_dir: path to the project snapshots directory
+    """
+
+    def __init__(self, snapshots_dir):
+
+        self._snapshots_dir = snapshots_dir
+        self._objects_dir = os.path.join(snapshots_dir, "objects")
+        self._manifests_dir = os.path.join(snapshots_dir, "manifests")
+
+    @staticmethod
+    def isManifest(path):
+        """
+        Returns True if the path is an incremental snapshot manifest.
+
+        :param path: path to a snapshot
+        """
+
+        return path.endswith(".json") and os.path.basename(os.path.dirname(path)) == "manifests"
+
+    def manifestsDir(self):
+        """
+        Returns the directory where the snapshot manifests are stored.
+        """
+
+        return self._manifests_dir
+
+    def _objectPath(self, digest):
+
+        return os.path.join(self._objects_dir, digest[:2], digest[2:])
+
+    def _loadManifest(self, path):
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise SnapshotStoreError("Could not read snapshot manifest {}: {}".format(path, e))
+
+    def _manifests(self):
+        """
+        Returns all the manifests sorted by creation time.
+
+        :returns: list of (path, manifest) tuples
+        """
+
+        if not os.path.isdir(self._manifests_dir):
+            return []
+        manifests = []
+        for name in os.listdir(self._manifests_dir):
+            path = os.path.join(self._manifests_dir, name)
+            if not name.endswith(".json"):
+                continue
+            try:
+                manifests.append((path, self._loadManifest(path)))
+            except SnapshotStoreError as e:
+                log.warning(str(e))
+        return sorted(manifests, key=lambda m: m[1].get("created", 0))
+
+    def snapshots(self):
+        """
+        Returns the snapshots with their sizes. The incremental size is the
+        size of the objects a snapshot added to the store, this is what deleting
+        the snapshot alone would give back if no later snapshot uses them.
+
+        :returns: list of dictionaries sorted by creation time
+        """
+
+        snapshots = []
+        seen = set()
+        for path, manifest in self._manifests():
+            total_size = 0
+            incremental_size = 0
+            for entry in manifest.get("files", {}).values():
+                total_size += entry["size"]
+                if entry["hash"] not in seen:
+                    seen.add(entry["hash"])
+                    incremental_size += entry["size"]
+            snapshots.append({"path": path,
+                              "name": manifest.get("name", ""),
+                              "created": manifest.get("created", 0),
+                              "total_size": total_size,
+                              "incremental_size": incremental_size})
+        return snapshots
+
+    @staticmethod
+    def _hashFile(path):
+
+        m = hashlib.sha256()
+        with open(path, "rb") as f:
+            while True:
+                buf = f.read(1024 * 1024)
+                if not buf:
+                    break
+                m.update(buf)
+        return m.hexdigest()
+
+    @staticmethod
+    def _cloneFile(source, destination):
+        """
+        Copies a file using a reflink when the filesystem supports it,
+        falls back to a regular copy otherwise.
+        """
+
+        if sys.platform.startswith("linux"):
+            import fcntl
+            try:
+                with open(source, "rb") as src, open(destination, "wb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return
+            except OSError:
+                pass
+        shutil.copyfile(source, destination)
+
+    def _storeObject(self, source, digest):
+        """
+        Adds a file to the object store if it is not already there.
+
+        The file may change between the time it is hashed and the time it is
+        copied (for instance the disk of a running node), so the copy is hashed
+        again and stored under the digest of what has actually been copied.
+
+        :param source: path to the file
+        :param digest: digest of the file when it was hashed
+
+        :returns: tuple (digest, size) of the stored object, None if the object was already there
+        """
+
+        if os.path.exists(self._objectPath(digest)):
+            return None
+        os.makedirs(self._snapshots_dir, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(suffix=".tmp", dir=self._snapshots_dir)
+        os.close(fd)
+        try:
+            self._cloneFile(source, temporary)
+            copied_digest = self._hashFile(temporary)
+            size = os.path.getsize(temporary)
+            object_path = self._objectPath(copied_digest)
+            if copied_digest != digest:
+                log.warning("{} has changed while it was copied to the snapshot".format(source))
+            if os.path.exists(object_path):
+                os.remove(temporary)
+            else:
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                os.replace(temporary, object_path)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return copied_digest, size
+
+    def create(self, name, source_dir, skip_dirs=None, progress_callback=None):
+        """
+        Creates a new snapshot of a directory.
+
+        :param name: snapshot name
+        :param source_dir: directory to snapshot
+        :param skip_dirs: directory names to ignore
+        :param progress_callback: called with a percentage, returning False cancels the operation
+
+        :returns: path to the manifest or None if canceled
+        """
+
+        skip_dirs = skip_dirs or []
+
+        # files unchanged since the previous snapshot are not hashed again
+        known = {}
+        manifests = self._manifests()
+        if manifests:
+            known = manifests[-1][1].get("files", {})
+
+        paths = []
+        directories = []
+        for path, dirs, filenames in os.walk(source_dir):
+            dirs[:] = [d for d in dirs if d not in skip_dirs]
+            relative_dir = os.path.relpath(path, source_dir)
+            if relative_dir != "." and not filenames and not dirs:
+                directories.append(relative_dir.replace(os.sep, "/"))
+            for filename in filenames:
+                paths.append(os.path.join(path, filename))
+
+        files = {}
+        for count, path in enumerate(paths, start=1):
+            relative_path = os.path.relpath(path, source_dir).replace(os.sep, "/")
+            try:
+                st = os.stat(path)
+                size = st.st_size
+                previous = known.get(relative_path)
+                if previous and previous["size"] == st.st_size and previous["mtime"] == st.st_mtime_ns:
+                    digest = previous["hash"]
+                else:
+                    digest = self._hashFile(path)
+                    stored = self._storeObject(path, digest)
+                    if stored:
+                        digest, size = stored
+                        log.debug("Snapshot object {} added for {}".format(digest, relative_path))
+            except OSError as e:
+                raise SnapshotStoreError("Could not snapshot file {}: {}".format(path, e))
+            files[relative_path] = {"hash": digest, "size": size, "mtime": st.st_mtime_ns}
+            if progress_callback and progress_callback(int(count / len(paths) * 100)) is False:
+                self.garbageCollect()
+                return None
+
+        manifest = {"name": name,
+                    "created": time.time(),
+                    "directories": directories,
+                    "files": files}
+        os.makedirs(self._manifests_dir, exist_ok=True)
+        manifest_path = os.path.join(self._manifests_dir, "{}_{}.json".format(name, time.strftime("%d%m%y_%H%M%S")))
+        try:
+            with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(manifest_path + ".tmp", manifest_path)
+        except OSError as e:
+            raise SnapshotStoreError("Could not write snapshot manifest {}: {}".format(manifest_path, e))
+        return manifest_path
+
+    def restore(self, manifest_path, destination_dir, progress_callback=None):
+        """
+        Restores a snapshot into a directory. Files which have the same
+        size and modification time as in the snapshot are left untouched.
+
+        :param manifest_path: path to the snapshot manifest
+        :param destination_dir: directory to restore to
+        :param progress_callback: called with a percentage, returning False cancels the operation
+
+        :returns: number of restored files
+        """
+
+        manifest = self._loadManifest(manifest_path)
+        for directory in manifest.get("directories", []):
+            os.makedirs(os.path.join(destination_dir, directory), exist_ok=True)
+
+        restored = 0
+        files = manifest.get("files", {})
+        for count, (relative_path, entry) in enumerate(files.items(), start=1):
+            destination = os.path.join(destination_dir, *relative_path.split("/"))
+            try:
+                st = os.stat(destination)
+                unchanged = st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime"]
+            except OSError:
+                unchanged = False
+            if not unchanged:
+                try:
+                    os.makedirs(os.path.dirname(destination), exist_ok=True)
+                    temporary = destination + ".gns3tmp"
+                    self._cloneFile(self._objectPath(entry["hash"]), temporary)
+                    os.replace(temporary, destination)
+                    os.utime(destination, ns=(entry["mtime"], entry["mtime"]))
+                except OSError as e:
+                    raise SnapshotStoreError("Could not restore file {}: {}".format(destination, e))
+                restored += 1
+            if progress_callback and progress_callback(int(count / len(files) * 100)) is False:
+                break
+        return restored
+
+    def delete(self, manifest_path):
+        """
+        Deletes a snapshot and the objects no other snapshot uses.
+
+        :param manifest_path: path to the snapshot manifest
+        """
+
+        try:
+            os.remove(manifest_path)
+        except OSError as e:
+            raise SnapshotStoreError("Could not delete snapshot {}: {}".format(manifest_path, e))
+        self.garbageCollect()
+
+    def garbageCollect(self):
+        """
+        Removes the objects which are not referenced by any snapshot.
+
+        :returns: number of bytes freed
+        """
+
+        referenced = set()
+        for _, manifest in self._manifests():
+            for entry in manifest.get("files", {}).values():
+                referenced.add(entry["hash"])
+
+        freed = 0
+        if not os.path.isdir(self._objects_dir):
+            return freed
+        for prefix in os.listdir(self._objects_dir):
+            prefix_dir = os.path.join(self._objects_dir, prefix)
+            for name in os.listdir(prefix_dir):
+                if prefix + name not in referenced:
+                    path = os.path.join(prefix_dir, name)
+                    try:
+                        freed += os.path.getsize(path)
+                        os.remove(path)
+                    except OSError as e:
+                        log.warning("Could not remove snapshot object {}: {}".format(path, e))
+            try:
+                os.rmdir(prefix_dir)
+            except OSError:
+                pass  # not empty
+        return freed
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Thread to create or restore incremental snapshots without blocking the GUI.
+"""
+
+from ..qt import QtCore
+from .snapshot_store import SnapshotStore, SnapshotStoreError
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class SnapshotWorker(QtCore.QObject):
+
+    """
+    Thread to create or restore an incremental snapshot.
+
+    :param snapshots_dir: path to the snapshots directory
+    :param project_dir: path to the project directory
+    :param snapshot_name: name of the snapshot to create
+    :param manifest_path: path to the manifest of the snapshot to restore
+    """
+
+    # signals to update the progress dialog.
+    error = QtCore.pyqtSignal(str, bool)
+    finished = QtCore.pyqtSignal()
+    updated = QtCore.pyqtSignal(int)
+
+    def __init__(self, snapshots_dir, project_dir, snapshot_name=None, manifest_path=None):
+
+        super().__init__()
+        self._is_running = False
+        self._store = SnapshotStore(snapshots_dir)
+        self._project_dir = project_dir
+        self._snapshot_name = snapshot_name
+        self._manifest_path = manifest_path
+
+    def _progress(self, value):
+
+        self.updated.emit(value)
+        return self._is_running
+
+    def run(self):
+        """
+        Worker starting point.
+        """
+
+        self._is_running = True
+        try:
+            if self._manifest_path:
+                restored = self._store.restore(self._manifest_path, self._project_dir, progress_callback=self._progress)
+                log.info("{} file(s) restored from snapshot {}".format(restored, self._manifest_path))
+            else:
+                self._store.create(self._snapshot_name, self._project_dir, skip_dirs=["snapshots"], progress_callback=self._progress)
+        except SnapshotStoreError as e:
+            self.error.emit(str(e), True)
+            return
+
+        if self._is_running:
+            self.finished.emit()
+
+    def cancel(self):
+        """
+        Cancel this worker.
+        """
+
+        if not self:
+            return
+        self._is_running = False
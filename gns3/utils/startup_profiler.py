@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Measures where the start of the GUI spends its time (--profile-startup).
+"""
+
+import sys
+import time
+import contextlib
+import importlib.abc
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class _TimingLoader:
+
+    """
+    Wraps a module loader to measure the time spent executing the module.
+    """
+
+    def __init__(self, loader, profiler):
+
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+
+        # the module keeps its real loader (pkg_resources looks at its type)
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        with self._profiler.measure("import {}".format(module.__name__), category="import"):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+
+    """
+    Finds the GNS3 modules with the other finders and wraps their loader.
+    """
+
+    def __init__(self, profiler, prefix):
+
+        self._profiler = profiler
+        self._prefix = prefix
+
+    def find_spec(self, fullname, path, target=None):
+
+        if fullname != self._prefix and not fullname.startswith(self._prefix + "."):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimingLoader(spec.loader, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+
+    """
+    Records the duration of the startup phases and of the imports.
+    Nothing is recorded unless it is enabled.
+    """
+
+    def __init__(self):
+
+        self._enabled = False
+        self._start = time.perf_counter()
+        self._timings = []
+        self._finder = None
+
+    def enabled(self):
+        """
+        Returns True if the startup is profiled.
+        """
+
+        return self._enabled
+
+    def enable(self, prefix="gns3"):
+        """
+        Starts profiling, the imports of the modules in the prefix package are measured.
+
+        :param prefix: package name
+        """
+
+        self._enabled = True
+        if self._finder is None:
+            self._finder = _TimingFinder(self, prefix)
+            sys.meta_path.insert(0, self._finder)
+
+    def disable(self):
+        """
+        Stops profiling.
+        """
+
+        self._enabled = False
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    @contextlib.contextmanager
+    def measure(self, name, category="phase"):
+        """
+        Measures the duration of a block of code.
+
+        :param name: what is measured
+        :param category: "phase", "import" or "init"
+        """
+
+        if not self._enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, category=category)
+
+    def record(self, name, duration, category="phase"):
+        """
+        Records a duration measured by the caller, for instance
+        the duration of a phase running in the background.
+
+        :param name: what is measured
+        :param duration: duration in seconds
+        :param category: "phase", "import" or "init"
+        """
+
+        if self._enabled:
+            self._timings.append((category, name, duration))
+
+    def timings(self, category=None):
+        """
+        Returns the recorded timings.
+
+        :param category: only return this category
+
+        :returns: list of (category, name, duration in seconds) tuples
+        """
+
+        return [timing for timing in self._timings if category is None or timing[0] == category]
+
+    def report(self, limit=25):
+        """
+        Logs and returns a report of the recorded timings.
+        Import times include the time to import the dependencies.
+
+        :param limit: number of imports to report
+
+        :returns: report (string)
+        """
+
+        lines = ["Startup profile ({:.0f} ms since the start)".format((time.perf_counter() - self._start) * 1000)]
+        for title, category, count in (("Phases", "phase", None),
+                                       ("Module initialisation", "init", None),
+                                       ("Slowest imports", "import", limit)):
+            timings = self.timings(category)
+            if category == "import":
+                timings = sorted(timings, key=lambda timing: timing[2], reverse=True)[:count]
+            if timings:
+                lines.append("{}:".format(title))
+                for _, name, duration in timings:
+                    lines.append("  {:>8.1f} ms  {}".format(duration * 1000, name))
+        report = "\n".join(lines)
+        log.info(report)
+        return report
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of StartupProfiler.
+
+        :returns: instance of StartupProfiler
+        """
+
+        if not hasattr(StartupProfiler, "_instance"):
+            StartupProfiler._instance = StartupProfiler()
+        return StartupProfiler._instance
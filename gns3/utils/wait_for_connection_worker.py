@@ -16,12 +16,11 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """
-Thread to repeatedly try to connect to a network resource.
+Thread to wait for a server to accept HTTP requests.
 """
 
-import socket
-import time
 from ..qt import QtCore
+from ..readiness_prober import ReadinessProber
 
 
 class WaitForConnectionWorker(QtCore.QObject):
@@ -31,6 +30,10 @@ class WaitForConnectionWorker(QtCore.QObject):
 
     :param host: destination host or IP address
     :param port: destination port
+    :param protocol: http or https
+    :param user: user for the authentication
+    :param password: password for the authentication
+    :param timeout: maximum time to wait in seconds
     """
 
     # signals to update the progress dialog.
@@ -38,12 +41,17 @@ class WaitForConnectionWorker(QtCore.QObject):
     finished = QtCore.pyqtSignal()
     updated = QtCore.pyqtSignal(int)
 
-    def __init__(self, host, port):
+    def __init__(self, host, port, protocol="http", user=None, password=None, timeout=30):
 
         super().__init__()
         self._is_running = False
         self._host = host
         self._port = port
+        self._protocol = protocol
+        self._user = user
+        self._password = password
+        self._timeout = timeout
+        self._prober = None
 
     def run(self):
         """
@@ -51,35 +59,22 @@ class WaitForConnectionWorker(QtCore.QObject):
         """
 
         self._is_running = True
-        connection_success = False
-        begin = time.time()
-
-        # try to connect for 30 seconds
-        while time.time() - begin < 30.0:
-            if not self._is_running:
-                return
-            time.sleep(0.01)
-            sock = None
-            try:
-                sock = socket.create_connection((self._host, self._port), timeout=10)
-            except OSError as e:
-                last_exception = e
-                continue
-            finally:
-                if sock:
-                    sock.close()
-            connection_success = True
-            break
+        # created here to live in the worker thread
+        self._prober = ReadinessProber(self._host, self._port, protocol=self._protocol, user=self._user,
+                                       password=self._password, timeout=self._timeout)
+        status, json_data = self._prober.waitForReady()
 
         if not self._is_running:
             return
 
-        if not connection_success:
-
+        if status == 0:
             # let the GUI know about the connection was unsuccessful
             self.error.emit("Could not connect to {} on port {}: {}".format(self._host,
                                                                             self._port,
-                                                                            last_exception), True)
+                                                                            self._prober.error()), True)
+            return
+        if status == 401:
+            self.error.emit("Wrong user or password for {} on port {}".format(self._host, self._port), True)
             return
 
         # connection has been successful, let's inform the GUI
@@ -93,3 +88,5 @@ class WaitForConnectionWorker(QtCore.QObject):
         if not self:
             return
         self._is_running = False
+        if self._prober is not None:
+            self._prober.cancel()
@@ -27,10 +27,17 @@ from ..qt import QtCore
 from ..version import __version__
 from ..gns3_vm import GNS3VM
 from ..servers import Servers
+from ..readiness_prober import ReadinessProber
 
 import logging
 log = logging.getLogger(__name__)
 
+# how long to wait for the GNS3 VM server, in seconds. The server used to be
+# polled 40 and 120 times, each attempt taking up to 4 seconds (3 seconds
+# request timeout and 1 second between the attempts)
+VERSION_TIMEOUT = 160
+INTERFACES_TIMEOUT = 480
+
 
 class WaitForVMWorker(QtCore.QObject):
 
@@ -47,6 +54,7 @@ class WaitForVMWorker(QtCore.QObject):
 
         super().__init__()
         self._is_running = False
+        self._prober = None
         self._vm = GNS3VM.instance()
 
         vm_settings = self._vm.settings()
@@ -143,23 +151,24 @@ class WaitForVMWorker(QtCore.QObject):
                     return True
         return False
 
-    def _waitForServer(self, vm_server, endpoint, retry=0):
+    def _waitForServer(self, vm_server, endpoint, timeout=0):
         """
         Wait for a VM server to reply to a request.
 
         :param vm_server: The server instance
-        :param retry: How many time we need to retry if server doesn't answer wait 1 second between test
+        :param endpoint: endpoint to request
+        :param timeout: How long to retry if the server doesn't answer, in seconds
+
+        :returns: tuple (status code, JSON reply), status 0 if the server could not be reached
         """
 
-        json_data = []
-        status = 0
-        while retry >= 0:
-            status, json_data = vm_server.getSynchronous(endpoint, timeout=3)
-            if status != 0 or not self._is_running:
-                break
-            self.thread().sleep(1)
-            retry -= 1
-        return status, json_data
+        if not self._is_running:
+            return 0, None
+        self._prober = ReadinessProber.forServer(vm_server, endpoint=endpoint, timeout=timeout, max_delay=1.0)
+        try:
+            return self._prober.waitForReady()
+        finally:
+            self._prober = None
 
     def run(self):
         """
@@ -178,7 +187,7 @@ class WaitForVMWorker(QtCore.QObject):
 
         log.info("GNS3 VM is started and server is running on {}:{}".format(vm_server.host(), vm_server.port()))
         try:
-            status, json_data = self._waitForServer(vm_server, "version", retry=40)
+            status, json_data = self._waitForServer(vm_server, "version", timeout=VERSION_TIMEOUT)
             if status == 401:
                 self.error.emit("Wrong user or password for the GNS3 VM".format(status), True)
                 return
@@ -308,7 +317,7 @@ class WaitForVMWorker(QtCore.QObject):
             vm_server.setPort(port)
             vm_server.setHost(ip_address)
             # ask the server all a list of all its interfaces along with IP addresses
-            status, json_data = self._waitForServer(vm_server, "interfaces", retry=120)
+            status, json_data = self._waitForServer(vm_server, "interfaces", timeout=INTERFACES_TIMEOUT)
             if status == 401:
                 self.error.emit("Wrong user or password for the GNS3 VM".format(status), True)
                 return False
@@ -352,5 +361,8 @@ class WaitForVMWorker(QtCore.QObject):
         if not self:
             return
         self._is_running = False
+        prober = self._prober
+        if prober is not None:
+            prober.cancel()
         self._vm.killRunningProcess()
         self._vm.setRunning(False)
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Sequential QIODevice generating a zip archive of a directory on the fly,
+so it can be used as an HTTP upload body without writing the archive to disk.
+
+Files are stored without compression and always use the zip64 format: this
+way the exact archive size is known in advance and can be sent as the
+Content-Length header.
+"""
+
+import os
+import time
+import zlib
+import struct
+
+from ..qt import QtCore
+
+import logging
+log = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+DATA_DESCRIPTOR = struct.Struct("<IIQQ")
+CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+ZIP64_EXTRA = struct.Struct("<HHQQQ")
+ZIP64_END = struct.Struct("<IQHHIIQQQQ")
+ZIP64_LOCATOR = struct.Struct("<IIQI")
+END = struct.Struct("<IHHHHIIH")
+
+ZIP64_VERSION = 45
+FLAGS = 0x08 | 0x800  # data descriptor and UTF-8 file names
+
+
+def _dosTime(timestamp):
+
+    t = time.localtime(timestamp)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+class ZipStreamDevice(QtCore.QIODevice):
+
+    """
+    Zip a directory while it is read.
+
+    :param directory: directory to archive
+    :param parent: parent object
+    """
+
+    def __init__(self, directory, parent=None):
+
+        super().__init__(parent)
+        self._files = []
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                arcname = os.path.relpath(path, directory).replace(os.sep, "/").encode("utf-8")
+                st = os.stat(path)
+                self._files.append((path, arcname, st.st_size, st.st_mtime))
+
+        self._size = END.size + ZIP64_END.size + ZIP64_LOCATOR.size
+        for _, arcname, size, _ in self._files:
+            self._size += LOCAL_HEADER.size + len(arcname) + size + DATA_DESCRIPTOR.size
+            self._size += CENTRAL_HEADER.size + len(arcname) + ZIP64_EXTRA.size
+        self._generator = None
+        self._buffer = b""
+
+    def isSequential(self):
+
+        return True
+
+    def size(self):
+        """
+        Returns the exact size of the archive.
+        """
+
+        return self._size
+
+    def bytesAvailable(self):
+
+        return len(self._buffer) + super().bytesAvailable() + (CHUNK_SIZE if self._generator else 0)
+
+    def open(self, mode):
+
+        self._generator = self._generate()
+        self._buffer = b""
+        return super().open(mode)
+
+    def close(self):
+
+        if self._generator:
+            self._generator.close()
+            self._generator = None
+        super().close()
+
+    def readData(self, maxlen):
+
+        while len(self._buffer) < maxlen and self._generator:
+            try:
+                self._buffer += next(self._generator)
+            except StopIteration:
+                self._generator = None
+            except OSError as e:
+                log.error("Could not read file for the archive: {}".format(e))
+                self._generator = None
+                self.setErrorString(str(e))
+                return None
+        data = self._buffer[:maxlen]
+        self._buffer = self._buffer[maxlen:]
+        return data
+
+    def writeData(self, data):
+
+        return -1
+
+    def atEnd(self):
+
+        return self._generator is None and not self._buffer
+
+    def _generate(self):
+        """
+        Yields the archive content.
+        """
+
+        offset = 0
+        central_directory = []
+        for path, arcname, size, mtime in self._files:
+            dos_time, dos_date = _dosTime(mtime)
+            header = LOCAL_HEADER.pack(0x04034b50, ZIP64_VERSION, FLAGS, 0, dos_time, dos_date,
+                                       0, 0, 0, len(arcname), 0)
+            yield header + arcname
+
+            crc = 0
+            remaining = size
+            with open(path, "rb") as f:
+                while remaining > 0:
+                    chunk = f.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise OSError("File {} has been truncated while archiving it".format(path))
+                    crc = zlib.crc32(chunk, crc)
+                    remaining -= len(chunk)
+                    yield chunk
+            crc &= 0xffffffff
+            yield DATA_DESCRIPTOR.pack(0x08074b50, crc, size, size)
+
+            extra = ZIP64_EXTRA.pack(0x0001, 24, size, size, offset)
+            central_directory.append(CENTRAL_HEADER.pack(0x02014b50, ZIP64_VERSION, ZIP64_VERSION, FLAGS, 0,
+                                                         dos_time, dos_date, crc, 0xffffffff, 0xffffffff,
+                                                         len(arcname), len(extra), 0, 0, 0, 0o100644 << 16,
+                                                         0xffffffff) + arcname + extra)
+            offset += LOCAL_HEADER.size + len(arcname) + size + DATA_DESCRIPTOR.size
+
+        central_directory = b"".join(central_directory)
+        yield central_directory
+        count = len(self._files)
+        yield ZIP64_END.pack(0x06064b50, ZIP64_END.size - 12, ZIP64_VERSION, ZIP64_VERSION, 0, 0,
+                             count, count, len(central_directory), offset)
+        yield ZIP64_LOCATOR.pack(0x07064b50, 0, offset + len(central_directory), 1)
+        yield END.pack(0x06054b50, 0, 0, 0xffff, 0xffff, 0xffffffff, 0xffffffff, 0)
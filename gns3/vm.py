@@ -22,7 +22,8 @@ Base class for VM classes.
 import os
 from gns3.servers import Servers
 from gns3.packet_capture import PacketCapture
-from gns3.qt import QtGui, QtCore
+from gns3.qt import QtGui, QtCore, qpartial
+from gns3.base_config_cache import BaseConfigCache
 
 from .node import Node
 
@@ -319,13 +320,13 @@ class VM(Node):
 
         log.debug("{} has deleted a NIO: {}".format(self.name(), result))
 
-    def _readBaseConfig(self, config_path):
+    def _baseConfigPath(self, config_path):
         """
-        Returns a base config content.
+        Returns the absolute path of a base config.
 
         :param config_path: path to the configuration file.
 
-        :returns: config content
+        :returns: absolute path or None if there is no file
         """
 
         if config_path is None or len(config_path.strip()) == 0:
@@ -336,20 +337,78 @@ class VM(Node):
 
         if not os.path.isfile(config_path):
             return None
+        return config_path
 
-        try:
-            with open(config_path, "rb") as f:
-                log.info("Opening configuration file: {}".format(config_path))
-                config = f.read().decode("utf-8")
-                config = config.replace('\r', "")
-                return config
-        except OSError as e:
-            self.error_signal.emit(self.id(), "Could not read configuration file {}: {}".format(config_path, e))
-            return None
-        except UnicodeDecodeError as e:
-            self.error_signal.emit(self.id(), "Invalid configuration file {}: {}".format(config_path, e))
+    def _readBaseConfig(self, config_path):
+        """
+        Returns a base config content.
+
+        :param config_path: path to the configuration file.
+
+        :returns: config content
+        """
+
+        config_path = self._baseConfigPath(config_path)
+        if config_path is None:
             return None
-        return ""
+
+        config, error = BaseConfigCache.instance().read(config_path)
+        if error:
+            self.error_signal.emit(self.id(), error)
+        return config
+
+    def _readBaseConfigs(self, config_paths, callback):
+        """
+        Reads base configs without blocking the GUI when they are large.
+
+        :param config_paths: dictionary of names and paths to the configuration files
+        :param callback: callback receiving a dictionary of names and config contents
+        """
+
+        paths = {}
+        for name, config_path in config_paths.items():
+            config_path = self._baseConfigPath(config_path)
+            if config_path is not None:
+                paths[name] = config_path
+        BaseConfigCache.instance().readMany(list(paths.values()), qpartial(self._readBaseConfigsCallback, paths, callback))
+
+    def _readBaseConfigsCallback(self, paths, callback, results):
+        """
+        Callback for _readBaseConfigs.
+
+        :param paths: dictionary of names and absolute paths
+        :param callback: callback receiving a dictionary of names and config contents
+        :param results: dictionary of paths and (content, error message)
+        """
+
+        configs = {}
+        for name, config_path in paths.items():
+            config, error = results[config_path]
+            if error:
+                self.error_signal.emit(self.id(), error)
+            elif config is not None:
+                configs[name] = config
+        callback(configs)
+
+    def _postWithBaseConfigs(self, path, callback, params, config_paths, **kwargs):
+        """
+        Reads base configs and sends them to the server with the other params.
+
+        :param path: remote path
+        :param callback: callback method to call when the server replies
+        :param params: params to send (dictionary)
+        :param config_paths: dictionary of param names and paths to the configuration files
+        """
+
+        self._readBaseConfigs(config_paths, qpartial(self._postWithBaseConfigsCallback, path, callback, params, kwargs))
+
+    def _postWithBaseConfigsCallback(self, path, callback, params, kwargs, configs):
+        """
+        Callback for _postWithBaseConfigs.
+        """
+
+        params.update(configs)
+        self.httpPost(path, callback, body=params, **kwargs)
 
     def startPacketCapture(self, port, capture_file_name, data_link_type):
         """
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Logging of the bodies of the requests sent to the servers.
+"""
+
+import json
+import pathlib
+import logging
+import logging.handlers
+
+from .qt import QtCore
+
+log = logging.getLogger(__name__)
+
+# maximum number of characters of a body written to the debug log
+BODY_PREVIEW_SIZE = 1024
+
+# rotation of the wire trace file
+WIRE_TRACE_MAX_BYTES = 10 * 1024 * 1024
+WIRE_TRACE_BACKUP_COUNT = 3
+
+
+def bodyText(body):
+    """
+    Returns the text of a request or response body.
+
+    :param body: dictionary, string, bytes, path or QIODevice
+    :returns: string
+    """
+
+    if body is None:
+        return ""
+    if isinstance(body, str):
+        return body
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    if isinstance(body, pathlib.Path):
+        return "<file {}>".format(body)
+    if isinstance(body, QtCore.QIODevice):
+        return "<stream>"
+    try:
+        return json.dumps(body, sort_keys=True)
+    except (TypeError, ValueError):
+        return repr(body)
+
+
+class BodyPreview:
+
+    """
+    Body formatted only when the log record is emitted,
+    and cut to a few characters.
+
+    :param body: request or response body
+    :param size: maximum number of characters
+    """
+
+    __slots__ = ("_body", "_size")
+
+    def __init__(self, body, size=BODY_PREVIEW_SIZE):
+
+        self._body = body
+        self._size = size
+
+    def __str__(self):
+
+        text = bodyText(self._body)
+        if len(text) > self._size:
+            return "{}... ({} characters)".format(text[:self._size], len(text))
+        return text
+
+
+class WireTrace:
+
+    """
+    Writes the full requests and responses to a rotating file,
+    disabled unless explicitly enabled.
+    """
+
+    def __init__(self):
+
+        self._logger = logging.getLogger("gns3.wire")
+        # the wire trace must never end in the normal logs
+        self._logger.propagate = False
+        self._handler = None
+
+    def isEnabled(self):
+        """
+        Returns True if the wire trace is written.
+        """
+
+        return self._handler is not None
+
+    def enable(self, path, max_bytes=WIRE_TRACE_MAX_BYTES, backup_count=WIRE_TRACE_BACKUP_COUNT):
+        """
+        Starts writing the wire trace.
+
+        :param path: path of the trace file
+        :param max_bytes: size of the file before it is rotated
+        :param backup_count: number of rotated files kept
+        """
+
+        self.disable()
+        self._handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self._handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        self._logger.addHandler(self._handler)
+        self._logger.setLevel(logging.DEBUG)
+        log.info("Writing the HTTP wire trace to {}".format(path))
+
+    def disable(self):
+        """
+        Stops writing the wire trace.
+        """
+
+        if self._handler is not None:
+            self._logger.removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
+
+    def request(self, query_id, method, url, body):
+        """
+        Traces a request.
+
+        :param query_id: query identifier, to match the response
+        :param method: HTTP method
+        :param url: request URL
+        :param body: request body
+        """
+
+        if self._handler is not None:
+            self._logger.debug("> %s %s %s\n%s", query_id, method, url, bodyText(body))
+
+    def response(self, query_id, url, status, body):
+        """
+        Traces a response.
+
+        :param query_id: query identifier, to match the request
+        :param url: request URL
+        :param status: HTTP status code
+        :param body: response body
+        """
+
+        if self._handler is not None:
+            self._logger.debug("< %s %s %s\n%s", query_id, status, url, bodyText(body))
+
+    @staticmethod
+    def instance():
+        """
+        Singleton to return only one instance of WireTrace.
+
+        :returns: instance of WireTrace
+        """
+
+        if not hasattr(WireTrace, "_instance"):
+            WireTrace._instance = WireTrace()
+        return WireTrace._instance
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Benchmark of the settings access with a large config file.
+"""
+
+import os
+import sys
+import json
+import timeit
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from gns3.local_config import LocalConfig
+from gns3.settings import GENERAL_SETTINGS
+from gns3.modules.qemu.settings import QEMU_SETTINGS, QEMU_VM_SETTINGS
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--templates", help="number of templates in the config", type=int, default=2000)
+parser.add_argument("--number", help="number of calls to time", type=int, default=100)
+args = parser.parse_args()
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    config_file = os.path.join(tmpdir, "gns3_gui.conf")
+    templates = []
+    for i in range(args.templates):
+        template = QEMU_VM_SETTINGS.copy()
+        template.update({"name": "VM{}".format(i), "server": "local"})
+        templates.append(template)
+    with open(config_file, "w") as f:
+        json.dump({"type": "settings", "Qemu": {"vms": templates}}, f)
+
+    config = LocalConfig(config_file=config_file)
+    config.loadSectionSettings("MainWindow", GENERAL_SETTINGS)
+
+    benchmarks = [
+        ("settings() (full copy)", lambda: config.settings()),
+        ("loadSectionSettings('MainWindow')", lambda: config.loadSectionSettings("MainWindow", GENERAL_SETTINGS)),
+        ("loadSectionSettings('Qemu')", lambda: config.loadSectionSettings("Qemu", {"vms": []})),
+        ("sectionSettings('Qemu')", lambda: config.sectionSettings("Qemu")),
+        ("sectionView('Qemu')", lambda: config.sectionView("Qemu")),
+        ("sectionView('Qemu') with defaults", lambda: config.sectionView("Qemu", QEMU_SETTINGS)),
+        ("experimental()", lambda: config.experimental()),
+    ]
+    print("{} templates, {} calls".format(args.templates, args.number))
+    for name, function in benchmarks:
+        duration = timeit.timeit(function, number=args.number)
+        print("{:<40} {:>10.3f} ms/call".format(name, duration / args.number * 1000))
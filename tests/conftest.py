@@ -45,6 +45,9 @@ def reset_modules():
     from gns3.servers import Servers
     Servers._instance = None
 
+    from gns3.base_config_cache import BaseConfigCache
+    BaseConfigCache._instance = None
+
 
 @pytest.fixture
 def project(local_server):
@@ -475,3 +475,49 @@ def test_exportConfigToDirectory(iou_device, tmpdir):
 
         with open(os.path.join(path, normalize_filename(iou_device.name()) + "_startup-config.cfg")) as f:
             assert f.read() == "TEST"
+
+
+def test_start_iourc_pushed_once(iou_device, fake_iourc):
+
+    iou_device._module._settings["iourc_path"] = fake_iourc
+    with patch('gns3.node.Node.httpPost') as mock:
+        iou_device.start()
+        args, kwargs = mock.call_args
+        assert args[0] == "/iou/vms/{vm_id}/start".format(vm_id=iou_device.vm_id())
+        assert kwargs["body"] == {"iourc_content": "[license]\r\ngns42 = dsfdsfdsfdsf;\r\n"}
+
+        # the server already has the iourc file
+        iou_device.start()
+        args, kwargs = mock.call_args
+        assert kwargs["body"] == {}
+
+        # push it again after an error
+        args[1]({"message": "error"}, error=True)
+        iou_device.start()
+        args, kwargs = mock.call_args
+        assert kwargs["body"] == {"iourc_content": "[license]\r\ngns42 = dsfdsfdsfdsf;\r\n"}
+
+
+def test_iourc_content_cache(fake_iourc):
+
+    module = IOU()
+    module._settings["iourc_path"] = fake_iourc
+    assert module.iourcContent() == "[license]\r\ngns42 = dsfdsfdsfdsf;\r\n"
+    with patch("builtins.open") as mock:
+        assert module.iourcContent() == "[license]\r\ngns42 = dsfdsfdsfdsf;\r\n"
+        assert not mock.called
+
+    # the file is read again when it changes
+    with open(fake_iourc, "wb") as f:
+        f.write(b"[license]\r\n")
+    os.utime(fake_iourc, (0, 0))
+    assert module.iourcContent() == "[license]\r\n"
+
+
+def test_configFiles(iou_device):
+
+    files = iou_device.configFiles({"startup_config_content": "TEST", "private_config_content": None})
+    assert files == {
+        normalize_filename(iou_device.name()) + "_startup-config.cfg": "TEST",
+        normalize_filename(iou_device.name()) + "_private-config.cfg": ""
+    }
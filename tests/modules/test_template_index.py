@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from unittest.mock import MagicMock
+
+from gns3.modules.template_index import TemplateIndex
+
+
+def _server(host, local=False):
+
+    server = MagicMock()
+    server.host.return_value = host
+    server.isLocal.return_value = local
+    return server
+
+
+def test_templates():
+
+    index = TemplateIndex()
+    index.rebuild({
+        "local:vm1": {"name": "vm1", "server": "local"},
+        "remote:vm2": {"name": "vm2", "server": "remote"},
+    })
+    assert index.templateKey("vm1") == "local:vm1"
+    assert index.templateKey("vm3") is None
+    assert index.templateKeys(_server("remote")) == ["remote:vm2"]
+    assert index.templateKeys(_server("127.0.0.1", local=True)) == ["local:vm1"]
+    assert index.templateKeys(_server("other")) == []
+
+
+def test_templates_same_name():
+
+    templates = OrderedDict([
+        ("local:vm1", {"name": "vm1", "server": "local"}),
+        ("remote:vm1", {"name": "vm1", "server": "remote"}),
+    ])
+    index = TemplateIndex()
+    index.rebuild(templates)
+    assert index.templateKey("vm1") == "remote:vm1"
+
+    index = TemplateIndex(first_match=True)
+    index.rebuild(templates)
+    assert index.templateKey("vm1") == "local:vm1"
+
+
+def test_nodes():
+
+    index = TemplateIndex(node_key=lambda node: node.settings()["vmname"])
+    node1 = MagicMock()
+    node1.settings.return_value = {"vmname": "vm1"}
+    node2 = MagicMock()
+    node2.settings.return_value = {"vmname": "vm1"}
+    index.addNode(node1)
+    index.addNode(node2)
+    index.addNode(node2)
+    assert index.nodes("vm1") == [node1, node2]
+
+    # the node is found with the value it was indexed with
+    node1.settings.return_value = {"vmname": "vm2"}
+    index.removeNode(node1)
+    assert index.nodes("vm1") == [node2]
+
+    index.clearNodes()
+    assert index.nodes("vm1") == []
+
+
+def test_update_node():
+
+    index = TemplateIndex(node_key=lambda node: node.settings()["vmname"])
+    node = MagicMock()
+    node.settings.return_value = {"vmname": "vm1"}
+    index.addNode(node)
+
+    node.settings.return_value = {"vmname": "vm2"}
+    index.updateNode(node)
+    assert index.nodes("vm1") == []
+    assert index.nodes("vm2") == [node]
+
+    # nodes not indexed are ignored
+    other = MagicMock()
+    index.updateNode(other)
+    assert index.nodes("vm2") == [node]
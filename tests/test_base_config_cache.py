@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from unittest.mock import MagicMock, patch
+
+from gns3.qt import QtCore
+from gns3.base_config_cache import BaseConfigCache, ASYNC_READ_THRESHOLD
+
+
+def test_read_cached(tmpdir):
+
+    path = str(tmpdir / "test.cfg")
+    with open(path, "w+") as f:
+        f.write("hostname R1\r\n")
+
+    cache = BaseConfigCache()
+    assert cache.read(path) == ("hostname R1\n", None)
+    with patch("gns3.base_config_cache.read_config") as mock:
+        assert cache.read(path) == ("hostname R1\n", None)
+        assert not mock.called
+    assert cache.statistics() == {"files": 1, "hits": 1, "misses": 1}
+
+
+def test_read_modified(tmpdir):
+
+    path = str(tmpdir / "test.cfg")
+    with open(path, "w+") as f:
+        f.write("hostname R1")
+
+    cache = BaseConfigCache()
+    assert cache.read(path) == ("hostname R1", None)
+    with open(path, "w+") as f:
+        f.write("hostname R2")
+    mtime = os.stat(path).st_mtime + 10
+    os.utime(path, (mtime, mtime))
+    assert cache.read(path) == ("hostname R2", None)
+
+
+def test_read_error(tmpdir):
+
+    path = str(tmpdir / "test.cfg")
+    with open(path, "wb+") as f:
+        f.write(b"\xff\xfe\xfa")
+
+    content, error = BaseConfigCache().read(path)
+    assert content is None
+    assert error.startswith("Invalid configuration file")
+
+
+def test_readMany_small_files(tmpdir):
+
+    path = str(tmpdir / "test.cfg")
+    with open(path, "w+") as f:
+        f.write("42")
+
+    callback = MagicMock()
+    BaseConfigCache().readMany([path, path], callback)
+    callback.assert_called_with({path: ("42", None)})
+
+
+def test_readMany_large_files(tmpdir):
+
+    path = str(tmpdir / "test.cfg")
+    content = "!\n" * ASYNC_READ_THRESHOLD
+    with open(path, "w+") as f:
+        f.write(content)
+
+    cache = BaseConfigCache()
+    callback1 = MagicMock()
+    callback2 = MagicMock()
+    cache.readMany([path], callback1)
+    # the file is not read again while it is read for the first request
+    cache.readMany([path], callback2)
+    QtCore.QThreadPool.globalInstance().waitForDone()
+    QtCore.QCoreApplication.processEvents()
+    callback1.assert_called_with({path: (content, None)})
+    callback2.assert_called_with({path: (content, None)})
+    assert cache.statistics()["misses"] == 1
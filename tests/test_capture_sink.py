@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import struct
+
+from gns3.qt import QtCore
+from gns3.capture_sink import CaptureSink
+
+
+def pcap(packets):
+    data = struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1)
+    for packet in packets:
+        data += struct.pack("<IIII", 0, 0, len(packet), len(packet)) + packet
+    return data
+
+
+def test_write_buffered(tmpdir):
+
+    path = str(tmpdir / "test.pcap")
+    sink = CaptureSink(path, flush_size=1024)
+    data = pcap([b"a" * 100])
+    sink.write(data)
+    # below the flush size nothing is written yet
+    assert os.path.getsize(path) == 0
+    sink.flush()
+    assert os.path.getsize(path) == len(data)
+    sink.write(pcap([b"b" * 2000])[24:])
+    assert os.path.getsize(path) == len(data) + 2016
+    sink.close()
+
+
+def test_count_packets_split_chunks(tmpdir):
+
+    sink = CaptureSink(str(tmpdir / "test.pcap"))
+    data = pcap([b"a" * 10, b"b" * 1500, b"c"])
+    # feed the data in small chunks splitting the headers
+    for i in range(0, len(data), 7):
+        sink.write(data[i:i + 7])
+    sink.close()
+
+    statistics = sink.statistics()
+    assert statistics["packets"] == 3
+    assert statistics["bytes"] == len(data)
+    with open(str(tmpdir / "test.pcap"), "rb") as f:
+        assert f.read() == data
+
+
+def test_unknown_format(tmpdir):
+
+    sink = CaptureSink(str(tmpdir / "test.pcap"))
+    sink.write(b"x" * 100)
+    sink.close()
+    assert sink.statistics()["packets"] == 0
+    assert sink.statistics()["bytes"] == 100
+    # writing after close is ignored
+    sink.write(b"x")
+
+
+def test_ring_buffer_rotation(tmpdir):
+
+    sink = CaptureSink(str(tmpdir / "capture"), ring_buffer_size=1000, ring_buffer_files=2)
+    assert sink.ringBuffer()
+    assert sink.path() is None
+    data = pcap([b"a" * 400] * 10)
+    for i in range(0, len(data), 100):
+        sink.write(data[i:i + 100])
+    sink.close()
+
+    # 416 bytes per packet, 3 packets per file and only the last 2 files are kept
+    assert sink.files() == [str(tmpdir / "capture_00003.pcap"), str(tmpdir / "capture_00004.pcap")]
+    assert sorted(os.listdir(str(tmpdir))) == ["capture_00003.pcap", "capture_00004.pcap"]
+    with open(sink.files()[0], "rb") as f:
+        assert f.read() == pcap([b"a" * 400] * 3)
+    with open(sink.path(), "rb") as f:
+        assert f.read() == pcap([b"a" * 400])
+    assert sink.statistics()["packets"] == 10
+
+
+def test_ring_buffer_live_output(tmpdir):
+
+    output = QtCore.QBuffer()
+    output.open(QtCore.QIODevice.WriteOnly)
+    sink = CaptureSink(str(tmpdir / "capture"), ring_buffer_size=400)
+    sink.addLiveOutput(output)
+    data = pcap([b"a" * 400, b"b" * 400, b"c" * 400])
+    sink.write(data)
+    sink.close()
+
+    # the reader received a single capture across the rotations
+    assert len(sink.files()) == 3
+    assert bytes(output.data()) == data
+
+
+def test_pcapng(tmpdir):
+
+    path = str(tmpdir / "test.pcapng")
+    sink = CaptureSink(path, pcapng=True)
+    sink.write(pcap([b"a" * 10, b"b" * 1500]))
+    sink.close()
+
+    with open(path, "rb") as f:
+        data = f.read()
+    blocks = []
+    offset = 0
+    while offset < len(data):
+        block_type, length = struct.unpack("<II", data[offset:offset + 8])
+        assert struct.unpack("<I", data[offset + length - 4:offset + length])[0] == length
+        blocks.append((block_type, data[offset:offset + length]))
+        offset += length
+    assert [block_type for block_type, _ in blocks] == [0x0A0D0D0A, 1, 6, 6]
+    # enhanced packet block data is padded to 32 bits
+    assert blocks[2][1][28:38] == b"a" * 10
+    assert len(blocks[2][1]) == 32 + 12
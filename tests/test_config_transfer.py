@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import zipfile
+import tarfile
+from unittest.mock import MagicMock
+
+from gns3.config_transfer import ConfigExporter, archive_format, import_configs
+
+
+def _node(name, server):
+
+    node = MagicMock()
+    node.name.return_value = name
+    node.server.return_value = server
+    node.configFilesPath.return_value = "/vms/{}/configs".format(name)
+    node.configFiles.side_effect = lambda result: {name + "_startup-config.cfg": result["startup_config_content"]}
+    return node
+
+
+def _reply(node, content="hostname R1"):
+
+    args, kwargs = node.httpGet.call_args
+    args[1]({"startup_config_content": content}, context=kwargs["context"])
+
+
+def test_archive_format():
+
+    assert archive_format("configs.zip") == "zip"
+    assert archive_format("configs.TAR") == "tar"
+    assert archive_format("configs.tar.gz") == "tar.gz"
+    assert archive_format("configs.tgz") == "tar.gz"
+    assert archive_format("configs") is None
+
+
+def test_export_bounded_per_server(tmpdir):
+
+    server1 = MagicMock()
+    server2 = MagicMock()
+    nodes = [_node("R{}".format(i), server1) for i in range(5)] + [_node("S1", server2)]
+    exporter = ConfigExporter(nodes, str(tmpdir), max_transfers=2)
+    exporter.start()
+    assert [node.httpGet.called for node in nodes] == [True, True, False, False, False, True]
+
+    _reply(nodes[0])
+    assert nodes[2].httpGet.called
+    assert not nodes[3].httpGet.called
+
+    # each reply starts the next request
+    for node in nodes[1:]:
+        _reply(node)
+    assert exporter.isFinished()
+    assert exporter.fileCount() == 6
+    assert exporter.size() == 6 * len("hostname R1")
+    with open(os.path.join(str(tmpdir), "R3_startup-config.cfg")) as f:
+        assert f.read() == "hostname R1"
+
+
+def test_export_error(tmpdir):
+
+    node = _node("R1", MagicMock())
+    exporter = ConfigExporter([node], str(tmpdir))
+    exporter.start()
+    args, kwargs = node.httpGet.call_args
+    args[1]({"message": "VM not found"}, error=True, context=kwargs["context"])
+    assert exporter.isFinished()
+    assert exporter.errors() == ["Could not export the configs of R1: VM not found"]
+
+
+def test_export_zip(tmpdir):
+
+    path = str(tmpdir / "configs.zip")
+    nodes = [_node("R1", MagicMock()), _node("R2", MagicMock())]
+    exporter = ConfigExporter(nodes, path, archive="zip")
+    exporter.start()
+    _reply(nodes[0])
+    _reply(nodes[1], "hostname R2")
+    assert exporter.isFinished()
+    with zipfile.ZipFile(path) as archive:
+        assert sorted(archive.namelist()) == ["R1_startup-config.cfg", "R2_startup-config.cfg"]
+        assert archive.read("R2_startup-config.cfg") == b"hostname R2"
+
+
+def test_export_tar(tmpdir):
+
+    path = str(tmpdir / "configs.tar.gz")
+    node = _node("R1", MagicMock())
+    exporter = ConfigExporter([node], path, archive="tar.gz")
+    exporter.start()
+    _reply(node)
+    with tarfile.open(path) as archive:
+        assert archive.extractfile("R1_startup-config.cfg").read() == b"hostname R1"
+
+
+def test_export_dry_run(tmpdir):
+
+    nodes = [_node("R1", MagicMock()), _node("R2", MagicMock())]
+    exporter = ConfigExporter(nodes, dry_run=True)
+    exporter.start()
+    _reply(nodes[0])
+    _reply(nodes[1], "hostname R2\n")
+    assert exporter.isFinished()
+    assert exporter.fileCount() == 2
+    assert exporter.size() == 23
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_export_cancel(tmpdir):
+
+    nodes = [_node("R{}".format(i), MagicMock()) for i in range(3)]
+    server = MagicMock()
+    for node in nodes:
+        node.server.return_value = server
+    exporter = ConfigExporter(nodes, str(tmpdir), max_transfers=1)
+    exporter.start()
+    exporter.cancel()
+    assert not exporter.isFinished()
+    _reply(nodes[0])
+    assert exporter.isFinished()
+    assert not nodes[1].httpGet.called
+    assert os.listdir(str(tmpdir)) == ["R0_startup-config.cfg"]
+
+
+def test_import_configs(tmpdir):
+
+    nodes = [MagicMock(), MagicMock()]
+    open(str(tmpdir / "R1_startup-config.cfg"), "w").close()
+    import_configs(nodes, str(tmpdir))
+    for node in nodes:
+        node.importConfigFromDirectory.assert_called_with(str(tmpdir), ["R1_startup-config.cfg"])
@@ -19,7 +19,7 @@ import pytest
 import unittest.mock
 
 from gns3.qt import QtCore, QtNetwork, FakeQtSignal
-from gns3.http_client import HTTPClient
+from gns3.http_client import HTTPClient, TextSink
 from gns3.version import __version__, __version_info__
 
 
@@ -80,11 +80,52 @@ def test_get_connected(http_client, http_request, network_manager, response):
     assert callback.called
 
 
+def test_get_sink(http_client, http_request, network_manager, response):
+
+    http_client._connected = True
+    type(response).readyRead = unittest.mock.PropertyMock(return_value=FakeQtSignal())
+    callback = unittest.mock.MagicMock()
+    sink = TextSink()
+
+    http_client.get("/test", callback, sink=sink)
+    response.setReadBufferSize.assert_called_with(256 * 1024)
+
+    response.readAll.return_value = "hé".encode()[:2]
+    response.readyRead.emit()
+    response.readAll.return_value = "hé".encode()[2:] + b"llo"
+    response.finished.emit()
+
+    assert sink.text() == "héllo"
+    args, kwargs = callback.call_args
+    assert args[0] == {"status": 200, "size": 6, "content_type": "application/json"}
+    assert "error" not in kwargs
+
+
+def test_get_sink_write_error(http_client, http_request, network_manager, response):
+
+    http_client._connected = True
+    type(response).readyRead = unittest.mock.PropertyMock(return_value=FakeQtSignal())
+    callback = unittest.mock.MagicMock()
+    sink = unittest.mock.MagicMock()
+    sink.write.side_effect = OSError("No space left on device")
+
+    http_client.get("/test", callback, sink=sink)
+    response.readAll.return_value = b"hello"
+    response.readyRead.emit()
+    assert response.abort.called
+
+    response.error.return_value = QtNetwork.QNetworkReply.OperationCanceledError
+    response.finished.emit()
+    args, kwargs = callback.call_args
+    assert kwargs["error"] is True
+    assert "No space left on device" in args[0]["message"]
+
+
 def test_get_connected_auth(http_client, http_request, network_manager, response):
 
     http_client._connected = True
-    http_client._user = "gns3"
-    http_client._password = "3sng"
+    http_client.setUser("gns3")
+    http_client.setPassword("3sng")
     callback = unittest.mock.MagicMock()
 
     http_client.get("/test", callback)
@@ -335,3 +376,21 @@ def test_callbackConnect_non_gns3_server(http_client):
     http_client._callbackConnect("GET", "/version", mock, {}, {}, params)
     assert http_client._connected is False
     mock.assert_called_with({"message": "The remote server http://127.0.0.1:3080 is not a GNS3 server"}, error=True, server=http_client)
+
+
+def test_isLocalServerRunning(http_client):
+
+    callback = unittest.mock.MagicMock()
+    with unittest.mock.patch("gns3.readiness_prober.ReadinessProber.start", autospec=True) as mock:
+        http_client.isLocalServerRunning(callback)
+    prober = mock.call_args[0][0]
+    # the check doesn't wait for the reply
+    assert not callback.called
+    prober.finished_signal.emit(200, {"version": "2.0.0"})
+    callback.assert_called_once_with(True)
+
+    callback = unittest.mock.MagicMock()
+    with unittest.mock.patch("gns3.readiness_prober.ReadinessProber.start", autospec=True) as mock:
+        http_client.isLocalServerRunning(callback)
+    mock.call_args[0][0].finished_signal.emit(0, None)
+    callback.assert_called_once_with(False)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import unittest.mock
+
+from gns3.qt import QtCore
+from gns3.inventory_cache import InventoryCache
+
+
+def test_get_single_flight():
+
+    server = unittest.mock.MagicMock()
+    inventory = InventoryCache(server)
+    callbacks = [unittest.mock.MagicMock() for _ in range(50)]
+    for callback in callbacks:
+        inventory.get("/interfaces", callback)
+
+    assert server.get.call_count == 1
+    args, kwargs = server.get.call_args
+    assert args[0] == "/interfaces"
+    reply_callback = args[1]
+    reply_callback([{"name": "eth0"}], server=server)
+
+    for callback in callbacks:
+        callback.assert_called_once_with([{"name": "eth0"}], server=server, context={})
+    assert inventory.statistics() == {"hits": 49, "misses": 1, "entries": 1}
+
+
+def test_get_cached():
+
+    server = unittest.mock.MagicMock()
+    inventory = InventoryCache(server)
+    inventory.get("/qemu/binaries", None, body={"archs": ["i386"]})
+    server.get.call_args[0][1]([{"path": "/usr/bin/qemu-system-i386"}], server=server)
+
+    callback = unittest.mock.MagicMock()
+    inventory.get("/qemu/binaries", callback, body={"archs": ["i386"]})
+    assert server.get.call_count == 1
+    # the cached reply is delivered asynchronously
+    assert not callback.called
+    QtCore.QCoreApplication.processEvents()
+    callback.assert_called_once_with([{"path": "/usr/bin/qemu-system-i386"}], server=server, context={})
+
+    # another body is another request
+    inventory.get("/qemu/binaries", callback)
+    assert server.get.call_count == 2
+
+
+def test_get_expired_refresh_and_invalidate():
+
+    server = unittest.mock.MagicMock()
+    inventory = InventoryCache(server)
+    inventory.get("/docker/images", None, ttl=0)
+    server.get.call_args[0][1]([], server=server)
+    inventory.get("/docker/images", None)
+    assert server.get.call_count == 2
+
+    server.get.call_args[0][1]([], server=server)
+    inventory.get("/docker/images", None, refresh=True)
+    assert server.get.call_count == 3
+
+    server.get.call_args[0][1]([], server=server)
+    inventory.invalidate("/docker")
+    inventory.get("/docker/images", None)
+    assert server.get.call_count == 4
+
+
+def test_get_error_not_cached():
+
+    server = unittest.mock.MagicMock()
+    inventory = InventoryCache(server)
+    callback = unittest.mock.MagicMock()
+    inventory.get("/virtualbox/vms", callback)
+    server.get.call_args[0][1]({"message": "VirtualBox is not installed"}, error=True, server=server)
+    callback.assert_called_once_with({"message": "VirtualBox is not installed"}, error=True, server=server, context={})
+
+    inventory.get("/virtualbox/vms", callback)
+    assert server.get.call_count == 2
+
+
+def test_refresh():
+
+    server = unittest.mock.MagicMock()
+    inventory = InventoryCache(server)
+    inventory.get("/qemu/binaries", None, body={"archs": ["i386"]})
+    server.get.call_args[0][1]([{"path": "/usr/bin/qemu-system-i386"}], server=server)
+
+    inventory.refresh()
+    assert server.get.call_count == 2
+    args, kwargs = server.get.call_args
+    assert args[0] == "/qemu/binaries"
+    assert kwargs["body"] == {"archs": ["i386"]}
+    args[1]([{"path": "/usr/bin/qemu-system-x86_64"}], server=server)
+
+    callback = unittest.mock.MagicMock()
+    inventory.get("/qemu/binaries", callback, body={"archs": ["i386"]})
+    assert server.get.call_count == 2
+    QtCore.QCoreApplication.processEvents()
+    callback.assert_called_once_with([{"path": "/usr/bin/qemu-system-x86_64"}], server=server, context={})
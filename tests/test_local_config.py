@@ -18,9 +18,12 @@
 import pytest
 import sys
 import os
+import copy
 import json
+import time
 from unittest.mock import patch, MagicMock
 
+from gns3.qt import QtCore
 from gns3.local_config import LocalConfig
 
 
@@ -270,3 +273,178 @@ def test_isMainGui_pid_file_exist_but_same_pid(tmpdir):
         with patch("gns3.local_config.LocalConfig.configDirectory") as mock_config_directory:
             mock_config_directory.return_value = str(tmpdir)
             assert LocalConfig().isMainGui() is True
+
+
+def test_sectionView(local_config):
+
+    local_config.saveSectionSettings("Test", {"a": {"b": 1}, "c": [1, 2]})
+    view = local_config.sectionView("Test")
+    assert view["a"]["b"] == 1
+    assert view["c"] == (1, 2)
+    with pytest.raises(TypeError):
+        view["a"]["b"] = 2
+    # the view is shared until the section changes
+    assert local_config.sectionView("Test") is view
+
+    version = local_config.version()
+    local_config.saveSectionSettings("Test", {"a": {"b": 2}})
+    assert local_config.version() > version
+    assert local_config.sectionView("Test")["a"]["b"] == 2
+    assert view["a"]["b"] == 1
+
+
+def test_sectionSettings(local_config):
+
+    local_config.saveSectionSettings("Test", {"a": {"b": 1}})
+    settings = local_config.sectionSettings("Test")
+    settings["a"]["b"] = 2
+    assert local_config.sectionView("Test")["a"]["b"] == 1
+    assert local_config.sectionSettings("Unknown") == {}
+
+
+def test_loadSectionSettingsLargeConfig(local_config):
+
+    templates = [{"name": "VM{}".format(i), "server": "local", "options": []} for i in range(2000)]
+    local_config._settings["Qemu"] = {"vms": templates}
+
+    # only the requested section is copied
+    with patch("gns3.local_config.copy.deepcopy", wraps=copy.deepcopy) as mock:
+        assert local_config.loadSectionSettings("MainWindow", {"a": 1}) == {"a": 1}
+        for call in mock.call_args_list:
+            assert call[0][0] is not local_config._settings
+            assert call[0][0] is not local_config._settings["Qemu"]
+
+
+def test_loadSectionSettingsTemplatesCopied(local_config):
+
+    templates = [{"name": "VM{}".format(i), "server": "local"} for i in range(10)]
+    local_config._settings["Qemu"] = {"vms": templates, "vm": {"a": 1}}
+
+    settings = local_config.loadSectionSettings("Qemu", {"vms": [], "vm": {"a": 2, "b": 2}})
+    # the templates are copied too, changing them doesn't change the config
+    settings["vms"][0]["name"] = "VM42"
+    settings["vm"]["a"] = 3
+    settings["vms"].append({"name": "VM10"})
+    assert local_config._settings["Qemu"]["vm"] == {"a": 1, "b": 2}
+    assert local_config._settings["Qemu"]["vms"][0]["name"] == "VM0"
+    assert len(local_config._settings["Qemu"]["vms"]) == 10
+
+
+def test_sectionViewDefaultSettings(local_config):
+
+    local_config._settings["Qemu"] = {"vms": [{"name": "VM0", "server": "local"}]}
+    view = local_config.sectionView("Qemu", {"vms": [], "enable_kvm": True})
+    assert view["enable_kvm"] is True
+    assert view["vms"][0]["name"] == "VM0"
+    assert local_config.sectionView("Qemu", {"vms": [], "enable_kvm": True}) is view
+
+    # the settings of a view can be saved as they are
+    settings = dict(view)
+    settings["enable_kvm"] = False
+    local_config.saveSectionSettings("Qemu", settings)
+    assert local_config._settings["Qemu"] == {"vms": [{"name": "VM0", "server": "local"}], "enable_kvm": False}
+
+
+def _writeExternalChange(config_file, settings):
+
+    with open(config_file, "w+") as f:
+        json.dump(settings, f)
+    # make sure the modification time is more recent than our last write
+    st = os.stat(config_file)
+    os.utime(config_file, (st.st_atime, st.st_mtime + 10))
+
+
+def test_checkConfigChangedSections(config_file, local_config):
+
+    local_config.setConfigFilePath(config_file)
+    settings = json.loads(open(config_file).read())
+    settings["VPCS"]["vpcs_path"] = "/bin/vpcs"
+    _writeExternalChange(config_file, settings)
+
+    sections = []
+    local_config.config_section_changed_signal.connect(lambda section: sections.append(section))
+    assert local_config.checkConfigChanged() == ["VPCS"]
+    assert sections == ["VPCS"]
+    assert local_config.sectionView("VPCS")["vpcs_path"] == "/bin/vpcs"
+
+    # nothing changed since the last check
+    assert local_config.checkConfigChanged() == []
+
+
+def test_checkConfigChangedSectionDeleted(config_file, local_config):
+
+    local_config.setConfigFilePath(config_file)
+    settings = json.loads(open(config_file).read())
+    del settings["VPCS"]
+    _writeExternalChange(config_file, settings)
+
+    sections = []
+    local_config.config_section_changed_signal.connect(lambda section: sections.append(section))
+    assert local_config.checkConfigChanged() == ["VPCS"]
+    assert sections == ["VPCS"]
+    assert "VPCS" not in local_config.settings()
+
+
+def test_watchConfigFile(config_file, local_config):
+
+    local_config.setConfigFilePath(config_file)
+    local_config.watchConfigFile(debounce=10)
+    settings = json.loads(open(config_file).read())
+    settings["VirtualBox"]["use_local_server"] = False
+    _writeExternalChange(config_file, settings)
+
+    sections = []
+    local_config.config_section_changed_signal.connect(lambda section: sections.append(section))
+    deadline = time.time() + 5
+    while not sections and time.time() < deadline:
+        QtCore.QCoreApplication.processEvents()
+        time.sleep(0.01)
+    assert sections == ["VirtualBox"]
+
+
+def test_writeBehind(local_config):
+
+    local_config.setWriteBehind(delay=10)
+    with patch("gns3.local_config.LocalConfig._saveConfigFile", wraps=local_config._saveConfigFile) as mock:
+        for i in range(10):
+            local_config.saveSectionSettings("Test", {"a": i})
+        # nothing is written until the delay expires
+        assert not mock.called
+        deadline = time.time() + 5
+        while not mock.called and time.time() < deadline:
+            QtCore.QCoreApplication.processEvents()
+            time.sleep(0.01)
+        local_config.flush()
+        assert mock.call_count == 1
+
+    with open(local_config.configFilePath()) as f:
+        assert json.load(f)["Test"] == {"a": 9}
+
+
+def test_writeBehindFlush(local_config):
+
+    local_config.setWriteBehind(delay=10000)
+    local_config.saveSectionSettings("Test", {"a": 1})
+    local_config.flush()
+    with open(local_config.configFilePath()) as f:
+        assert json.load(f)["Test"] == {"a": 1}
+
+    # the content has not changed, the file is not written again
+    with patch("gns3.local_config.os.replace") as mock:
+        local_config.saveSectionSettings("Test", {"a": 2})
+        local_config.saveSectionSettings("Test", {"a": 1})
+        local_config.flush()
+        assert not mock.called
+
+
+def test_writeBehindSnapshot(local_config):
+
+    local_config.saveSectionSettings("Test", {"a": 1})
+    snapshot = local_config._snapshotConfig()
+    # the changes made after the snapshot are not saved with it
+    local_config.saveSectionSettings("Test", {"a": 2})
+    assert snapshot["Test"]["a"] == 1
+    local_config._last_written_hash = None
+    local_config._saveConfigFile(snapshot)
+    with open(local_config.configFilePath()) as f:
+        assert json.load(f)["Test"] == {"a": 1}
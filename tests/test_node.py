@@ -18,21 +18,25 @@
 
 from unittest.mock import patch, Mock
 
+from gns3.node import Node
 
-def test_allocateUDPPort(vpcs_device):
 
-    with patch('gns3.node.Node.httpPost') as mock:
-        vpcs_device.allocateUDPPort(1)
-        assert mock.called
-        args, kwargs = mock.call_args
-        assert args[0] == "/ports/udp"
+def test_allocateUDPPort(vpcs_device):
 
+    with patch('gns3.project.Project.post') as mock:
         # Connect the signal
         signal_mock = Mock()
         vpcs_device.allocate_udp_nio_signal.connect(signal_mock)
 
+        vpcs_device.allocateUDPPort(1)
+        assert mock.called
+        args, kwargs = mock.call_args
+        assert args[0] == vpcs_device.server()
+        assert args[1] == "/ports/udp"
+        assert not signal_mock.called
+
         # Callback
-        args[1]({"udp_port": 4242}, context=kwargs["context"])
+        args[2]({"udp_port": 4242})
 
         # Check the signal
         assert signal_mock.called
@@ -40,3 +44,62 @@ def test_allocateUDPPort(vpcs_device):
         assert args[0] == vpcs_device.id()
         assert args[1] == 1
         assert args[2] == 4242
+
+
+def test_allocateName(vpcs_device):
+
+    assert vpcs_device.allocateName("PC") == "PC1"
+    assert vpcs_device.allocateName("PC-{0}") == "PC-1"
+    assert vpcs_device.allocateName("PC") == "PC2"
+
+
+def test_allocateName_released(vpcs_device):
+
+    assert [vpcs_device.allocateName("R") for _ in range(3)] == ["R1", "R2", "R3"]
+    vpcs_device._allocated_names.remove("R2")
+    assert not vpcs_device.hasAllocatedName("R2")
+    vpcs_device.setName("R4")
+    assert vpcs_device.allocateName("R") == "R2"
+    assert vpcs_device.allocateName("R") == "R5"
+
+
+def test_update_delta(vpcs_device):
+
+    vpcs_device._settings["console"] = 2000
+    with patch('gns3.node.Node.httpPut') as mock:
+        vpcs_device.update({"name": vpcs_device.name(), "console": 2001})
+        args, kwargs = mock.call_args
+        assert kwargs["body"] == {"console": 2001}
+
+        # the same change is not sent twice while waiting for the server
+        mock.reset_mock()
+        statistics = Node.updateStatistics()
+        vpcs_device.update({"console": 2001})
+        assert not mock.called
+        assert Node.updateStatistics()["skipped"] == statistics["skipped"] + 1
+
+        args[1]({"console": 2001})
+        assert vpcs_device.settings()["console"] == 2001
+        vpcs_device.update({"console": 2001})
+        assert not mock.called
+        vpcs_device.update({"console": 2000})
+        assert mock.called
+
+
+def test_update_revert_while_pending(vpcs_device):
+
+    vpcs_device._settings["console"] = 2000
+    with patch('gns3.node.Node.httpPut') as mock:
+        vpcs_device.update({"console": 2001})
+        first_callback = mock.call_args[0][1]
+
+        # reverting to the acknowledged value while the update is pending is sent
+        mock.reset_mock()
+        vpcs_device.update({"console": 2000})
+        args, kwargs = mock.call_args
+        assert kwargs["body"] == {"console": 2000}
+
+        first_callback({"console": 2001})
+        args[1]({"console": 2000})
+        assert vpcs_device.settings()["console"] == 2000
+        assert vpcs_device._pending_settings == {}
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest.mock import MagicMock
+
+from gns3.node import Node
+from gns3.node_index import NodeIndex
+from gns3.modules.vpcs.vpcs_device import VPCSDevice
+from gns3.modules.vpcs import VPCS
+
+
+def test_status(vpcs_device):
+
+    index = NodeIndex()
+    index.addNode(vpcs_device)
+    assert index.nodes("start") == [vpcs_device]
+    assert index.nodes("start", Node.started) == []
+    assert index.count(Node.stopped) == 1
+
+    vpcs_device.setStatus(Node.started)
+    assert index.nodes("console", Node.started) == [vpcs_device]
+    assert index.count(Node.stopped) == 0
+    assert index.count(Node.started) == 1
+
+    # VPCS devices cannot be suspended
+    assert index.nodes("suspend") == []
+
+
+def test_initialized(local_server, project):
+
+    node = VPCSDevice(VPCS(), local_server, project)
+    index = NodeIndex()
+    index.addNode(node)
+    assert index.nodes() == []
+
+    node.setInitialized(True)
+    node.created_signal.emit(node.id())
+    assert index.nodes("stop") == [node]
+
+
+def test_remove(vpcs_device):
+
+    index = NodeIndex()
+    updated = MagicMock()
+    index.updated_signal.connect(updated)
+    index.addNode(vpcs_device)
+    assert updated.called
+
+    index.removeNode(vpcs_device)
+    assert index.nodes() == []
+    # status changes of a removed node are ignored
+    vpcs_device.setStatus(Node.started)
+    assert index.count(Node.started) == 0
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import json
+import socket
+import threading
+import http.server
+
+import pytest
+
+from gns3.readiness_prober import ReadinessProber
+
+
+class VersionHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.headers.get("Authorization") is None and self.server.protected:
+            self.send_response(401)
+            self.end_headers()
+            return
+        body = json.dumps({"version": "2.0.0", "local": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), VersionHandler)
+    server.protected = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def unused_port():
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_wait_for_ready(http_server):
+
+    prober = ReadinessProber("127.0.0.1", http_server.server_address[1])
+    status, json_data = prober.waitForReady()
+    assert status == 200
+    assert json_data["version"] == "2.0.0"
+    assert prober.isReady()
+    assert prober.metrics()["attempts"] == 1
+    assert prober.metrics()["time_to_ready"] is not None
+
+
+def test_wait_for_ready_authentication(http_server):
+
+    http_server.protected = True
+    prober = ReadinessProber("127.0.0.1", http_server.server_address[1])
+    assert prober.waitForReady() == (401, None)
+
+    prober = ReadinessProber("127.0.0.1", http_server.server_address[1], user="gns3", password="gns3")
+    assert prober.waitForReady()[0] == 200
+
+
+def test_wait_for_ready_timeout():
+
+    prober = ReadinessProber("127.0.0.1", unused_port(), timeout=0.3, initial_delay=0.01)
+    assert prober.waitForReady() == (0, None)
+    assert not prober.isReady()
+    # the probes are retried with an increasing delay
+    assert 1 < prober.metrics()["attempts"] < 10
+    assert prober.error()
+
+
+def test_wait_for_ready_max_attempts():
+
+    prober = ReadinessProber("127.0.0.1", unused_port(), max_attempts=1)
+    assert prober.waitForReady() == (0, None)
+    assert prober.metrics()["attempts"] == 1
+
+
+def test_backoff_delay():
+
+    prober = ReadinessProber("127.0.0.1", 3080, initial_delay=0.1, max_delay=1, jitter=0)
+    delays = []
+    for attempts in range(1, 7):
+        prober._attempts = attempts
+        delays.append(prober._delay())
+    assert delays == [0.1, 0.2, 0.4, 0.8, 1, 1]
+
+
+def test_cancel():
+
+    prober = ReadinessProber("127.0.0.1", unused_port(), timeout=30)
+    finished = []
+    prober.finished_signal.connect(lambda status, json_data: finished.append(status))
+    prober.start()
+    prober.cancel()
+    assert finished == [0]
+    assert prober.error() == "Canceled"
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import json
+
+from gns3.request_metrics import RequestMetrics, endpointTemplate, latencyPercentile
+
+
+def test_endpoint_template():
+
+    assert endpointTemplate("/projects/0bd61a8e-ea4b-4f34-bb2c-1f2b7a5d0e0f/qemu/vms/4e5a2d1c-e5f5-4b7b-a2d2-12b3c3d4e5f6/start") == "/projects/{id}/qemu/vms/{id}/start"
+    assert endpointTemplate("/projects/0bd61a8e-ea4b-4f34-bb2c-1f2b7a5d0e0f/vpcs/vms/4e5a2d1c-e5f5-4b7b-a2d2-12b3c3d4e5f6/adapters/0/ports/1/nio") == "/projects/{id}/vpcs/vms/{id}/adapters/{id}/ports/{id}/nio"
+    assert endpointTemplate("/projects/0bd61a8e-ea4b-4f34-bb2c-1f2b7a5d0e0f/files/project-files/qemu/disk.qcow2") == "/projects/{id}/files/{path}"
+    assert endpointTemplate("/projects/0bd61a8e-ea4b-4f34-bb2c-1f2b7a5d0e0f/export?include_images=1") == "/projects/{id}/export"
+
+
+def test_statistics():
+
+    metrics = RequestMetrics()
+    for i in range(10):
+        token = metrics.requestStarted("http://127.0.0.1:3080", "POST", "/projects/{}/vpcs/vms".format(i), bytes_out=10)
+        metrics.dataReceived(token, 100)
+        metrics.requestFinished(token, error=(i == 0))
+    token = metrics.requestStarted("http://127.0.0.1:3080", "GET", "/projects/1/notifications")
+
+    statistics = metrics.statistics()
+    assert len(statistics) == 2
+    assert statistics[0]["endpoint"] == "/projects/{id}/vpcs/vms"
+    assert statistics[0]["count"] == 10
+    assert statistics[0]["errors"] == 1
+    assert statistics[0]["bytes_in"] == 1000
+    assert statistics[0]["bytes_out"] == 100
+    assert statistics[0]["p50"] is not None
+    assert statistics[1]["in_flight"] == 1
+    assert statistics[1]["p50"] is None
+
+    metrics.reset()
+    statistics = metrics.statistics()
+    assert len(statistics) == 1
+    assert statistics[0]["in_flight"] == 1
+    metrics.requestFinished(token, stream=True)
+    assert metrics.statistics()[0]["in_flight"] == 0
+
+
+def test_latency_percentile():
+
+    latencies = [latency / 1000 for latency in range(1, 101)]
+    assert latencyPercentile([], 50) is None
+    assert latencyPercentile(latencies, 50) == 50
+    assert latencyPercentile(latencies, 95) == 95
+    assert latencyPercentile(latencies, 99) == 99
+
+
+def test_server_statistics():
+
+    metrics = RequestMetrics()
+    metrics.requestFinished(metrics.requestStarted("http://127.0.0.1:3080", "GET", "/version"))
+    metrics.requestFinished(metrics.requestStarted("http://127.0.0.1:3080", "POST", "/projects"), error=True)
+    statistics = metrics.serverStatistics()["http://127.0.0.1:3080"]
+    assert statistics["count"] == 2
+    assert statistics["errors"] == 1
+    assert statistics["p50"] is not None
+
+
+def test_export():
+
+    metrics = RequestMetrics()
+    metrics.requestFinished(metrics.requestStarted("http://127.0.0.1:3080", "GET", "/version"))
+    assert json.loads(metrics.toJSON())["endpoints"][0]["endpoint"] == "/version"
+    assert json.loads(metrics.toJSON())["servers"]["http://127.0.0.1:3080"]["count"] == 1
+    lines = metrics.toCSV().splitlines()
+    assert lines[0].startswith("server,method,endpoint,count")
+    assert lines[1].startswith("http://127.0.0.1:3080,GET,/version,1,0,0")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from gns3.qt import QtNetwork
+from gns3.server_connection import ServerConnection, DEFAULT_CONNECTION_SETTINGS
+
+
+@pytest.fixture(autouse=True)
+def connection_settings():
+
+    ServerConnection.setSettings({})
+    yield
+    ServerConnection.setSettings({})
+
+
+def test_base_url():
+
+    connection = ServerConnection("http", "127.0.0.1", 3080, None, None, MagicMock())
+    assert connection.baseUrl() == "http://127.0.0.1:3080/v1"
+    assert connection.url("/version").toString() == "http://127.0.0.1:3080/v1/version"
+
+    connection.setServer("https", "::1", 3443, "gns3", "3sng")
+    assert connection.baseUrl() == "https://gns3@[::1]:3443/v1"
+
+
+def test_base_url_computed_once():
+
+    connection = ServerConnection("http", "::1", 3080, None, None, MagicMock())
+    connection.baseUrl()
+    with patch("ipaddress.IPv6Address") as mock:
+        connection.baseUrl()
+        assert not mock.called
+
+
+def test_auth_header():
+
+    connection = ServerConnection("http", "127.0.0.1", 3080, None, None, MagicMock())
+    assert connection.authHeader() is None
+    connection.setServer("http", "127.0.0.1", 3080, "gns3", "3sng")
+    assert connection.authHeader() == b"Basic Z25zMzozc25n"
+
+
+def test_prepare_request():
+
+    ServerConnection.setSettings({"http_pipelining": True})
+    connection = ServerConnection("http", "127.0.0.1", 3080, "gns3", "3sng", MagicMock())
+    request = MagicMock()
+    connection.prepareRequest(request)
+    request.setRawHeader.assert_any_call(b"Authorization", b"Basic Z25zMzozc25n")
+    request.setAttribute.assert_any_call(QtNetwork.QNetworkRequest.HttpPipeliningAllowedAttribute, True)
+
+
+def test_network_manager():
+
+    network_manager = QtNetwork.QNetworkAccessManager()
+    connection = ServerConnection("http", "127.0.0.1", 3080, None, None, network_manager)
+    assert connection.networkManager() is network_manager
+    assert connection.networkManager() is network_manager
+
+    ServerConnection.setSettings({"max_connections_per_host": 12})
+    network_managers = {connection.networkManager(), connection.networkManager()}
+    assert len(network_managers) == 2
+    assert network_manager in network_managers
+
+
+def test_keep_alive():
+
+    network_manager = MagicMock()
+    connection = ServerConnection("http", "127.0.0.1", 3080, None, None, network_manager)
+    connection.requestStarted()
+    # a request has just been sent, the connection is still open
+    connection._keepAliveSlot()
+    assert not network_manager.connectToHost.called
+
+    connection._last_request -= DEFAULT_CONNECTION_SETTINGS["keep_alive_interval"]
+    connection._keepAliveSlot()
+    network_manager.connectToHost.assert_called_with("127.0.0.1", 3080)
+    assert connection.statistics()["preconnects"] == 1
+
+
+def test_keep_alive_all_network_managers():
+
+    ServerConnection.setSettings({"max_connections_per_host": 12})
+    network_manager = QtNetwork.QNetworkAccessManager()
+    connection = ServerConnection("http", "127.0.0.1", 3080, None, None, network_manager)
+    with patch("gns3.qt.QtNetwork.QNetworkAccessManager.connectToHost") as mock:
+        connection._keepAliveSlot()
+        assert mock.call_count == 2
+    assert connection.statistics()["preconnects"] == 2
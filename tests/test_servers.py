@@ -17,6 +17,8 @@
 
 import sys
 import json
+import time
+import signal
 import pytest
 import binascii
 import subprocess
@@ -24,7 +26,7 @@ import logging
 
 
 from gns3.servers import Servers
-from gns3.qt import QtWidgets
+from gns3.qt import QtCore, QtWidgets
 from unittest.mock import MagicMock, patch
 
 
@@ -260,3 +262,39 @@ def test_killAlreadyRunningServer(tmpdir):
             mock.assert_called_with(pid=42)
             assert mock_process.kill.called
 
+
+
+def test_interruptLocalServer():
+
+    servers = Servers.instance()
+    process = MagicMock()
+    process.poll.side_effect = [None, None, 0]
+    servers._local_server_process = process
+    callback = MagicMock()
+    servers.interruptLocalServer(callback, timeout=0)
+    # the local server is stopped without blocking
+    assert not callback.called
+    process.send_signal.assert_called_once_with(signal.CTRL_BREAK_EVENT if sys.platform.startswith("win") else signal.SIGINT)
+    # still running after the timeout
+    assert process.kill.called
+    deadline = time.time() + 5
+    while not callback.called and time.time() < deadline:
+        QtCore.QCoreApplication.processEvents()
+        time.sleep(0.01)
+    assert callback.called
+
+
+def test_localServerAutoStart_already_running():
+
+    servers = Servers.instance()
+    running = [True, False]
+    callback = MagicMock()
+    with patch("gns3.local_config.LocalConfig.isMainGui", return_value=True):
+        with patch("gns3.http_client.HTTPClient.isLocalServerRunning", side_effect=lambda cb: cb(running.pop(0))):
+            with patch("gns3.servers.Servers._killAlreadyRunningServer") as kill:
+                with patch("gns3.servers.Servers.initLocalServer", return_value=True):
+                    with patch("gns3.servers.Servers.startLocalServer", return_value=True) as start:
+                        servers.localServerAutoStart(callback)
+    assert kill.called
+    assert start.called
+    callback.assert_called_once_with(True)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from unittest.mock import patch, MagicMock
+
+from gns3.servers import Servers
+from gns3.startup_orchestrator import StartupOrchestrator
+
+
+def test_start_nothing_to_wait_for():
+
+    Servers.instance()._settings["local_server"]["auto_start"] = False
+    startup = StartupOrchestrator()
+    finished = MagicMock()
+    startup.finished_signal.connect(lambda ready: finished(ready))
+    with patch("gns3.gns3_vm.GNS3VM.autoStart", return_value=False):
+        startup.start()
+    assert startup.isFinished()
+    assert startup.localServerReady()
+    finished.assert_called_with(True)
+
+
+def test_start_vm_and_local_server_in_parallel():
+
+    Servers.instance()._settings["local_server"]["auto_start"] = True
+    Servers.instance().vmSettings()["adjust_local_server_ip"] = False
+    startup = StartupOrchestrator()
+    workers = {}
+
+    def run_worker(name, worker, callback):
+        workers[name] = callback
+
+    finished = MagicMock()
+    startup.finished_signal.connect(lambda ready: finished(ready))
+    with patch("gns3.gns3_vm.GNS3VM.autoStart", return_value=True):
+        with patch("gns3.gns3_vm.GNS3VM.isRemote", return_value=False):
+            with patch("gns3.servers.Servers.localServerAutoStart", side_effect=lambda callback: callback(True)):
+                with patch("gns3.startup_orchestrator.StartupOrchestrator._runWorker", side_effect=run_worker):
+                    with patch("gns3.readiness_prober.ReadinessProber.start"):
+                        startup.start()
+
+    # both phases are running at the same time
+    assert set(workers) == {"gns3_vm"}
+    assert startup._local_server_prober is not None
+
+    assert startup.runningPhases() == ["gns3_vm", "local_server"]
+    startup._local_server_prober.finished_signal.emit(200, {"version": "2.0.0"})
+    assert startup.localServerReady()
+    assert not startup.isFinished()
+    assert startup.runningPhases() == ["gns3_vm"]
+
+    with patch("gns3.gns3_vm.GNS3VM.adjustLocalServerIP"):
+        workers["gns3_vm"](False, "GNS3 VM is not configured")
+    assert startup.isFinished()
+    finished.assert_called_with(True)
+    phases = {name: (duration, success) for name, duration, success in startup.phases()}
+    assert phases["local_server"][1] is True
+    assert phases["gns3_vm"][1] is False
+    assert phases["gns3_vm"][0] is not None
+
+
+def test_local_server_ready_after_vm_when_ip_adjusted():
+
+    Servers.instance()._settings["local_server"]["auto_start"] = True
+    Servers.instance().vmSettings()["adjust_local_server_ip"] = True
+    startup = StartupOrchestrator()
+    workers = {}
+
+    def run_worker(name, worker, callback):
+        workers[name] = callback
+
+    ready = MagicMock()
+    startup.local_server_ready_signal.connect(lambda: ready())
+    with patch("gns3.gns3_vm.GNS3VM.autoStart", return_value=True):
+        with patch("gns3.gns3_vm.GNS3VM.isRemote", return_value=False):
+            with patch("gns3.servers.Servers.localServerAutoStart", side_effect=lambda callback: callback(True)):
+                with patch("gns3.startup_orchestrator.StartupOrchestrator._runWorker", side_effect=run_worker):
+                    with patch("gns3.readiness_prober.ReadinessProber.start"):
+                        startup.start()
+
+    # the local server may be restarted on another address once the GNS3 VM is started
+    startup._local_server_prober.finished_signal.emit(200, {"version": "2.0.0"})
+    assert not startup.localServerReady()
+    assert not ready.called
+
+    with patch("gns3.gns3_vm.GNS3VM.adjustLocalServerIP"):
+        workers["gns3_vm"](True, "")
+    assert startup.localServerReady()
+    assert ready.call_count == 1
+    assert startup.isFinished()
+
+
+def test_restart_local_server_when_ip_adjusted():
+
+    Servers.instance()._settings["local_server"]["auto_start"] = True
+    Servers.instance().vmSettings()["adjust_local_server_ip"] = True
+    startup = StartupOrchestrator()
+    workers = {}
+
+    def run_worker(name, worker, callback):
+        workers[name] = callback
+
+    with patch("gns3.gns3_vm.GNS3VM.autoStart", return_value=True):
+        with patch("gns3.gns3_vm.GNS3VM.isRemote", return_value=False):
+            with patch("gns3.servers.Servers.localServerAutoStart", side_effect=lambda callback: callback(True)):
+                with patch("gns3.startup_orchestrator.StartupOrchestrator._runWorker", side_effect=run_worker):
+                    with patch("gns3.readiness_prober.ReadinessProber.start"):
+                        startup.start()
+    startup._local_server_prober.finished_signal.emit(200, {"version": "2.0.0"})
+
+    def adjust_local_server_ip():
+        Servers.instance().localServer().setHost("192.168.56.1")
+
+    with patch("gns3.gns3_vm.GNS3VM.adjustLocalServerIP", side_effect=adjust_local_server_ip):
+        with patch("gns3.servers.Servers.interruptLocalServer") as interrupt:
+            workers["gns3_vm"](True, "")
+    # the local server is stopped without blocking, the startup waits for it
+    assert interrupt.called
+    assert startup.runningPhases() == ["local_server"]
+    assert not startup.isFinished()
+
+    with patch("gns3.servers.Servers.localServerAutoStart", side_effect=lambda callback: callback(True)):
+        with patch("gns3.readiness_prober.ReadinessProber.start"):
+            interrupt.call_args[0][0]()
+    startup._local_server_prober.finished_signal.emit(200, {"version": "2.0.0"})
+    assert startup.localServerReady()
+    assert startup.isFinished()
+
+
+def test_start_local_server_error():
+
+    Servers.instance()._settings["local_server"]["auto_start"] = True
+    startup = StartupOrchestrator()
+    errors = []
+    startup.phase_finished_signal.connect(lambda name, success, message: errors.append((name, success)))
+    with patch("gns3.gns3_vm.GNS3VM.autoStart", return_value=False):
+        with patch("gns3.servers.Servers.localServerAutoStart", side_effect=lambda callback: callback(False)):
+            startup.start()
+    assert errors == [("local_server", False)]
+    assert startup.isFinished()
+    assert not startup.localServerReady()
+
+
+def test_connect_remote_servers(remote_server):
+
+    Servers.instance()._settings["local_server"]["auto_start"] = False
+    startup = StartupOrchestrator()
+    with patch("gns3.gns3_vm.GNS3VM.autoStart", return_value=False):
+        with patch("gns3.http_client.HTTPClient.get") as mock:
+            startup.start()
+            assert mock.called
+            # the remote servers do not delay the startup
+            assert startup.isFinished()
+            callback = mock.call_args[0][1]
+    callback({"message": "error"}, error=True)
+    assert startup.phases()[-1][0] == "remote_servers"
+    assert startup.phases()[-1][2] is True
@@ -357,6 +357,8 @@ def test_load(project, monkeypatch, main_window, tmpdir):
             callback({"project_id": uuid.uuid4(), "path": str(tmpdir)})
         elif path[-14:] == "/notifications":
             pass
+        elif path.endswith("/ports/udp"):
+            callback({"udp_port": 10000})
         else:
             callback({"vm_id": uuid.uuid4()})
 
@@ -375,6 +377,8 @@ def test_load(project, monkeypatch, main_window, tmpdir):
     assert topology.getNode(1).server() is not None
     assert topology.getNode(2).initialized()
     assert main_window.uiGraphicsView.addLink.called
+    # the UDP ports of the link are allocated in advance
+    assert project.udpPortPool(topology.getNode(1).server()).statistics()["allocated"] == 2
 
 
 def test_load_invalid_server(project, monkeypatch, main_window, tmpdir):
@@ -482,6 +486,8 @@ def test_load_invalid_server(project, monkeypatch, main_window, tmpdir):
             callback({"project_id": uuid.uuid4(), "path": str(tmpdir)})
         elif path[-14:] == "/notifications":
             pass
+        elif path.endswith("/ports/udp"):
+            callback({"udp_port": 10000})
         else:
             callback({"vm_id": uuid.uuid4()})
 
@@ -609,6 +615,8 @@ def test_load_1_2_topology(project, monkeypatch, main_window, tmpdir):
             assert project_call < 2
         elif path[-14:] == "/notifications":
             pass
+        elif path.endswith("/ports/udp"):
+            callback({"udp_port": 10000})
         else:
             callback({"vm_id": uuid.uuid4()})
 
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest.mock import MagicMock
+
+from gns3.udp_port_pool import UDPPortPool
+
+
+class LocalPortServer:
+
+    """
+    Stand-in for a server allocating UDP ports, the replies
+    are sent when reply() is called.
+    """
+
+    def __init__(self):
+
+        self.next_port = 10000
+        self.pending = []
+
+    def post(self, server, path, callback, **kwargs):
+
+        assert path == "/ports/udp"
+        self.pending.append(callback)
+
+    def reply(self, count=None, error=False):
+
+        count = len(self.pending) if count is None else count
+        for _ in range(count):
+            callback = self.pending.pop(0)
+            if error:
+                callback({"message": "no port available"}, error=True)
+            else:
+                callback({"udp_port": self.next_port})
+                self.next_port += 1
+
+
+def test_acquire_waits_for_the_server():
+
+    project = LocalPortServer()
+    pool = UDPPortPool(project, MagicMock(), batch_size=4)
+    callback = MagicMock()
+    pool.acquire(callback)
+    assert not callback.called
+    # the pool requests more ports than needed
+    assert len(project.pending) == 5
+
+    project.reply(1)
+    callback.assert_called_with(10000, None)
+
+    # the next ports come from the pool
+    project.reply()
+    callback = MagicMock()
+    pool.acquire(callback)
+    callback.assert_called_with(10001, None)
+    assert pool.statistics()["served_from_pool"] == 1
+
+
+def test_reserve():
+
+    project = LocalPortServer()
+    pool = UDPPortPool(project, MagicMock(), batch_size=4)
+    pool.reserve(100)
+    assert len(project.pending) == 100
+    pool.reserve(100)
+    assert len(project.pending) == 100
+
+    # the links are created while the ports are allocated
+    callbacks = [MagicMock() for _ in range(100)]
+    for callback in callbacks[:50]:
+        pool.acquire(callback)
+    project.reply()
+    for callback in callbacks[50:]:
+        pool.acquire(callback)
+    ports = set(callback.call_args[0][0] for callback in callbacks)
+    assert len(ports) == 100
+    assert pool.statistics()["allocated"] == 100
+
+
+def test_acquire_error():
+
+    project = LocalPortServer()
+    pool = UDPPortPool(project, MagicMock(), batch_size=2)
+    callback = MagicMock()
+    pool.acquire(callback)
+    project.reply(1, error=True)
+    callback.assert_called_with(None, "no port available")
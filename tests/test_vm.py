@@ -122,3 +122,10 @@ def test_readBaseConfigRelative(vpcs_device, tmpdir):
     with patch('gns3.servers.Servers.localServerSettings', return_value={'configs_path': str(tmpdir)}):
         assert vpcs_device._readBaseConfig(str("test.cfg")) == "42"
 
+
+def test_readBaseConfigs(vpcs_device, tmpdir):
+    with open(str(tmpdir / "test.cfg"), "w+") as f:
+        f.write("42")
+    callback = Mock()
+    vpcs_device._readBaseConfigs({"startup_script": str(tmpdir / "test.cfg"), "private_config": ""}, callback)
+    callback.assert_called_with({"startup_script": "42"})
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import pathlib
+
+from gns3.wire_trace import WireTrace, BodyPreview, bodyText
+
+
+def test_body_text():
+
+    assert bodyText(None) == ""
+    assert bodyText({"name": "R1"}) == '{"name": "R1"}'
+    assert bodyText(b"hello") == "hello"
+    assert bodyText(pathlib.Path("/tmp/disk.qcow2")) == "<file /tmp/disk.qcow2>"
+
+
+def test_body_preview():
+
+    assert str(BodyPreview("hello")) == "hello"
+    assert str(BodyPreview("a" * 20, size=10)) == "a" * 10 + "... (20 characters)"
+
+
+def test_wire_trace(tmpdir):
+
+    path = str(tmpdir / "wire.log")
+    wire_trace = WireTrace()
+    assert not wire_trace.isEnabled()
+    wire_trace.request("1", "GET", "http://127.0.0.1:3080/v1/version", None)
+
+    wire_trace.enable(path)
+    try:
+        assert wire_trace.isEnabled()
+        wire_trace.request("2", "POST", "http://127.0.0.1:3080/v1/projects", {"name": "test" * 1000})
+        wire_trace.response("2", "http://127.0.0.1:3080/v1/projects", 201, '{"project_id": "abc"}')
+    finally:
+        wire_trace.disable()
+
+    with open(path) as f:
+        content = f.read()
+    assert "> 1 GET" not in content
+    assert "> 2 POST http://127.0.0.1:3080/v1/projects" in content
+    # the full body is written
+    assert "test" * 1000 in content
+    assert '< 2 201 http://127.0.0.1:3080/v1/projects\n{"project_id": "abc"}' in content
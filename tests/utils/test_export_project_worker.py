@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import zipfile
+from unittest.mock import MagicMock
+
+from gns3.utils.export_project_worker import ExportProjectWorker
+
+
+def test_downloadFileProgress_and_merge(tmpdir):
+
+    path = str(tmpdir / "test.gns3project")
+    vm_archive = str(tmpdir / "vm.zip")
+    with zipfile.ZipFile(vm_archive, "w") as myzip:
+        myzip.writestr("project-files/qemu/hda.qcow2", b"disk")
+
+    with zipfile.ZipFile(str(tmpdir / "local.zip"), "w") as myzip:
+        myzip.writestr("project.gns3", b"{}")
+    with open(str(tmpdir / "local.zip"), "rb") as f:
+        local_archive = f.read()
+
+    worker = ExportProjectWorker(MagicMock(), path, False)
+    worker._is_running = True
+    worker._openArchive(path)
+    # the archive is received in several parts
+    worker._downloadFileProgress(local_archive[:10])
+    worker._downloadFileProgress(local_archive[10:])
+    worker._vm_archive = vm_archive
+    worker._exportLocalReceived({})
+
+    assert not os.path.exists(vm_archive)
+    with zipfile.ZipFile(path) as myzip:
+        assert sorted(myzip.namelist()) == ["project.gns3", "servers/vm/project-files/qemu/hda.qcow2"]
+        assert myzip.read("servers/vm/project-files/qemu/hda.qcow2") == b"disk"
+
+
+def test_cancel(tmpdir):
+
+    path = str(tmpdir / "test.gns3project")
+    worker = ExportProjectWorker(MagicMock(), path, False)
+    worker._is_running = True
+    worker._openArchive(path)
+    worker._downloadFileProgress(b"data")
+    worker.cancel()
+    assert not os.path.exists(path)
+    worker._downloadFileProgress(b"data")
+    assert not os.path.exists(path)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import time
+
+from gns3.utils.name_allocator import NameAllocator
+
+
+def test_allocate():
+
+    allocator = NameAllocator()
+    assert allocator.allocate("PC") == "PC1"
+    assert allocator.allocate("PC") == "PC2"
+    assert allocator.allocate("PC-{0}") == "PC-1"
+    assert allocator.allocate("{id}R{0}") == "1R1"
+    assert "PC2" in allocator
+    assert len(allocator) == 4
+
+
+def test_allocate_skips_added_names():
+
+    allocator = NameAllocator()
+    allocator.add("R1")
+    allocator.add("R3")
+    assert allocator.allocate("R") == "R2"
+    assert allocator.allocate("R") == "R4"
+
+
+def test_remove_reuses_lowest_number():
+
+    allocator = NameAllocator()
+    for _ in range(5):
+        allocator.allocate("IOU")
+    allocator.remove("IOU4")
+    allocator.remove("IOU2")
+    assert allocator.allocate("IOU") == "IOU2"
+    assert allocator.allocate("IOU") == "IOU4"
+    assert allocator.allocate("IOU") == "IOU6"
+
+
+def test_remove_name_taken_again():
+
+    allocator = NameAllocator()
+    allocator.allocate("R")
+    allocator.allocate("R")
+    allocator.remove("R1")
+    allocator.add("R1")
+    assert allocator.allocate("R") == "R3"
+
+
+def test_load():
+
+    allocator = NameAllocator()
+    allocator.allocate("PC")
+    allocator.load(["PC2", "PC3", None, "R1"])
+    assert allocator.allocate("PC") == "PC4"
+    assert allocator.allocate("R") == "R2"
+
+
+def test_allocate_10000_names():
+
+    allocator = NameAllocator()
+    start = time.monotonic()
+    names = [allocator.allocate("PC-{0}") for _ in range(10000)]
+    assert time.monotonic() - start < 0.5
+    assert len(set(names)) == 10000
+    assert names[-1] == "PC-10000"
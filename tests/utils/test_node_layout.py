@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import math
+import pytest
+
+from gns3.utils.node_layout import node_layout
+
+
+def test_node_layout_grid():
+
+    assert node_layout("grid", 5, spacing=50, nodes_per_line=2) == [(0, 0), (50, 0), (0, 50), (50, 50), (0, 100)]
+
+
+def test_node_layout_line():
+
+    assert node_layout("line", 3, spacing=10) == [(0, 0), (10, 0), (20, 0)]
+
+
+def test_node_layout_ring():
+
+    positions = node_layout("ring", 12, spacing=100)
+    assert len(positions) == 12
+    # the neighbour nodes are at least spacing apart
+    for index, (x, y) in enumerate(positions):
+        next_x, next_y = positions[(index + 1) % len(positions)]
+        assert math.hypot(next_x - x, next_y - y) >= 100 - 1e-6
+    assert node_layout("ring", 1) == [(0, 0)]
+
+
+def test_node_layout_unknown():
+
+    with pytest.raises(ValueError):
+        node_layout("spiral", 3)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import pytest
+from unittest.mock import patch
+
+from gns3.utils.snapshot_store import SnapshotStore
+
+
+@pytest.fixture
+def project_dir(tmpdir):
+    path = str(tmpdir / "project")
+    os.makedirs(os.path.join(path, "project-files", "qemu", "vm1"))
+    os.makedirs(os.path.join(path, "project-files", "snapshots"))
+    os.makedirs(os.path.join(path, "project-files", "empty"))
+    with open(os.path.join(path, "test.gns3"), "w+") as f:
+        f.write("topology")
+    with open(os.path.join(path, "project-files", "qemu", "vm1", "hda.qcow2"), "wb+") as f:
+        f.write(b"a" * 4096)
+    return path
+
+
+@pytest.fixture
+def store(project_dir):
+    return SnapshotStore(os.path.join(project_dir, "project-files", "snapshots"))
+
+
+def test_create_and_list(store, project_dir):
+
+    manifest_path = store.create("test", project_dir, skip_dirs=["snapshots"])
+    assert SnapshotStore.isManifest(manifest_path)
+    snapshots = store.snapshots()
+    assert len(snapshots) == 1
+    assert snapshots[0]["name"] == "test"
+    assert snapshots[0]["total_size"] == 4096 + len("topology")
+    assert snapshots[0]["incremental_size"] == 4096 + len("topology")
+
+
+def test_incremental_size(store, project_dir):
+
+    store.create("first", project_dir, skip_dirs=["snapshots"])
+    with open(os.path.join(project_dir, "test.gns3"), "w+") as f:
+        f.write("topology changed")
+    store.create("second", project_dir, skip_dirs=["snapshots"])
+
+    snapshots = store.snapshots()
+    assert len(snapshots) == 2
+    assert snapshots[1]["incremental_size"] == len("topology changed")
+
+
+def test_create_unchanged_files_are_not_hashed(store, project_dir):
+
+    store.create("first", project_dir, skip_dirs=["snapshots"])
+    with patch("gns3.utils.snapshot_store.SnapshotStore._hashFile") as mock:
+        store.create("second", project_dir, skip_dirs=["snapshots"])
+        assert not mock.called
+
+
+def test_create_file_changed_while_copied(store, project_dir):
+
+    disk = os.path.join(project_dir, "project-files", "qemu", "vm1", "hda.qcow2")
+    clone_file = SnapshotStore._cloneFile
+
+    def write_and_clone(source, destination):
+        # the node writes to its disk between the hash and the copy
+        if source == disk:
+            with open(disk, "wb") as f:
+                f.write(b"b" * 2048)
+        clone_file(source, destination)
+
+    with patch("gns3.utils.snapshot_store.SnapshotStore._cloneFile", side_effect=write_and_clone):
+        manifest_path = store.create("test", project_dir, skip_dirs=["snapshots"])
+
+    entry = store._loadManifest(manifest_path)["files"]["project-files/qemu/vm1/hda.qcow2"]
+    assert entry["hash"] == SnapshotStore._hashFile(disk)
+    assert entry["size"] == 2048
+    with open(store._objectPath(entry["hash"]), "rb") as f:
+        assert f.read() == b"b" * 2048
+
+
+def test_restore(store, project_dir):
+
+    manifest_path = store.create("test", project_dir, skip_dirs=["snapshots"])
+    disk = os.path.join(project_dir, "project-files", "qemu", "vm1", "hda.qcow2")
+    with open(disk, "wb+") as f:
+        f.write(b"b" * 10)
+    os.rmdir(os.path.join(project_dir, "project-files", "empty"))
+
+    assert store.restore(manifest_path, project_dir) == 1
+    with open(disk, "rb") as f:
+        assert f.read() == b"a" * 4096
+    assert os.path.isdir(os.path.join(project_dir, "project-files", "empty"))
+
+    # nothing changed since the restore
+    assert store.restore(manifest_path, project_dir) == 0
+
+
+def test_delete(store, project_dir):
+
+    first = store.create("first", project_dir, skip_dirs=["snapshots"])
+    with open(os.path.join(project_dir, "test.gns3"), "w+") as f:
+        f.write("topology changed")
+    store.create("second", project_dir, skip_dirs=["snapshots"])
+
+    objects_dir = os.path.join(project_dir, "project-files", "snapshots", "objects")
+    objects = sum(len(files) for _, _, files in os.walk(objects_dir))
+    assert objects == 3
+
+    store.delete(first)
+    assert len(store.snapshots()) == 1
+    objects = sum(len(files) for _, _, files in os.walk(objects_dir))
+    assert objects == 2
+
+
+def test_create_cancel(store, project_dir):
+
+    assert store.create("test", project_dir, skip_dirs=["snapshots"], progress_callback=lambda p: False) is None
+    assert store.snapshots() == []
+    assert not os.listdir(os.path.join(project_dir, "project-files", "snapshots", "objects"))
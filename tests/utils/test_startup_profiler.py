@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import sys
+
+from gns3.utils.startup_profiler import StartupProfiler
+from gns3.modules import MODULES
+
+
+def test_measure_disabled():
+
+    profiler = StartupProfiler()
+    with profiler.measure("test"):
+        pass
+    assert profiler.timings() == []
+
+
+def test_measure_import():
+
+    profiler = StartupProfiler()
+    profiler.enable()
+    try:
+        sys.modules.pop("gns3.utils.normalize_filename", None)
+        import gns3.utils.normalize_filename  # noqa
+        with profiler.measure("test"):
+            pass
+    finally:
+        profiler.disable()
+    assert profiler.timings("phase")[0][1] == "test"
+    assert "import gns3.utils.normalize_filename" in [name for _, name, _ in profiler.timings("import")]
+    assert "test" in profiler.report()
+
+
+def test_lazy_modules_node_classes():
+
+    for module in MODULES:
+        assert sorted(module.nodeClasses()) == sorted(node_class.__name__ for node_class in module.classes())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2016 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import io
+import os
+import zipfile
+
+from gns3.qt import QtCore
+from gns3.utils.zip_stream_device import ZipStreamDevice
+
+
+def test_zip_stream_device(tmpdir):
+
+    os.makedirs(str(tmpdir / "vm" / "project-files" / "qemu"))
+    with open(str(tmpdir / "vm" / "project.gns3"), "w+") as f:
+        f.write("{}")
+    with open(str(tmpdir / "vm" / "project-files" / "qemu" / "hda.qcow2"), "wb+") as f:
+        f.write(os.urandom(3 * 1024 * 1024 + 42))
+
+    device = ZipStreamDevice(str(tmpdir / "vm"))
+    assert device.isSequential()
+    device.open(QtCore.QIODevice.ReadOnly)
+    data = b""
+    while not device.atEnd():
+        data += bytes(device.read(65536))
+    device.close()
+
+    assert len(data) == device.size()
+    with zipfile.ZipFile(io.BytesIO(data)) as myzip:
+        assert myzip.testzip() is None
+        assert sorted(myzip.namelist()) == ["project-files/qemu/hda.qcow2", "project.gns3"]
+        assert myzip.read("project.gns3") == b"{}"